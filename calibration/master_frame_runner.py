@@ -79,7 +79,7 @@ Examples:
     parser.add_argument(
         "--rejection-method",
         type=str,
-        choices=["sigma_clip", "minmax"],
+        choices=["sigma_clip", "minmax", "median", "sigma_clip_median", "winsorized", "mean"],
         help="Frame rejection method (overrides config)",
     )
 
@@ -64,6 +64,8 @@ class DarkCapture:
         self.min_exposure = dark_config.get("min_exposure", 0.001)  # 1ms for bias
         self.max_exposure = dark_config.get("max_exposure", 60.0)  # 60s max
         self.exposure_factors = dark_config.get("exposure_factors", [0.5, 1.0, 2.0, 4.0])
+        # Raw series: no calibration/debayer, FITS written on a background thread
+        self.raw_capture = bool(dark_config.get("raw_capture", True))
         # Resolve output directory (support both new and legacy key)
         self.dark_output_dir = (
             dark_config.get("output_dir") or dark_config.get("output_directory") or "darks"
@@ -326,6 +328,9 @@ class DarkCapture:
             os.makedirs(exp_dir, exist_ok=True)
             self.logger.debug(f"Created/verified directory: {exp_dir}")
 
+            if self._use_raw_capture():
+                return self._capture_dark_series_raw(exposure_time, exp_dir, timestamp)
+
             for i in range(self.num_darks):
                 # Generate filename
                 if exposure_time == self.min_exposure:
@@ -609,6 +614,56 @@ class DarkCapture:
             msg = f"Dark series capture failed for {exposure_time:.3f}s: {e}"
             return error_status(msg)
 
+    def _use_raw_capture(self) -> bool:
+        return (
+            self.raw_capture
+            and self.video_capture is not None
+            and self.video_capture.camera_type in ("ascom", "alpaca")
+            and hasattr(self.video_capture, "capture_raw_series")
+        )
+
+    def _capture_dark_series_raw(
+        self, exposure_time: float, exp_dir: str, timestamp: str
+    ) -> Status:
+        """Capture a dark/bias series through VideoCapture.capture_raw_series."""
+        camera_config = self.config.get_camera_config()
+        section = camera_config.get(self.video_capture.camera_type, {})
+        gain = section.get("gain", None)
+        binning = section.get("binning", 1)
+        prefix = "bias" if exposure_time == self.min_exposure else "dark"
+        paths = [
+            os.path.join(exp_dir, f"{prefix}_{timestamp}_{i+1:03d}.fits")
+            for i in range(self.num_darks)
+        ]
+        status = self.video_capture.capture_raw_series(
+            exposure_time, paths, gain=gain, binning=binning
+        )
+        if not status.is_success:
+            return error_status(
+                f"Dark series capture failed for {exposure_time:.3f}s: {status.message}"
+            )
+        captured_files = list(status.data or [])
+        details = status.details or {}
+        self.logger.info(
+            "Dark series for %.3fs completed: %d/%d frames (%.2f frames/s)",
+            exposure_time,
+            len(captured_files),
+            self.num_darks,
+            details.get("frames_per_s") or 0.0,
+        )
+        return success_status(
+            f"Dark series for {exposure_time:.3f}s captured: {len(captured_files)} frames",
+            data=captured_files,
+            details={
+                "exposure_time": exposure_time,
+                "captured_count": len(captured_files),
+                "target_count": self.num_darks,
+                "output_directory": exp_dir,
+                "elapsed_s": details.get("elapsed_s"),
+                "frames_per_s": details.get("frames_per_s"),
+            },
+        )
+
     def capture_bias_only(self) -> Status:
         """Capture only bias frames (minimum exposure time).
 
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Model-based flat exposure search.
+
+Sensor response to a uniform light source is linear between the bias level and
+saturation: ``ADU(t) = bias + rate * t``. Instead of stepping the exposure by a
+fixed factor, FlatExposureSolver fits this model to the test frames taken so
+far and jumps straight to the exposure that gives the target level:
+
+    1 sample: line through the configured bias level (0 if unknown)
+    2+ samples: least-squares fit of bias and rate over the most recent samples
+        (twilight sky brightness drifts, so old samples are dropped)
+
+Saturated samples carry no rate information; they only bound the exposure
+from above. Test frame statistics come from a strided subsample and are
+computed from a single histogram pass (see frame_statistics).
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Frames at or above this fraction of full scale are treated as saturated
+SATURATION_FRACTION = 0.95
+
+# Samples used for the linear fit
+MAX_FIT_SAMPLES = 3
+
+
+def frame_statistics(
+    frame: np.ndarray, max_samples: int = 65536, roi_fraction: float = 1.0
+) -> Dict[str, Any]:
+    """Mean, std, min, max and median of a strided subsample of a frame.
+
+    Args:
+        frame: 2D (or HxWxC) image
+        max_samples: Upper bound for the number of pixels inspected
+        roi_fraction: Fraction of each axis of the centered region to sample
+
+    Returns:
+        Dict with mean_value, std_value, min_value, max_value, median_value and
+        sample_count
+    """
+    region = np.asarray(frame)
+    if 0.0 < roi_fraction < 1.0 and region.ndim >= 2:
+        h, w = region.shape[0], region.shape[1]
+        rh, rw = max(1, int(h * roi_fraction)), max(1, int(w * roi_fraction))
+        y0, x0 = (h - rh) // 2, (w - rw) // 2
+        region = region[y0 : y0 + rh, x0 : x0 + rw]
+    if region.ndim >= 2 and max_samples > 0:
+        pixels = region.shape[0] * region.shape[1]
+        stride = max(1, int(math.ceil(math.sqrt(pixels / max_samples))))
+        region = region[::stride, ::stride]
+    sample = region.ravel()
+    if sample.size == 0:
+        raise ValueError("Empty frame")
+
+    if np.issubdtype(sample.dtype, np.integer) and int(sample.min()) >= 0:
+        # One pass to build the histogram; moments and order statistics come from the bins
+        counts = np.bincount(sample.astype(np.intp, copy=False))
+        levels = np.nonzero(counts)[0]
+        weights = counts[levels].astype(np.float64)
+        values = levels.astype(np.float64)
+        n = float(weights.sum())
+        mean = float(np.dot(values, weights) / n)
+        var = float(np.dot((values - mean) ** 2, weights) / n)
+        cumulative = np.cumsum(weights)
+        median = float(values[np.searchsorted(cumulative, n / 2.0)])
+        return {
+            "mean_value": mean,
+            "std_value": math.sqrt(var),
+            "min_value": float(values[0]),
+            "max_value": float(values[-1]),
+            "median_value": median,
+            "sample_count": int(n),
+        }
+
+    data = sample.astype(np.float64, copy=False)
+    return {
+        "mean_value": float(data.mean()),
+        "std_value": float(data.std()),
+        "min_value": float(data.min()),
+        "max_value": float(data.max()),
+        "median_value": float(np.median(data)),
+        "sample_count": int(data.size),
+    }
+
+
+@dataclass(frozen=True)
+class ExposureSample:
+    """Mean level of one test frame."""
+
+    exposure: float
+    level: float
+    saturated: bool
+
+
+class FlatExposureSolver:
+    """Predict the flat exposure that reaches a target ADU level."""
+
+    def __init__(
+        self,
+        target_level: float,
+        full_scale: float,
+        min_exposure: float = 0.001,
+        max_exposure: float = 10.0,
+        bias_level: Optional[float] = None,
+        backoff_factor: float = 1.5,
+    ) -> None:
+        """Initialize the solver.
+
+        Args:
+            target_level: Target mean level (ADU)
+            full_scale: Maximum ADU of the sensor
+            min_exposure: Shortest allowed exposure (s)
+            max_exposure: Longest allowed exposure (s)
+            bias_level: Known bias level (ADU) used until two samples exist
+            backoff_factor: Extra reduction applied after a saturated frame
+        """
+        self.target_level = float(target_level)
+        self.full_scale = float(full_scale)
+        self.min_exposure = float(min_exposure)
+        self.max_exposure = float(max_exposure)
+        self.bias_level = float(bias_level) if bias_level is not None else 0.0
+        self.backoff_factor = max(1.0, float(backoff_factor))
+        self.samples: List[ExposureSample] = []
+
+    def add_sample(self, exposure: float, level: float) -> ExposureSample:
+        """Record the mean level measured at an exposure."""
+        sample = ExposureSample(
+            float(exposure), float(level), level >= SATURATION_FRACTION * self.full_scale
+        )
+        self.samples.append(sample)
+        return sample
+
+    def model(self) -> Optional[Tuple[float, float]]:
+        """Current (bias, rate) estimate, or None if no usable sample exists."""
+        linear = [s for s in self.samples if not s.saturated][-MAX_FIT_SAMPLES:]
+        if not linear:
+            return None
+        exposures = np.array([s.exposure for s in linear])
+        levels = np.array([s.level for s in linear])
+        if len(linear) >= 2 and np.ptp(exposures) > 0:
+            rate, bias = np.polyfit(exposures, levels, 1)
+            if rate > 0 and bias < self.target_level:
+                return float(bias), float(rate)
+        # Line through the bias level and the most recent sample
+        last = linear[-1]
+        bias = min(self.bias_level, last.level)
+        rate = (last.level - bias) / last.exposure if last.exposure > 0 else 0.0
+        if rate <= 0:
+            return None
+        return bias, rate
+
+    def next_exposure(self) -> float:
+        """Exposure predicted to reach the target level, clamped to the limits."""
+        if not self.samples:
+            raise ValueError("No samples recorded")
+        last = self.samples[-1]
+        estimate = self.model()
+        if last.saturated:
+            # The true level is at least full scale: the target needs at most this much
+            bias = estimate[0] if estimate else self.bias_level
+            fraction = (self.target_level - bias) / max(self.full_scale - bias, 1.0)
+            exposure = last.exposure * fraction / self.backoff_factor
+            if estimate:
+                exposure = min(exposure, (self.target_level - estimate[0]) / estimate[1])
+        elif estimate is None:
+            # No signal above the bias yet
+            exposure = last.exposure * self.backoff_factor**2
+        else:
+            bias, rate = estimate
+            exposure = (self.target_level - bias) / rate
+        return float(min(max(exposure, self.min_exposure), self.max_exposure))
@@ -6,7 +6,7 @@ This module provides automatic flat field capture functionality with:
 - Configurable target count rate (default: 50% of maximum)
 - Configurable tolerance (default: 10%)
 - Configurable number of flats (default: 40)
-- Automatic exposure time adjustment
+- Model-based exposure time search on subframe test frames
 - Quality control and validation
 
 The system automatically adjusts exposure time to achieve the target count rate
@@ -20,6 +20,7 @@ from pathlib import Path
 import time
 from typing import Any, Dict
 
+from calibration.exposure_model import FlatExposureSolver, frame_statistics
 from capture.controller import VideoCapture
 import numpy as np
 from status import Status, error_status, success_status, warning_status
@@ -65,6 +66,13 @@ class FlatCapture:
         self.max_exposure = flat_config.get("max_exposure", 10.0)  # 10s
         self.exposure_step_factor = flat_config.get("exposure_step_factor", 1.5)
         self.max_adjustment_attempts = flat_config.get("max_adjustment_attempts", 10)
+        # Test frames: centered region per axis (hardware subframe when supported)
+        self.test_frame_roi = float(flat_config.get("test_frame_roi", 0.5))
+        self.stats_max_samples = int(flat_config.get("stats_max_samples", 65536))
+        # Known bias level (ADU) for the first exposure prediction; None = assume 0
+        self.bias_level = flat_config.get("bias_level", None)
+        # Raw series: no calibration/debayer, FITS written on a background thread
+        self.raw_capture = bool(flat_config.get("raw_capture", True))
         # Resolve output directory (support both new and legacy key)
         self.flat_output_dir = (
             flat_config.get("output_dir") or flat_config.get("output_directory") or "flats"
@@ -76,6 +84,7 @@ class FlatCapture:
         self.video_capture = None
         self.current_exposure = None
         self.is_running = False
+        self._hardware_roi = False
 
     def _create_output_directories(self):
         """Create necessary output directories."""
@@ -176,111 +185,84 @@ class FlatCapture:
             return error_status(f"Flat capture failed: {e}")
 
     def _adjust_exposure_for_target(self) -> Status:
-        """Intelligent exposure adjustment to achieve target count rate.
+        """Find the exposure time that gives the target count rate.
 
-        Uses adaptive step sizes and oscillation prevention for better convergence.
+        Fits a linear ADU-versus-exposure model to the test frames taken so far and
+        jumps to the exposure predicted for the target level. Test frames are read out
+        as a centered subframe when the camera supports it.
 
         Returns:
             Status: Success or error status
         """
         try:
-            self.logger.info("Starting intelligent exposure adjustment...")
-
-            # Track previous values to detect oscillations
-            previous_exposures = []
-            previous_count_rates = []
-            oscillation_detected = False
-
-            for attempt in range(self.max_adjustment_attempts):
-                # Capture a test frame
-                test_status = self._capture_test_frame()
-                if not test_status.is_success:
-                    return test_status
-
-                # Analyze the frame
-                analysis = test_status.data
-                current_count_rate = analysis["mean_count_rate"]
-
-                # Store history for oscillation detection
-                previous_exposures.append(self.current_exposure)
-                previous_count_rates.append(current_count_rate)
-
-                # Keep only last 4 values for oscillation detection
-                if len(previous_exposures) > 4:
-                    previous_exposures.pop(0)
-                    previous_count_rates.pop(0)
-
-                self.logger.info(
-                    "Attempt %d: Exposure=%.3fs, Count rate=%.1f%%, Target=%.1f%%",
-                    attempt + 1,
-                    self.current_exposure,
-                    current_count_rate * 100,
-                    self.target_count_rate * 100,
-                )
-
-                # Check if we're within tolerance
-                if self._is_within_tolerance(current_count_rate, self.target_count_rate):
-                    self.logger.info(f"✅ Target count rate achieved: {current_count_rate:.1%}")
-                    return success_status("Exposure time adjusted successfully")
-
-                # Calculate distance from target (as percentage)
-                distance_from_target = abs(current_count_rate - self.target_count_rate)
-                relative_distance = distance_from_target / self.target_count_rate
-
-                # Detect oscillations (if we have enough history)
-                if len(previous_count_rates) >= 4:
-                    oscillation_detected = self._detect_oscillation(
-                        previous_count_rates, previous_exposures
+            self.logger.info("Starting model-based exposure adjustment...")
+
+            max_possible_count = self._max_possible_count()
+            solver = FlatExposureSolver(
+                target_level=self.target_count_rate * max_possible_count,
+                full_scale=max_possible_count,
+                min_exposure=self.min_exposure,
+                max_exposure=self.max_exposure,
+                bias_level=self.bias_level,
+                backoff_factor=self.exposure_step_factor,
+            )
+            self._hardware_roi = False
+            if self.test_frame_roi < 1.0 and hasattr(self.video_capture, "set_subframe"):
+                self._hardware_roi = bool(self.video_capture.set_subframe(self.test_frame_roi))
+                if self._hardware_roi:
+                    self.logger.debug(f"Test frames use a {self.test_frame_roi:.0%} subframe")
+
+            try:
+                for attempt in range(self.max_adjustment_attempts):
+                    test_status = self._capture_test_frame()
+                    if not test_status.is_success:
+                        return test_status
+
+                    analysis: Dict[str, Any] = test_status.data or {}
+                    current_count_rate = analysis["mean_count_rate"]
+                    self.logger.info(
+                        "Attempt %d: Exposure=%.3fs, Count rate=%.1f%%, Target=%.1f%%",
+                        attempt + 1,
+                        self.current_exposure,
+                        current_count_rate * 100,
+                        self.target_count_rate * 100,
                     )
-                    if oscillation_detected:
-                        self.logger.warning(
-                            "🔄 Oscillation detected! Using conservative adjustment..."
-                        )
 
-                # Calculate adaptive step size
-                step_factor = self._calculate_adaptive_step(
-                    relative_distance, oscillation_detected, attempt
-                )
+                    if self._is_within_tolerance(current_count_rate, self.target_count_rate):
+                        self.logger.info(f"✅ Target count rate achieved: {current_count_rate:.1%}")
+                        return success_status(
+                            "Exposure time adjusted successfully",
+                            details={"attempts": attempt + 1, "exposure": self.current_exposure},
+                        )
 
-                # Determine adjustment direction and magnitude
-                if current_count_rate < self.target_count_rate:
-                    # Too dark, increase exposure
-                    new_exposure = self.current_exposure * step_factor
-                    direction = "increase"
-                else:
-                    # Too bright, decrease exposure
-                    new_exposure = self.current_exposure / step_factor
-                    direction = "decrease"
+                    sample = solver.add_sample(self.current_exposure, analysis["mean_value"])
+                    new_exposure = solver.next_exposure()
+                    if new_exposure == self.current_exposure:
+                        return warning_status(
+                            "Target count rate not reachable within exposure limits "
+                            f"({self.min_exposure}s - {self.max_exposure}s)"
+                        )
 
-                # Apply bounds checking
-                if new_exposure > self.max_exposure:
-                    self.logger.warning(
-                        f"Exposure would exceed maximum ({self.max_exposure}s), using maximum"
-                    )
-                    new_exposure = self.max_exposure
-                elif new_exposure < self.min_exposure:
-                    self.logger.warning(
-                        f"Exposure would be below minimum ({self.min_exposure}s), using minimum"
+                    estimate = solver.model()
+                    self.logger.info(
+                        "Adjusting exposure: %.3fs → %.3fs (%s)",
+                        self.current_exposure,
+                        new_exposure,
+                        (
+                            "saturated"
+                            if sample.saturated
+                            else (
+                                f"bias={estimate[0]:.0f} ADU, rate={estimate[1]:.1f} ADU/s"
+                                if estimate
+                                else "no signal"
+                            )
+                        ),
                     )
-                    new_exposure = self.min_exposure
-
-                # Log the adjustment
-                change_percent = (
-                    (new_exposure - self.current_exposure) / self.current_exposure
-                ) * 100
-                self.logger.info(
-                    "Adjusting exposure: %.3fs → %.3fs (%+.1f%%, %s, step_factor=%.2f)",
-                    self.current_exposure,
-                    new_exposure,
-                    change_percent,
-                    direction,
-                    step_factor,
-                )
-
-                self.current_exposure = new_exposure
-
-                # Allow camera to adjust
-                time.sleep(0.2)  # Slightly longer delay for better stability
+                    self.current_exposure = new_exposure
+            finally:
+                if self._hardware_roi:
+                    self.video_capture.set_subframe(None)
+                    self._hardware_roi = False
 
             return warning_status(
                 f"Could not achieve target count rate after {self.max_adjustment_attempts} attempts"
@@ -290,91 +272,10 @@ class FlatCapture:
             self.logger.error(f"Error adjusting exposure: {e}")
             return error_status(f"Exposure adjustment failed: {e}")
 
-    def _calculate_adaptive_step(
-        self, relative_distance: float, oscillation_detected: bool, attempt: int
-    ) -> float:
-        """Calculate adaptive step size based on distance from target and oscillation state.
-
-        Args:
-            relative_distance: Distance from target as fraction (0.0 = at target, 1.0 = 100% off)
-            oscillation_detected: Whether oscillation was detected
-            attempt: Current attempt number
-
-        Returns:
-            float: Step factor to apply to exposure time
-        """
-        # Base step factors for different distance ranges
-        if relative_distance > 0.5:  # Very far from target (>50% off)
-            base_step = 2.0
-        elif relative_distance > 0.2:  # Far from target (20-50% off)
-            base_step = 1.5
-        elif relative_distance > 0.1:  # Moderate distance (10-20% off)
-            base_step = 1.3
-        elif relative_distance > 0.05:  # Close to target (5-10% off)
-            base_step = 1.15
-        else:  # Very close to target (<5% off)
-            base_step = 1.08
-
-        # Reduce step size if oscillation detected
-        if oscillation_detected:
-            base_step = min(base_step, 1.2)  # Conservative step when oscillating
-
-        # Gradually reduce step size with attempts (convergence)
-        attempt_factor = max(0.8, 1.0 - (attempt * 0.05))  # Reduce by 5% per attempt, minimum 0.8
-
-        final_step = base_step * attempt_factor
-
-        # Ensure reasonable bounds
-        final_step = max(1.05, min(2.5, final_step))
-
-        return final_step
-
-    def _detect_oscillation(self, count_rates: list, exposures: list) -> bool:
-        """Detect oscillation in count rates and exposures.
-
-        Args:
-            count_rates: List of recent count rates
-            exposures: List of recent exposure times
-
-        Returns:
-            bool: True if oscillation is detected
-        """
-        if len(count_rates) < 4 or len(exposures) < 4:
-            return False
-
-        # Check for alternating pattern in count rates (crossing target)
-        target = self.target_count_rate
-        crossings = 0
-        for i in range(1, len(count_rates)):
-            if (count_rates[i - 1] < target and count_rates[i] > target) or (
-                count_rates[i - 1] > target and count_rates[i] < target
-            ):
-                crossings += 1
-
-        # Check for alternating exposure changes (increasing/decreasing pattern)
-        exposure_changes = []
-        for i in range(1, len(exposures)):
-            change = exposures[i] - exposures[i - 1]
-            exposure_changes.append(change > 0)  # True if increasing
-
-        alternating_exposures = 0
-        for i in range(1, len(exposure_changes)):
-            if exposure_changes[i] != exposure_changes[i - 1]:
-                alternating_exposures += 1
-
-        # Oscillation detected if:
-        # 1. Multiple crossings of target value, OR
-        # 2. Alternating exposure changes with small improvements
-        oscillation = (crossings >= 2) or (alternating_exposures >= 2 and len(count_rates) >= 4)
-
-        if oscillation:
-            self.logger.debug(
-                "Oscillation indicators: crossings=%d, alternating_exposures=%d",
-                crossings,
-                alternating_exposures,
-            )
-
-        return oscillation
+    def _max_possible_count(self) -> int:
+        """Full-scale ADU from the configured camera bit depth."""
+        bit_depth = self.config.get_camera_config().get("bit_depth", 16)
+        return int((2 ** int(bit_depth)) - 1)
 
     def _capture_test_frame(self) -> Status:
         """Capture a single test frame for exposure adjustment.
@@ -386,8 +287,20 @@ class FlatCapture:
             if not self.video_capture:
                 return error_status("Video capture not available")
 
-            # Capture frame with current exposure time
-            if (
+            # Capture frame with current exposure time; the level is measured on raw
+            # ADU, so calibration and debayering are skipped where possible
+            camera_type = self.video_capture.camera_type
+            if hasattr(self.video_capture, "acquire_raw_frame") and camera_type in (
+                "ascom",
+                "alpaca",
+            ):
+                section = self.config.get_camera_config().get(camera_type, {})
+                frame_status = self.video_capture.acquire_raw_frame(
+                    self.current_exposure,
+                    section.get("gain", None),
+                    section.get("binning", 1),
+                )
+            elif (
                 hasattr(self.video_capture, "capture_single_frame_ascom")
                 and self.video_capture.camera_type == "ascom"
             ):
@@ -524,18 +437,17 @@ class FlatCapture:
                     "error": f"Invalid frame type: {type(frame)}",
                 }
 
-            # Calculate statistics on original data (no conversion to float32)
-            mean_value = np.mean(frame)
-            std_value = np.std(frame)
-            min_value = np.min(frame)
-            max_value = np.max(frame)
-
-            # Get bit depth from camera configuration
-            camera_config = self.config.get_camera_config()
-            bit_depth = camera_config.get("bit_depth", 16)  # Default to 16-bit
+            # Statistics of a strided subsample, from a single histogram pass
+            stats = frame_statistics(
+                frame,
+                max_samples=self.stats_max_samples,
+                roi_fraction=1.0 if self._hardware_roi else self.test_frame_roi,
+            )
+            mean_value = stats["mean_value"]
+            max_value = stats["max_value"]
 
-            # Calculate maximum possible count based on bit depth
-            max_possible_count = (2**bit_depth) - 1
+            bit_depth = self.config.get_camera_config().get("bit_depth", 16)
+            max_possible_count = self._max_possible_count()
 
             # Calculate count rate as percentage of maximum
             count_rate = mean_value / max_possible_count
@@ -559,10 +471,7 @@ class FlatCapture:
                 count_rate = 1.0
 
             return {
-                "mean_value": mean_value,
-                "std_value": std_value,
-                "min_value": min_value,
-                "max_value": max_value,
+                **stats,
                 "max_possible_count": max_possible_count,
                 "mean_count_rate": count_rate,
                 "frame_shape": frame.shape,
@@ -622,6 +531,38 @@ class FlatCapture:
                 gain = None
                 binning = 1
 
+            if (
+                self.raw_capture
+                and hasattr(self.video_capture, "capture_raw_series")
+                and self.video_capture.camera_type in ("ascom", "alpaca")
+            ):
+                paths = [
+                    os.path.join(self.flat_output_dir, f"flat_{timestamp}_{i+1:03d}.fits")
+                    for i in range(self.num_flats)
+                ]
+                status = self.video_capture.capture_raw_series(
+                    self.current_exposure, paths, gain=gain, binning=binning
+                )
+                if not status.is_success:
+                    return error_status(f"Flat series capture failed: {status.message}")
+                captured_files = list(status.data or [])
+                self.logger.info(
+                    "Flat series capture completed: %d/%d frames (%.2f frames/s)",
+                    len(captured_files),
+                    self.num_flats,
+                    (status.details or {}).get("frames_per_s") or 0.0,
+                )
+                return success_status(
+                    f"Flat series captured: {len(captured_files)} frames",
+                    data=captured_files,
+                    details={
+                        "captured_count": len(captured_files),
+                        "target_count": self.num_flats,
+                        "output_directory": self.flat_output_dir,
+                        "elapsed_s": (status.details or {}).get("elapsed_s"),
+                    },
+                )
+
             for i in range(self.num_flats):
                 # Generate filename
                 filename = f"flat_{timestamp}_{i+1:03d}.fits"
@@ -665,8 +606,6 @@ class FlatCapture:
                         frame_details["binning"] = binning
 
                     # Save the frame directly as FITS with proper details
-                    from status import success_status
-
                     frame_with_details = success_status(
                         "Frame captured", data=frame_data, details=frame_details
                     )
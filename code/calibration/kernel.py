@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Calibration Kernel for Telescope Streaming System
+
+Applies dark subtraction and flat correction in a single pass per row chunk:
+``out = (raw - offset) * inv_flat``. The offset term and the reciprocal of the
+flat are prepared once per master set, and the per-frame work writes straight
+into an output buffer without full-frame temporaries. Large frames are split
+into row chunks processed on a thread pool (numpy ufuncs release the GIL).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PreparedMasters:
+    """Per-master-set terms for the fused calibration kernel.
+
+    Attributes:
+        offset: Term subtracted from the raw frame (master dark, float32) or None
+        inv_flat: Reciprocal of the normalized flat (float32, 1.0 where flat <= 0) or None
+    """
+
+    offset: Optional[np.ndarray]
+    inv_flat: Optional[np.ndarray]
+
+    @property
+    def shape(self) -> Optional[Tuple[int, ...]]:
+        term = self.offset if self.offset is not None else self.inv_flat
+        return tuple(term.shape) if term is not None else None
+
+
+def prepare_masters(
+    dark: Optional[np.ndarray] = None, flat: Optional[np.ndarray] = None
+) -> PreparedMasters:
+    """Build the kernel terms for one master dark / master flat combination.
+
+    Args:
+        dark: Master dark (includes the bias signal) or None
+        flat: Normalized master flat or None
+
+    Returns:
+        PreparedMasters with contiguous float32 arrays
+    """
+    offset = None
+    if dark is not None:
+        offset = np.ascontiguousarray(dark, dtype=np.float32)
+    inv_flat = None
+    if flat is not None:
+        flat32 = np.asarray(flat, dtype=np.float32)
+        # Same guard as before: non-positive (and NaN) flat pixels leave the frame unscaled
+        inv_flat = np.ones(flat32.shape, dtype=np.float32)
+        np.divide(1.0, flat32, out=inv_flat, where=flat32 > 0)
+    return PreparedMasters(offset=offset, inv_flat=inv_flat)
+
+
+class CalibrationKernel:
+    """Row-chunked, in-place application of prepared calibration terms."""
+
+    def __init__(
+        self, max_workers: Optional[int] = None, min_rows_per_chunk: int = 256, logger=None
+    ) -> None:
+        """Initialize the kernel.
+
+        Args:
+            max_workers: Thread count for large frames (None/0 = min(8, cpu count), 1 = serial)
+            min_rows_per_chunk: Frames with fewer rows per worker are processed serially
+            logger: Logger instance
+        """
+        if not max_workers:
+            max_workers = min(8, os.cpu_count() or 1)
+        self.max_workers = max(1, int(max_workers))
+        self.min_rows_per_chunk = max(1, int(min_rows_per_chunk))
+        self.logger = logger or logging.getLogger(__name__)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="calib"
+                )
+            return self._executor
+
+    def _chunks(self, rows: int) -> List[Tuple[int, int]]:
+        workers = min(self.max_workers, max(1, rows // self.min_rows_per_chunk))
+        if workers <= 1:
+            return [(0, rows)]
+        step = -(-rows // workers)
+        return [(r0, min(rows, r0 + step)) for r0 in range(0, rows, step)]
+
+    def apply(
+        self,
+        raw: np.ndarray,
+        prepared: PreparedMasters,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Compute ``(raw - offset) * inv_flat`` into ``out``.
+
+        Args:
+            raw: Frame data of any numeric dtype and any strides (e.g. a transposed view)
+            prepared: Terms from prepare_masters with the same shape as raw
+            out: Optional float32 C-contiguous buffer of raw's shape to write into
+
+        Returns:
+            The float32 output array
+        """
+        if out is None or out.shape != raw.shape or out.dtype != np.float32:
+            out = np.empty(raw.shape, dtype=np.float32)
+        offset, inv_flat = prepared.offset, prepared.inv_flat
+        if raw.ndim == 0 or raw.shape[0] == 0:
+            out[...] = raw
+            return out
+
+        def _run(r0: int, r1: int) -> None:
+            dst = out[r0:r1]
+            if offset is not None:
+                np.subtract(raw[r0:r1], offset[r0:r1], out=dst, casting="unsafe")
+                if inv_flat is not None:
+                    np.multiply(dst, inv_flat[r0:r1], out=dst)
+            elif inv_flat is not None:
+                np.multiply(raw[r0:r1], inv_flat[r0:r1], out=dst, casting="unsafe")
+            else:
+                dst[...] = raw[r0:r1]
+
+        chunks = self._chunks(int(raw.shape[0]))
+        if len(chunks) == 1:
+            _run(0, int(raw.shape[0]))
+        else:
+            executor = self._get_executor()
+            for fut in [executor.submit(_run, r0, r1) for r0, r1 in chunks]:
+                fut.result()
+        return out
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (a new pool is created on demand)."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+def frame_stats(data: np.ndarray) -> Dict[str, float]:
+    """Return min/max/mean of a calibrated frame, ignoring NaNs."""
+    if data.size == 0:
+        return {}
+    return {
+        "min": float(np.nanmin(data)),
+        "max": float(np.nanmax(data)),
+        "mean": float(np.nanmean(data)),
+    }
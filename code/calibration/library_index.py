@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Calibration library index for incremental master frame builds.
+
+A JSON manifest records every raw calibration frame (path, mtime, size and the
+EXPTIME, GAIN, OFFSET, READOUT and CCD-TEMP header values) and, per master
+group, the inputs, combine settings and resulting master file. A later run
+compares the current inputs with the manifest:
+
+    unchanged: same inputs and settings; the existing master is reused
+    append: only new frames were added and the group keeps a running
+        accumulator; the new frames are folded into it
+    rebuild: anything else (changed or removed frames, new settings)
+
+Headers are only re-read for frames whose mtime or size changed. Running
+accumulators (per-pixel count/mean/M2) are kept for the mean combine mode,
+whose result can be extended exactly without rereading the old frames.
+"""
+
+from dataclasses import asdict, dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from calibration.master_store import header_number
+import numpy as np
+
+_INDEX_VERSION = 1
+
+# Combine modes whose result a RunningStack reproduces exactly
+INCREMENTAL_METHODS = ("mean",)
+
+PLAN_UNCHANGED = "unchanged"
+PLAN_APPEND = "append"
+PLAN_REBUILD = "rebuild"
+
+
+@dataclass
+class FrameRecord:
+    """File signature and acquisition settings of one raw calibration frame."""
+
+    path: str
+    mtime: float
+    size: int
+    exptime: Optional[float] = None
+    gain: Optional[float] = None
+    offset: Optional[float] = None
+    readout: Optional[float] = None
+    ccd_temp: Optional[float] = None
+
+    @property
+    def signature(self) -> List[Union[float, int]]:
+        return [self.mtime, self.size]
+
+
+class RunningStack:
+    """Per-pixel count/mean/M2 (Welford) accumulator that can be saved and extended."""
+
+    def __init__(
+        self, count: int = 0, mean: Optional[np.ndarray] = None, m2: Optional[np.ndarray] = None
+    ) -> None:
+        self.count = int(count)
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float64)
+        self.m2 = None if m2 is None else np.asarray(m2, dtype=np.float64)
+
+    def add(self, frame: np.ndarray) -> None:
+        """Fold one frame into the accumulator."""
+        arr = np.asarray(frame, dtype=np.float64)
+        if self.mean is None or self.m2 is None:
+            self.count = 1
+            self.mean = arr.copy()
+            self.m2 = np.zeros_like(arr)
+            return
+        if arr.shape != self.mean.shape:
+            raise ValueError(f"Frame shape {arr.shape} != accumulator shape {self.mean.shape}")
+        self.count += 1
+        delta = arr - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (arr - self.mean)
+
+    def result(self) -> Optional[np.ndarray]:
+        """Mean frame as float32 (None if empty)."""
+        if self.mean is None:
+            return None
+        return self.mean.astype(np.float32)
+
+    def std(self) -> Optional[np.ndarray]:
+        """Per-pixel sample standard deviation as float32 (None if empty)."""
+        if self.m2 is None:
+            return None
+        return np.sqrt(np.maximum(self.m2 / max(self.count - 1, 1), 0.0)).astype(np.float32)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write count, mean and M2 to an .npz file (atomically)."""
+        if self.mean is None or self.m2 is None:
+            raise ValueError("Cannot save an empty accumulator")
+        target = Path(path)
+        fd, tmp_path = tempfile.mkstemp(suffix=".npz", dir=str(target.parent))
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, count=np.int64(self.count), mean=self.mean, m2=self.m2)
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RunningStack":
+        with np.load(str(path)) as data:
+            return cls(int(data["count"]), data["mean"], data["m2"])
+
+
+class CalibrationLibrary:
+    """JSON manifest of raw calibration frames and the masters built from them."""
+
+    def __init__(self, index_path: Union[str, Path], logger=None) -> None:
+        """Initialize the library and load an existing manifest.
+
+        Args:
+            index_path: Manifest file (created on the first save)
+            logger: Logger instance
+        """
+        self.index_path = Path(index_path)
+        self.logger = logger or logging.getLogger(__name__)
+        self._frames: Dict[str, Dict[str, Any]] = {}
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, encoding="utf-8") as fh:
+                index = json.load(fh)
+        except Exception as e:
+            self.logger.warning(f"Calibration library index unreadable, starting empty: {e}")
+            return
+        if index.get("version") != _INDEX_VERSION:
+            self.logger.info("Calibration library index layout changed; rebuilding all masters")
+            return
+        self._frames = dict(index.get("frames", {}))
+        self._groups = dict(index.get("groups", {}))
+
+    def save(self) -> None:
+        """Persist the manifest atomically; frames that no longer exist are dropped."""
+        self._frames = {p: rec for p, rec in self._frames.items() if os.path.exists(p)}
+        payload = {"version": _INDEX_VERSION, "frames": self._frames, "groups": self._groups}
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".json", dir=str(self.index_path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, indent=1)
+            os.replace(tmp_path, self.index_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def scan(self, files: Sequence[str]) -> List[FrameRecord]:
+        """Return records for files, reading headers only for new or modified files."""
+        records: List[FrameRecord] = []
+        for file_path in files:
+            path = os.path.abspath(file_path)
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                self.logger.warning(f"Skipping calibration frame {path}: {e}")
+                continue
+            cached = self._frames.get(path)
+            if cached and cached.get("mtime") == st.st_mtime and cached.get("size") == st.st_size:
+                records.append(FrameRecord(**cached))
+                continue
+            record = FrameRecord(path=path, mtime=st.st_mtime, size=st.st_size)
+            self._read_header(record)
+            self._frames[path] = asdict(record)
+            records.append(record)
+        return records
+
+    def _read_header(self, record: FrameRecord) -> None:
+        try:
+            import astropy.io.fits as fits
+
+            header = fits.getheader(record.path, 0)
+        except Exception as e:
+            self.logger.debug(f"Failed to read header of {record.path}: {e}")
+            return
+        record.exptime = header_number(header, "EXPTIME")
+        record.gain = header_number(header, "GAIN")
+        record.offset = header_number(header, "OFFSET")
+        record.readout = header_number(header, "READOUT")
+        record.ccd_temp = header_number(header, "CCD-TEMP")
+
+    def group(self, name: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry of a master group (inputs, settings, master, accumulator)."""
+        return self._groups.get(name)
+
+    def plan(self, name: str, records: Sequence[FrameRecord], settings: Dict[str, Any]) -> str:
+        """Decide how to bring a group's master up to date.
+
+        Returns:
+            PLAN_UNCHANGED, PLAN_APPEND or PLAN_REBUILD
+        """
+        entry = self._groups.get(name)
+        if not entry or entry.get("settings") != settings:
+            return PLAN_REBUILD
+        master = entry.get("master")
+        if not master or not os.path.exists(master):
+            return PLAN_REBUILD
+        previous: Dict[str, List[Any]] = entry.get("inputs", {})
+        current = {r.path: r.signature for r in records}
+        if current == previous:
+            return PLAN_UNCHANGED
+        kept = all(current.get(path) == sig for path, sig in previous.items())
+        accumulator = entry.get("accumulator")
+        if (
+            kept
+            and settings.get("method") in INCREMENTAL_METHODS
+            and accumulator
+            and os.path.exists(accumulator)
+        ):
+            return PLAN_APPEND
+        return PLAN_REBUILD
+
+    def new_records(self, name: str, records: Sequence[FrameRecord]) -> List[FrameRecord]:
+        """Records not yet part of the group's last build."""
+        previous = (self._groups.get(name) or {}).get("inputs", {})
+        return [r for r in records if r.path not in previous]
+
+    def record_group(
+        self,
+        name: str,
+        records: Sequence[FrameRecord],
+        settings: Dict[str, Any],
+        master: str,
+        accumulator: Optional[str] = None,
+    ) -> None:
+        """Store the inputs and outputs of a finished build.
+
+        The accumulator of the previous build of this group (internal state) is
+        deleted when a new file replaces it. Previous master files are kept; users
+        and configs may still refer to them by path.
+        """
+        previous = self._groups.get(name) or {}
+        old = previous.get("accumulator")
+        if old and old != accumulator and os.path.exists(old):
+            try:
+                os.remove(old)
+            except OSError as e:
+                self.logger.warning(f"Could not remove superseded accumulator {old}: {e}")
+        self._groups[name] = {
+            "inputs": {r.path: r.signature for r in records},
+            "settings": settings,
+            "master": master,
+            "accumulator": accumulator,
+        }
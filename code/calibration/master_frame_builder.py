@@ -18,8 +18,18 @@ import logging
 import os
 from pathlib import Path
 import re
-from typing import Any, Dict, List, Optional, Tuple
-
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from calibration.library_index import (
+    INCREMENTAL_METHODS,
+    PLAN_APPEND,
+    PLAN_REBUILD,
+    PLAN_UNCHANGED,
+    CalibrationLibrary,
+    FrameRecord,
+    RunningStack,
+)
+from calibration.tile_combiner import TileCombiner
 import numpy as np
 from status import Status, error_status, success_status
 
@@ -84,11 +94,23 @@ class MasterFrameCreator:
         )
         self.rejection_method = master_config.get(
             "rejection_method", "sigma_clip"
-        )  # 'sigma_clip' or 'minmax'
+        )  # see calibration.tile_combiner.COMBINE_METHODS
         self.sigma_threshold = master_config.get("sigma_threshold", 3.0)
         self.normalization_method = master_config.get(
             "normalization_method", "mean"
         )  # 'mean', 'median', 'max'
+        # Tile-parallel combine: worker processes (0 = CPU count) and stack memory cap
+        self.combine_workers = int(master_config.get("combine_workers", 0) or 0)
+        self.combine_memory_mb = float(master_config.get("combine_memory_mb", 1024))
+        # Calibration library index: skip unchanged groups, extend mean stacks in place
+        self.incremental = bool(master_config.get("incremental", True))
+        self.save_accumulators = bool(master_config.get("save_accumulators", True))
+        self.library_index = master_config.get("library_index") or os.path.join(
+            self.master_output_dir, "calibration_library.json"
+        )
+        self.library: Optional[CalibrationLibrary] = (
+            CalibrationLibrary(self.library_index, logger=self.logger) if self.incremental else None
+        )
 
         # Ensure output directory exists
         os.makedirs(self.master_output_dir, exist_ok=True)
@@ -320,13 +342,37 @@ class MasterFrameCreator:
                 f"Found {len(dark_files)} dark files for {exposure_time:.3f}s exposure"
             )
 
+            group = f"dark:{os.path.abspath(exp_dir)}"
+            settings = {"method": self.rejection_method, "sigma": self.sigma_threshold}
+            plan, records = self._library_plan(group, dark_files, settings)
+            if plan == PLAN_UNCHANGED and self.library is not None:
+                master_path = (self.library.group(group) or {}).get("master")
+                self.logger.info(
+                    f"Master dark for {exposure_time:.3f}s is up to date: {master_path}"
+                )
+                return success_status(
+                    f"Master dark up to date for {exposure_time:.3f}s exposure",
+                    data=master_path,
+                    details={
+                        "exposure_time": exposure_time,
+                        "input_files": len(dark_files),
+                        "output_file": master_path,
+                        "plan": plan,
+                    },
+                )
+
             # Load and combine dark frames (streaming to avoid high memory usage)
-            master_dark = self._combine_frames_streaming_files(
-                dark_files,
-                frame_type=f"dark_{exposure_time:.3f}s",
-                rejection_method=self.rejection_method,
-                sigma_threshold=self.sigma_threshold,
-            )
+            frame_type = f"dark_{exposure_time:.3f}s"
+            stack = self._running_stack(group, plan, records, frame_type)
+            if stack is not None:
+                master_dark = stack.result()
+            else:
+                master_dark = self._combine_frames_streaming_files(
+                    dark_files,
+                    frame_type=frame_type,
+                    rejection_method=self.rejection_method,
+                    sigma_threshold=self.sigma_threshold,
+                )
 
             if master_dark is None:
                 return error_status("Failed to combine dark frames")
@@ -341,7 +387,8 @@ class MasterFrameCreator:
             output_path = os.path.join(self.master_output_dir, filename)
 
             # Save as FITS file (simplified - in real implementation use astropy.io.fits)
-            self._save_as_fits(master_dark, output_path, exposure_time, "master_dark")
+            if self._save_as_fits(master_dark, output_path, exposure_time, "master_dark"):
+                self._record_library_group(group, records, settings, output_path, stack)
 
             self.logger.info(f"Master dark saved: {output_path}")
 
@@ -352,6 +399,7 @@ class MasterFrameCreator:
                     "exposure_time": exposure_time,
                     "input_files": len(dark_files),
                     "output_file": output_path,
+                    "plan": plan,
                 },
             )
 
@@ -492,19 +540,48 @@ class MasterFrameCreator:
         try:
             self.logger.info(f"Creating master flat from {len(flat_files)} files...")
 
+            group = f"flat:{os.path.abspath(self.flat_dir)}"
+            settings = {
+                "method": self.rejection_method,
+                "sigma": self.sigma_threshold,
+                "normalization": self.normalization_method,
+                "master_dark": os.path.abspath(master_dark_path),
+                "master_dark_mtime": os.path.getmtime(master_dark_path),
+            }
+            plan, records = self._library_plan(group, flat_files, settings)
+            if plan == PLAN_UNCHANGED and self.library is not None:
+                master_path = (self.library.group(group) or {}).get("master")
+                self.logger.info(f"Master flat is up to date: {master_path}")
+                return success_status(
+                    f"Master flat up to date for {exposure_time:.3f}s exposure",
+                    data=master_path,
+                    details={
+                        "exposure_time": exposure_time,
+                        "input_files": len(flat_files),
+                        "master_dark_used": master_dark_path,
+                        "output_file": master_path,
+                        "plan": plan,
+                    },
+                )
+
             # Load master dark
             master_dark = self._load_fits_file(master_dark_path)
             if master_dark is None:
                 return error_status(f"Failed to load master dark: {master_dark_path}")
 
             # Combine dark-subtracted flats via streaming (apply subtraction on the fly)
-            master_flat = self._combine_flats_with_dark_streaming(
-                flat_files,
-                master_dark,
-                frame_type=f"flat_{exposure_time:.3f}s",
-                rejection_method=self.rejection_method,
-                sigma_threshold=self.sigma_threshold,
-            )
+            frame_type = f"flat_{exposure_time:.3f}s"
+            stack = self._running_stack(group, plan, records, frame_type, subtract=master_dark)
+            if stack is not None:
+                master_flat = stack.result()
+            else:
+                master_flat = self._combine_flats_with_dark_streaming(
+                    flat_files,
+                    master_dark,
+                    frame_type=frame_type,
+                    rejection_method=self.rejection_method,
+                    sigma_threshold=self.sigma_threshold,
+                )
 
             if master_flat is None:
                 return error_status("Failed to combine dark-subtracted flat frames")
@@ -518,7 +595,10 @@ class MasterFrameCreator:
             output_path = os.path.join(self.master_output_dir, filename)
 
             # Save as FITS file
-            self._save_as_fits(master_flat_normalized, output_path, exposure_time, "master_flat")
+            if self._save_as_fits(
+                master_flat_normalized, output_path, exposure_time, "master_flat"
+            ):
+                self._record_library_group(group, records, settings, output_path, stack)
 
             self.logger.info(f"Master flat saved: {output_path}")
 
@@ -530,6 +610,7 @@ class MasterFrameCreator:
                     "input_files": len(flat_files),
                     "master_dark_used": master_dark_path,
                     "output_file": output_path,
+                    "plan": plan,
                 },
             )
 
@@ -537,147 +618,93 @@ class MasterFrameCreator:
             self.logger.error(f"Error creating master flat: {e}")
             return error_status(f"Master flat creation failed: {e}")
 
+    def _library_plan(
+        self, group: str, files: List[str], settings: Dict[str, Any]
+    ) -> Tuple[str, List[FrameRecord]]:
+        """Scan the inputs of a master group and decide how to update it."""
+        if self.library is None:
+            return PLAN_REBUILD, []
+        records = self.library.scan(files)
+        plan = self.library.plan(group, records, settings)
+        if plan == PLAN_APPEND:
+            added = len(self.library.new_records(group, records))
+            self.logger.info(f"{group}: {added} new frame(s), extending running accumulator")
+        elif plan == PLAN_REBUILD and self.library.group(group) is not None:
+            self.logger.info(f"{group}: inputs or settings changed, rebuilding")
+        return plan, records
+
+    def _running_stack(
+        self,
+        group: str,
+        plan: str,
+        records: List[FrameRecord],
+        frame_type: str,
+        subtract: Optional[np.ndarray] = None,
+    ) -> Optional[RunningStack]:
+        """Build or extend the running accumulator of a mean-combined group.
+
+        Returns None when the group is combined by the tile combiner instead.
+        """
+        if (
+            self.library is None
+            or not self.save_accumulators
+            or self.rejection_method not in INCREMENTAL_METHODS
+        ):
+            return None
+        entry = self.library.group(group)
+        if plan == PLAN_APPEND and entry is not None:
+            stack = RunningStack.load(entry["accumulator"])
+            todo = self.library.new_records(group, records)
+        else:
+            stack = RunningStack()
+            todo = list(records)
+        self.logger.info(f"Accumulating {len(todo)} {frame_type} frames (total {stack.count})")
+        for record in todo:
+            arr = self._load_fits_file(record.path)
+            if arr is None:
+                continue
+            stack.add(arr if subtract is None else arr - subtract)
+        return stack if stack.count > 0 else None
+
+    def _record_library_group(
+        self,
+        group: str,
+        records: List[FrameRecord],
+        settings: Dict[str, Any],
+        master_path: str,
+        stack: Optional[RunningStack],
+    ) -> None:
+        """Store a finished build (and its accumulator) in the calibration library."""
+        if self.library is None:
+            return
+        try:
+            accumulator = None
+            if stack is not None:
+                accumulator = os.path.splitext(master_path)[0] + "_accumulator.npz"
+                stack.save(accumulator)
+            self.library.record_group(group, records, settings, master_path, accumulator)
+            self.library.save()
+        except Exception as e:
+            self.logger.warning(f"Failed to update calibration library index: {e}")
+
     def _combine_frames_streaming_files(
         self, files: List[str], frame_type: str, rejection_method: str, sigma_threshold: float
     ) -> Optional[np.ndarray]:
-        """Combine frames from file paths using streaming to reduce memory.
+        """Combine frames from file paths tile by tile (see calibration.tile_combiner).
 
-        Supports 'sigma_clip' (two-pass Welford) and 'minmax' (two-pass exclude one
-        min and one max per pixel). Falls back to simple mean if frames < 3 or
-        unknown method.
+        Each file is read once; memory stays within combine_memory_mb.
         """
         try:
             if not files:
                 self.logger.error(f"No valid frames found for {frame_type}")
                 return None
-
-            # Peek first file for shape
-            first = self._load_fits_file(files[0])
-            if first is None:
-                return None
-            shape = first.shape
-
-            if rejection_method == "sigma_clip":
-                return self._sigma_clip_combine_files(files, sigma_threshold, shape)
-            elif rejection_method == "minmax":
-                return self._minmax_combine_files(files, shape)
-            else:
-                # Simple mean (one pass)
-                self.logger.info(f"Combining {len(files)} {frame_type} frames with simple mean")
-                sum_img = np.zeros(shape, dtype=np.float64)
-                count = 0
-                for fp in files:
-                    arr = self._load_fits_file(fp)
-                    if arr is None:
-                        continue
-                    sum_img += arr
-                    count += 1
-                if count == 0:
-                    return None
-                return (sum_img / float(count)).astype(np.float32)
+            self.logger.info(f"Combining {len(files)} {frame_type} frames ({rejection_method})")
+            combiner = self._tile_combiner(rejection_method, sigma_threshold)
+            return cast(Optional[np.ndarray], combiner.combine(files))
         except Exception as e:
             self.logger.error(f"Error combining {frame_type} frames: {e}")
             return None
 
-    def _sigma_clip_combine_files(
-        self, files: List[str], sigma: float, shape: Tuple[int, int]
-    ) -> Optional[np.ndarray]:
-        """Two-pass sigma clipping combine from files using Welford streaming."""
-        try:
-            self.logger.info(f"Sigma-clip combining {len(files)} frames (sigma={sigma})")
-            # First pass: mean and variance (Welford)
-            n = 0
-            mean = np.zeros(shape, dtype=np.float64)
-            M2 = np.zeros(shape, dtype=np.float64)
-            for fp in files:
-                arr = self._load_fits_file(fp)
-                if arr is None:
-                    continue
-                n += 1
-                delta = arr - mean
-                mean += delta / n
-                delta2 = arr - mean
-                M2 += delta * delta2
-            if n == 0:
-                return None
-            std = np.sqrt(np.maximum(M2 / max(n - 1, 1), 0.0))
-
-            # Second pass: accumulate within clip
-            sum_img = np.zeros(shape, dtype=np.float64)
-            count_img = np.zeros(shape, dtype=np.uint32)
-            threshold = sigma * std
-            for fp in files:
-                arr = self._load_fits_file(fp)
-                if arr is None:
-                    continue
-                mask = np.less_equal(np.abs(arr - mean), threshold)
-                sum_img += np.where(mask, arr, 0.0)
-                count_img += mask.astype(np.uint32)
-            count_nonzero = np.maximum(count_img, 1)
-            combined = (sum_img / count_nonzero.astype(np.float64)).astype(np.float32)
-            return combined
-        except Exception as e:
-            self.logger.error(f"Sigma-clip combine failed: {e}")
-            return None
-
-    def _minmax_combine_files(
-        self, files: List[str], shape: Tuple[int, int]
-    ) -> Optional[np.ndarray]:
-        """Two-pass min/max rejection combine from files (exclude one min and one max per pixel)."""
-        try:
-            self.logger.info(f"MinMax combining {len(files)} frames")
-            # First pass: per-pixel min and max
-            min_img = np.full(shape, np.inf, dtype=np.float32)
-            max_img = np.full(shape, -np.inf, dtype=np.float32)
-            n = 0
-            for fp in files:
-                arr = self._load_fits_file(fp)
-                if arr is None:
-                    continue
-                n += 1
-                np.minimum(min_img, arr, out=min_img)
-                np.maximum(max_img, arr, out=max_img)
-            if n == 0:
-                return None
-            if n <= 2:
-                # Not enough frames to reject extremes; simple mean
-                sum_img = np.zeros(shape, dtype=np.float64)
-                cnt = 0
-                for fp in files:
-                    arr = self._load_fits_file(fp)
-                    if arr is None:
-                        continue
-                    sum_img += arr
-                    cnt += 1
-                if cnt == 0:
-                    return None
-                return (sum_img / float(cnt)).astype(np.float32)
-
-            # Second pass: accumulate excluding exactly one min and one max per pixel
-            sum_img = np.zeros(shape, dtype=np.float64)
-            count_img = np.zeros(shape, dtype=np.uint32)
-            min_used = np.zeros(shape, dtype=bool)
-            max_used = np.zeros(shape, dtype=bool)
-            for fp in files:
-                arr = self._load_fits_file(fp)
-                if arr is None:
-                    continue
-                is_min = (arr == min_img) & (~min_used)
-                is_max = (arr == max_img) & (~max_used)
-                include = ~(is_min | is_max)
-                sum_img += np.where(include, arr, 0.0)
-                count_img += include.astype(np.uint32)
-                # Mark min/max used only where they occurred
-                min_used |= is_min
-                max_used |= is_max
-            # Avoid division by zero
-            count_nonzero = np.maximum(count_img, 1)
-            combined = (sum_img / count_nonzero.astype(np.float64)).astype(np.float32)
-            return combined
-        except Exception as e:
-            self.logger.error(f"MinMax combine failed: {e}")
-            return None
-
     def _combine_flats_with_dark_streaming(
         self,
         flat_files: List[str],
@@ -686,108 +713,30 @@ class MasterFrameCreator:
         rejection_method: str,
         sigma_threshold: float,
     ) -> Optional[np.ndarray]:
-        """Streaming combine for flats with on-the-fly dark subtraction."""
+        """Tile-wise combine for flats with on-the-fly dark subtraction."""
         try:
             if not flat_files:
                 return None
-            shape = master_dark.shape
-            if rejection_method == "sigma_clip":
-                # First pass Welford on (flat - dark)
-                n = 0
-                mean = np.zeros(shape, dtype=np.float64)
-                M2 = np.zeros(shape, dtype=np.float64)
-                for fp in flat_files:
-                    flat = self._load_fits_file(fp)
-                    if flat is None:
-                        continue
-                    arr = flat - master_dark
-                    n += 1
-                    delta = arr - mean
-                    mean += delta / n
-                    delta2 = arr - mean
-                    M2 += delta * delta2
-                if n == 0:
-                    return None
-                std = np.sqrt(np.maximum(M2 / max(n - 1, 1), 0.0))
-
-                # Second pass accumulate
-                sum_img = np.zeros(shape, dtype=np.float64)
-                count_img = np.zeros(shape, dtype=np.uint32)
-                threshold = sigma_threshold * std
-                for fp in flat_files:
-                    flat = self._load_fits_file(fp)
-                    if flat is None:
-                        continue
-                    arr = flat - master_dark
-                    mask = np.less_equal(np.abs(arr - mean), threshold)
-                    sum_img += np.where(mask, arr, 0.0)
-                    count_img += mask.astype(np.uint32)
-                count_nonzero = np.maximum(count_img, 1)
-                return (sum_img / count_nonzero.astype(np.float64)).astype(np.float32)
-            elif rejection_method == "minmax":
-                # First pass min/max
-                min_img = np.full(shape, np.inf, dtype=np.float32)
-                max_img = np.full(shape, -np.inf, dtype=np.float32)
-                n = 0
-                for fp in flat_files:
-                    flat = self._load_fits_file(fp)
-                    if flat is None:
-                        continue
-                    arr = flat - master_dark
-                    n += 1
-                    np.minimum(min_img, arr, out=min_img)
-                    np.maximum(max_img, arr, out=max_img)
-                if n == 0:
-                    return None
-                if n <= 2:
-                    sum_img = np.zeros(shape, dtype=np.float64)
-                    cnt = 0
-                    for fp in flat_files:
-                        flat = self._load_fits_file(fp)
-                        if flat is None:
-                            continue
-                        arr = flat - master_dark
-                        sum_img += arr
-                        cnt += 1
-                    if cnt == 0:
-                        return None
-                    return (sum_img / float(cnt)).astype(np.float32)
-
-                sum_img = np.zeros(shape, dtype=np.float64)
-                count_img = np.zeros(shape, dtype=np.uint32)
-                min_used = np.zeros(shape, dtype=bool)
-                max_used = np.zeros(shape, dtype=bool)
-                for fp in flat_files:
-                    flat = self._load_fits_file(fp)
-                    if flat is None:
-                        continue
-                    arr = flat - master_dark
-                    is_min = (arr == min_img) & (~min_used)
-                    is_max = (arr == max_img) & (~max_used)
-                    include = ~(is_min | is_max)
-                    sum_img += np.where(include, arr, 0.0)
-                    count_img += include.astype(np.uint32)
-                    min_used |= is_min
-                    max_used |= is_max
-                count_nonzero = np.maximum(count_img, 1)
-                return (sum_img / count_nonzero.astype(np.float64)).astype(np.float32)
-            else:
-                # Simple mean
-                sum_img = np.zeros(shape, dtype=np.float64)
-                cnt = 0
-                for fp in flat_files:
-                    flat = self._load_fits_file(fp)
-                    if flat is None:
-                        continue
-                    sum_img += flat - master_dark
-                    cnt += 1
-                if cnt == 0:
-                    return None
-                return (sum_img / float(cnt)).astype(np.float32)
+            self.logger.info(
+                f"Combining {len(flat_files)} {frame_type} frames ({rejection_method}) "
+                "with dark subtraction"
+            )
+            combiner = self._tile_combiner(rejection_method, sigma_threshold)
+            combined = combiner.combine(flat_files, subtract=master_dark.astype(np.float32))
+            return cast(Optional[np.ndarray], combined)
         except Exception as e:
             self.logger.error(f"Combine flats with dark (streaming) failed: {e}")
             return None
 
+    def _tile_combiner(self, rejection_method: str, sigma_threshold: float) -> TileCombiner:
+        return TileCombiner(
+            method=rejection_method,
+            sigma=sigma_threshold,
+            max_memory_mb=self.combine_memory_mb,
+            workers=self.combine_workers,
+            logger=self.logger,
+        )
+
     def _normalize_master_flat(self, master_flat: np.ndarray) -> np.ndarray:
         """Normalize master flat frame.
 
@@ -889,6 +838,10 @@ class MasterFrameCreator:
             "rejection_method": self.rejection_method,
             "sigma_threshold": self.sigma_threshold,
             "normalization_method": self.normalization_method,
+            "combine_workers": self.combine_workers,
+            "combine_memory_mb": self.combine_memory_mb,
+            "incremental": self.incremental,
+            "library_index": self.library_index,
             "num_darks": self.num_darks,
             "num_flats": self.num_flats,
             "science_exposure_time": self.science_exposure_time,
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Master Frame Store for Telescope Streaming System
+
+Keeps a header-only index of master calibration frames and loads pixel data
+lazily on first use into a least-recently-used cache with a byte budget.
+Transposed (orientation-swapped) variants are cached alongside the originals so
+per-frame calibration never has to transpose a master frame again. Values derived
+from cached frames (e.g. prepared calibration terms) are cached in the same byte
+budget and dropped together with the frames they were built from.
+"""
+
+from collections import OrderedDict
+import logging
+from pathlib import Path
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, TypeVar, Union, cast
+
+import numpy as np
+
+CacheKey = Tuple[str, bool]
+T = TypeVar("T")
+
+
+def header_number(header: Any, keyword: str) -> Optional[Union[float, int]]:
+    """Return a numeric FITS header value, converting numeric strings; None otherwise."""
+    try:
+        if keyword not in header:
+            return None
+        value = header[keyword]
+    except Exception:
+        return None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def header_shape(header: Any) -> Optional[Tuple[int, ...]]:
+    """Return the numpy shape of the primary HDU described by a FITS header."""
+    try:
+        naxis = int(header.get("NAXIS", 0))
+        if naxis <= 0:
+            return None
+        # FITS axis order is reversed relative to numpy
+        return tuple(int(header[f"NAXIS{i}"]) for i in range(naxis, 0, -1))
+    except Exception:
+        return None
+
+
+class MasterFrameStore:
+    """Header index plus lazily loaded, memory-bounded master frame data."""
+
+    def __init__(self, max_bytes: Optional[int] = None, logger=None) -> None:
+        """Initialize the store.
+
+        Args:
+            max_bytes: Byte budget for cached frame data (None = unbounded). A single
+                frame larger than the budget is still served but evicts everything else.
+            logger: Logger instance
+        """
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self.logger = logger or logging.getLogger(__name__)
+        self._headers: Dict[str, Dict[str, Any]] = {}
+        self._cache: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._cached_bytes = 0
+        # Derived values by source array ids: (source arrays, value, bytes charged)
+        self._derived: (
+            "OrderedDict[Tuple[Optional[int], ...], Tuple[Tuple[Any, ...], Any, int]]"
+        ) = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def cached_bytes(self) -> int:
+        """Total bytes of frame data currently held in memory."""
+        return self._cached_bytes
+
+    def index_file(self, file_path: Union[str, Path]) -> Dict[str, Any]:
+        """Read only the FITS header of a master frame and record it in the index.
+
+        Returns:
+            Dict with file, exposure_time, gain, offset, readout_mode and shape
+        """
+        import astropy.io.fits as fits
+
+        path = str(file_path)
+        header = fits.getheader(path, 0)
+        info = {
+            "file": path,
+            "exposure_time": header_number(header, "EXPTIME"),
+            "gain": header_number(header, "GAIN"),
+            "offset": header_number(header, "OFFSET"),
+            "readout_mode": header_number(header, "READOUT"),
+            "shape": header_shape(header),
+        }
+        with self._lock:
+            self._headers[path] = info
+        return info
+
+    def get(self, file_path: Union[str, Path], transposed: bool = False) -> Optional[np.ndarray]:
+        """Return float32 frame data, loading it on first use.
+
+        Args:
+            file_path: Path of an indexed (or any) master FITS file
+            transposed: Return the 2D transposed variant (cached separately)
+
+        Returns:
+            C-contiguous float32 array or None if the file has no data
+        """
+        path = str(file_path)
+        key: CacheKey = (path, bool(transposed))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+            data: Optional[np.ndarray]
+            if transposed:
+                base = self.get(path, transposed=False)
+                if base is None or base.ndim != 2:
+                    return None
+                data = np.ascontiguousarray(base.T)
+            else:
+                data = self._load(path)
+            if data is None:
+                return None
+            self._insert(key, data)
+            return data
+
+    def _load(self, path: str) -> Optional[np.ndarray]:
+        import astropy.io.fits as fits
+
+        with fits.open(path, memmap=False) as hdul:
+            raw = hdul[0].data
+            if raw is None:
+                self.logger.warning(f"FITS file {path} contains no data")
+                return None
+            # One conversion to native-endian float32; reused for every frame
+            data = np.ascontiguousarray(raw, dtype=np.float32)
+        self.logger.debug(
+            "Loaded master frame data: %s (%s, %.1f MB)", path, data.shape, data.nbytes / 1e6
+        )
+        return data
+
+    def get_derived(
+        self,
+        sources: Sequence[Optional[np.ndarray]],
+        build: Callable[[], Tuple[T, int]],
+    ) -> T:
+        """Return a value computed from source arrays, building it once per source set.
+
+        Args:
+            sources: Arrays the value is derived from (None allowed)
+            build: Returns (value, bytes it holds beyond the source arrays)
+
+        The entry is charged to the byte budget and dropped when one of its
+        source frames is evicted, so it never keeps evicted frames alive.
+        """
+        key = tuple(id(src) if src is not None else None for src in sources)
+        with self._lock:
+            entry = self._derived.get(key)
+            # Entries hold their sources, so an id match is only trusted for the same objects
+            if entry is not None and all(a is b for a, b in zip(entry[0], sources, strict=True)):
+                self._derived.move_to_end(key)
+                return cast(T, entry[1])
+            value, nbytes = build()
+            if entry is not None:
+                self._drop_derived(key)
+            self._derived[key] = (tuple(sources), value, int(nbytes))
+            self._cached_bytes += int(nbytes)
+            self._enforce_budget()
+            return value
+
+    def _insert(self, key: CacheKey, data: np.ndarray) -> None:
+        self._cache[key] = data
+        self._cached_bytes += int(data.nbytes)
+        self._enforce_budget()
+
+    def _enforce_budget(self) -> None:
+        """Evict derived values first, then frames, least recently used first."""
+        if self.max_bytes is None:
+            return
+        while self._cached_bytes > self.max_bytes and self._derived:
+            self._drop_derived(next(iter(self._derived)))
+        while self._cached_bytes > self.max_bytes and len(self._cache) > 1:
+            old_key, old = self._cache.popitem(last=False)
+            self._cached_bytes -= int(old.nbytes)
+            self._drop_dependents(old)
+            self.logger.debug(
+                "Evicted master frame data %s (transposed=%s)", old_key[0], old_key[1]
+            )
+
+    def _drop_derived(self, key: Tuple[Optional[int], ...]) -> None:
+        _, _, nbytes = self._derived.pop(key)
+        self._cached_bytes -= nbytes
+
+    def _drop_dependents(self, data: np.ndarray) -> None:
+        for key in [k for k, entry in self._derived.items() if any(s is data for s in entry[0])]:
+            self._drop_derived(key)
+
+    def is_loaded(self, file_path: Union[str, Path], transposed: bool = False) -> bool:
+        return (str(file_path), bool(transposed)) in self._cache
+
+    def header(self, file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        return self._headers.get(str(file_path))
+
+    def clear(self) -> None:
+        """Drop the header index and all cached data."""
+        with self._lock:
+            self._headers.clear()
+            self._cache.clear()
+            self._derived.clear()
+            self._cached_bytes = 0
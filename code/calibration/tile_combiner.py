@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Tile-parallel master frame combiner.
+
+The sensor is split into row tiles. For each tile every input file is
+memory-mapped and only the tile's rows are read, so each pixel is read from
+disk exactly once. The (n_frames, rows, width) stack of a tile is reduced in
+one step, which makes exact order statistics (median, clipped median) possible
+while the memory cap bounds the stack size. Tiles are reduced in a process
+pool.
+
+Combine methods:
+    mean: Plain mean
+    sigma_clip: Mean of values within sigma * std of the mean (one iteration)
+    minmax: Mean excluding one minimum and one maximum per pixel
+    median: Exact median
+    sigma_clip_median: Iterative clipping around the median; median of survivors
+    winsorized: Mean after clamping values beyond sigma robust (MAD) standard
+        deviations of the median
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import logging
+import math
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+COMBINE_METHODS = ("mean", "sigma_clip", "minmax", "median", "sigma_clip_median", "winsorized")
+MAX_CLIP_ITERATIONS = 5
+
+# float32 stack plus the temporaries of the reductions (sort, masks, float64 sums)
+_BYTES_PER_STACK_VALUE = 4 * 3
+
+# Standard deviation of a normal distribution per unit of median absolute deviation
+_MAD_TO_STD = 1.4826
+
+_BITPIX_DTYPES = {8: "u1", 16: ">i2", 32: ">i4", 64: ">i8", -32: ">f4", -64: ">f8"}
+
+
+@dataclass(frozen=True)
+class FrameLayout:
+    """Location of a primary-HDU image inside an uncompressed FITS file."""
+
+    path: str
+    offset: int
+    dtype: str
+    shape: Tuple[int, ...]
+    bscale: float = 1.0
+    bzero: float = 0.0
+
+    def read_rows(self, row_start: int, row_stop: int) -> np.ndarray:
+        """Read rows [row_start, row_stop) as float32 (physical values)."""
+        mm = np.memmap(self.path, dtype=self.dtype, mode="r", offset=self.offset, shape=self.shape)
+        try:
+            tile = np.array(mm[..., row_start:row_stop, :], dtype=np.float32)
+        finally:
+            del mm
+        if self.bscale != 1.0:
+            tile *= np.float32(self.bscale)
+        if self.bzero != 0.0:
+            tile += np.float32(self.bzero)
+        return tile
+
+
+def describe_frame(path: str) -> FrameLayout:
+    """Read the primary header of a FITS file and locate its data unit.
+
+    Raises:
+        ValueError: If the primary HDU has no image data or an unsupported BITPIX
+    """
+    import astropy.io.fits as fits
+
+    with fits.open(path, memmap=False, do_not_scale_image_data=True) as hdul:
+        header = hdul[0].header
+        naxis = int(header.get("NAXIS", 0))
+        if naxis < 2:
+            raise ValueError(f"No image data in primary HDU of {path}")
+        shape = tuple(int(header[f"NAXIS{i}"]) for i in range(naxis, 0, -1))
+        dtype = _BITPIX_DTYPES.get(int(header["BITPIX"]))
+        if dtype is None:
+            raise ValueError(f"Unsupported BITPIX {header['BITPIX']} in {path}")
+        offset = int(hdul.fileinfo(0)["datLoc"])
+        return FrameLayout(
+            path=path,
+            offset=offset,
+            dtype=dtype,
+            shape=shape,
+            bscale=float(header.get("BSCALE", 1.0)),
+            bzero=float(header.get("BZERO", 0.0)),
+        )
+
+
+def reduce_stack(stack: np.ndarray, method: str, sigma: float = 3.0) -> np.ndarray:
+    """Combine a (n_frames, ...) float32 stack along axis 0 into float32."""
+    n = stack.shape[0]
+    if method == "median":
+        return np.asarray(np.median(stack, axis=0), dtype=np.float32)
+    if method == "sigma_clip" and n >= 2:
+        mean = stack.mean(axis=0, dtype=np.float64)
+        std = stack.std(axis=0, dtype=np.float64, ddof=1)
+        keep = np.abs(stack - mean) <= sigma * std
+        total = np.where(keep, stack, 0.0).sum(axis=0, dtype=np.float64)
+        return np.asarray(total / np.maximum(keep.sum(axis=0), 1), dtype=np.float32)
+    if method == "minmax" and n > 2:
+        ordered = np.sort(stack, axis=0)
+        return np.asarray(ordered[1:-1].mean(axis=0, dtype=np.float64), dtype=np.float32)
+    if method == "sigma_clip_median" and n >= 2:
+        work = stack.copy()
+        for _ in range(MAX_CLIP_ITERATIONS):
+            center = np.nanmedian(work, axis=0)
+            std = np.nanstd(work, axis=0, ddof=1)
+            reject = np.abs(work - center) > sigma * std
+            if not reject.any():
+                break
+            work[reject] = np.nan
+        return np.asarray(np.nanmedian(work, axis=0), dtype=np.float32)
+    if method == "winsorized" and n >= 3:
+        # Clamp to the median +/- sigma robust standard deviations (1.4826 * MAD)
+        center = np.median(stack, axis=0)
+        scale = np.float32(_MAD_TO_STD) * np.median(np.abs(stack - center), axis=0)
+        clamped = np.clip(stack, center - sigma * scale, center + sigma * scale)
+        return np.asarray(clamped.mean(axis=0, dtype=np.float64), dtype=np.float32)
+    return np.asarray(stack.mean(axis=0, dtype=np.float64), dtype=np.float32)
+
+
+def _combine_tile(
+    layouts: Sequence[FrameLayout],
+    row_start: int,
+    row_stop: int,
+    method: str,
+    sigma: float,
+    subtract: Optional[np.ndarray],
+) -> Tuple[int, np.ndarray]:
+    """Read one row tile from every frame and reduce it (process pool worker)."""
+    first = layouts[0].read_rows(row_start, row_stop)
+    stack = np.empty((len(layouts),) + first.shape, dtype=np.float32)
+    stack[0] = first
+    for i in range(1, len(layouts)):
+        stack[i] = layouts[i].read_rows(row_start, row_stop)
+    if subtract is not None:
+        stack -= subtract
+    return row_start, reduce_stack(stack, method, sigma)
+
+
+class TileCombiner:
+    """Combine FITS frames tile by tile with a bounded memory footprint."""
+
+    def __init__(
+        self,
+        method: str = "sigma_clip",
+        sigma: float = 3.0,
+        max_memory_mb: float = 1024.0,
+        workers: Optional[int] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the combiner.
+
+        Args:
+            method: One of COMBINE_METHODS (unknown methods fall back to mean)
+            sigma: Clipping threshold in standard deviations
+            max_memory_mb: Upper bound for the tile stacks held by all workers
+            workers: Worker processes (None or 0 = CPU count, 1 = no process pool)
+            logger: Logger instance
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        if method not in COMBINE_METHODS:
+            self.logger.warning(f"Unknown combine method '{method}', using mean")
+            method = "mean"
+        self.method = method
+        self.sigma = float(sigma)
+        self.max_memory_mb = max(0.0, float(max_memory_mb))
+        self.workers = int(workers) if workers else (os.cpu_count() or 1)
+
+    def rows_per_tile(self, n_frames: int, shape: Tuple[int, ...]) -> int:
+        """Rows per tile so that all concurrent tile stacks fit the memory cap."""
+        height = shape[-2]
+        row_values = n_frames * int(np.prod(shape)) // max(height, 1)
+        budget = self.max_memory_mb * 1024 * 1024 / max(self.workers, 1)
+        rows = int(budget // max(row_values * _BYTES_PER_STACK_VALUE, 1))
+        if self.workers > 1:
+            # Several tiles per worker keep the pool busy until the end
+            rows = min(rows, math.ceil(height / (self.workers * 4)))
+        return max(1, min(rows, height))
+
+    def combine(
+        self, files: Sequence[str], subtract: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """Combine files into one float32 frame.
+
+        Args:
+            files: FITS file paths; unreadable files or shape mismatches are skipped
+            subtract: Optional frame subtracted from every input before combining
+
+        Returns:
+            Combined frame or None if no usable input
+        """
+        layouts = self._usable_layouts(files, None if subtract is None else subtract.shape)
+        if not layouts:
+            return None
+        shape = layouts[0].shape
+        height = shape[-2]
+        rows = self.rows_per_tile(len(layouts), shape)
+        tiles = [(r, min(r + rows, height)) for r in range(0, height, rows)]
+        self.logger.info(
+            f"Combining {len(layouts)} frames ({self.method}) in {len(tiles)} tiles "
+            f"of {rows} rows with {min(self.workers, len(tiles))} worker(s)"
+        )
+
+        result = np.empty(shape, dtype=np.float32)
+
+        def _store(row_start: int, tile: np.ndarray) -> None:
+            result[..., row_start : row_start + tile.shape[-2], :] = tile
+
+        def _sub(r0: int, r1: int) -> Optional[np.ndarray]:
+            return None if subtract is None else subtract[..., r0:r1, :]
+
+        if self.workers > 1 and len(tiles) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(tiles))) as pool:
+                    futures = [
+                        pool.submit(
+                            _combine_tile, layouts, r0, r1, self.method, self.sigma, _sub(r0, r1)
+                        )
+                        for r0, r1 in tiles
+                    ]
+                    for future in futures:
+                        _store(*future.result())
+                return result
+            except (OSError, RuntimeError) as e:
+                self.logger.warning(f"Process pool unavailable ({e}); combining serially")
+
+        for r0, r1 in tiles:
+            _store(*_combine_tile(layouts, r0, r1, self.method, self.sigma, _sub(r0, r1)))
+        return result
+
+    def _usable_layouts(
+        self, files: Sequence[str], shape: Optional[Tuple[int, ...]]
+    ) -> List[FrameLayout]:
+        layouts: List[FrameLayout] = []
+        for path in files:
+            try:
+                layout = describe_frame(path)
+            except Exception as e:
+                self.logger.warning(f"Skipping {path}: {e}")
+                continue
+            if shape is None:
+                shape = layout.shape
+            if layout.shape != shape:
+                self.logger.warning(f"Skipping {path}: shape {layout.shape} != {shape}")
+                continue
+            layouts.append(layout)
+        return layouts
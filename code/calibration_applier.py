@@ -14,8 +14,10 @@ The system automatically:
 
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, Union, cast
+from typing import Any, Dict, Optional, Tuple, Union, cast
 
+from calibration.kernel import CalibrationKernel, PreparedMasters, frame_stats, prepare_masters
+from calibration.master_store import MasterFrameStore, header_number
 from exceptions import CalibrationError
 import numpy as np
 from status import Status, error_status, success_status, warning_status
@@ -59,10 +61,26 @@ class CalibrationApplier:
             }
         self.master_dir = master_config.get("output_dir", "master_frames")
 
-        # Cache for loaded master frames
+        # Index of master frames (headers only); pixel data is loaded lazily by the store
         self.master_bias_cache = None
         self.master_dark_cache = {}
         self.master_flat_cache = None
+        try:
+            cache_max_mb = master_config.get("cache_max_mb", 2048)
+            cache_max_bytes = int(float(cache_max_mb) * 1024 * 1024) if cache_max_mb else None
+        except Exception:
+            cache_max_bytes = None
+        self.master_store: MasterFrameStore = MasterFrameStore(
+            max_bytes=cache_max_bytes, logger=self.logger
+        )
+
+        # Fused calibration kernel, prepared master terms and optional output buffer ring
+        self.kernel = CalibrationKernel(
+            max_workers=master_config.get("calibration_threads", 0), logger=self.logger
+        )
+        self.output_buffer_count = int(master_config.get("output_buffers", 0) or 0)
+        self._output_buffers: list = []
+        self._output_buffer_index = 0
 
         # Calibration settings
         self.enable_calibration = master_config.get("enable_calibration", True)
@@ -107,14 +125,8 @@ class CalibrationApplier:
                 if candidates:
                     bias_path = candidates[0]
             if bias_path.exists():
-                self.master_bias_cache = {
-                    "data": self._load_fits_file(bias_path),
-                    "file": str(bias_path),
-                    "gain": self._extract_camera_setting(bias_path, "GAIN"),
-                    "offset": self._extract_camera_setting(bias_path, "OFFSET"),
-                    "readout_mode": self._extract_camera_setting(bias_path, "READOUT"),
-                }
-                self.logger.info(f"Loaded master bias: {bias_path}")
+                self.master_bias_cache = self._index_master_file(bias_path)
+                self.logger.info(f"Indexed master bias: {bias_path}")
             else:
                 self.logger.info(f"Master bias not found: {bias_path}")
 
@@ -134,16 +146,11 @@ class CalibrationApplier:
                         m = re.match(r"^master_dark_(\d+(?:\.\d+)?)s(?:_.*)?$", filename)
                         if m:
                             exposure_time = float(m.group(1))
-                            self.master_dark_cache[exposure_time] = {
-                                "data": self._load_fits_file(dark_file),
-                                "file": str(dark_file),
-                                "exposure_time": exposure_time,
-                                "gain": self._extract_camera_setting(dark_file, "GAIN"),
-                                "offset": self._extract_camera_setting(dark_file, "OFFSET"),
-                                "readout_mode": self._extract_camera_setting(dark_file, "READOUT"),
-                            }
+                            dark_info = self._index_master_file(dark_file)
+                            dark_info["exposure_time"] = exposure_time
+                            self.master_dark_cache[exposure_time] = dark_info
                             self.logger.info(
-                                f"Loaded master dark for {exposure_time}s: {dark_file}"
+                                f"Indexed master dark for {exposure_time}s: {dark_file}"
                             )
                         else:
                             self.logger.warning(
@@ -163,14 +170,8 @@ class CalibrationApplier:
                 if candidates:
                     flat_path = candidates[0]
             if flat_path.exists():
-                self.master_flat_cache = {
-                    "data": self._load_fits_file(flat_path),
-                    "file": str(flat_path),
-                    "gain": self._extract_camera_setting(flat_path, "GAIN"),
-                    "offset": self._extract_camera_setting(flat_path, "OFFSET"),
-                    "readout_mode": self._extract_camera_setting(flat_path, "READOUT"),
-                }
-                self.logger.info(f"Loaded master flat: {flat_path}")
+                self.master_flat_cache = self._index_master_file(flat_path)
+                self.logger.info(f"Indexed master flat: {flat_path}")
             else:
                 self.logger.info(f"Master flat not found: {flat_path}")
 
@@ -180,12 +181,140 @@ class CalibrationApplier:
                 + (1 if self.master_flat_cache else 0)
             )
 
-            self.logger.info(f"Loaded {total_masters} master frames total")
+            self.logger.info(f"Indexed {total_masters} master frames total (data loaded on use)")
 
         except Exception as e:
             self.logger.error(f"Error loading master frames: {e}")
             raise CalibrationError(f"Error loading master frames: {e}") from e
 
+    def load_master_frames(self) -> Status:
+        """Index master frames from disk and report the result as a Status."""
+        try:
+            self.master_store.clear()
+            self._load_master_frames()
+        except Exception as e:
+            return error_status(f"Failed to load master frames: {e}")
+        total_masters = (
+            (1 if self.master_bias_cache else 0)
+            + len(self.master_dark_cache)
+            + (1 if self.master_flat_cache else 0)
+        )
+        if total_masters == 0:
+            return warning_status("No master frames found", details={"total_masters": 0})
+        return success_status(
+            f"Indexed {total_masters} master frames", details={"total_masters": total_masters}
+        )
+
+    def _index_master_file(self, fits_file: Path) -> Dict[str, Any]:
+        """Read a master frame header once and return its index entry (no pixel data)."""
+        info = self.master_store.index_file(fits_file)
+        return {
+            "file": info["file"],
+            "exposure_time": info.get("exposure_time"),
+            "gain": info.get("gain"),
+            "offset": info.get("offset"),
+            "readout_mode": info.get("readout_mode"),
+            "shape": info.get("shape"),
+        }
+
+    def _master_data(
+        self, master_info: Dict[str, Any], target_shape: Optional[tuple] = None
+    ) -> Optional[np.ndarray]:
+        """Return master frame data as float32, in the orientation matching target_shape.
+
+        Data is taken from an explicit ``data`` entry when present, otherwise from the
+        lazy master store. Transposed variants are cached so they are built only once.
+        """
+        explicit = master_info.get("data")
+        if explicit is not None:
+            data = np.asarray(explicit, dtype=np.float32)
+            if target_shape is None or data.shape == tuple(target_shape) or data.ndim != 2:
+                return data
+            if data.T.shape == tuple(target_shape):
+                cached_t = master_info.get("_data_transposed")
+                if cached_t is None or cached_t.shape != tuple(target_shape):
+                    cached_t = np.ascontiguousarray(data.T)
+                    master_info["_data_transposed"] = cached_t
+                return cast(np.ndarray, cached_t)
+            return data
+
+        file_path = master_info.get("file")
+        if not file_path:
+            return None
+        shape = master_info.get("shape")
+        transposed = bool(
+            target_shape is not None
+            and shape is not None
+            and len(shape) == 2
+            and tuple(shape) != tuple(target_shape)
+            and tuple(reversed(shape)) == tuple(target_shape)
+        )
+        return cast(
+            Optional[np.ndarray], self.master_store.get(str(file_path), transposed=transposed)
+        )
+
+    def _resolve_master_array(
+        self, master_info: Dict[str, Any], frame_shape: tuple, kind: str
+    ) -> Optional[np.ndarray]:
+        """Return master data matching frame_shape, or None (with a warning) if unusable."""
+        try:
+            data = self._master_data(master_info, frame_shape)
+        except Exception as load_err:
+            self.logger.warning(f"Could not load master {kind} data: {load_err}")
+            return None
+        if data is None:
+            self.logger.warning(f"Selected master {kind} has no data: {master_info.get('file')}")
+            return None
+        if data.shape != tuple(frame_shape):
+            self.logger.warning(
+                "Master %s shape %s != frame shape %s; skipping %s correction",
+                kind,
+                data.shape,
+                tuple(frame_shape),
+                kind,
+            )
+            return None
+        return data
+
+    def _prepared_masters(
+        self, dark: Optional[np.ndarray], flat: Optional[np.ndarray]
+    ) -> PreparedMasters:
+        """Return kernel terms for this dark/flat pair, computing them once per master set.
+
+        The terms are cached in the master store, within its byte budget, and are
+        dropped when the store evicts the dark or flat they were built from.
+        """
+
+        def build() -> Tuple[PreparedMasters, int]:
+            masters = prepare_masters(dark, flat)
+            # offset usually is the dark itself; only count arrays the terms add
+            extra = sum(
+                int(term.nbytes)
+                for term in (masters.offset, masters.inv_flat)
+                if term is not None and term is not dark and term is not flat
+            )
+            return masters, extra
+
+        return self.master_store.get_derived((dark, flat), build)
+
+    def _next_output_buffer(self, shape: tuple) -> Optional[np.ndarray]:
+        """Return the next buffer of the output ring, or None to allocate per frame.
+
+        Reused buffers are overwritten by later frames, so the ring must be larger than
+        the number of calibrated frames a consumer holds on to at once.
+        """
+        if self.output_buffer_count <= 0:
+            return None
+        if self._output_buffers and self._output_buffers[0].shape != tuple(shape):
+            self._output_buffers = []
+        if len(self._output_buffers) < self.output_buffer_count:
+            buf = np.empty(shape, dtype=np.float32)
+            self._output_buffers.append(buf)
+            return buf
+        buf = self._output_buffers[self._output_buffer_index % self.output_buffer_count]
+        self._output_buffer_index += 1
+        return cast(np.ndarray, buf)
+
     def _extract_camera_setting(self, fits_file: Path, keyword: str) -> Optional[Union[float, int]]:
         """Extract camera setting from FITS header.
 
@@ -199,20 +328,8 @@ class CalibrationApplier:
         try:
             import astropy.io.fits as fits
 
-            with fits.open(fits_file) as hdul:
-                header = hdul[0].header
-                if keyword in header:
-                    value = header[keyword]
-                    # Convert to appropriate type
-                    if isinstance(value, (int, float)):
-                        return value
-                    elif isinstance(value, str):
-                        try:
-                            return float(value)
-                        except ValueError:
-                            return None
-                    return None
-                return None
+            value = header_number(fits.getheader(str(fits_file), 0), keyword)
+            return cast(Optional[Union[float, int]], value)
         except Exception as e:
             self.logger.debug(f"Could not extract {keyword} from {fits_file.name}: {e}")
             return None
@@ -432,6 +549,7 @@ class CalibrationApplier:
         *,
         exposure_time_s: Optional[float] = None,
         frame_details: Optional[Dict[str, Any]] = None,
+        compute_stats: bool = False,
     ) -> Status:
         """Apply dark and flat calibration to a frame.
 
@@ -439,6 +557,7 @@ class CalibrationApplier:
             frame_data: Raw frame data as numpy array
             exposure_time: Frame exposure time in seconds
             frame_info: Additional frame information including gain, offset, readout_mode (optional)
+            compute_stats: Add min/max/mean of the calibrated frame to details["stats"]
 
         Returns:
             Status: Success or error status with calibrated frame data
@@ -520,10 +639,11 @@ class CalibrationApplier:
             if raw is None:
                 return error_status("No frame data provided for calibration")
 
-            # Start with original frame as float32
-            # Ensure numeric ndarray for calibrated_frame
+            # Keep the original dtype; the kernel converts to float32 while writing the output
             try:
-                calibrated_frame = np.asarray(raw, dtype=np.float32)
+                frame_arr = np.asarray(raw)
+                if frame_arr.dtype.kind not in "biuf":
+                    frame_arr = np.asarray(raw, dtype=np.float32)
             except Exception as conv_err:
                 self.logger.warning(f"Could not convert frame to float32 array: {conv_err}")
                 return warning_status(
@@ -531,35 +651,24 @@ class CalibrationApplier:
                     data=raw if isinstance(raw, np.ndarray) else None,
                     details={"calibration_applied": False, "reason": "invalid_frame_dtype"},
                 )
-            # Standardize orientation to long-side horizontal BEFORE calibration
-            try:
-                oriented = False
-                if calibrated_frame.ndim == 2:
-                    h, w = calibrated_frame.shape
-                    if h > w:
-                        calibrated_frame = calibrated_frame.T
-                        oriented = True
-                elif calibrated_frame.ndim == 3:
-                    h, w = calibrated_frame.shape[:2]
-                    if h > w:
-                        calibrated_frame = np.transpose(calibrated_frame, (1, 0, 2))
-                        oriented = True
-                if oriented:
+            # Standardize orientation to long-side horizontal BEFORE calibration (view only)
+            if frame_arr.ndim == 2:
+                h, w = frame_arr.shape
+                if h > w:
+                    frame_arr = frame_arr.T
                     self.logger.debug(
                         "Standardized frame orientation to long-side horizontal before calibration"
                     )
-            except Exception as e_orient:
-                self.logger.debug(f"Orientation standardization skipped: {e_orient}")
-            try:
-                self.logger.debug(
-                    "Frame array ok: shape=%s, dtype=%s, min=%s, max=%s",
-                    calibrated_frame.shape,
-                    calibrated_frame.dtype,
-                    (float(np.nanmin(calibrated_frame)) if calibrated_frame.size else "n/a"),
-                    (float(np.nanmax(calibrated_frame)) if calibrated_frame.size else "n/a"),
-                )
-            except Exception:
-                pass
+            elif frame_arr.ndim == 3:
+                h, w = frame_arr.shape[:2]
+                if h > w:
+                    frame_arr = np.transpose(frame_arr, (1, 0, 2))
+                    self.logger.debug(
+                        "Standardized frame orientation to long-side horizontal before calibration"
+                    )
+            self.logger.debug(
+                "Frame array ok: shape=%s, dtype=%s", frame_arr.shape, frame_arr.dtype
+            )
             calibration_details = {
                 "original_exposure_time": exposure_time,
                 "original_gain": gain,
@@ -573,75 +682,11 @@ class CalibrationApplier:
                 "master_flat_settings": None,
             }
 
-            # Apply dark subtraction with matching settings
+            # Select master dark with matching settings
+            dark_arr = None
             master_dark = self._find_best_master_dark(exposure_time, gain, offset, readout_mode)
             if master_dark:
-                dark_data = master_dark.get("data")
-                if dark_data is None:
-                    self.logger.warning(
-                        f"Selected master dark has no data: {master_dark.get('file')}"
-                    )
-                else:
-                    try:
-                        dark_arr = np.asarray(dark_data, dtype=np.float32)
-                    except Exception as conv_err:
-                        self.logger.warning(
-                            f"Could not convert master dark to float32 array: {conv_err}"
-                        )
-                        dark_arr = None
-                    if dark_arr is not None:
-                        self.logger.debug(
-                            "Master dark selected: file=%s, exp=%s, shape=%s, dtype=%s",
-                            master_dark.get("file"),
-                            master_dark.get("exposure_time"),
-                            getattr(dark_arr, "shape", None),
-                            getattr(dark_arr, "dtype", None),
-                        )
-                        # Try to resolve residual orientation mismatch in 2D case
-                        applied_dark = False
-                        if dark_arr.shape != calibrated_frame.shape:
-                            if dark_arr.ndim == 2 and calibrated_frame.ndim == 2:
-                                if dark_arr.T.shape == calibrated_frame.shape:
-                                    self.logger.debug(
-                                        "Transposing master dark to match frame orientation (2D)"
-                                    )
-                                    dark_arr = dark_arr.T
-                                elif calibrated_frame.T.shape == dark_arr.shape:
-                                    self.logger.debug(
-                                        "Transposing frame to match master dark orientation (2D)"
-                                    )
-                                    calibrated_frame = calibrated_frame.T
-                        if dark_arr.shape == calibrated_frame.shape:
-                            calibrated_frame = calibrated_frame - dark_arr
-                            applied_dark = True
-                            # Debug: summarize frame after dark subtraction
-                            try:
-                                self.logger.debug(
-                                    "After dark subtraction: shape=%s, dtype=%s, min=%s, max=%s",
-                                    calibrated_frame.shape,
-                                    calibrated_frame.dtype,
-                                    (
-                                        float(np.nanmin(calibrated_frame))
-                                        if calibrated_frame.size
-                                        else "n/a"
-                                    ),
-                                    (
-                                        float(np.nanmax(calibrated_frame))
-                                        if calibrated_frame.size
-                                        else "n/a"
-                                    ),
-                                )
-                            except Exception:
-                                pass
-                        else:
-                            self.logger.warning(
-                                "Master dark shape %s != frame shape %s; skipping dark subtraction",
-                                dark_arr.shape,
-                                calibrated_frame.shape,
-                            )
-                calibration_details["dark_subtraction_applied"] = bool(
-                    "applied_dark" in locals() and applied_dark
-                )
+                dark_arr = self._resolve_master_array(master_dark, frame_arr.shape, "dark")
                 calibration_details["master_dark_used"] = master_dark["file"]
                 calibration_details["master_dark_settings"] = {
                     "exposure_time": master_dark["exposure_time"],
@@ -649,144 +694,55 @@ class CalibrationApplier:
                     "offset": master_dark.get("offset"),
                     "readout_mode": master_dark.get("readout_mode"),
                 }
-                if calibration_details["dark_subtraction_applied"]:
-                    self.logger.debug(
-                        f"Applied dark subtraction using {master_dark['file']} "
-                        f"(exp: {master_dark['exposure_time']:.3f}s, "
-                        f"gain: {master_dark.get('gain', 'N/A')}, "
-                        f"offset: {master_dark.get('offset', 'N/A')}, "
-                        f"readout: {master_dark.get('readout_mode', 'N/A')})"
-                    )
             else:
                 self.logger.warning(
                     f"No suitable master dark found for exp={exposure_time:.3f}s, "
                     f"gain={gain}, offset={offset}, readout={readout_mode}"
                 )
 
-            # Validate calibrated_frame before flat correction
-            if not isinstance(calibrated_frame, np.ndarray):
-                self.logger.error(
-                    "Calibrated frame has invalid type before flat correction: %s",
-                    type(calibrated_frame),
-                )
-                try:
-                    calibrated_frame = np.asarray(calibrated_frame, dtype=np.float32)
-                    self.logger.debug(
-                        "Recovered calibrated frame to ndarray: shape=%s, dtype=%s",
-                        calibrated_frame.shape,
-                        calibrated_frame.dtype,
-                    )
-                except Exception as conv_err:
-                    self.logger.error(f"Failed to recover calibrated frame to ndarray: {conv_err}")
-                    return error_status("Calibration failed: invalid frame after dark subtraction")
-
-            try:
-                self.logger.debug(
-                    "Pre-flat: frame shape=%s, dtype=%s, min=%s, max=%s",
-                    calibrated_frame.shape,
-                    calibrated_frame.dtype,
-                    (float(np.nanmin(calibrated_frame)) if calibrated_frame.size else "n/a"),
-                    (float(np.nanmax(calibrated_frame)) if calibrated_frame.size else "n/a"),
-                )
-            except Exception:
-                pass
-
-            # Apply flat correction with matching settings
+            # Select master flat with matching settings
+            flat_arr = None
             master_flat = self._find_best_master_flat(gain, offset, readout_mode)
             if master_flat:
-                # Avoid division by zero
-                flat_data = master_flat["data"]
-                try:
-                    flat_data = np.asarray(flat_data, dtype=np.float32)
-                except Exception as conv_err:
-                    self.logger.warning(
-                        f"Could not convert master flat to float32 array: {conv_err}"
-                    )
-                    flat_data = None
-                if flat_data is None:
-                    self.logger.warning(
-                        f"Selected master flat has no data: {master_flat.get('file')}"
-                    )
-                    flat_data_safe = None
-                else:
-                    self.logger.debug(
-                        "Master flat selected: file=%s, shape=%s, dtype=%s",
-                        master_flat.get("file"),
-                        flat_data.shape,
-                        flat_data.dtype,
-                    )
-                    # Try orientation fix similar to dark (only for 2D)
-                    if flat_data.shape != calibrated_frame.shape:
-                        if flat_data.ndim == 2 and calibrated_frame.ndim == 2:
-                            if flat_data.T.shape == calibrated_frame.shape:
-                                self.logger.debug(
-                                    "Transposing master flat to match frame orientation (2D)"
-                                )
-                                flat_data = flat_data.T
-                            elif calibrated_frame.T.shape == flat_data.shape:
-                                self.logger.debug(
-                                    "Transposing frame to match master flat orientation (2D)"
-                                )
-                                calibrated_frame = calibrated_frame.T
-                    flat_data_safe = None
-                    if flat_data.shape == calibrated_frame.shape:
-                        flat_data_safe = np.where(flat_data > 0, flat_data, 1.0)
-                        try:
-                            self.logger.debug(
-                                "Flat safe stats: min=%s, max=%s",
-                                (
-                                    float(np.nanmin(flat_data_safe))
-                                    if flat_data_safe.size
-                                    else "n/a"
-                                ),
-                                (
-                                    float(np.nanmax(flat_data_safe))
-                                    if flat_data_safe.size
-                                    else "n/a"
-                                ),
-                            )
-                        except Exception:
-                            pass
-                if flat_data_safe is not None:
-                    calibrated_frame = calibrated_frame / flat_data_safe
-                    calibration_details["flat_correction_applied"] = True
-                    try:
-                        self.logger.debug(
-                            "After flat: shape=%s, dtype=%s, min=%s, max=%s",
-                            calibrated_frame.shape,
-                            calibrated_frame.dtype,
-                            (
-                                float(np.nanmin(calibrated_frame))
-                                if calibrated_frame.size
-                                else "n/a"
-                            ),
-                            (
-                                float(np.nanmax(calibrated_frame))
-                                if calibrated_frame.size
-                                else "n/a"
-                            ),
-                        )
-                    except Exception:
-                        pass
+                flat_arr = self._resolve_master_array(master_flat, frame_arr.shape, "flat")
                 calibration_details["master_flat_used"] = master_flat["file"]
                 calibration_details["master_flat_settings"] = {
                     "gain": master_flat.get("gain"),
                     "offset": master_flat.get("offset"),
                     "readout_mode": master_flat.get("readout_mode"),
                 }
-                if calibration_details["flat_correction_applied"]:
-                    self.logger.debug(
-                        f"Applied flat correction using {master_flat['file']} "
-                        f"(gain: {master_flat.get('gain', 'N/A')}, "
-                        f"offset: {master_flat.get('offset', 'N/A')}, "
-                        f"readout: {master_flat.get('readout_mode', 'N/A')})"
-                    )
             else:
                 self.logger.warning(
                     f"No suitable master flat found for gain={gain}, "
                     f"offset={offset}, readout={readout_mode}"
                 )
 
+            # Single fused pass: (raw - dark) * (1 / flat) into the output buffer
+            prepared = self._prepared_masters(dark_arr, flat_arr)
+            calibrated_frame = self.kernel.apply(
+                frame_arr, prepared, out=self._next_output_buffer(frame_arr.shape)
+            )
+            calibration_details["dark_subtraction_applied"] = prepared.offset is not None
+            calibration_details["flat_correction_applied"] = prepared.inv_flat is not None
+            if master_dark and prepared.offset is not None:
+                self.logger.debug(
+                    f"Applied dark subtraction using {master_dark['file']} "
+                    f"(exp: {master_dark['exposure_time']:.3f}s, "
+                    f"gain: {master_dark.get('gain', 'N/A')}, "
+                    f"offset: {master_dark.get('offset', 'N/A')}, "
+                    f"readout: {master_dark.get('readout_mode', 'N/A')})"
+                )
+            if master_flat and prepared.inv_flat is not None:
+                self.logger.debug(
+                    f"Applied flat correction using {master_flat['file']} "
+                    f"(gain: {master_flat.get('gain', 'N/A')}, "
+                    f"offset: {master_flat.get('offset', 'N/A')}, "
+                    f"readout: {master_flat.get('readout_mode', 'N/A')})"
+                )
+            if compute_stats:
+                calibration_details["stats"] = frame_stats(calibrated_frame)
+                self.logger.debug("Calibrated frame stats: %s", calibration_details["stats"])
+
             # Determine if calibration was applied
             calibration_applied = (
                 calibration_details["dark_subtraction_applied"]
@@ -877,10 +833,11 @@ class CalibrationApplier:
         try:
             self.logger.info("Reloading master frames...")
 
-            # Clear existing cache
+            # Clear existing index and cached data
             self.master_bias_cache = None
             self.master_dark_cache.clear()
             self.master_flat_cache = None
+            self.master_store.clear()
 
             # Reload master frames
             self._load_master_frames()
@@ -940,8 +897,17 @@ class CalibrationApplier:
             "dark_settings": dark_settings,
             "flat_settings": flat_settings,
             "settings_matching_enabled": True,  # New feature
+            "master_data_cached_bytes": self.master_store.cached_bytes,
         }
 
+    @staticmethod
+    def _master_shape(master_info: Dict[str, Any]) -> Optional[tuple]:
+        data = master_info.get("data")
+        if data is not None:
+            return tuple(np.shape(data))
+        shape = master_info.get("shape")
+        return tuple(shape) if shape is not None else None
+
     def get_master_frame_info(self) -> Dict[str, Any]:
         """Get detailed information about loaded master frames.
 
@@ -952,8 +918,8 @@ class CalibrationApplier:
         for exp_time, dark_data in self.master_dark_cache.items():
             dark_info[f"{exp_time:.3f}s"] = {
                 "file": dark_data["file"],
-                "shape": dark_data["data"].shape,
-                "dtype": str(dark_data["data"].dtype),
+                "shape": self._master_shape(dark_data),
+                "dtype": "float32",
                 "gain": dark_data.get("gain"),
                 "offset": dark_data.get("offset"),
                 "readout_mode": dark_data.get("readout_mode"),
@@ -963,8 +929,8 @@ class CalibrationApplier:
         if self.master_flat_cache:
             flat_info = {
                 "file": self.master_flat_cache["file"],
-                "shape": self.master_flat_cache["data"].shape,
-                "dtype": str(self.master_flat_cache["data"].dtype),
+                "shape": self._master_shape(self.master_flat_cache),
+                "dtype": "float32",
                 "gain": self.master_flat_cache.get("gain"),
                 "offset": self.master_flat_cache.get("offset"),
                 "readout_mode": self.master_flat_cache.get("readout_mode"),
@@ -974,8 +940,8 @@ class CalibrationApplier:
         if self.master_bias_cache:
             bias_info = {
                 "file": self.master_bias_cache["file"],
-                "shape": self.master_bias_cache["data"].shape,
-                "dtype": str(self.master_bias_cache["data"].dtype),
+                "shape": self._master_shape(self.master_bias_cache),
+                "dtype": "float32",
                 "gain": self.master_bias_cache.get("gain"),
                 "offset": self.master_bias_cache.get("offset"),
                 "readout_mode": self.master_bias_cache.get("readout_mode"),
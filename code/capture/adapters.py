@@ -96,6 +96,11 @@ class AlpacaCameraAdapter(CameraInterface):
     def bin_y(self, value: int) -> None:
         self._cam.bin_y = value
 
+    def set_subframe(self, start_x: int, start_y: int, num_x: int, num_y: int) -> bool:
+        if not hasattr(self._cam, "set_subframe"):
+            return False
+        return bool(self._cam.set_subframe(start_x, start_y, num_x, num_y))
+
     def is_color_camera(self) -> bool:
         return bool(self._cam.is_color_camera())
 
@@ -152,6 +157,12 @@ class AlpacaCameraAdapter(CameraInterface):
     def heat_sink_temperature(self) -> Optional[float]:
         return getattr(self._cam, "heat_sink_temperature", None)
 
+    def attach_device_state(self, device_state: Any) -> None:
+        """Let the wrapper keep its cooling cache current from device-state snapshots."""
+        attach = getattr(self._cam, "attach_device_state", None)
+        if callable(attach):
+            attach(device_state)
+
 
 class AscomCameraAdapter(CameraInterface):
     def __init__(self, camera) -> None:
@@ -249,6 +260,17 @@ class AscomCameraAdapter(CameraInterface):
     def bin_y(self, value: int) -> None:
         self._cam.bin_y = value
 
+    def set_subframe(self, start_x: int, start_y: int, num_x: int, num_y: int) -> bool:
+        cam = getattr(self._cam, "camera", None)
+        if cam is None:
+            return False
+        try:
+            cam.NumX, cam.NumY = int(num_x), int(num_y)
+            cam.StartX, cam.StartY = int(start_x), int(start_y)
+            return True
+        except Exception:
+            return False
+
     def is_color_camera(self) -> bool:
         if hasattr(self._cam, "is_color_camera"):
             return bool(self._cam.is_color_camera())
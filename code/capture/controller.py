@@ -16,6 +16,7 @@ from calibration_applier import CalibrationApplier
 from capture.adapters import AlpacaCameraAdapter, AscomCameraAdapter, OpenCVCameraAdapter
 from capture.frame import Frame
 from capture.settings import CameraSettings
+from services.device_state import DeviceStateService, create_device_state_service
 from status import CameraStatus, error_status, success_status, warning_status
 from utils.status_utils import unwrap_status
 
@@ -78,12 +79,19 @@ class VideoCapture:
         init_status = self._initialize_camera()
         if not init_status.is_success:
             self.logger.warning(f"Camera initialization: {init_status.message}")
+        # Background snapshots of slow-changing camera properties (gain, cooling, ...)
+        self.device_state: Optional[DeviceStateService] = None
+        self._start_device_state()
         # Reusable writer instance
         try:
             from services.frame_writer import FrameWriter
 
             self._frame_writer = FrameWriter(
-                self.config, logger=self.logger, camera=self.camera, camera_type=self.camera_type
+                self.config,
+                logger=self.logger,
+                camera=self.camera,
+                camera_type=self.camera_type,
+                device_state=self.device_state,
             )
         except Exception:
             self._frame_writer = None
@@ -94,7 +102,7 @@ class VideoCapture:
                 self.cooling_service = CoolingService(self.config, logger=self.logger)
                 camera_obj: Optional[Any] = self.camera
                 if camera_obj is not None:
-                    self.cooling_service.initialize(camera_obj)
+                    self.cooling_service.initialize(camera_obj, device_state=self.device_state)
             except Exception as e:
                 self.logger.warning(f"Cooling service unavailable: {e}")
 
@@ -109,6 +117,22 @@ class VideoCapture:
         except Exception as e:
             self.logger.warning(f"Failed to create output directories: {e}")
 
+    def _start_device_state(self) -> None:
+        """Poll ASCOM/Alpaca camera properties in the background (camera.device_state)."""
+        if self.camera is None or self.camera_type not in ("ascom", "alpaca"):
+            return
+        try:
+            self.device_state = create_device_state_service(self.camera, self.config, self.logger)
+            if self.device_state is None:
+                return
+            attach = getattr(self.camera, "attach_device_state", None)
+            if callable(attach):
+                attach(self.device_state)
+            self.device_state.start()
+        except Exception as e:
+            self.logger.warning(f"Device state polling unavailable: {e}")
+            self.device_state = None
+
     def _initialize_camera(self) -> CameraStatus:
         if self.camera_type == "opencv":
             try:
@@ -248,7 +272,9 @@ class VideoCapture:
                     if not hasattr(self, "cooling_service") or self.cooling_service is None:
                         self.cooling_service = CoolingService(self.config, logger=self.logger)
                         if self.camera:
-                            self.cooling_service.initialize(self.camera)
+                            self.cooling_service.initialize(
+                                self.camera, device_state=self.device_state
+                            )
                     target_temp = (
                         self.config.get_camera_config()
                         .get("cooling", {})
@@ -315,6 +341,9 @@ class VideoCapture:
             return 1.0
 
     def disconnect(self) -> None:
+        if self.device_state is not None:
+            self.device_state.stop()
+            self.device_state = None
         if self.camera_type == "opencv":
             if self.cap:
                 self.cap.release()
@@ -416,14 +445,33 @@ class VideoCapture:
                 return None
             return self.current_frame
 
-    def capture_single_frame(self) -> CameraStatus:
-        # Unified single-frame capture via adapter
+    def _ensure_camera_connected(self) -> bool:
         if not self.camera:
             init_status = self._initialize_camera()
             if not init_status or (
                 hasattr(init_status, "is_success") and not init_status.is_success
             ):
-                return error_status("Failed to connect to camera")
+                return False
+        return True
+
+    def capture_single_frame(self) -> CameraStatus:
+        # Unified single-frame capture via adapter
+        if not self._ensure_camera_connected():
+            return error_status("Failed to connect to camera")
+        return self.capture_single_frame_generic(*self._configured_exposure())
+
+    def acquire_single_frame(self) -> CameraStatus:
+        """Expose and download one frame with the configured settings.
+
+        First stage of capture_single_frame (no calibration/debayer); finish the
+        frame with process_raw_frame(). Used by the pipelined capture mode.
+        """
+        if not self._ensure_camera_connected():
+            return error_status("Failed to connect to camera")
+        return self.acquire_raw_frame(*self._configured_exposure())
+
+    def _configured_exposure(self) -> tuple[float, Optional[float], int | list[int]]:
+        """Return (exposure_time_s, gain, binning) from config and the adaptive override."""
         # Choose exposure/gain/binning from appropriate config block
         cam_cfg = self.config.get_camera_config()
         if self.camera_type == "alpaca":
@@ -453,11 +501,54 @@ class VideoCapture:
             self.readout_mode = section.get("readout_mode", getattr(self, "readout_mode", None))
         except Exception:
             pass
-        return self.capture_single_frame_generic(exposure_time, gain, binning)
+        return exposure_time, gain, binning
+
+    def set_subframe(self, fraction: Optional[float] = None) -> bool:
+        """Read out only a centered region covering `fraction` of each sensor axis.
+
+        Args:
+            fraction: Region size per axis (None or >= 1.0 restores the full frame)
+
+        Returns:
+            bool: True if the camera supports subframes and accepted the region
+        """
+        if not self.camera or not hasattr(self.camera, "set_subframe"):
+            return False
+        try:
+            binning = int(getattr(self.camera, "bin_x", None) or 1)
+            width = int(getattr(self.camera, "camera_x_size", 0) or 0) // binning
+            height = int(getattr(self.camera, "camera_y_size", 0) or 0) // binning
+            if width <= 0 or height <= 0:
+                return False
+            if fraction is None or fraction >= 1.0:
+                return bool(self.camera.set_subframe(0, 0, width, height))
+            # Even offsets and sizes keep the Bayer phase of color sensors
+            num_x = max(2, int(width * fraction) // 2 * 2)
+            num_y = max(2, int(height * fraction) // 2 * 2)
+            start_x = (width - num_x) // 4 * 2
+            start_y = (height - num_y) // 4 * 2
+            return bool(self.camera.set_subframe(start_x, start_y, num_x, num_y))
+        except Exception as e:
+            self.logger.debug(f"Subframe not applied: {e}")
+            return False
 
     def capture_single_frame_generic(
         self, exposure_time_s: float, gain: Optional[float] = None, binning: int | list[int] = 1
     ) -> CameraStatus:
+        acquired = self.acquire_raw_frame(exposure_time_s, gain, binning)
+        if not acquired.is_success:
+            return acquired
+        return self.process_raw_frame(acquired)
+
+    def acquire_raw_frame(
+        self, exposure_time_s: float, gain: Optional[float] = None, binning: int | list[int] = 1
+    ) -> CameraStatus:
+        """Expose and download one frame.
+
+        Returns:
+            CameraStatus: Success with the raw camera array and frame details
+                (settings, capture_started_at, timings_ms expose/readout) or error
+        """
         if not self.camera:
             return error_status("Camera not connected")
         try:
@@ -498,6 +589,7 @@ class VideoCapture:
                 str(gain),
                 str(binning),
             )
+            t_expose = time.perf_counter()
             self.camera.start_exposure(exposure_time_s, light=True)
 
             # Wait for image readiness depending on camera type
@@ -517,10 +609,17 @@ class VideoCapture:
                             return error_status("Exposure timeout")
                 elif self.camera_type == "ascom":
                     time.sleep(min(max(exposure_time_s, 0.0) + 0.05, exposure_time_s + 0.5))
+            t_readout = time.perf_counter()
             image_data = self.camera.get_image_array()
+            t_done = time.perf_counter()
+            # Drivers may return a Status carrying the array and download timings
+            download_info: dict[str, Any] = {}
+            if hasattr(image_data, "is_success") and hasattr(image_data, "data"):
+                if not image_data.is_success:
+                    return error_status(f"Failed to get image data: {image_data.message}")
+                download_info = dict(getattr(image_data, "details", None) or {})
+                image_data = image_data.data
             try:
-                import numpy as _np
-
                 shape0 = getattr(image_data, "shape", None)
                 dtype0 = getattr(image_data, "dtype", None)
                 self.logger.debug(
@@ -547,9 +646,32 @@ class VideoCapture:
             frame_details = {
                 **settings.to_dict(),
                 "debayered": bool(getattr(self.camera, "is_color_camera", lambda: False)()),
+                **download_info,
+                "capture_started_at": capture_started_at,
+                "timings_ms": {
+                    "expose": (t_readout - t_expose) * 1000.0,
+                    "readout": (t_done - t_readout) * 1000.0,
+                },
             }
+            return success_status("Frame acquired", data=image_data, details=frame_details)
+        except Exception as e:
+            return error_status(f"Error capturing frame: {e}")
+
+    def process_raw_frame(self, acquired: Any) -> CameraStatus:
+        """Calibrate and debayer a frame from acquire_raw_frame() into the captured frame.
 
-            frame_data = image_data
+        Args:
+            acquired: Success status returned by acquire_raw_frame()
+
+        Returns:
+            CameraStatus: Same result as capture_single_frame_generic()
+        """
+        try:
+            frame_data = acquired.data
+            frame_details: Dict[str, Any] = dict(getattr(acquired, "details", None) or {})
+            frame_details["timings_ms"] = dict(frame_details.get("timings_ms") or {})
+            exposure_time_s = frame_details.get("exposure_time_s")
+            capture_started_at = frame_details.get("capture_started_at")
             # Preserve original undebayered mosaic (if available) for RAW FITS archival
             raw_mosaic = None
             try:
@@ -579,6 +701,7 @@ class VideoCapture:
                 )
             except Exception:
                 raw_mosaic = None
+            t_calibrate = time.perf_counter()
             if self.enable_calibration and self.calibration_applier:
                 calibration_status = self.calibration_applier.calibrate_frame(
                     frame_data, exposure_time_s, frame_details
@@ -587,6 +710,7 @@ class VideoCapture:
                 calibration_status = success_status(
                     "Calibration skipped", data=frame_data, details={"calibration_applied": False}
                 )
+            frame_details["timings_ms"]["calibrate"] = (time.perf_counter() - t_calibrate) * 1000.0
 
             if calibration_status.is_success:
                 calibrated_frame = calibration_status.data
@@ -606,9 +730,13 @@ class VideoCapture:
                 try:
                     from processing.format_conversion import debayer_to_color_and_green
 
+                    t_debayer = time.perf_counter()
                     color16, green16, pattern = debayer_to_color_and_green(
                         calibrated_frame, self.camera, self.config, self.logger
                     )
+                    frame_details["timings_ms"]["debayer"] = (
+                        time.perf_counter() - t_debayer
+                    ) * 1000.0
                     if pattern:
                         frame_details["bayer_pattern"] = pattern
                     # Prefer raw mosaic derived from calibrated_frame when possible
@@ -686,6 +814,136 @@ class VideoCapture:
         except Exception as e:
             return error_status(f"Error capturing frame: {e}")
 
+    def capture_raw_series(
+        self,
+        exposure_time_s: float,
+        paths: list[str],
+        gain: Optional[float] = None,
+        binning: int | list[int] = 1,
+        metadata: Optional[Dict[str, Any]] = None,
+        max_pending: int = 4,
+        write_timeout_s: float = 300.0,
+    ) -> CameraStatus:
+        """Capture a calibration series (bias/dark/flat) as raw sensor frames.
+
+        Frames skip calibration, debayering and Frame construction: each downloaded
+        buffer goes straight to a dedicated FITS writer thread and the next exposure
+        starts immediately. At most max_pending frames wait for the writer; when the
+        queue is full, exposures pause instead of dropping frames, whatever the
+        display writer's ``async_writer`` policy is.
+
+        Args:
+            exposure_time_s: Exposure time per frame
+            paths: One output FITS path per frame
+            gain: Gain (None = current)
+            binning: Binning
+            metadata: Extra header metadata for every frame
+            max_pending: Frames buffered for the writer before exposures pause
+            write_timeout_s: Longest pause for a free writer slot before a frame is lost
+
+        Returns:
+            CameraStatus: Success with the list of written paths; details carry
+                captured/failed counts, elapsed_s and frames_per_s. Error when no
+                frame was saved.
+        """
+        if not self._ensure_camera_connected():
+            return error_status("Failed to connect to camera")
+        import numpy as _np
+        from processing.orientation import enforce_long_side_horizontal
+        from services.frame_writer import FrameWriter
+
+        # The writer never touches the camera; temperatures are sampled here
+        writer = FrameWriter(
+            self.config,
+            logger=self.logger,
+            camera=None,
+            camera_type=self.camera_type,
+            workers=1,
+            max_queue=max(1, int(max_pending)),
+            full_policy="block",
+            block_timeout_s=write_timeout_s,
+        )
+        cooling = self._cooling_details()
+        futures = []
+        failed = 0
+        t_start = time.perf_counter()
+        try:
+            for index, path in enumerate(paths):
+                acquired = self.acquire_raw_frame(exposure_time_s, gain, binning)
+                if not acquired.is_success or acquired.data is None:
+                    failed += 1
+                    self.logger.warning(
+                        f"Raw frame {index + 1}/{len(paths)} failed: {acquired.message}"
+                    )
+                    continue
+                details: Dict[str, Any] = dict(acquired.details or {})
+                details.update(metadata or {})
+                details.update(cooling)
+                temperature = self._ccd_temperature()
+                if temperature is not None:
+                    details["ccd_temperature"] = temperature
+                details["debayered"] = False
+                # Same orientation as FITS saved through save_frame()
+                raw, _ = enforce_long_side_horizontal(_np.squeeze(_np.asarray(acquired.data)))
+                futures.append(writer.submit(raw, path, metadata=details, raw=True))
+        finally:
+            writer.flush()
+            writer.shutdown()
+        elapsed = time.perf_counter() - t_start
+        saved: list[str] = []
+        for future in futures:
+            status = future.result()
+            if status.is_success:
+                saved.append(status.data)
+            else:
+                failed += 1
+                self.logger.warning(f"Raw frame write failed: {status.message}")
+        details = {
+            "exposure_time_s": exposure_time_s,
+            "requested": len(paths),
+            "captured": len(saved),
+            "failed": failed,
+            "elapsed_s": elapsed,
+            "frames_per_s": (len(saved) / elapsed) if elapsed > 0 else None,
+        }
+        if not saved:
+            return error_status(f"Raw series failed: 0/{len(paths)} frames saved", details=details)
+        return success_status(
+            f"Raw series captured: {len(saved)}/{len(paths)} frames", data=saved, details=details
+        )
+
+    def _read_camera_value(self, name: str, default: Any = None) -> Any:
+        snapshot = self.device_state.current() if self.device_state is not None else None
+        if snapshot is not None and name in snapshot:
+            return snapshot.get(name)
+        try:
+            value = getattr(self.camera, name, default)
+            return default if value is None else value
+        except Exception:
+            return default
+
+    def _ccd_temperature(self) -> Optional[float]:
+        # Adapters expose ccd_temperature; raw drivers use ccdtemperature
+        value = self._read_camera_value("ccd_temperature")
+        if value is None:
+            value = self._read_camera_value("ccdtemperature")
+        try:
+            return None if value is None else float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _cooling_details(self) -> Dict[str, Any]:
+        """Sample temperature and cooler state for header metadata."""
+        details: Dict[str, Any] = {}
+        temperature = self._ccd_temperature()
+        if temperature is not None:
+            details["ccd_temperature"] = temperature
+        for key in ("set_ccd_temperature", "cooler_power", "cooler_on"):
+            value = self._read_camera_value(key)
+            if value is not None:
+                details[key] = value
+        return details
+
     def capture_single_frame_ascom(
         self, exposure_time_s: float, gain: Optional[float] = None, binning: int = 1
     ) -> CameraStatus:
@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 """
 Dataclass representing a captured frame with metadata.
+
+Derived products (debayered color, oriented views, 8-bit display image) are
+computed lazily and cached on the frame, so every consumer of one capture
+shares a single computation.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, cast
 
 import numpy as np
 
@@ -19,3 +24,55 @@ class Frame:
     green_channel: Optional[np.ndarray] = None  # debayered green channel for solving/stacking
     # Original undebayered (mono Bayer) data after calibration; used for RAW FITS archival
     raw_data: Optional[np.ndarray] = None
+    # Per-frame product cache (see product()); not part of equality or repr
+    _products: Dict[Hashable, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _products_lock: Any = field(
+        default_factory=threading.RLock, init=False, repr=False, compare=False
+    )
+
+    def product(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached product for key, computing it once with factory().
+
+        Products are treated as read-only by all consumers. A factory returning None
+        is not cached so a later call can retry.
+        """
+        with self._products_lock:
+            if key in self._products:
+                return self._products[key]
+            value = factory()
+            if value is not None:
+                self._products[key] = value
+            return value
+
+    def has_product(self, key: Hashable) -> bool:
+        return key in self._products
+
+    def invalidate_products(self) -> None:
+        """Drop cached products (call after modifying data in place)."""
+        with self._products_lock:
+            self._products.clear()
+
+    @property
+    def oriented(self) -> np.ndarray:
+        """View of data with the long side horizontal (cached)."""
+        from processing.orientation import enforce_long_side_horizontal
+
+        return cast(
+            np.ndarray,
+            self.product("oriented", lambda: enforce_long_side_horizontal(self.data)[0]),
+        )
+
+    @property
+    def oriented_green(self) -> Optional[np.ndarray]:
+        """View of the green channel with the long side horizontal (cached)."""
+        if self.green_channel is None:
+            return None
+        from processing.orientation import enforce_long_side_horizontal
+
+        green = self.green_channel
+        return cast(
+            np.ndarray,
+            self.product("oriented_green", lambda: enforce_long_side_horizontal(green)[0]),
+        )
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Pipelined capture for long-exposure cameras.
+
+The exposure stage starts exposure N+1 as soon as the pixels of frame N are
+downloaded; calibration/debayer runs on a second thread, and finished frames
+wait in a bounded queue for the consumer (save and plate-solve stage). Bounded
+queues provide backpressure: a slow consumer eventually pauses the exposure
+stage instead of growing memory.
+
+Each frame's ``timings_ms`` details gain the queue waits (raw_queue, out_queue)
+and the exposure start-to-start ``cycle``; ``stats()`` reports the duty cycle.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class CapturePipeline:
+    """Exposure and processing stages connected by bounded queues."""
+
+    def __init__(
+        self,
+        acquire: Callable[[], Any],
+        process: Callable[[Any], Any],
+        raw_queue_size: int = 2,
+        output_queue_size: int = 2,
+        gate: Optional[Callable[[], bool]] = None,
+        min_interval_s: float = 0.0,
+        retry_delay_s: float = 0.5,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            acquire: Exposes and downloads one frame; returns a Status (data = raw array)
+            process: Turns an acquired Status into the captured frame Status
+            raw_queue_size: Downloaded frames waiting for calibration
+            output_queue_size: Finished frames waiting for the consumer
+            gate: Optional check before each exposure; False skips the exposure
+            min_interval_s: Minimum time between exposure starts
+            retry_delay_s: Pause after a failed acquisition or a closed gate
+            logger: Logger instance
+        """
+        self.acquire = acquire
+        self.process = process
+        self.gate = gate
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self.retry_delay_s = max(0.01, float(retry_delay_s))
+        self.logger = logger or logging.getLogger(__name__)
+        self._raw: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(raw_queue_size)))
+        self._out: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(output_queue_size)))
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "acquired": 0,
+            "processed": 0,
+            "delivered": 0,
+            "failed": 0,
+            "exposure_s": 0.0,
+            "started_at": None,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        """Start the exposure and processing threads."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._exposure_loop, name="capture-expose", daemon=True),
+            threading.Thread(target=self._process_loop, name="capture-process", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop both stages; an exposure in progress finishes first."""
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._threads = []
+        for q in (self._raw, self._out):
+            try:
+                while True:
+                    q.get_nowait()
+            except queue.Empty:
+                pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Return the next finished frame Status, or None on timeout."""
+        try:
+            status, t_queued = self._out.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        timings = self._timings(status)
+        if timings is not None:
+            timings["out_queue"] = (time.perf_counter() - t_queued) * 1000.0
+        with self._lock:
+            self._stats["delivered"] += 1
+        return status
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus duty_cycle (exposure time / wall time since the first exposure)."""
+        with self._lock:
+            out = dict(self._stats)
+        started = out.pop("started_at")
+        elapsed = (time.monotonic() - started) if started is not None else 0.0
+        out["duty_cycle"] = (out["exposure_s"] / elapsed) if elapsed > 0 else None
+        out["raw_queue"] = self._raw.qsize()
+        out["out_queue"] = self._out.qsize()
+        return out
+
+    @staticmethod
+    def _timings(status: Any) -> Optional[Dict[str, Any]]:
+        details = getattr(status, "details", None)
+        if not isinstance(details, dict):
+            return None
+        timings = details.get("timings_ms")
+        if not isinstance(timings, dict):
+            timings = details["timings_ms"] = {}
+        return timings
+
+    def _put(self, q: "queue.Queue[Any]", item: Any) -> bool:
+        # Blocking put that still honors stop()
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _exposure_loop(self) -> None:
+        last_start: Optional[float] = None
+        while not self._stop.is_set():
+            try:
+                if last_start is not None and self.min_interval_s > 0:
+                    wait = last_start + self.min_interval_s - time.monotonic()
+                    if wait > 0 and self._stop.wait(wait):
+                        break
+                if self.gate is not None and not self.gate():
+                    self._stop.wait(self.retry_delay_s)
+                    continue
+                start = time.monotonic()
+                status = self.acquire()
+                if not getattr(status, "is_success", False):
+                    with self._lock:
+                        self._stats["failed"] += 1
+                    self.logger.warning(
+                        "Pipelined exposure failed: %s", getattr(status, "message", status)
+                    )
+                    self._stop.wait(self.retry_delay_s)
+                    continue
+                timings = self._timings(status)
+                if timings is not None and last_start is not None:
+                    timings["cycle"] = (start - last_start) * 1000.0
+                last_start = start
+                with self._lock:
+                    if self._stats["started_at"] is None:
+                        self._stats["started_at"] = start
+                    self._stats["acquired"] += 1
+                    details = getattr(status, "details", None) or {}
+                    self._stats["exposure_s"] += float(details.get("exposure_time_s") or 0.0)
+                self._put(self._raw, (status, time.perf_counter()))
+            except Exception as e:
+                self.logger.error(f"Error in pipelined exposure stage: {e}")
+                self._stop.wait(self.retry_delay_s)
+
+    def _process_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                acquired, t_queued = self._raw.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                timings = self._timings(acquired)
+                if timings is not None:
+                    timings["raw_queue"] = (time.perf_counter() - t_queued) * 1000.0
+                status = self.process(acquired)
+                if not getattr(status, "is_success", False):
+                    with self._lock:
+                        self._stats["failed"] += 1
+                    self.logger.warning(
+                        "Pipelined processing failed: %s", getattr(status, "message", status)
+                    )
+                    continue
+                with self._lock:
+                    self._stats["processed"] += 1
+                self._put(self._out, (status, time.perf_counter()))
+            except Exception as e:
+                with self._lock:
+                    self._stats["failed"] += 1
+                self.logger.error(f"Error in pipelined processing stage: {e}")
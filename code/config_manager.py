@@ -108,9 +108,22 @@ class ConfigManager:
                 "elevation_m": 0.0,
             },
             "mount": {
+                "type": "ascom",  # "ascom" (COM, Windows) or "alpaca" (HTTP)
                 "driver_id": "ASCOM.tenmicron_mount.Telescope",
+                "alpaca": {
+                    "host": "localhost",
+                    "port": 11111,
+                    "device_id": 0,
+                    "timeout_s": 5.0,  # HTTP request timeout in seconds
+                },
                 "connection_timeout": 10,
                 "validate_coordinates": True,
+                "telemetry": {
+                    "enabled": True,  # One thread polls the mount for all consumers
+                    "poll_interval_s": 1.0,  # Poll interval while the mount is at rest
+                    "slewing_poll_interval_s": 0.2,  # Poll interval while the mount slews
+                    "max_age_s": 3.0,  # Older samples are ignored
+                },
             },
             "telescope": {
                 "focal_length": 1000,
@@ -147,6 +160,13 @@ class ConfigManager:
                     "exposure_time": 0.1,  # Manual exposure time in seconds
                     "gain": 1.0,  # Gain setting
                     "binning": [1, 1],  # Binning factor [x, y] for Alpaca
+                    "image_transfer": "imagebytes",  # imagebytes (JSON fallback), json, alpyca
+                    "download_timeout_s": 120.0,  # Socket timeout for image downloads
+                },
+                "device_state": {
+                    "enabled": True,  # Poll slow-changing properties (ASCOM/Alpaca) in background
+                    "poll_interval_s": 5.0,  # Seconds between polls
+                    "max_age_s": 15.0,  # Older snapshots are ignored
                 },
             },
             "frame_processing": {
@@ -159,6 +179,19 @@ class ConfigManager:
                 "output_dir": "captured_frames",  # Directory for captured frames
                 "cache_dir": "cache",  # Directory for temporary files
                 "file_format": "PNG",  # File format for saved frames (fits, jpg, png, tiff, etc.)
+                "async_writer": {
+                    "enabled": False,  # Write display/FITS/RAW outputs on a background pool
+                    "workers": 3,  # Parallel write jobs
+                    "max_queue": 8,  # Queued + running writes before backpressure applies
+                    "full_policy": "block",  # 'block' (wait for a slot) or 'drop'
+                    "block_timeout_s": 30.0,  # Max wait for a slot / a pending write
+                },
+                "pipelined_capture": {
+                    "enabled": False,  # Expose the next frame while the last one is processed
+                    "raw_queue_size": 2,  # Downloaded frames waiting for calibration
+                    "output_queue_size": 2,  # Finished frames waiting for save/solve
+                    "min_interval_s": 0.0,  # Minimum time between exposure starts
+                },
             },
             "plate_solve": {
                 "auto_solve": True,
@@ -166,6 +199,17 @@ class ConfigManager:
                 "save_plate_solve_frames": True,
                 "plate_solve_dir": "plate_solve_frames",
                 "default_solver": "platesolve2",
+                "async_solve": True,  # Solve on a background worker (latest frame wins)
+                "tracking": {
+                    "enabled": False,  # Track the WCS between full solves by star matching
+                    "match_tolerance_px": 2.0,
+                    "min_matches": 8,
+                    "max_stars": 40,  # Brightest stars per frame used for matching
+                    "max_drift_px": 200,  # Image-center shift that forces a full solve
+                    "max_reference_age_s": 600,  # 0 = no periodic full solve
+                    "max_sources": 200,  # Stars detected per frame
+                    "detection_sigma": 5.0,
+                },
                 "platesolve2": {
                     "executable_path": (
                         "C:/Program Files (x86)/PlaneWave Instruments/PWI3/PlateSolve2/"
@@ -180,6 +224,21 @@ class ConfigManager:
                     "max_stars": 200,
                 },
                 "astrometry": {"api_key": "", "api_url": "http://nova.astrometry.net/api/"},
+                "race": {
+                    "timeout": 300,  # Seconds before the whole race gives up
+                    "max_parallel": None,  # Concurrent entries (None: all)
+                    "adaptive_order": True,  # Launch entries that won more often first
+                    "entries": [],  # {solver, name, overrides} per entry
+                },
+                "astrometry_local": {
+                    "warm_engine": False,  # Keep one astrometry-engine process running
+                    "engine_path": "astrometry-engine",
+                    "engine_args": ["-f", "-"],  # Read .axy file names from stdin
+                    "extract_stars": False,  # Solve an in-process star list (.xyls)
+                    "max_sources": 200,  # Brightest sources passed to the solver
+                    "detection_sigma": 5.0,  # Detection threshold above background noise
+                    "background_mesh": 64,  # Background box size in pixels
+                },
             },
             "overlay": {
                 "wait_for_plate_solve": True,
@@ -195,12 +254,46 @@ class ConfigManager:
                 "use_timestamps": False,
                 "timestamp_format": "%Y%m%d_%H%M%S",
                 "update": {"update_interval": 30, "max_retries": 3, "retry_delay": 5},
+                "catalog_cache": {
+                    "enabled": False,
+                    "cache_dir": "cache/catalog_tiles",
+                    "tile_size_deg": 2.0,
+                    "max_age_days": 30,
+                    "max_tiles_in_memory": 64,
+                    "max_tiles_on_disk": 5000,
+                    "offline_catalog": None,
+                    "offline_only": False,
+                },
                 "display": {
                     "object_color": [255, 0, 0],
                     "text_color": [255, 255, 255],
                     "marker_size": 5,
                     "text_offset": [8, -8],
                 },
+                "compositing": {
+                    "in_memory": True,  # Blend the RGBA overlay onto the display frame in memory
+                    "save_overlay_file": True,  # Also write the overlay PNG (OBS, viewers)
+                },
+                "layer_cache": {
+                    "enabled": True,  # Reuse title, info panel and sky layers between overlays
+                    "tolerance_px": 1.0,  # Max marker movement for reusing the sky layer
+                    "sky_max_age_s": 300,  # Redraw the sky layer at least this often
+                },
+                "stream_server": {
+                    "enabled": False,  # Live HTTP stream of the combined frames
+                    "host": "127.0.0.1",  # "0.0.0.0" serves other machines on the network
+                    "port": 8080,
+                    "jpeg_quality": 85,
+                    "max_fps": 10.0,  # Per-client frame rate cap (0: no cap)
+                    "max_clients": 16,
+                    "keepalive_s": 15.0,
+                    "write_timeout_s": 10.0,  # Disconnect clients that stop reading
+                },
+                "solar_system": {
+                    "enabled": False,
+                    # JPL ephemeris for the Moon and planets ("builtin" needs no download)
+                    "ephemeris": "de432s",
+                },
             },
             "logging": {
                 "verbose": True,
@@ -519,7 +612,11 @@ class ConfigManager:
                     "max_exposure": 10.0,  # Maximum exposure time (10s)
                     "exposure_step_factor": 1.5,  # Factor for exposure adjustment
                     "max_adjustment_attempts": 10,  # Maximum attempts to adjust exposure
+                    "test_frame_roi": 0.5,  # Test frame region per axis (centered)
+                    "stats_max_samples": 65536,  # Pixels sampled for test frame statistics
+                    "bias_level": None,  # Known bias level (ADU); None = assume 0
                     "output_dir": "flats",  # Output directory for flat frames
+                    "raw_capture": True,  # Raw series with background FITS writer
                 },
             ),
         )
@@ -542,6 +639,7 @@ class ConfigManager:
                     "max_exposure": 60.0,  # Maximum exposure time
                     "exposure_factors": [0.5, 1.0, 2.0, 4.0],  # Factors for extended range
                     "output_dir": "darks",  # Output directory for dark frames
+                    "raw_capture": True,  # Raw series with background FITS writer
                 },
             ),
         )
@@ -558,8 +656,14 @@ class ConfigManager:
                 "master_frames",
                 {
                     "output_dir": "master_frames",  # Output directory for master frames
-                    "rejection_method": "sigma_clip",  # 'sigma_clip' or 'minmax'
+                    # 'sigma_clip', 'minmax', 'median', 'sigma_clip_median', 'winsorized', 'mean'
+                    "rejection_method": "sigma_clip",
                     "sigma_threshold": 3.0,  # Sigma threshold for rejection
+                    "combine_workers": 0,  # Processes for tile-wise combining (0 = CPU count)
+                    "combine_memory_mb": 1024,  # Memory cap for the tile stacks of all workers
+                    "incremental": True,  # Rebuild only masters whose raw frames changed
+                    "save_accumulators": True,  # Keep count/mean/M2 stacks for 'mean' masters
+                    "library_index": "",  # "" = <output_dir>/calibration_library.json
                     "normalization_method": "mean",  # 'mean', 'median', 'max'
                     "quality_control": True,  # Enable quality control
                     "save_individual_masters": True,  # Save individual master frames
@@ -569,6 +673,9 @@ class ConfigManager:
                     "enable_calibration": True,  # Enable automatic calibration
                     "auto_load_masters": True,  # Auto-load master frames on startup
                     "calibration_tolerance": 0.1,  # 10% tolerance for exposure time matching
+                    "cache_max_mb": 2048,  # Memory budget for lazily loaded master frame data
+                    "calibration_threads": 0,  # Worker threads for calibration (0 = auto)
+                    "output_buffers": 0,  # Reused calibrated-frame buffers (0 = new per frame)
                 },
             ),
         )
@@ -35,7 +35,11 @@ class AlpycaCameraWrapper:
         self.logger = logger or logging.getLogger(__name__)
         self.camera = None
         self.cooling_cache = {}
+        # Optional DeviceStateService keeping the cooling cache current
+        self.device_state = None
         self.cache_file = None
+        # Transfer info of the last image download (encoding, bytes, timings)
+        self.last_download = {}
 
         # Initialize cache file path
         self._init_cache_path()
@@ -113,8 +117,33 @@ class AlpycaCameraWrapper:
         except Exception as e:
             self.logger.warning(f"Failed to save cooling cache: {e}")
 
+    def attach_device_state(self, device_state):
+        """Keep the cooling cache current from device-state snapshots."""
+        self.device_state = device_state
+        device_state.add_listener(self._update_cooling_cache_from_snapshot)
+
+    def _update_cooling_cache_from_snapshot(self, snapshot):
+        """Update the cooling cache from a snapshot; the file is written on changes only."""
+        values = {
+            "temperature": snapshot.get("ccd_temperature"),
+            "target_temperature": snapshot.get("set_ccd_temperature"),
+            "cooler_on": snapshot.get("cooler_on"),
+            "cooler_power": snapshot.get("cooler_power"),
+        }
+        changed = any(self.cooling_cache.get(k) != v for k, v in values.items())
+        self.cooling_cache = {
+            **values,
+            "timestamp": snapshot.timestamps.get("ccd_temperature", datetime.now().timestamp()),
+        }
+        if changed:
+            self._save_cooling_cache()
+
     def _update_cooling_cache(self):
         """Update cooling cache with current values."""
+        if self.device_state is not None and self.device_state.is_running:
+            # The next poll (right away) refreshes the cache through the listener
+            self.device_state.invalidate()
+            return
         try:
             if self.camera:
                 self.cooling_cache = {
@@ -341,6 +370,28 @@ class AlpycaCameraWrapper:
         except Exception:
             return False
 
+    # ============================================================================
+    # Subframe (ROI) Control
+    # ============================================================================
+
+    def set_subframe(self, start_x, start_y, num_x, num_y):
+        """Set the readout region in binned pixels.
+
+        Returns:
+            bool: True if the camera accepted the region
+        """
+        try:
+            if not self.camera:
+                return False
+            self.camera.NumX = int(num_x)
+            self.camera.NumY = int(num_y)
+            self.camera.StartX = int(start_x)
+            self.camera.StartY = int(start_y)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to set subframe: {e}")
+            return False
+
     # ============================================================================
     # Cooling System
     # ============================================================================
@@ -611,17 +662,70 @@ class AlpycaCameraWrapper:
     def get_image_array(self):
         """Get the image array.
 
+        Downloads with the Alpaca ImageBytes binary protocol (JSON fallback) unless
+        ``camera.alpaca.image_transfer`` selects otherwise; falls back to Alpyca's
+        ImageArray if the direct download fails.
+
         Returns:
-            Status: Success with image data or error status
+            Status: Success with image data (details: image_transfer, download_ms, ...)
+                or error status
         """
+        transfer = self._image_transfer_mode()
+        if transfer in ("imagebytes", "json"):
+            try:
+                from drivers.alpaca.imagebytes import download_image_array
+
+                image_array, info = download_image_array(
+                    self.host,
+                    self.port,
+                    self.device_id,
+                    timeout_s=self._download_timeout_s(),
+                    prefer_binary=(transfer == "imagebytes"),
+                )
+                self.last_download = info
+                self.logger.info(
+                    "Image array retrieved via %s: %.1f MB in %.0f ms (%.1f MB/s, decode %.0f ms)",
+                    info["image_transfer"],
+                    info["download_bytes"] / 1e6,
+                    info["download_ms"],
+                    (info["download_bytes_per_s"] or 0.0) / 1e6,
+                    info["decode_ms"],
+                )
+                return success_status("Image retrieved", data=image_array, details=dict(info))
+            except Exception as e:
+                self.logger.warning(f"Direct image download failed, falling back to Alpyca: {e}")
+
         try:
+            t0 = time.perf_counter()
             image_array = self.camera.ImageArray
+            info = {
+                "image_transfer": "alpyca",
+                "download_ms": (time.perf_counter() - t0) * 1000.0,
+            }
+            self.last_download = info
             self.logger.info("Image array retrieved successfully")
-            return success_status("Image retrieved", data=image_array)
+            return success_status("Image retrieved", data=image_array, details=dict(info))
         except Exception as e:
             self.logger.error(f"Failed to get image array: {e}")
             return error_status(f"Failed to get image array: {e}")
 
+    def _alpaca_config(self):
+        try:
+            return self.config.get_camera_config().get("alpaca", {}) or {}
+        except Exception:
+            return {}
+
+    def _image_transfer_mode(self):
+        """Image download encoding: imagebytes (binary, JSON fallback), json or alpyca."""
+        mode = str(self._alpaca_config().get("image_transfer", "imagebytes")).lower()
+        return mode if mode in ("imagebytes", "json", "alpyca") else "imagebytes"
+
+    def _download_timeout_s(self):
+        try:
+            return float(self._alpaca_config().get("download_timeout_s", 120.0))
+        except (TypeError, ValueError):
+            return 120.0
+
     # ============================================================================
     # Cooling Methods
     # ============================================================================
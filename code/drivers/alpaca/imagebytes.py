@@ -0,0 +1,214 @@
+"""
+Alpaca image download with the ImageBytes binary protocol.
+
+Requests ``imagearray`` with ``Accept: application/imagebytes`` and decodes the
+binary payload straight into a typed NumPy array. Servers without ImageBytes
+support answer with the JSON ImageArray, which is decoded as a fallback.
+
+ImageBytes layout: a 44-byte header of eleven little-endian int32 values
+(metadata version, error number, client/server transaction IDs, data start,
+image element type, transmission element type, rank, dimensions 1-3) followed
+by the pixel data, with the last dimension varying fastest. The decoded array
+has the same (NumX, NumY[, planes]) shape as ``np.asarray(ImageArray)``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import struct
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+import urllib.parse
+import urllib.request
+
+import numpy as np
+
+IMAGE_BYTES_MIME = "application/imagebytes"
+HEADER_FORMAT = "<11i"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+METADATA_VERSION = 1
+
+# Alpaca ImageArrayElementTypes -> little-endian numpy dtypes
+ELEMENT_TYPES: Dict[int, np.dtype] = {
+    1: np.dtype("<i2"),  # Int16
+    2: np.dtype("<i4"),  # Int32
+    3: np.dtype("<f8"),  # Double
+    4: np.dtype("<f4"),  # Single
+    5: np.dtype("<u8"),  # UInt64
+    6: np.dtype("u1"),  # Byte
+    7: np.dtype("<i8"),  # Int64
+    8: np.dtype("<u2"),  # UInt16
+    9: np.dtype("<u4"),  # UInt32
+}
+
+_transaction_ids = itertools.count(1)
+
+
+class AlpacaImageError(RuntimeError):
+    """Raised when the device reports an error or the payload cannot be decoded."""
+
+
+def element_type_code(dtype: Any) -> int:
+    """Return the Alpaca element type code for a numpy dtype."""
+    dt = np.dtype(dtype).newbyteorder("<")
+    for code, candidate in ELEMENT_TYPES.items():
+        if candidate == dt:
+            return code
+    raise ValueError(f"Unsupported ImageBytes element type: {dtype}")
+
+
+def decode_image_bytes(payload: Union[bytes, bytearray]) -> np.ndarray:
+    """Decode an ImageBytes payload into an array without copying the pixel data.
+
+    The array is a view of payload; pass a bytearray to get a writable array.
+
+    Raises:
+        AlpacaImageError: On a device error or a malformed payload
+    """
+    if len(payload) < HEADER_SIZE:
+        raise AlpacaImageError("ImageBytes payload shorter than its header")
+    (
+        _version,
+        error_number,
+        _client_tid,
+        _server_tid,
+        data_start,
+        _image_type,
+        transmission_type,
+        rank,
+        dim1,
+        dim2,
+        dim3,
+    ) = struct.unpack_from(HEADER_FORMAT, payload)
+    if error_number != 0:
+        message = bytes(payload[data_start:]).decode("utf-8", errors="replace")
+        raise AlpacaImageError(f"Alpaca error {error_number}: {message}")
+    dtype = ELEMENT_TYPES.get(transmission_type)
+    if dtype is None:
+        raise AlpacaImageError(f"Unsupported ImageBytes transmission type: {transmission_type}")
+    if rank == 2:
+        shape: Tuple[int, ...] = (dim1, dim2)
+    elif rank == 3:
+        shape = (dim1, dim2, dim3)
+    else:
+        raise AlpacaImageError(f"Unsupported ImageBytes rank: {rank}")
+    count = int(np.prod(shape))
+    if data_start < HEADER_SIZE or len(payload) - data_start < count * dtype.itemsize:
+        raise AlpacaImageError("ImageBytes payload shorter than its declared dimensions")
+    data = np.frombuffer(payload, dtype=dtype, count=count, offset=data_start).reshape(shape)
+    # Native byte order for downstream numpy/OpenCV code (no-op on little-endian hosts)
+    return data if dtype.isnative else data.astype(dtype.newbyteorder("="))
+
+
+def encode_image_bytes(
+    image: np.ndarray,
+    client_transaction_id: int = 0,
+    server_transaction_id: int = 0,
+    image_element_type: Optional[int] = None,
+) -> bytes:
+    """Encode an array as an ImageBytes payload (used by simulators and tests)."""
+    arr = np.asarray(image)
+    if arr.ndim not in (2, 3):
+        raise ValueError("ImageBytes supports rank 2 and 3 arrays")
+    transmission_type = element_type_code(arr.dtype)
+    dims = list(arr.shape) + [0] * (3 - arr.ndim)
+    header = struct.pack(
+        HEADER_FORMAT,
+        METADATA_VERSION,
+        0,
+        client_transaction_id,
+        server_transaction_id,
+        HEADER_SIZE,
+        image_element_type if image_element_type is not None else transmission_type,
+        transmission_type,
+        arr.ndim,
+        *dims,
+    )
+    body = np.ascontiguousarray(arr, dtype=ELEMENT_TYPES[transmission_type]).tobytes()
+    return header + body
+
+
+def _read_body(response: Any) -> bytearray:
+    """Read the response body into one preallocated, writable buffer."""
+    length = response.headers.get("Content-Length")
+    if not length:
+        return bytearray(response.read())
+    buf = bytearray(int(length))
+    view = memoryview(buf)
+    received = 0
+    while received < len(buf):
+        n = response.readinto(view[received:])
+        if not n:
+            raise AlpacaImageError(f"Image download truncated at {received} of {len(buf)} bytes")
+        received += n
+    return buf
+
+
+def decode_image_json(payload: Union[bytes, bytearray]) -> np.ndarray:
+    """Decode a JSON ImageArray response.
+
+    Raises:
+        AlpacaImageError: On a device error or a response without a value
+    """
+    doc = json.loads(payload)
+    if int(doc.get("ErrorNumber", 0) or 0) != 0:
+        raise AlpacaImageError(f"Alpaca error {doc.get('ErrorNumber')}: {doc.get('ErrorMessage')}")
+    if "Value" not in doc:
+        raise AlpacaImageError("ImageArray response without a value")
+    # Alpaca ImageArrayElementTypes: Int32 (2) is the JSON default
+    dtype = ELEMENT_TYPES.get(int(doc.get("Type", 2) or 2), np.dtype(np.int32))
+    return np.asarray(doc["Value"], dtype=dtype.newbyteorder("="))
+
+
+def download_image_array(
+    host: str,
+    port: int,
+    device_id: int,
+    client_id: int = 1,
+    timeout_s: float = 120.0,
+    prefer_binary: bool = True,
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Download the current image of an Alpaca camera.
+
+    Args:
+        host: Alpaca server host
+        port: Alpaca server port
+        device_id: Camera device number
+        client_id: Alpaca ClientID
+        timeout_s: Socket timeout for the request
+        prefer_binary: Ask for ImageBytes (False forces the JSON encoding)
+
+    Returns:
+        Tuple of (image array, transfer info with image_transfer, download_bytes,
+        download_ms, decode_ms and download_bytes_per_s)
+    """
+    query = urllib.parse.urlencode(
+        {"ClientID": int(client_id), "ClientTransactionID": next(_transaction_ids)}
+    )
+    url = f"http://{host}:{int(port)}/api/v1/camera/{int(device_id)}/imagearray?{query}"
+    accept = f"{IMAGE_BYTES_MIME}, application/json" if prefer_binary else "application/json"
+    request = urllib.request.Request(url, headers={"Accept": accept})
+
+    t0 = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout_s) as response:
+        content_type = str(response.headers.get("Content-Type", "")).lower()
+        payload = _read_body(response)
+    t1 = time.perf_counter()
+    if IMAGE_BYTES_MIME in content_type:
+        transfer = "imagebytes"
+        image = decode_image_bytes(payload)
+    else:
+        transfer = "json"
+        image = decode_image_json(payload)
+    t2 = time.perf_counter()
+
+    download_s = t1 - t0
+    info = {
+        "image_transfer": transfer,
+        "download_bytes": len(payload),
+        "download_ms": download_s * 1000.0,
+        "decode_ms": (t2 - t1) * 1000.0,
+        "download_bytes_per_s": (len(payload) / download_s) if download_s > 0 else None,
+    }
+    return image, info
@@ -0,0 +1,287 @@
+"""
+Alpaca Mount Interface - ASCOM telescope control over HTTP.
+
+Talks to an ASCOM Alpaca telescope device with plain HTTP requests (no Alpyca
+or COM needed), so it runs on any platform and can be tested against a local
+stand-in server. The public methods mirror drivers.ascom.mount.ASCOMMount and
+return the same MountStatus objects; RA is converted from hours to degrees.
+
+    mount:
+      type: "alpaca"
+      alpaca:
+        host: "localhost"
+        port: 11111
+        device_id: 0
+        timeout_s: 5.0
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+import urllib.parse
+import urllib.request
+
+from exceptions import ConnectionError, MountError, ValidationError
+from status import MountStatus, error_status, success_status, warning_status
+
+_transaction_ids = itertools.count(1)
+
+
+class AlpacaTelescopeClient:
+    """Minimal Alpaca client for one telescope device (GET/PUT of properties)."""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 11111,
+        device_id: int = 0,
+        timeout_s: float = 5.0,
+        client_id: int = 1,
+    ) -> None:
+        self.base_url = f"http://{host}:{int(port)}/api/v1/telescope/{int(device_id)}"
+        self.timeout_s = float(timeout_s)
+        self.client_id = int(client_id)
+
+    def _call(self, request: urllib.request.Request, name: str) -> Any:
+        with urllib.request.urlopen(request, timeout=self.timeout_s) as response:
+            doc: Dict[str, Any] = json.loads(response.read() or b"{}")
+        error_number = int(doc.get("ErrorNumber", 0) or 0)
+        if error_number:
+            raise MountError(f"Alpaca {name}: {doc.get('ErrorMessage') or error_number}")
+        return doc.get("Value")
+
+    def get(self, name: str) -> Any:
+        """Read a device property (e.g. 'rightascension')."""
+        query = urllib.parse.urlencode(
+            {"ClientID": self.client_id, "ClientTransactionID": next(_transaction_ids)}
+        )
+        url = f"{self.base_url}/{name.lower()}?{query}"
+        return self._call(urllib.request.Request(url, headers={"Accept": "application/json"}), name)
+
+    def put(self, name: str, **params: Any) -> Any:
+        """Write a device property or call a method (form-encoded parameters)."""
+        fields = {
+            key: (str(value) if not isinstance(value, bool) else ("True" if value else "False"))
+            for key, value in params.items()
+        }
+        fields.update(
+            {"ClientID": str(self.client_id), "ClientTransactionID": str(next(_transaction_ids))}
+        )
+        request = urllib.request.Request(
+            f"{self.base_url}/{name.lower()}",
+            data=urllib.parse.urlencode(fields).encode(),
+            method="PUT",
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        return self._call(request, name)
+
+
+class AlpacaMount:
+    """Alpaca telescope mount with the ASCOMMount interface."""
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        device_id: Optional[int] = None,
+        config=None,
+        logger=None,
+    ) -> None:
+        """Connect to the Alpaca telescope.
+
+        Args:
+            host: Alpaca server host (default: mount.alpaca.host)
+            port: Alpaca server port (default: mount.alpaca.port)
+            device_id: Telescope device number (default: mount.alpaca.device_id)
+            config: Optional ConfigManager instance
+            logger: Optional logger instance
+
+        Raises:
+            ConnectionError: If the device cannot be reached or connected.
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        mount_config: Dict[str, Any] = {}
+        if config is not None:
+            try:
+                mount_config = config.get_mount_config() or {}
+            except Exception:
+                mount_config = {}
+        alpaca_config = mount_config.get("alpaca", {}) or {}
+        self.host = host or alpaca_config.get("host", "localhost")
+        self.port = int(port if port is not None else alpaca_config.get("port", 11111))
+        self.device_id = int(
+            device_id if device_id is not None else alpaca_config.get("device_id", 0)
+        )
+        self.validate_coordinates = bool(mount_config.get("validate_coordinates", True))
+        self.telescope = AlpacaTelescopeClient(
+            self.host,
+            self.port,
+            self.device_id,
+            timeout_s=float(alpaca_config.get("timeout_s", 5.0)),
+        )
+        try:
+            if not self.telescope.get("connected"):
+                self.logger.info(
+                    f"Connecting to Alpaca mount at {self.host}:{self.port}, "
+                    f"device {self.device_id}"
+                )
+                self.telescope.put("connected", Connected=True)
+            if not self.telescope.get("connected"):
+                raise ConnectionError("Failed to connect to mount")
+        except ConnectionError:
+            raise
+        except Exception as e:
+            raise ConnectionError(f"Error connecting to Alpaca mount: {e}") from e
+
+    def _connected(self) -> bool:
+        try:
+            return bool(self.telescope.get("connected"))
+        except Exception:
+            return False
+
+    def get_coordinates(self) -> MountStatus:
+        """Get current mount coordinates (RA, Dec) in degrees."""
+        try:
+            ra_hours = float(self.telescope.get("rightascension"))
+            dec_deg = float(self.telescope.get("declination"))
+            if self.validate_coordinates:
+                if not (0 <= ra_hours <= 24):
+                    raise ValidationError(f"Invalid RA value: {ra_hours}")
+                if not (-90 <= dec_deg <= 90):
+                    raise ValidationError(f"Invalid Dec value: {dec_deg}")
+            ra_deg = ra_hours * 15.0
+            return success_status(
+                f"Coordinates retrieved: RA={ra_deg:.4f}°, Dec={dec_deg:.4f}°",
+                data=(ra_deg, dec_deg),
+                details={"is_connected": True, "ra_hours": ra_hours, "dec_deg": dec_deg},
+            )
+        except ValidationError as e:
+            return error_status(
+                f"Coordinate validation failed: {e}", details={"is_connected": True}
+            )
+        except Exception as e:
+            return error_status(f"Error reading coordinates: {e}", details={"is_connected": False})
+
+    def is_slewing(self) -> MountStatus:
+        """Check if the mount is currently slewing."""
+        try:
+            is_slewing = bool(self.telescope.get("slewing"))
+            return success_status(
+                f"Mount slewing status: {'Slewing' if is_slewing else 'Not slewing'}",
+                data=is_slewing,
+                details={"is_connected": True, "is_slewing": is_slewing},
+            )
+        except Exception as e:
+            self.logger.error(f"Error checking slewing status: {e}")
+            return error_status(
+                f"Error checking slewing status: {e}",
+                details={"is_connected": True, "is_slewing": None},
+            )
+
+    def is_tracking(self) -> MountStatus:
+        """Check if the mount is tracking."""
+        try:
+            tracking = bool(self.telescope.get("tracking"))
+            return success_status(
+                f"Mount tracking: {'On' if tracking else 'Off'}",
+                data=tracking,
+                details={"is_connected": True, "is_tracking": tracking},
+            )
+        except Exception as e:
+            return error_status(
+                f"Error checking tracking status: {e}",
+                details={"is_connected": True, "is_tracking": None},
+            )
+
+    def get_side_of_pier(self) -> Optional[int]:
+        """ASCOM PierSide value (0 east, 1 west, -1 unknown), None if unsupported."""
+        try:
+            value = self.telescope.get("sideofpier")
+            return None if value is None else int(value)
+        except Exception:
+            return None
+
+    def wait_for_slewing_complete(
+        self, timeout: float = 300.0, check_interval: float = 1.0
+    ) -> MountStatus:
+        """Poll until the mount stops slewing (see ASCOMMount.wait_for_slewing_complete)."""
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            slewing_status = self.is_slewing()
+            if not slewing_status.is_success:
+                return slewing_status
+            if not slewing_status.data:
+                elapsed_time = time.time() - start_time
+                return success_status(
+                    "Slewing completed",
+                    data=True,
+                    details={"is_connected": True, "is_slewing": False, "wait_time": elapsed_time},
+                )
+            time.sleep(check_interval)
+        elapsed_time = time.time() - start_time
+        self.logger.warning(f"Slewing timeout after {elapsed_time:.1f} seconds")
+        return warning_status(
+            f"Slewing timeout after {elapsed_time:.1f} seconds",
+            data=False,
+            details={
+                "is_connected": True,
+                "is_slewing": True,
+                "wait_time": elapsed_time,
+                "timeout": True,
+            },
+        )
+
+    def get_mount_status(self) -> MountStatus:
+        """Coordinates, slewing, tracking, park and pier side in one status."""
+        coord_status = self.get_coordinates()
+        if not coord_status.is_success:
+            return coord_status
+        slewing_status = self.is_slewing()
+        if not slewing_status.is_success:
+            return slewing_status
+        ra_deg, dec_deg = coord_status.data or (float("nan"), float("nan"))
+        mount_info: Dict[str, Any] = {
+            "is_connected": True,
+            "is_slewing": slewing_status.data,
+            "coordinates": coord_status.data,
+            "ra_deg": ra_deg,
+            "dec_deg": dec_deg,
+        }
+        for key, name in (("at_park", "atpark"), ("tracking", "tracking")):
+            try:
+                mount_info[key] = bool(self.telescope.get(name))
+            except Exception as e:
+                self.logger.debug(f"Could not get mount property {name}: {e}")
+        side_of_pier = self.get_side_of_pier()
+        if side_of_pier is not None:
+            mount_info["side_of_pier"] = side_of_pier
+        message = (
+            f"Mount status: RA={mount_info['ra_deg']:.4f}°, "
+            f"Dec={mount_info['dec_deg']:.4f}°, "
+            f"Slewing={'Yes' if mount_info['is_slewing'] else 'No'}"
+        )
+        return success_status(message, data=mount_info, details=mount_info)
+
+    def disconnect(self) -> MountStatus:
+        """Disconnect from the Alpaca telescope."""
+        try:
+            if self._connected():
+                self.telescope.put("connected", Connected=False)
+                self.logger.info("Disconnected from Alpaca mount.")
+                return success_status(
+                    "Successfully disconnected from mount", details={"is_connected": False}
+                )
+            return warning_status("Mount was not connected", details={"is_connected": False})
+        except Exception as e:
+            self.logger.warning(f"Error disconnecting: {e}")
+            return error_status(f"Error disconnecting: {e}", details={"is_connected": True})
+
+    def __enter__(self) -> "AlpacaMount":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.disconnect()
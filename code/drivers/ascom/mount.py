@@ -216,6 +216,37 @@ class ASCOMMount:
                 details={"is_connected": True, "is_slewing": None},
             )
 
+    def is_tracking(self) -> MountStatus:
+        """Check if the mount is tracking.
+
+        Returns:
+            MountStatus: Status object with the tracking state as data.
+        """
+        try:
+            if not self.telescope.Connected:
+                return error_status(
+                    "Mount not connected", details={"is_connected": False, "is_tracking": None}
+                )
+            tracking = bool(self.telescope.Tracking)
+            return success_status(
+                f"Mount tracking: {'On' if tracking else 'Off'}",
+                data=tracking,
+                details={"is_connected": True, "is_tracking": tracking},
+            )
+        except Exception as e:
+            return error_status(
+                f"Error checking tracking status: {e}",
+                details={"is_connected": True, "is_tracking": None},
+            )
+
+    def get_side_of_pier(self) -> Optional[int]:
+        """ASCOM PierSide value (0 east, 1 west, -1 unknown), None if unsupported."""
+        try:
+            value = self.telescope.SideOfPier
+            return None if value is None else int(value)
+        except Exception:
+            return None
+
     def wait_for_slewing_complete(
         self, timeout: float = 300.0, check_interval: float = 1.0
     ) -> MountStatus:
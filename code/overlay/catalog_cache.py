@@ -0,0 +1,634 @@
+#!/usr/bin/env python3
+"""
+Persistent sky-tiled catalog cache for overlay generation.
+
+The sky is split into declination bands of ``tile_size_deg``; each band is cut into
+RA tiles whose on-sky width is at most ``tile_size_deg``. Every tile is stored as a
+structured ``.npy`` array under the cache directory and loaded memory-mapped on
+demand, so cone searches around the current pointing are answered locally without
+a SIMBAD round-trip. Tiles are filled from SIMBAD results or from an offline
+catalog file, carry their fill time (age) and are evicted by LRU both in memory
+and on disk.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+TileKey = Tuple[int, int]
+
+# Normalized record layout shared by all tiles
+CATALOG_DTYPE = np.dtype(
+    [
+        ("ra", "f8"),
+        ("dec", "f8"),
+        ("V", "f4"),
+        ("otype", "U16"),
+        ("main_id", "U40"),
+        ("dim_maj", "f4"),
+        ("dim_min", "f4"),
+        ("dim_pa", "f4"),
+    ]
+)
+
+# Column names the overlay generator should use for dimensions of cached rows
+CACHE_DIMENSION_FIELDS = ("dim_maj", "dim_min", "dim_pa", None)
+
+_INDEX_VERSION = 1
+_INDEX_SAVE_INTERVAL_S = 60.0
+# Source prefix of tiles imported from an offline catalog file
+_FILE_SOURCE_PREFIX = "file:"
+
+
+def _angular_distance_deg(
+    ra1_deg: np.ndarray | float,
+    dec1_deg: np.ndarray | float,
+    ra2_deg: float,
+    dec2_deg: float,
+) -> np.ndarray:
+    """Vectorized great-circle distance (haversine) in degrees."""
+    ra1 = np.deg2rad(ra1_deg)
+    dec1 = np.deg2rad(dec1_deg)
+    ra2 = math.radians(ra2_deg)
+    dec2 = math.radians(dec2_deg)
+    sin_ddec = np.sin((dec1 - dec2) * 0.5)
+    sin_dra = np.sin((ra1 - ra2) * 0.5)
+    a = sin_ddec**2 + np.cos(dec1) * math.cos(dec2) * sin_dra**2
+    dist: np.ndarray = np.rad2deg(2.0 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0))))
+    return dist
+
+
+def _to_float_array(values: Any, n: int) -> np.ndarray:
+    """Convert a catalog column (masked, '--', None, strings) to float64 with NaN."""
+    try:
+        filled = np.ma.filled(np.ma.asarray(values, dtype=np.float64), np.nan)
+        return np.asarray(filled, dtype=np.float64).reshape(n)
+    except (TypeError, ValueError):
+        out = np.full(n, np.nan, dtype=np.float64)
+        for i, value in enumerate(values):
+            if value is None or value is np.ma.masked:
+                continue
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                continue
+        return out
+
+
+def _to_str_list(values: Any) -> List[str]:
+    out: List[str] = []
+    for value in values:
+        if value is None or value is np.ma.masked:
+            out.append("")
+        elif isinstance(value, bytes):
+            out.append(value.decode("utf-8", errors="ignore"))
+        else:
+            out.append(str(value))
+    return out
+
+
+def records_from_table(
+    table: Any,
+    picked_maj: Optional[str] = None,
+    picked_min: Optional[str] = None,
+    picked_ang: Optional[str] = None,
+) -> np.ndarray:
+    """Normalize a SIMBAD result (or any astropy-like table) into ``CATALOG_DTYPE``.
+
+    Args:
+        table: astropy Table or an iterable of rows exposing ``colnames``
+        picked_maj: Column holding the major axis (arcmin), if any
+        picked_min: Column holding the minor axis (arcmin), if any
+        picked_ang: Column holding the position angle (deg), if any
+
+    Returns:
+        np.ndarray: Structured array; rows without usable coordinates are dropped
+    """
+    rows = list(table) if table is not None else []
+    n = len(rows)
+    if n == 0:
+        return np.zeros(0, dtype=CATALOG_DTYPE)
+
+    colnames = list(getattr(table, "colnames", None) or rows[0].colnames)
+
+    def column(name: Optional[str]) -> Optional[Any]:
+        if not name or name not in colnames:
+            return None
+        try:
+            if hasattr(table, "columns"):
+                return table[name]
+        except Exception:
+            pass
+        return [row[name] for row in rows]
+
+    def first(names: Sequence[str]) -> Optional[str]:
+        return next((c for c in names if c in colnames), None)
+
+    ra_vals = column(first(["RA", "ra", "RA_d", "ra_d"]))
+    dec_vals = column(first(["DEC", "dec", "DEC_d", "dec_d"]))
+    if ra_vals is None or dec_vals is None:
+        return np.zeros(0, dtype=CATALOG_DTYPE)
+
+    ra = _to_float_array(ra_vals, n)
+    dec = _to_float_array(dec_vals, n)
+    if np.isnan(ra).all():
+        # Sexagesimal string columns (older astroquery releases)
+        try:
+            from astropy.coordinates import SkyCoord
+
+            coords = SkyCoord(ra=ra_vals, dec=dec_vals, unit="deg")
+            ra = np.asarray(coords.ra.degree, dtype=np.float64)
+            dec = np.asarray(coords.dec.degree, dtype=np.float64)
+        except Exception:
+            return np.zeros(0, dtype=CATALOG_DTYPE)
+
+    out = np.zeros(n, dtype=CATALOG_DTYPE)
+    out["ra"] = np.mod(ra, 360.0)
+    out["dec"] = dec
+    v_vals = column("V")
+    out["V"] = _to_float_array(v_vals, n) if v_vals is not None else np.nan
+    otype_vals = column("otype")
+    if otype_vals is not None:
+        out["otype"] = _to_str_list(otype_vals)
+    id_vals = column(first(["MAIN_ID", "main_id", "MAINID", "mainid"]))
+    if id_vals is not None:
+        out["main_id"] = _to_str_list(id_vals)
+
+    for field, name in (("dim_maj", picked_maj), ("dim_min", picked_min), ("dim_pa", picked_ang)):
+        vals = column(name)
+        out[field] = _to_float_array(vals, n) if vals is not None else np.nan
+
+    # Legacy combined 'dimensions' string ("MAJ x MIN")
+    dims_vals = column("dimensions")
+    if dims_vals is not None:
+        for i, dims in enumerate(_to_str_list(dims_vals)):
+            if not dims.strip() or dims == "--":
+                continue
+            try:
+                parts = [float(p.strip()) for p in dims.split("x")]
+            except ValueError:
+                continue
+            if np.isnan(out["dim_maj"][i]):
+                out["dim_maj"][i] = parts[0]
+            if np.isnan(out["dim_min"][i]):
+                out["dim_min"][i] = parts[1] if len(parts) > 1 else parts[0]
+
+    valid: np.ndarray = out[np.isfinite(out["ra"]) & np.isfinite(out["dec"])]
+    return valid
+
+
+def records_to_table(records: np.ndarray):
+    """Convert cached records into an astropy Table the overlay generator can iterate.
+
+    Missing magnitudes and dimensions are returned as masked values.
+    """
+    from astropy.table import MaskedColumn, Table
+
+    table = Table()
+    table["ra"] = np.asarray(records["ra"], dtype=np.float64)
+    table["dec"] = np.asarray(records["dec"], dtype=np.float64)
+    for name in ("V", "dim_maj", "dim_min", "dim_pa"):
+        values = np.asarray(records[name], dtype=np.float64)
+        table[name] = MaskedColumn(values, mask=~np.isfinite(values))
+    table["otype"] = np.asarray(records["otype"])
+    table["main_id"] = np.asarray(records["main_id"])
+    return table
+
+
+class CatalogTileCache:
+    """Sky-tiled, disk-backed catalog store answering cone searches locally."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        tile_size_deg: float = 2.0,
+        max_age_s: Optional[float] = None,
+        max_tiles_in_memory: int = 64,
+        max_tiles_on_disk: Optional[int] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.tiles_dir = self.cache_dir / "tiles"
+        self.index_path = self.cache_dir / "index.json"
+        self.tile_size_deg = float(tile_size_deg)
+        if not (0.0 < self.tile_size_deg <= 90.0):
+            raise ValueError(f"tile_size_deg must be in (0, 90], not {tile_size_deg}")
+        self.max_age_s = float(max_age_s) if max_age_s else None
+        self.max_tiles_in_memory = max(1, int(max_tiles_in_memory))
+        self.max_tiles_on_disk = int(max_tiles_on_disk) if max_tiles_on_disk else None
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._n_bands = int(math.ceil(180.0 / self.tile_size_deg))
+        self._band_height = 180.0 / self._n_bands
+        self._ra_counts = np.array(
+            [self._ra_count_for_band(i) for i in range(self._n_bands)], dtype=np.int64
+        )
+
+        self._lock = threading.RLock()
+        self._loaded: "OrderedDict[TileKey, np.ndarray]" = OrderedDict()
+        self._tiles: Dict[str, Dict[str, Any]] = {}
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._index_dirty = False
+        self._index_saved_at = 0.0
+        self._load_index()
+
+    # ------------------------------------------------------------------ geometry
+    def _ra_count_for_band(self, band: int) -> int:
+        dec_lo = -90.0 + band * self._band_height
+        dec_hi = dec_lo + self._band_height
+        # Widest edge of the band (closest to the equator) sets the RA subdivision
+        widest = 0.0 if dec_lo <= 0.0 <= dec_hi else min(abs(dec_lo), abs(dec_hi))
+        circumference = 360.0 * math.cos(math.radians(widest))
+        return max(1, int(math.ceil(circumference / self.tile_size_deg - 1e-9)))
+
+    def _band_of(self, dec_deg: float) -> int:
+        return int(min(self._n_bands - 1, max(0, math.floor((dec_deg + 90.0) / self._band_height))))
+
+    def tile_bounds(self, tile: TileKey) -> Tuple[float, float, float, float]:
+        """Return (ra_min, ra_max, dec_min, dec_max) of a tile in degrees."""
+        band, ra_idx = tile
+        width = 360.0 / float(self._ra_counts[band])
+        dec_lo = -90.0 + band * self._band_height
+        return ra_idx * width, (ra_idx + 1) * width, dec_lo, dec_lo + self._band_height
+
+    def tile_of(self, ra_deg: np.ndarray, dec_deg: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized tile lookup: returns (band, ra_index) arrays."""
+        ra = np.mod(np.asarray(ra_deg, dtype=np.float64), 360.0)
+        dec = np.asarray(dec_deg, dtype=np.float64)
+        bands = np.clip(
+            np.floor((dec + 90.0) / self._band_height).astype(np.int64), 0, self._n_bands - 1
+        )
+        counts = self._ra_counts[bands]
+        ra_idx = np.minimum(np.floor(ra / (360.0 / counts)).astype(np.int64), counts - 1)
+        return bands, ra_idx
+
+    def tiles_for_cone(self, ra_deg: float, dec_deg: float, radius_deg: float) -> List[TileKey]:
+        """Return all tiles overlapping the cone's RA/Dec bounding box."""
+        ra_deg = float(ra_deg) % 360.0
+        radius_deg = max(0.0, float(radius_deg))
+        dec_min = max(-90.0, dec_deg - radius_deg)
+        dec_max = min(90.0, dec_deg + radius_deg)
+        contains_pole = dec_deg + radius_deg >= 90.0 or dec_deg - radius_deg <= -90.0
+
+        tiles: List[TileKey] = []
+        for band in range(self._band_of(dec_min), self._band_of(dec_max) + 1):
+            count = int(self._ra_counts[band])
+            width = 360.0 / count
+            _, _, band_lo, band_hi = self.tile_bounds((band, 0))
+            max_abs_dec = max(abs(max(band_lo, dec_min)), abs(min(band_hi, dec_max)))
+            cos_dec = math.cos(math.radians(max_abs_dec))
+            if contains_pole or cos_dec < 1e-9 or radius_deg / cos_dec >= 180.0:
+                tiles.extend((band, j) for j in range(count))
+                continue
+            half_width = radius_deg / cos_dec
+            first = int(math.floor((ra_deg - half_width) / width))
+            last = int(math.floor((ra_deg + half_width) / width))
+            if last - first + 1 >= count:
+                tiles.extend((band, j) for j in range(count))
+            else:
+                tiles.extend((band, j % count) for j in range(first, last + 1))
+        return tiles
+
+    def covering_radius(self, ra_deg: float, dec_deg: float, tiles: Iterable[TileKey]) -> float:
+        """Smallest cone radius (deg) around (ra, dec) that fully contains all tiles."""
+        ras: List[float] = []
+        decs: List[float] = []
+        for tile in tiles:
+            ra0, ra1, dec0, dec1 = self.tile_bounds(tile)
+            for fr in (0.0, 0.25, 0.5, 0.75, 1.0):
+                for fd in (0.0, 0.5, 1.0):
+                    ras.append(ra0 + fr * (ra1 - ra0))
+                    decs.append(dec0 + fd * (dec1 - dec0))
+        if not ras:
+            return 0.0
+        dist = _angular_distance_deg(np.array(ras), np.array(decs), ra_deg, dec_deg)
+        # Small margin for edge curvature between the sampled boundary points
+        return float(min(180.0, dist.max() + 0.05 * self.tile_size_deg))
+
+    @staticmethod
+    def _key_str(tile: TileKey) -> str:
+        return f"d{tile[0]:03d}_r{tile[1]:04d}"
+
+    def _tile_path(self, tile: TileKey) -> Path:
+        return self.tiles_dir / f"{self._key_str(tile)}.npy"
+
+    # ------------------------------------------------------------------ index
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as fh:
+                index = json.load(fh)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self.logger.warning(f"Catalog cache index unreadable, starting empty: {e}")
+            return
+        if (
+            index.get("version") != _INDEX_VERSION
+            or abs(float(index.get("tile_size_deg", 0.0)) - self.tile_size_deg) > 1e-9
+        ):
+            self.logger.info("Catalog cache layout changed; discarding existing tiles")
+            self.clear()
+            return
+        self._tiles = dict(index.get("tiles", {}))
+        self._sources = dict(index.get("sources", {}))
+
+    def save_index(self) -> None:
+        """Persist the tile index (fill times, last access, sources) atomically."""
+        with self._lock:
+            payload = {
+                "version": _INDEX_VERSION,
+                "tile_size_deg": self.tile_size_deg,
+                "tiles": self._tiles,
+                "sources": self._sources,
+            }
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".json", dir=str(self.cache_dir))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(payload, fh)
+                os.replace(tmp_path, self.index_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+            self._index_dirty = False
+            self._index_saved_at = time.time()
+
+    def _maybe_save_index(self) -> None:
+        if self._index_dirty and time.time() - self._index_saved_at >= _INDEX_SAVE_INTERVAL_S:
+            try:
+                self.save_index()
+            except Exception as e:
+                self.logger.debug(f"Catalog cache index save skipped: {e}")
+
+    def clear(self) -> None:
+        """Remove all cached tiles and the index."""
+        with self._lock:
+            self._loaded.clear()
+            self._tiles = {}
+            self._sources = {}
+            if self.tiles_dir.exists():
+                for path in self.tiles_dir.glob("*.npy"):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+            try:
+                self.index_path.unlink()
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------ status
+    def has_tile(self, tile: TileKey) -> bool:
+        return self._key_str(tile) in self._tiles
+
+    def tile_age_s(self, tile: TileKey, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the tile was filled, or None if it is not cached."""
+        info = self._tiles.get(self._key_str(tile))
+        if info is None:
+            return None
+        return max(0.0, (now if now is not None else time.time()) - float(info["filled_at"]))
+
+    def is_stale(self, tile: TileKey, now: Optional[float] = None) -> bool:
+        if self.max_age_s is None:
+            return False
+        age = self.tile_age_s(tile, now)
+        return age is not None and age > self.max_age_s
+
+    def missing_tiles(
+        self, ra_deg: float, dec_deg: float, radius_deg: float, include_stale: bool = True
+    ) -> List[TileKey]:
+        """Tiles needed for the cone that are absent (or stale, if requested)."""
+        now = time.time()
+        with self._lock:
+            return [
+                tile
+                for tile in self.tiles_for_cone(ra_deg, dec_deg, radius_deg)
+                if not self.has_tile(tile) or (include_stale and self.is_stale(tile, now))
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tiles_on_disk": len(self._tiles),
+                "tiles_in_memory": len(self._loaded),
+                "rows_on_disk": int(sum(int(t.get("rows", 0)) for t in self._tiles.values())),
+                "sources": sorted(self._sources),
+            }
+
+    # ------------------------------------------------------------------ storage
+    def _load_tile(self, tile: TileKey) -> np.ndarray:
+        arr = self._loaded.get(tile)
+        if arr is not None:
+            self._loaded.move_to_end(tile)
+        else:
+            info = self._tiles[self._key_str(tile)]
+            if int(info.get("rows", 0)) == 0:
+                arr = np.zeros(0, dtype=CATALOG_DTYPE)
+            else:
+                arr = np.load(self._tile_path(tile), mmap_mode="r", allow_pickle=False)
+            self._loaded[tile] = arr
+            while len(self._loaded) > self.max_tiles_in_memory:
+                self._loaded.popitem(last=False)
+        self._tiles[self._key_str(tile)]["last_access"] = time.time()
+        self._index_dirty = True
+        return arr
+
+    def store_records(
+        self, records: np.ndarray, tiles: Iterable[TileKey], source: str = "simbad"
+    ) -> int:
+        """Store normalized records into the given (fully covered) tiles.
+
+        Records outside ``tiles`` are ignored; tiles without records are stored as
+        empty so that they count as covered.
+
+        Returns:
+            int: Number of tiles written
+        """
+        tiles = list(dict.fromkeys(tiles))
+        if not tiles:
+            return 0
+        records = np.asarray(records, dtype=CATALOG_DTYPE)
+        # Group rows by tile with one sort instead of one mask per tile
+        bands, ra_idx = self.tile_of(records["ra"], records["dec"])
+        codes = bands * int(self._ra_counts.max()) + ra_idx
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        now = time.time()
+        with self._lock:
+            self.tiles_dir.mkdir(parents=True, exist_ok=True)
+            for tile in tiles:
+                code = tile[0] * int(self._ra_counts.max()) + tile[1]
+                lo = np.searchsorted(sorted_codes, code, side="left")
+                hi = np.searchsorted(sorted_codes, code, side="right")
+                rows = records[order[lo:hi]]
+                path = self._tile_path(tile)
+                self._loaded.pop(tile, None)
+                if len(rows):
+                    fd, tmp_path = tempfile.mkstemp(suffix=".npy", dir=str(self.tiles_dir))
+                    os.close(fd)
+                    try:
+                        np.save(tmp_path, rows, allow_pickle=False)
+                        os.replace(tmp_path, path)
+                    finally:
+                        if os.path.exists(tmp_path):
+                            os.unlink(tmp_path)
+                elif path.exists():
+                    path.unlink()
+                key = self._key_str(tile)
+                info = {
+                    "filled_at": now,
+                    "last_access": now,
+                    "rows": int(len(rows)),
+                    "source": source,
+                }
+                # Remember which offline catalog a tile came from even after a refresh
+                if source.startswith(_FILE_SOURCE_PREFIX):
+                    info["catalog"] = source
+                elif "catalog" in self._tiles.get(key, {}):
+                    info["catalog"] = self._tiles[key]["catalog"]
+                self._tiles[key] = info
+            self._evict_disk_lru()
+            self.save_index()
+        return len(tiles)
+
+    def _evict_disk_lru(self) -> None:
+        """Drop the least recently used tiles beyond ``max_tiles_on_disk``.
+
+        Tiles imported from an offline catalog do not count against the limit and are
+        never evicted; the catalog covers the whole sky and is only imported once.
+        """
+        if self.max_tiles_on_disk is None:
+            return
+        evictable = [
+            (key, info)
+            for key, info in self._tiles.items()
+            if not str(info.get("source", "")).startswith(_FILE_SOURCE_PREFIX)
+        ]
+        excess = len(evictable) - self.max_tiles_on_disk
+        if excess <= 0:
+            return
+        evictable.sort(key=lambda kv: float(kv[1].get("last_access", 0.0)))
+        for key, info in evictable[:excess]:
+            band, ra_idx = int(key[1:4]), int(key[6:])
+            self._loaded.pop((band, ra_idx), None)
+            try:
+                self._tile_path((band, ra_idx)).unlink()
+            except OSError:
+                pass
+            del self._tiles[key]
+            # The offline catalog no longer covers the sky; import it again next time
+            catalog = info.get("catalog")
+            if catalog:
+                self._sources.pop(catalog, None)
+
+    def fill_from_table(
+        self,
+        table: Any,
+        tiles: Iterable[TileKey],
+        picked_maj: Optional[str] = None,
+        picked_min: Optional[str] = None,
+        picked_ang: Optional[str] = None,
+        source: str = "simbad",
+    ) -> int:
+        """Normalize a SIMBAD result and store it into the tiles its query covered."""
+        records = records_from_table(table, picked_maj, picked_min, picked_ang)
+        return self.store_records(records, tiles, source=source)
+
+    def import_catalog(self, path: str | Path, format: Optional[str] = None) -> int:
+        """Import an offline catalog file (any format astropy Table can read).
+
+        The catalog is treated as full-sky: every tile is marked as covered. Imported
+        tiles are kept outside the ``max_tiles_on_disk`` limit. Re-importing an
+        unchanged file is a no-op.
+
+        Returns:
+            int: Number of rows imported (0 if already up to date)
+        """
+        from astropy.table import Table
+
+        path = Path(path)
+        mtime = path.stat().st_mtime
+        source = f"{_FILE_SOURCE_PREFIX}{path.name}"
+        with self._lock:
+            known = self._sources.get(source)
+            if known and float(known.get("mtime", -1.0)) == mtime:
+                return 0
+        table = Table.read(str(path), format=format) if format else Table.read(str(path))
+        maj = next((c for c in ("dim_maj", "dim_majaxis", "majdiam") if c in table.colnames), None)
+        mnr = next((c for c in ("dim_min", "dim_minaxis", "mindiam") if c in table.colnames), None)
+        ang = next((c for c in ("dim_pa", "dim_angle", "pa") if c in table.colnames), None)
+        records = records_from_table(table, maj, mnr, ang)
+        all_tiles = [(b, j) for b in range(self._n_bands) for j in range(int(self._ra_counts[b]))]
+        self.store_records(records, all_tiles, source=source)
+        with self._lock:
+            self._sources[source] = {"mtime": mtime, "rows": int(len(records))}
+            self.save_index()
+        self.logger.info(f"Imported {len(records)} catalog rows from {path}")
+        return int(len(records))
+
+    # ------------------------------------------------------------------ queries
+    def cone_search(
+        self, ra_deg: float, dec_deg: float, radius_deg: float, allow_partial: bool = False
+    ) -> Optional[np.ndarray]:
+        """Return cached records within ``radius_deg`` of (ra, dec).
+
+        Returns None when any needed tile is missing, unless ``allow_partial`` is set.
+        Stale tiles are still used; callers refresh them via ``missing_tiles``.
+        """
+        with self._lock:
+            tiles = self.tiles_for_cone(ra_deg, dec_deg, radius_deg)
+            chunks = []
+            for tile in tiles:
+                if not self.has_tile(tile):
+                    if allow_partial:
+                        continue
+                    return None
+                arr = self._load_tile(tile)
+                if len(arr):
+                    chunks.append(arr)
+            self._maybe_save_index()
+        if not chunks:
+            return np.zeros(0, dtype=CATALOG_DTYPE)
+        records = np.concatenate(chunks)
+        dist = _angular_distance_deg(records["ra"], records["dec"], ra_deg, dec_deg)
+        return records[dist <= radius_deg]
+
+
+def create_catalog_cache(config, logger=None) -> Optional[CatalogTileCache]:
+    """Build a CatalogTileCache from ``overlay.catalog_cache`` config, or None if disabled."""
+    try:
+        cache_cfg = config.get_overlay_config().get("catalog_cache", {}) or {}
+    except Exception:
+        return None
+    if not bool(cache_cfg.get("enabled", False)):
+        return None
+
+    max_age_days = cache_cfg.get("max_age_days", 30)
+    cache = CatalogTileCache(
+        cache_cfg.get("cache_dir", os.path.join("cache", "catalog_tiles")),
+        tile_size_deg=float(cache_cfg.get("tile_size_deg", 2.0)),
+        max_age_s=float(max_age_days) * 86400.0 if max_age_days else None,
+        max_tiles_in_memory=int(cache_cfg.get("max_tiles_in_memory", 64)),
+        max_tiles_on_disk=cache_cfg.get("max_tiles_on_disk"),
+        logger=logger,
+    )
+    offline_catalog = cache_cfg.get("offline_catalog")
+    if offline_catalog:
+        try:
+            cache.import_catalog(offline_catalog, cache_cfg.get("offline_catalog_format"))
+        except Exception as e:
+            (logger or logging.getLogger(__name__)).warning(
+                f"Could not import offline catalog {offline_catalog}: {e}"
+            )
+    return cache
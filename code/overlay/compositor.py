@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+In-memory overlay compositing.
+
+The overlay is mostly transparent: a title, an info panel and the object
+markers cover a small part of the frame. prepare_overlay() converts an RGBA
+overlay once into premultiplied color and inverse alpha for the tiles that
+contain visible pixels; OverlayCompositor.composite() then blends it onto the
+uint8 display frame inside those tiles only, writing into an output buffer
+that is reused between frames:
+
+    out = premultiplied_rgb + base * (255 - alpha) / 255
+
+Display frames follow the OpenCV convention (BGR, or single-channel for mono
+cameras); the overlay's channels are swapped during preparation, so frames
+are blended and encoded (cv2.imencode) without any per-frame conversion.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# (x0, y0, x1, y1), exclusive end
+Box = Tuple[int, int, int, int]
+
+_INTERPOLATION = {
+    "nearest": cv2.INTER_NEAREST,
+    "bilinear": cv2.INTER_LINEAR,
+    "bicubic": cv2.INTER_CUBIC,
+    "lanczos": cv2.INTER_LANCZOS4,
+}
+
+
+@dataclass
+class PreparedOverlay:
+    """Overlay converted for blending: per box premultiplied color and inverse alpha."""
+
+    size: Tuple[int, int]  # (width, height)
+    boxes: List[Box] = field(default_factory=list)
+    # uint16 arrays (h, w, 3) and (h, w, 1) per box
+    premultiplied: List[np.ndarray] = field(default_factory=list)
+    inverse_alpha: List[np.ndarray] = field(default_factory=list)
+    bgr: bool = True
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of the frame covered by the blended boxes."""
+        width, height = self.size
+        area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in self.boxes)
+        return area / float(max(1, width * height))
+
+
+def opaque_boxes(alpha: np.ndarray, tile: int = 32) -> List[Box]:
+    """Boxes covering all pixels with alpha > 0, built from tile x tile cells.
+
+    Runs of occupied tiles in a tile row form a box; boxes with the same
+    horizontal extent in consecutive tile rows are merged.
+    """
+    height, width = alpha.shape[:2]
+    if height == 0 or width == 0:
+        return []
+    tile = max(1, int(tile))
+    visible = alpha > 0
+    occupied = np.logical_or.reduceat(
+        np.logical_or.reduceat(visible, np.arange(0, height, tile), axis=0),
+        np.arange(0, width, tile),
+        axis=1,
+    )
+    boxes: List[Box] = []
+    open_boxes: Dict[Tuple[int, int], int] = {}  # (x0, x1) -> index in boxes
+    for row in range(occupied.shape[0]):
+        y0, y1 = row * tile, min((row + 1) * tile, height)
+        cells = np.flatnonzero(np.diff(np.concatenate(([0], occupied[row].view(np.int8), [0]))))
+        current: Dict[Tuple[int, int], int] = {}
+        for start, stop in zip(cells[::2], cells[1::2], strict=True):
+            x0, x1 = int(start) * tile, min(int(stop) * tile, width)
+            index = open_boxes.get((x0, x1))
+            if index is not None:
+                bx0, by0, bx1, _ = boxes[index]
+                boxes[index] = (bx0, by0, bx1, y1)
+            else:
+                index = len(boxes)
+                boxes.append((x0, y0, x1, y1))
+            current[(x0, x1)] = index
+        open_boxes = current
+    return boxes
+
+
+def _as_rgba_image(overlay: Any) -> Image.Image:
+    if isinstance(overlay, Image.Image):
+        return overlay if overlay.mode == "RGBA" else overlay.convert("RGBA")
+    array = np.asarray(overlay)
+    if array.ndim != 3 or array.shape[2] != 4:
+        raise ValueError(f"Overlay must be RGBA, got shape {array.shape}")
+    return Image.fromarray(array.astype(np.uint8, copy=False), "RGBA")
+
+
+def prepare_overlay(
+    overlay: Any,
+    size: Optional[Tuple[int, int]] = None,
+    bgr: bool = True,
+    tile: int = 32,
+) -> PreparedOverlay:
+    """Prepare an RGBA overlay (PIL image or (h, w, 4) array) for composite().
+
+    Args:
+        overlay: RGBA overlay
+        size: Frame size (width, height); the overlay is resized (LANCZOS) to it
+        bgr: Channel order of the frames it will be blended onto
+        tile: Tile size for the visible-area boxes
+    """
+    image = _as_rgba_image(overlay)
+    if size is not None and image.size != tuple(size):
+        image = image.resize((int(size[0]), int(size[1])), Image.Resampling.LANCZOS)
+    rgba = np.asarray(image)
+    prepared = PreparedOverlay(size=image.size, bgr=bgr)
+    channels = [2, 1, 0] if bgr else [0, 1, 2]
+    for box in opaque_boxes(rgba[..., 3], tile):
+        x0, y0, x1, y1 = box
+        region = rgba[y0:y1, x0:x1]
+        alpha = region[..., 3:4].astype(np.uint16)
+        color = region[..., channels].astype(np.uint16)
+        prepared.boxes.append(box)
+        prepared.premultiplied.append((color * alpha + 127) // 255)
+        prepared.inverse_alpha.append(255 - alpha)
+    return prepared
+
+
+class OverlayCompositor:
+    """Blend prepared overlays onto display frames into a reused buffer."""
+
+    def __init__(self, tile: int = 32) -> None:
+        self.tile = int(tile)
+        self._out: Optional[np.ndarray] = None
+        # Last prepared overlay and the source/size/order it was prepared for
+        self._prepared: Optional[PreparedOverlay] = None
+        self._prepared_key: Optional[Tuple[Any, Tuple[int, int], bool]] = None
+
+    @property
+    def buffer(self) -> Optional[np.ndarray]:
+        """Output buffer of the last composite() (overwritten by the next call)."""
+        return self._out
+
+    def prepare(self, overlay: Any, size: Tuple[int, int], bgr: bool = True) -> PreparedOverlay:
+        """Prepared version of overlay; reused while the same overlay object is passed."""
+        if isinstance(overlay, PreparedOverlay):
+            if overlay.size != tuple(size) or overlay.bgr != bgr:
+                raise ValueError(f"Prepared overlay is {overlay.size}, frame is {tuple(size)}")
+            return overlay
+        key = (overlay, (int(size[0]), int(size[1])), bool(bgr))
+        prepared = self._prepared
+        if (
+            prepared is None
+            or self._prepared_key is None
+            or self._prepared_key[0] is not overlay
+            or self._prepared_key[1:] != key[1:]
+        ):
+            prepared = prepare_overlay(overlay, size=size, bgr=bgr, tile=self.tile)
+            self._prepared, self._prepared_key = prepared, key
+        return prepared
+
+    def composite(self, base: np.ndarray, overlay: Any, bgr: bool = True) -> np.ndarray:
+        """Blend overlay onto a uint8 frame (h, w), (h, w, 3) or (h, w, 4).
+
+        Returns:
+            (h, w, 3) uint8 image; the buffer is reused by the next call
+        """
+        if base.dtype != np.uint8:
+            raise ValueError(f"Display frame must be uint8, got {base.dtype}")
+        height, width = base.shape[:2]
+        prepared = self.prepare(overlay, (width, height), bgr=bgr)
+        out = self._out
+        if out is None or out.shape != (height, width, 3):
+            out = self._out = np.empty((height, width, 3), dtype=np.uint8)
+        if base.ndim == 2:
+            np.copyto(out, base[..., None])
+        else:
+            np.copyto(out, base[..., :3])
+        for (x0, y0, x1, y1), premultiplied, inverse_alpha in zip(
+            prepared.boxes, prepared.premultiplied, prepared.inverse_alpha, strict=True
+        ):
+            region = out[y0:y1, x0:x1]
+            blended = region * inverse_alpha
+            blended += 127
+            blended //= 255
+            blended += premultiplied
+            region[...] = blended
+        return out
+
+
+def fit_to_resolution(
+    image: np.ndarray,
+    resolution: Sequence[int],
+    mode: str = "letterbox",
+    resample: str = "lanczos",
+    background: Sequence[int] = (0, 0, 0),
+    bgr: bool = True,
+) -> np.ndarray:
+    """Resize to (width, height) by letterbox (pad), crop (cover) or stretch.
+
+    background is an RGB color, used by letterbox.
+    """
+    target_w, target_h = int(resolution[0]), int(resolution[1])
+    src_h, src_w = image.shape[:2]
+    if target_w <= 0 or target_h <= 0 or (src_w, src_h) == (target_w, target_h):
+        return image
+    interpolation = _INTERPOLATION.get(str(resample).lower(), cv2.INTER_LANCZOS4)
+    mode = str(mode).lower()
+    if mode == "stretch":
+        resized: np.ndarray = cv2.resize(image, (target_w, target_h), interpolation=interpolation)
+        return resized
+    if mode == "crop":
+        scale = max(target_w / src_w, target_h / src_h)
+    else:
+        scale = min(target_w / src_w, target_h / src_h)
+    new_w = max(1, int(round(src_w * scale)))
+    new_h = max(1, int(round(src_h * scale)))
+    scaled = cv2.resize(image, (new_w, new_h), interpolation=interpolation)
+    if mode == "crop":
+        left = max(0, (new_w - target_w) // 2)
+        top = max(0, (new_h - target_h) // 2)
+        cropped: np.ndarray = scaled[top : top + target_h, left : left + target_w]
+        return cropped
+    color = [int(c) for c in background][:3]
+    if image.ndim == 2:
+        fill: Any = color[0]
+    else:
+        fill = color[::-1] if bgr else color
+    canvas = np.empty((target_h, target_w) + image.shape[2:], dtype=image.dtype)
+    canvas[...] = fill
+    off_x = (target_w - new_w) // 2
+    off_y = (target_h - new_h) // 2
+    canvas[off_y : off_y + new_h, off_x : off_x + new_w] = scaled
+    return canvas
+
+
+def encode_image(image: np.ndarray, extension: str = ".png", quality: int = 95) -> bytes:
+    """Encode a BGR (or mono) uint8 image once; the format follows the extension."""
+    ext = extension.lower() if extension.startswith(".") else f".{extension.lower()}"
+    params: List[int] = []
+    if ext in (".jpg", ".jpeg"):
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+    ok, buffer = cv2.imencode(ext, image, params)
+    if not ok:
+        raise ValueError(f"Encoding {ext} failed")
+    return bytes(buffer.tobytes())
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write data to path via a temporary file, so readers never see partial files."""
+    out_dir = os.path.dirname(path) or "."
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(path)[1], dir=out_dir)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
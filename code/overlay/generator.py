@@ -4,11 +4,17 @@ import logging
 import os
 import platform
 import tempfile
-from typing import Optional, Tuple
+from typing import Optional, Tuple, cast
 
 # astroquery is optional; we import Simbad lazily in generate_overlay()
 from astropy.coordinates import SkyCoord
 import astropy.units as u
+import numpy as np
+from overlay.catalog_cache import (
+    CACHE_DIMENSION_FIELDS,
+    create_catalog_cache,
+    records_to_table,
+)
 from overlay.drawing import (
     compute_ellipse_label_pose,
     draw_ellipse_for_object,
@@ -18,9 +24,16 @@ from overlay.drawing import (
     draw_title,
 )
 from overlay.info import cooling_info, format_coordinates, fov_info, telescope_info
+from overlay.layers import OverlayLayerCache, SkyLayerKey
+from overlay.projection import (
+    build_projection_wcs,
+    radec_to_pixel_arrays,
+    radec_to_pixel_arrays_wcs,
+)
 from overlay.projection import skycoord_to_pixel_with_rotation as project_skycoord
 from overlay.simbad_fields import discover_simbad_dimension_fields
 from PIL import Image, ImageDraw, ImageFont
+from services.ephemeris import ephemeris_name, ephemeris_service_for_site
 
 
 class OverlayGenerator:
@@ -51,6 +64,12 @@ class OverlayGenerator:
         self.image_size = tuple(self.overlay_config.get("image_size", [800, 800]))
         self.max_name_length = self.overlay_config.get("max_name_length", 15)
         self.default_filename = self.overlay_config.get("default_filename", "overlay.png")
+        # Catalog objects drawn by the last render_overlay()
+        self.last_objects_drawn = 0
+        # Title, info panel and sky annotations are cached as separate layers
+        self.layers: OverlayLayerCache = OverlayLayerCache.from_config(self.overlay_config)
+        # Set by the sky layer render when the SIMBAD query failed or found nothing
+        self._sky_catalog_failed = False
 
         # Display settings
         self.object_color = tuple(self.display_config.get("object_color", [255, 0, 0]))
@@ -108,6 +127,12 @@ class OverlayGenerator:
         # Solar system overlay settings
         self.solar_system_config = self.overlay_config.get("solar_system", {})
 
+        # Local catalog tile cache (created lazily; see overlay.catalog_cache)
+        self.catalog_cache_config = self.overlay_config.get("catalog_cache", {}) or {}
+        self.catalog_offline_only = bool(self.catalog_cache_config.get("offline_only", False))
+        self._catalog_cache = None
+        self._catalog_cache_failed = False
+
     def get_font(self):
         """Loads an available font for the current system."""
         font_size = self.overlay_config.get("font_size", 14)
@@ -167,14 +192,7 @@ class OverlayGenerator:
             )
 
         # WCS branch: derive pixel scale (arcsec/pixel) from FOV and image size
-        width_px, height_px = size_px
-        try:
-            scale_x_arcsec = float(fov_width_deg) * 3600.0 / float(width_px)
-            scale_y_arcsec = float(fov_height_deg) * 3600.0 / float(height_px)
-            pixel_scale_arcsec = (scale_x_arcsec + scale_y_arcsec) * 0.5
-        except Exception:
-            # Fallback to symmetric estimate
-            pixel_scale_arcsec = float(fov_width_deg) * 3600.0 / max(1.0, float(width_px))
+        pixel_scale_arcsec = self._pixel_scale_arcsec(size_px, fov_width_deg, fov_height_deg)
 
         from overlay.projection import skycoord_to_pixel_wcs as project_skycoord_wcs
 
@@ -198,6 +216,197 @@ class OverlayGenerator:
             obj_coord, center_coord, size_px, fov_deg, fov_deg, 0.0
         )
 
+    @staticmethod
+    def _pixel_scale_arcsec(size_px, fov_width_deg, fov_height_deg) -> float:
+        """Mean pixel scale (arcsec/pixel) derived from FOV and image size."""
+        width_px, height_px = size_px
+        try:
+            scale_x_arcsec = float(fov_width_deg) * 3600.0 / float(width_px)
+            scale_y_arcsec = float(fov_height_deg) * 3600.0 / float(height_px)
+            return (scale_x_arcsec + scale_y_arcsec) * 0.5
+        except Exception:
+            # Fallback to symmetric estimate
+            return float(fov_width_deg) * 3600.0 / max(1.0, float(width_px))
+
+    def project_radec_arrays(
+        self,
+        ra_deg,
+        dec_deg,
+        center_coord,
+        size_px,
+        fov_width_deg,
+        fov_height_deg,
+        position_angle_deg=0.0,
+        flip_x: bool = False,
+        flip_y: bool = False,
+        wcs_path: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Batch counterpart of ``skycoord_to_pixel_with_rotation``.
+
+        Projects RA/Dec arrays (degrees) in one vectorized call. On the WCS branch
+        the WCS is built (or its FITS header parsed) exactly once per call.
+
+        Returns:
+            (x, y) integer pixel arrays (int64); non-finite inputs map to a large
+            negative sentinel so they never pass bounds checks.
+        """
+        cen_ra = center_coord.ra.degree
+        cen_dec = center_coord.dec.degree
+
+        xs: np.ndarray
+        ys: np.ndarray
+        if not (wcs_path or self.use_wcs_projection):
+            xs, ys = radec_to_pixel_arrays(
+                ra_deg,
+                dec_deg,
+                cen_ra,
+                cen_dec,
+                size_px,
+                fov_width_deg,
+                fov_height_deg,
+                position_angle_deg,
+                flip_x,
+                flip_y,
+                self.ra_increases_left,
+            )
+        else:
+            try:
+                w, wcs_size = build_projection_wcs(
+                    cen_ra,
+                    cen_dec,
+                    size_px,
+                    self._pixel_scale_arcsec(size_px, fov_width_deg, fov_height_deg),
+                    position_angle_deg=position_angle_deg,
+                    ra_increases_left=self.ra_increases_left,
+                    wcs_path=wcs_path,
+                )
+                xs, ys = radec_to_pixel_arrays_wcs(
+                    ra_deg, dec_deg, w, wcs_size, flip_x=flip_x, flip_y=flip_y
+                )
+            except ImportError:
+                xs, ys = radec_to_pixel_arrays(
+                    ra_deg,
+                    dec_deg,
+                    cen_ra,
+                    cen_dec,
+                    size_px,
+                    fov_width_deg,
+                    fov_height_deg,
+                    position_angle_deg,
+                    flip_x,
+                    flip_y,
+                    self.ra_increases_left,
+                )
+
+        # Round like the scalar path; keep NaN rows out of bounds
+        sentinel = np.iinfo(np.int64).min
+        xs_i = np.where(np.isfinite(xs), np.rint(xs), sentinel).astype(np.int64)
+        ys_i = np.where(np.isfinite(ys), np.rint(ys), sentinel).astype(np.int64)
+        return xs_i, ys_i
+
+    @staticmethod
+    def _column_to_float_array(values) -> np.ndarray:
+        """Convert a catalog column (masked, strings like '--', None) to float64 with NaN."""
+        try:
+            filled = np.ma.filled(np.ma.asarray(values, dtype=np.float64), np.nan)
+            return np.asarray(filled, dtype=np.float64)
+        except (TypeError, ValueError):
+            out = np.full(len(values), np.nan, dtype=np.float64)
+            for i, value in enumerate(values):
+                if value is None or value is np.ma.masked:
+                    continue
+                try:
+                    out[i] = float(value)
+                except (TypeError, ValueError):
+                    continue
+            return out
+
+    def _catalog_column(self, result, rows, name: str):
+        """Return a catalog column, using table column access when available."""
+        try:
+            if hasattr(result, "columns"):
+                return result[name]
+        except Exception:
+            pass
+        return [row[name] for row in rows]
+
+    def _select_catalog_objects(
+        self,
+        result,
+        rows: list,
+        center,
+        img_size,
+        fov_w: float,
+        fov_h: float,
+        pa_deg: float,
+        flip_x: bool,
+        flip_y: bool,
+        mag_limit: float,
+        wcs_path: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Filter catalog rows by magnitude, type and image bounds before drawing.
+
+        Returns:
+            (indices, xs, ys): indices into ``rows`` that should be drawn, plus the
+            projected integer pixel coordinates for all rows.
+        """
+        empty = np.empty(0, dtype=np.int64)
+        if not rows:
+            return empty, empty, empty
+
+        colnames = list(getattr(result, "colnames", None) or rows[0].colnames)
+        ra_col = next((c for c in ["RA", "ra", "RA_d", "ra_d"] if c in colnames), None)
+        dec_col = next((c for c in ["DEC", "dec", "DEC_d", "dec_d"] if c in colnames), None)
+        if ra_col is None or dec_col is None:
+            self.logger.warning(f"Could not find RA/Dec columns. Available: {colnames}")
+            return empty, empty, empty
+
+        keep = np.ones(len(rows), dtype=bool)
+
+        # Magnitude filter: objects without V are kept only if configured
+        if "V" in colnames:
+            vmag = self._column_to_float_array(self._catalog_column(result, rows, "V"))
+            has_v = np.isfinite(vmag)
+            with np.errstate(invalid="ignore"):
+                keep &= np.where(has_v, vmag <= mag_limit, bool(self.include_no_magnitude))
+        elif not self.include_no_magnitude:
+            keep[:] = False
+
+        # Object type filter
+        if self.object_types and "otype" in colnames:
+            otypes = np.array(
+                [str(t) for t in self._catalog_column(result, rows, "otype")], dtype=object
+            )
+            keep &= np.isin(otypes, [str(t) for t in self.object_types])
+
+        ra_vals = self._catalog_column(result, rows, ra_col)
+        dec_vals = self._catalog_column(result, rows, dec_col)
+        ra_arr = self._column_to_float_array(ra_vals)
+        dec_arr = self._column_to_float_array(dec_vals)
+        if np.isnan(ra_arr).all() and len(ra_vals) > 0:
+            # Sexagesimal string columns: let SkyCoord parse them in one vectorized call
+            try:
+                coords = SkyCoord(ra=ra_vals, dec=dec_vals, unit="deg")
+                ra_arr = np.asarray(coords.ra.degree, dtype=np.float64)
+                dec_arr = np.asarray(coords.dec.degree, dtype=np.float64)
+            except Exception as e:
+                self.logger.warning(f"Could not parse catalog coordinates: {e}")
+
+        xs, ys = self.project_radec_arrays(
+            ra_arr,
+            dec_arr,
+            center,
+            img_size,
+            fov_w,
+            fov_h,
+            pa_deg,
+            flip_x,
+            flip_y,
+            wcs_path=wcs_path,
+        )
+        keep &= (xs >= 0) & (xs <= img_size[0]) & (ys >= 0) & (ys <= img_size[1])
+        return np.flatnonzero(keep), xs, ys
+
     def validate_coordinates(self, ra: float, dec: float):
         """Validates RA/Dec values."""
         if not (0 <= ra <= 360):
@@ -316,6 +525,53 @@ class OverlayGenerator:
 
     # Removed local drawing wrappers; direct overlay.drawing calls are used instead
 
+    def _get_catalog_cache(self):
+        """Return the local catalog tile cache, creating it lazily (None if disabled)."""
+        if self._catalog_cache is None and not self._catalog_cache_failed:
+            try:
+                self._catalog_cache = create_catalog_cache(self.config, self.logger)
+            except Exception as e:
+                self._catalog_cache_failed = True
+                self.logger.warning(f"Catalog cache unavailable: {e}")
+        return self._catalog_cache
+
+    def _query_catalog_cache(self, cache, center, radius_deg: float, simbad, picked_fields):
+        """Answer the catalog cone search from the local tile cache.
+
+        Missing or stale tiles are filled with a single SIMBAD cone query covering all
+        of them when ``simbad`` is available; otherwise, or when that query fails,
+        whatever is cached is used.
+
+        Returns:
+            (astropy Table with cached rows or None if the cache cannot cover the field,
+            True if the SIMBAD fill query failed)
+        """
+        ra_deg = float(center.ra.degree)
+        dec_deg = float(center.dec.degree)
+        missing = cache.missing_tiles(ra_deg, dec_deg, radius_deg)
+        simbad_failed = False
+        if missing and simbad is not None:
+            query_radius = cache.covering_radius(ra_deg, dec_deg, missing)
+            self.logger.info(
+                "SIMBAD query running (filling %d catalog tiles, r=%.2f deg)...",
+                len(missing),
+                query_radius,
+            )
+            try:
+                table = simbad.query_region(center, radius=query_radius * u.deg)
+            except Exception as e:
+                self.logger.warning(f"Simbad query failed: {e}; using cached catalog tiles only")
+                simbad_failed = True
+            else:
+                cache.fill_from_table(table, missing, *picked_fields, source="simbad")
+
+        records = cache.cone_search(
+            ra_deg, dec_deg, radius_deg, allow_partial=simbad is None or simbad_failed
+        )
+        if records is None:
+            return None, simbad_failed
+        return records_to_table(records), simbad_failed
+
     def _should_draw_ellipse(self, object_type: str) -> bool:
         """Determine if an object should be drawn as an ellipse based on its type.
 
@@ -414,518 +670,655 @@ class OverlayGenerator:
             astronomical overlay suitable for telescope streaming and observation.
         """
         try:
-            # Validate input values
-            self.validate_coordinates(ra_deg, dec_deg)
-
-            # Use provided values or defaults
-            fov_w = fov_width_deg if fov_width_deg is not None else self.fov_deg
-            fov_h = fov_height_deg if fov_height_deg is not None else self.fov_deg
-            pa_deg_in = position_angle_deg if position_angle_deg is not None else 0.0
-            # Apply user-configured rotation offset
-            pa_deg = pa_deg_in + float(self.rotation_offset_deg)
-            img_size = image_size if image_size is not None else self.image_size
-            mag_limit = mag_limit if mag_limit is not None else self.mag_limit
-            # Default: do not flip X; solver PA already accounts for flips
-            if flip_x is None:
-                flip_x = bool(is_flipped) if is_flipped is not None else False
-            flip_y = flip_y if flip_y is not None else False
+            img = self.render_overlay(
+                ra_deg,
+                dec_deg,
+                fov_width_deg=fov_width_deg,
+                fov_height_deg=fov_height_deg,
+                position_angle_deg=position_angle_deg,
+                image_size=image_size,
+                mag_limit=mag_limit,
+                flip_x=flip_x,
+                flip_y=flip_y,
+                is_flipped=is_flipped,
+                status_messages=status_messages,
+                wcs_path=wcs_path,
+            )
             output_file = output_file or self.default_filename
+            self.save_overlay(img, output_file)
+            self.logger.info(
+                "Overlay with %d objects saved as %s", self.last_objects_drawn, output_file
+            )
+            # Return path string to satisfy method signature
+            return str(output_file)
 
-            # Do not adjust PA here; upstream solvers (e.g., PlateSolve2) may already apply PA+180°.
-            # If a solver indicates flipping without PA correction,
-            # the X-mirror in the projection handles it.
-
-            center = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame="icrs")
+        except Exception as e:
+            self.logger.error(f"Error: {e}")
+            # Re-raise or return a fallback path; we return the default filename
+            return output_file or self.default_filename
 
-            # Try to import astroquery lazily (if enabled)
-            simbad_available = False
-            if bool(getattr(self, "catalog_query_enabled", True)):
+    def save_overlay(self, img: Image.Image, output_file: str) -> str:
+        """Write a rendered overlay as PNG without exposing partial files."""
+        # Atomic save to avoid partial writes/race conditions
+        try:
+            out_dir = os.path.dirname(output_file) or "."
+            os.makedirs(out_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".png", dir=out_dir)
+            os.close(fd)
+            try:
+                img.save(tmp_path)
+                os.replace(tmp_path, output_file)
+            finally:
                 try:
-                    from astroquery.simbad import Simbad  # noqa: F401
-
-                    simbad_available = True
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
                 except Exception:
-                    simbad_available = False
-                    self.logger.warning(
-                        "astroquery not available; generating overlay without catalog objects"
-                    )
+                    pass
+        except Exception:
+            # Fallback to direct save if atomic path fails
+            img.save(output_file)
+        return str(output_file)
 
-            result = None
-            if simbad_available:
-                # Configure SIMBAD with robust field selection (delegated)
-                custom_simbad = Simbad()
-                custom_simbad.reset_votable_fields()
-                custom_simbad.add_votable_fields("ra", "dec", "V", "otype", "main_id")
-                picked_maj, picked_min, picked_ang, picked_dims, pa_supported = (
-                    discover_simbad_dimension_fields(Simbad)
+    def render_overlay(
+        self,
+        ra_deg: float,
+        dec_deg: float,
+        fov_width_deg: Optional[float] = None,
+        fov_height_deg: Optional[float] = None,
+        position_angle_deg: Optional[float] = None,
+        image_size: Optional[Tuple[int, int]] = None,
+        mag_limit: Optional[float] = None,
+        flip_x: Optional[bool] = None,
+        flip_y: Optional[bool] = None,
+        is_flipped: Optional[bool] = None,
+        status_messages: Optional[list[str]] = None,
+        wcs_path: Optional[str] = None,
+    ) -> Image.Image:
+        """Draw the overlay for the given coordinates into an RGBA image.
+
+        Same arguments as generate_overlay(); nothing is written to disk, so the
+        image can be composited in memory (see overlay.compositor).
+
+        Returns:
+            Image.Image: Transparent RGBA overlay of size image_size
+
+        Raises:
+            ValueError: If the coordinates are invalid
+        """
+        # Validate input values
+        self.validate_coordinates(ra_deg, dec_deg)
+
+        # Use provided values or defaults
+        fov_w = fov_width_deg if fov_width_deg is not None else self.fov_deg
+        fov_h = fov_height_deg if fov_height_deg is not None else self.fov_deg
+        pa_deg_in = position_angle_deg if position_angle_deg is not None else 0.0
+        # Apply user-configured rotation offset
+        pa_deg = pa_deg_in + float(self.rotation_offset_deg)
+        img_size = image_size if image_size is not None else self.image_size
+        mag_limit = mag_limit if mag_limit is not None else self.mag_limit
+        # Default: do not flip X; solver PA already accounts for flips
+        if flip_x is None:
+            flip_x = bool(is_flipped) if is_flipped is not None else False
+        flip_y = flip_y if flip_y is not None else False
+
+        img_size = (int(img_size[0]), int(img_size[1]))
+
+        layers = self.layers
+        title = layers.layer("title", img_size, lambda: self._render_title_layer(img_size))
+        panel = None
+        if self.info_panel_enabled:
+            lines = self._info_panel_lines(ra_deg, dec_deg, fov_w, fov_h, pa_deg, status_messages)
+            panel = layers.layer(
+                "info_panel",
+                (img_size, tuple(lines)),
+                lambda: self._render_info_panel_layer(img_size, lines),
+            )
+        sky_key = SkyLayerKey(
+            ra_deg=float(ra_deg),
+            dec_deg=float(dec_deg),
+            fov_width_deg=float(fov_w),
+            fov_height_deg=float(fov_h),
+            pa_deg=float(pa_deg),
+            image_size=img_size,
+            options=self._sky_layer_options(mag_limit, flip_x, flip_y, wcs_path),
+        )
+        self._sky_catalog_failed = False
+        sky = layers.layer(
+            "sky",
+            sky_key,
+            lambda: self._render_sky_layer(
+                ra_deg, dec_deg, fov_w, fov_h, pa_deg, img_size, mag_limit, flip_x, flip_y, wcs_path
+            ),
+            max_age_s=layers.sky_max_age_s,
+        )
+        if self._sky_catalog_failed:
+            # Retry the SIMBAD query with the next overlay instead of reusing a
+            # sky layer without catalog markers
+            layers.invalidate("sky")
+        # Title and info panel below the sky annotations
+        return cast(Image.Image, layers.compose(img_size, [title, panel, sky]))
+
+    def _render_title_layer(self, img_size: Tuple[int, int]) -> Image.Image:
+        """Title box layer."""
+        img = Image.new("RGBA", img_size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        draw_title(
+            draw,
+            img_size,
+            self.title_config.get("text", "OST Telescope Streaming"),
+            self.title_config.get("position", "top_center"),
+            self._get_title_font(self.title_config.get("font_size", 18)),
+            tuple(self.title_config.get("font_color", [255, 255, 0, 255])),
+            tuple(self.title_config.get("background_color", [0, 0, 0, 180])),
+            self.title_config.get("padding", 10),
+            tuple(self.title_config.get("border_color", [255, 255, 255, 255])),
+            self.title_config.get("border_width", 1),
+        )
+        return img
+
+    def _info_panel_lines(
+        self,
+        ra_deg: float,
+        dec_deg: float,
+        fov_w: float,
+        fov_h: float,
+        pa_deg: float,
+        status_messages: Optional[list[str]] = None,
+    ) -> list[tuple[str, tuple]]:
+        """Text lines and colors of the info panel."""
+        lines = []
+        title_color = tuple(self.info_panel_config.get("title_color", [255, 255, 0, 255]))
+        text_color = tuple(self.info_panel_config.get("text_color", [255, 255, 255, 255]))
+        lines.append(("INFO PANEL", title_color))
+        lines.append(("", text_color))
+        # Optional status messages (e.g., slewing/parking)
+        if status_messages:
+            alert_color = tuple(self.info_panel_config.get("alert_color", [255, 165, 0, 255]))
+            for msg in status_messages:
+                lines.append((msg, alert_color))
+            lines.append(("", text_color))
+        if self.info_panel_config.get("show_timestamp", True):
+            try:
+                from datetime import datetime
+                from datetime import timezone as _tz
+
+                ts_now = datetime.now(_tz.utc).strftime("%Y-%m-%d %H:%M:%SZ")
+            except Exception:
+                ts_now = datetime.now().strftime("%Y-%m-%d %H:%M:%SZ")
+            lines.append((f"Time (UTC): {ts_now}", text_color))
+        if self.info_panel_config.get("show_coordinates", True):
+            lines.append((format_coordinates(ra_deg, dec_deg), text_color))
+        if pa_deg != 0.0:
+            lines.append((f"Position Angle: {pa_deg:.1f}°", text_color))
+        if self.info_panel_config.get("show_telescope_info", True):
+            lines.append(("", text_color))
+            lines.append((telescope_info(self.config.get_telescope_config()), text_color))
+        if self.info_panel_config.get("show_camera_info", True):
+            # Prefer FITS-derived camera name via _get_camera_info()
+            lines.append((self._get_camera_info(), text_color))
+        if self.info_panel_config.get("show_fov_info", True):
+            lines.append(("", text_color))
+            lines.append((fov_info(fov_w, fov_h), text_color))
+        if self.show_cooling_info:
+            # Try to get cooling status if cooling service exists
+            try:
+                from services.cooling.service import CoolingService  # noqa: F401
+
+                cooling_status = None
+                # Heuristic: video processor may have started status monitoring
+                if (
+                    hasattr(self, "video_processor")
+                    and self.video_processor
+                    and hasattr(self.video_processor, "cooling_service")
+                ):
+                    cs = self.video_processor.cooling_service
+                    if cs:
+                        cooling_status = cs.get_cooling_status()
+                # Fallback: inspector in config not available here; show enabled flag only
+                enabled = bool(
+                    self.config.get_camera_config().get("cooling", {}).get("enable_cooling", False)
                 )
-                for fld in [picked_maj, picked_min, picked_ang, picked_dims]:
-                    if fld:
-                        try:
-                            custom_simbad.add_votable_fields(fld)
-                        except Exception:
-                            pass
+                lines.append((cooling_info(cooling_status, enabled), text_color))
+            except Exception:
+                pass
+        return lines
+
+    def _render_info_panel_layer(
+        self, img_size: Tuple[int, int], lines: list[tuple[str, tuple]]
+    ) -> Image.Image:
+        """Info panel layer."""
+        img = Image.new("RGBA", img_size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        info_font = self._get_info_panel_font(self.info_panel_config.get("font_size", 12))
+        draw_info_panel(
+            draw,
+            img_size,
+            lines,
+            self.info_panel_config.get("position", "top_right"),
+            self.info_panel_config.get("width", 300),
+            self.info_panel_config.get("padding", 10),
+            self.info_panel_config.get("line_spacing", 5),
+            tuple(self.info_panel_config.get("background_color", [0, 0, 0, 180])),
+            tuple(self.info_panel_config.get("border_color", [255, 255, 255, 255])),
+            self.info_panel_config.get("border_width", 2),
+            info_font,
+        )
+        return img
 
-                # Radius is half-diagonal of field of view
-                radius = ((fov_w**2 + fov_h**2) ** 0.5) / 2
+    def _sky_layer_options(self, mag_limit, flip_x, flip_y, wcs_path) -> tuple:
+        """Sky layer inputs besides the pointing; these must match exactly for reuse."""
+        wcs_mtime = None
+        if wcs_path:
+            try:
+                wcs_mtime = os.path.getmtime(wcs_path)
+            except OSError:
+                wcs_mtime = None
+        # Settings may be changed on the instance (runner overrides, tests)
+        return (
+            mag_limit,
+            bool(flip_x),
+            bool(flip_y),
+            wcs_path,
+            wcs_mtime,
+            bool(getattr(self, "catalog_query_enabled", True)),
+            bool(self.include_no_magnitude),
+            tuple(self.object_types or ()),
+            self.max_name_length,
+            self.object_color,
+            self.text_color,
+            self.marker_size,
+            repr(self.text_offset),
+            self.ellipse_label_color,
+            self.ellipse_label_font_size,
+            bool(self.ra_increases_left),
+            bool(self.use_wcs_projection),
+            repr(self.secondary_fov_config),
+            repr(self.solar_system_config),
+        )
 
-                self.logger.info("SIMBAD query running...")
-                try:
-                    result = custom_simbad.query_region(center, radius=radius * u.deg)
-                except Exception as e:
-                    self.logger.warning(
-                        f"Simbad query failed: {e}; proceeding without catalog objects"
-                    )
-                    result = None
+    def _render_sky_layer(
+        self,
+        ra_deg: float,
+        dec_deg: float,
+        fov_w: float,
+        fov_h: float,
+        pa_deg: float,
+        img_size: Tuple[int, int],
+        mag_limit: float,
+        flip_x: bool,
+        flip_y: bool,
+        wcs_path: Optional[str] = None,
+    ) -> Image.Image:
+        """Secondary FOV, solar system bodies and catalog objects layer."""
+        # Do not adjust PA here; upstream solvers (e.g., PlateSolve2) may already apply PA+180°.
+        # If a solver indicates flipping without PA correction,
+        # the X-mirror in the projection handles it.
 
-            if result is None or len(result) == 0:
-                if simbad_available:
-                    self.logger.warning("No objects found.")
-                # Continue to render minimal overlay elements (title, info panel, secondary FOV)
-                # without any catalog objects.
-                result = None
+        center = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame="icrs")
 
-            # Debug: Print available column names
-            if result is not None and self.advanced_config.get("debug_simbad", False):
-                self.logger.debug("Available columns: %s", result.colnames)
-                self.logger.debug("Number of objects: %d", len(result))
-
-            # Prepare image
-            img = Image.new("RGBA", img_size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            font = self.get_font()
-
-            # Draw title and info panel first (so they appear behind objects)
-            draw_title(
-                draw,
-                img_size,
-                self.title_config.get("text", "OST Telescope Streaming"),
-                self.title_config.get("position", "top_center"),
-                self._get_title_font(self.title_config.get("font_size", 18)),
-                tuple(self.title_config.get("font_color", [255, 255, 0, 255])),
-                tuple(self.title_config.get("background_color", [0, 0, 0, 180])),
-                self.title_config.get("padding", 10),
-                tuple(self.title_config.get("border_color", [255, 255, 255, 255])),
-                self.title_config.get("border_width", 1),
-            )
+        # Try to import astroquery lazily (if enabled)
+        catalog_enabled = bool(getattr(self, "catalog_query_enabled", True))
+        catalog_cache = self._get_catalog_cache() if catalog_enabled else None
+        simbad_available = False
+        if catalog_enabled and not (catalog_cache is not None and self.catalog_offline_only):
+            try:
+                from astroquery.simbad import Simbad  # noqa: F401
 
-            if self.info_panel_enabled:
-                info_font = self._get_info_panel_font(self.info_panel_config.get("font_size", 12))
-                lines = []
-                title_color = tuple(self.info_panel_config.get("title_color", [255, 255, 0, 255]))
-                text_color = tuple(self.info_panel_config.get("text_color", [255, 255, 255, 255]))
-                lines.append(("INFO PANEL", title_color))
-                lines.append(("", text_color))
-                # Optional status messages (e.g., slewing/parking)
-                if status_messages:
-                    alert_color = tuple(
-                        self.info_panel_config.get("alert_color", [255, 165, 0, 255])
+                simbad_available = True
+            except Exception:
+                simbad_available = False
+                if catalog_cache is None:
+                    self.logger.warning(
+                        "astroquery not available; generating overlay without catalog objects"
                     )
-                    for msg in status_messages:
-                        lines.append((msg, alert_color))
-                    lines.append(("", text_color))
-                if self.info_panel_config.get("show_timestamp", True):
-                    try:
-                        from datetime import datetime
-                        from datetime import timezone as _tz
 
-                        ts_now = datetime.now(_tz.utc).strftime("%Y-%m-%d %H:%M:%SZ")
-                    except Exception:
-                        ts_now = datetime.now().strftime("%Y-%m-%d %H:%M:%SZ")
-                    lines.append((f"Time (UTC): {ts_now}", text_color))
-                if self.info_panel_config.get("show_coordinates", True):
-                    lines.append((format_coordinates(ra_deg, dec_deg), text_color))
-                if pa_deg != 0.0:
-                    lines.append((f"Position Angle: {pa_deg:.1f}°", text_color))
-                if self.info_panel_config.get("show_telescope_info", True):
-                    lines.append(("", text_color))
-                    lines.append((telescope_info(self.config.get_telescope_config()), text_color))
-                if self.info_panel_config.get("show_camera_info", True):
-                    # Prefer FITS-derived camera name via _get_camera_info()
-                    lines.append((self._get_camera_info(), text_color))
-                if self.info_panel_config.get("show_fov_info", True):
-                    lines.append(("", text_color))
-                    lines.append((fov_info(fov_w, fov_h), text_color))
-                if self.show_cooling_info:
-                    # Try to get cooling status if cooling service exists
+        # Radius is half-diagonal of field of view
+        radius = ((fov_w**2 + fov_h**2) ** 0.5) / 2
+
+        result = None
+        custom_simbad = None
+        picked_maj = picked_min = picked_ang = picked_dims = None
+        if simbad_available:
+            # Configure SIMBAD with robust field selection (delegated)
+            custom_simbad = Simbad()
+            custom_simbad.reset_votable_fields()
+            custom_simbad.add_votable_fields("ra", "dec", "V", "otype", "main_id")
+            picked_maj, picked_min, picked_ang, picked_dims, pa_supported = (
+                discover_simbad_dimension_fields(Simbad)
+            )
+            for fld in [picked_maj, picked_min, picked_ang, picked_dims]:
+                if fld:
                     try:
-                        from services.cooling.service import CoolingService  # noqa: F401
-
-                        cooling_status = None
-                        # Heuristic: video processor may have started status monitoring
-                        if (
-                            hasattr(self, "video_processor")
-                            and self.video_processor
-                            and hasattr(self.video_processor, "cooling_service")
-                        ):
-                            cs = self.video_processor.cooling_service
-                            if cs:
-                                cooling_status = cs.get_cooling_status()
-                        # Fallback: inspector in config not available here; show enabled flag only
-                        enabled = bool(
-                            self.config.get_camera_config()
-                            .get("cooling", {})
-                            .get("enable_cooling", False)
-                        )
-                        lines.append((cooling_info(cooling_status, enabled), text_color))
+                        custom_simbad.add_votable_fields(fld)
                     except Exception:
                         pass
 
-                draw_info_panel(
-                    draw,
-                    img_size,
-                    lines,
-                    self.info_panel_config.get("position", "top_right"),
-                    self.info_panel_config.get("width", 300),
-                    self.info_panel_config.get("padding", 10),
-                    self.info_panel_config.get("line_spacing", 5),
-                    tuple(self.info_panel_config.get("background_color", [0, 0, 0, 180])),
-                    tuple(self.info_panel_config.get("border_color", [255, 255, 255, 255])),
-                    self.info_panel_config.get("border_width", 2),
-                    info_font,
-                )
-
-            # Draw secondary FOV overlay
-            # Prepare label font honoring display.label_font_size
-            label_font = None
+        cache_hit = False
+        # The cache already asked SIMBAD for its missing tiles and got no answer
+        fill_failed = False
+        if catalog_cache is not None:
             try:
-                label_font_size = int(
-                    self.secondary_fov_config.get("display", {}).get("label_font_size", 12)
+                result, fill_failed = self._query_catalog_cache(
+                    catalog_cache,
+                    center,
+                    radius,
+                    custom_simbad,
+                    (picked_maj, picked_min, picked_ang),
                 )
-                label_font = self._get_info_panel_font(size=label_font_size)
-            except Exception:
-                label_font = None
+            except Exception as e:
+                self.logger.warning(f"Catalog cache lookup failed: {e}")
+                result = None
+            if result is not None:
+                cache_hit = True
+                picked_maj, picked_min, picked_ang, picked_dims = CACHE_DIMENSION_FIELDS
+            # Partial coverage after a failed fill: retry SIMBAD with the next overlay
+            self._sky_catalog_failed = fill_failed
+
+        if custom_simbad is not None and not cache_hit and not fill_failed:
+            self.logger.info("SIMBAD query running...")
+            try:
+                result = custom_simbad.query_region(center, radius=radius * u.deg)
+            except Exception as e:
+                self.logger.warning(f"Simbad query failed: {e}; proceeding without catalog objects")
+                result = None
 
-            draw_secondary_fov(
-                draw,
-                img_size,
-                ra_deg,
-                dec_deg,
-                fov_w,
-                fov_h,
-                pa_deg,
-                self.secondary_fov_config,
-                self.ra_increases_left,
-                label_font=label_font,
+        if result is None or len(result) == 0:
+            if simbad_available or cache_hit:
+                self.logger.warning("No objects found.")
+            # A failed or empty SIMBAD answer may be transient; cached tiles are not
+            self._sky_catalog_failed = fill_failed or (custom_simbad is not None and not cache_hit)
+            # Continue to render minimal overlay elements (title, info panel, secondary FOV)
+            # without any catalog objects.
+            result = None
+
+        # Debug: Print available column names
+        if result is not None and self.advanced_config.get("debug_simbad", False):
+            self.logger.debug("Available columns: %s", result.colnames)
+            self.logger.debug("Number of objects: %d", len(result))
+
+        img = Image.new("RGBA", img_size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        font = self.get_font()
+
+        # Draw secondary FOV overlay
+        # Prepare label font honoring display.label_font_size
+        label_font = None
+        try:
+            label_font_size = int(
+                self.secondary_fov_config.get("display", {}).get("label_font_size", 12)
             )
+            label_font = self._get_info_panel_font(size=label_font_size)
+        except Exception:
+            label_font = None
+
+        draw_secondary_fov(
+            draw,
+            img_size,
+            ra_deg,
+            dec_deg,
+            fov_w,
+            fov_h,
+            pa_deg,
+            self.secondary_fov_config,
+            self.ra_increases_left,
+            label_font=label_font,
+        )
 
-            # Draw solar system bodies (Moon and planets) if enabled
+        # Draw solar system bodies (Moon and planets) if enabled
+        try:
+            if bool(self.solar_system_config.get("enabled", False)):
+                self._draw_solar_system(
+                    draw,
+                    img_size,
+                    ra_deg,
+                    dec_deg,
+                    fov_w,
+                    fov_h,
+                    pa_deg,
+                    flip_x,
+                )
+        except Exception as e:
+            # Do not fail overlay on ephemeris errors
+            self.logger.debug(f"Solar system overlay skipped: {e}")
+
+        # Select drawable objects with vectorized masks, projecting all rows at once
+        rows = list(result) if result is not None else []
+        selected, xs, ys = self._select_catalog_objects(
+            result,
+            rows,
+            center,
+            img_size,
+            fov_w,
+            fov_h,
+            pa_deg,
+            flip_x,
+            flip_y,
+            mag_limit,
+            wcs_path=wcs_path,
+        )
+
+        # Process objects (if any)
+        objects_drawn = 0
+        for idx in selected:
+            row = rows[idx]
             try:
-                if bool(self.solar_system_config.get("enabled", False)):
-                    self._draw_solar_system(
+                x, y = int(xs[idx]), int(ys[idx])
+                # Check if we should draw an ellipse for this object type
+                object_type = row.get("otype", "") if "otype" in row.colnames else ""
+                should_draw_ellipse = self._should_draw_ellipse(object_type)
+
+                # Check if we have dimension data for ellipse
+                has_dimensions = False
+                dim_maj = None
+                dim_min = None
+                pa = None
+
+                if should_draw_ellipse:
+                    # Prefer explicit numeric fields first
+                    # (use whichever we successfully added)
+                    if (
+                        picked_maj
+                        and picked_maj in row.colnames
+                        and row[picked_maj] not in (None, "--")
+                    ):
+                        try:
+                            dim_maj = float(row[picked_maj])
+                        except Exception:
+                            dim_maj = None
+                    if (
+                        picked_min
+                        and picked_min in row.colnames
+                        and row[picked_min] not in (None, "--")
+                    ):
+                        try:
+                            dim_min = float(row[picked_min])
+                        except Exception:
+                            dim_min = None
+                    if (
+                        picked_ang
+                        and picked_ang in row.colnames
+                        and row[picked_ang] not in (None, "--")
+                    ):
+                        try:
+                            pa = float(row[picked_ang])
+                        except Exception:
+                            pa = None
+
+                    # Fallback to legacy combined string field
+                    if (dim_maj is None or dim_min is None) and (
+                        (picked_dims and picked_dims in row.colnames)
+                        or "dimensions" in row.colnames
+                    ):
+                        dimensions_str = str(row["dimensions"])
+                        if dimensions_str != "--" and dimensions_str.strip():
+                            try:
+                                if "x" in dimensions_str:
+                                    parts = dimensions_str.split("x")
+                                    if len(parts) == 2:
+                                        dim_maj = dim_maj or float(parts[0].strip())
+                                        dim_min = dim_min or float(parts[1].strip())
+                                else:
+                                    dim_maj = dim_maj or float(dimensions_str)
+                                    dim_min = dim_min or dim_maj
+                            except (ValueError, TypeError):
+                                pass
+
+                    # Final fallback for PA via 'pa' field (if supported)
+                    if (
+                        pa is None
+                        and picked_ang
+                        and picked_ang in row.colnames
+                        and row[picked_ang] is not None
+                    ):
+                        pa_str = str(row[picked_ang])
+                        if pa_str != "--" and pa_str.strip():
+                            try:
+                                pa = float(pa_str)
+                            except (ValueError, TypeError):
+                                pa = None
+
+                    has_dimensions = dim_maj is not None and dim_min is not None
+                    pa = pa or 0.0
+
+                # Draw ellipse if we have dimension data
+                if (
+                    should_draw_ellipse
+                    and has_dimensions
+                    and dim_maj is not None
+                    and dim_min is not None
+                ):
+                    ellipse_drawn = draw_ellipse_for_object(
                         draw,
+                        x,
+                        y,
+                        dim_maj,
+                        dim_min,
+                        pa or 0.0,
                         img_size,
-                        ra_deg,
-                        dec_deg,
                         fov_w,
                         fov_h,
                         pa_deg,
                         flip_x,
+                        tuple(self.object_color),
+                        2,
                     )
-            except Exception as e:
-                # Do not fail overlay on ephemeris errors
-                self.logger.debug(f"Solar system overlay skipped: {e}")
-
-            # Process objects (if any)
-            objects_drawn = 0
-            for row in result or []:
-                try:
-                    # Handle objects with and without V magnitude
-                    has_v_magnitude = (
-                        "V" in row.colnames and row["V"] is not None and row["V"] != "--"
+                    if not ellipse_drawn:
+                        # Fallback to marker if ellipse drawing failed
+                        draw.ellipse(
+                            (
+                                x - self.marker_size,
+                                y - self.marker_size,
+                                x + self.marker_size,
+                                y + self.marker_size,
+                            ),
+                            outline=self.object_color,
+                            width=2,
+                        )
+                else:
+                    # Draw standard marker
+                    draw.ellipse(
+                        (
+                            x - self.marker_size,
+                            y - self.marker_size,
+                            x + self.marker_size,
+                            y + self.marker_size,
+                        ),
+                        outline=self.object_color,
+                        width=2,
                     )
 
-                    # Skip objects that are too faint (if they have magnitude)
-                    if has_v_magnitude and row["V"] > mag_limit:
-                        continue
-
-                    # Skip objects without magnitude if configured
-                    if not has_v_magnitude and not self.include_no_magnitude:
-                        continue
+                # Safe name handling - try different possible column names
+                name = None
+                name_columns = ["MAIN_ID", "main_id", "MAINID", "mainid"]
 
-                    # Filter by object type if specified
-                    if self.object_types and "otype" in row.colnames:
-                        obj_type = row["otype"]
-                        if obj_type not in self.object_types:
-                            continue
-
-                    # Try different possible column names for RA/Dec
-                    ra_col = None
-                    dec_col = None
-
-                    # Check for various possible column names
-                    for ra_name in ["RA", "ra", "RA_d", "ra_d"]:
-                        if ra_name in row.colnames:
-                            ra_col = ra_name
-                            break
-
-                    for dec_name in ["DEC", "dec", "DEC_d", "dec_d"]:
-                        if dec_name in row.colnames:
-                            dec_col = dec_name
+                for name_col in name_columns:
+                    if name_col in row.colnames:
+                        name_value = row[name_col]
+                        if name_value is not None:
+                            if isinstance(name_value, bytes):
+                                name = name_value.decode("utf-8", errors="ignore")
+                            else:
+                                name = str(name_value)
                             break
 
-                    if ra_col is None or dec_col is None:
-                        self.logger.warning(
-                            f"Could not find RA/Dec columns. Available: {row.colnames}"
-                        )
-                        continue
-
-                    # Use found column names
-                    obj_coord = SkyCoord(ra=row[ra_col], dec=row[dec_col], unit="deg")
-                    x, y = self.skycoord_to_pixel_with_rotation(
-                        obj_coord,
-                        center,
+                # Fallback if no name found
+                if name is None:
+                    name = f"Obj_{objects_drawn}"
+
+                # Truncate long names
+                if len(name) > self.max_name_length:
+                    name = name[: self.max_name_length - 3] + "..."
+
+                # If we drew an ellipse, place label along ellipse edge;
+                # otherwise offset near marker
+                if (
+                    should_draw_ellipse
+                    and has_dimensions
+                    and dim_maj is not None
+                    and dim_min is not None
+                ):
+                    lx, ly, tang_deg = compute_ellipse_label_pose(
+                        int(x),
+                        int(y),
+                        float(dim_maj),
+                        float(dim_min),
+                        float(pa or 0.0),
                         img_size,
                         fov_w,
                         fov_h,
                         pa_deg,
                         flip_x,
-                        flip_y,
-                        wcs_path=wcs_path,
+                        theta_deg=45.0,
                     )
-
-                    # Check if object is within image bounds
-                    if 0 <= x <= img_size[0] and 0 <= y <= img_size[1]:
-                        # Check if we should draw an ellipse for this object type
-                        object_type = row.get("otype", "") if "otype" in row.colnames else ""
-                        should_draw_ellipse = self._should_draw_ellipse(object_type)
-
-                        # Check if we have dimension data for ellipse
-                        has_dimensions = False
-                        dim_maj = None
-                        dim_min = None
-                        pa = None
-
-                        if should_draw_ellipse:
-                            # Prefer explicit numeric fields first
-                            # (use whichever we successfully added)
-                            if (
-                                picked_maj
-                                and picked_maj in row.colnames
-                                and row[picked_maj] not in (None, "--")
-                            ):
-                                try:
-                                    dim_maj = float(row[picked_maj])
-                                except Exception:
-                                    dim_maj = None
-                            if (
-                                picked_min
-                                and picked_min in row.colnames
-                                and row[picked_min] not in (None, "--")
-                            ):
-                                try:
-                                    dim_min = float(row[picked_min])
-                                except Exception:
-                                    dim_min = None
-                            if (
-                                picked_ang
-                                and picked_ang in row.colnames
-                                and row[picked_ang] not in (None, "--")
-                            ):
-                                try:
-                                    pa = float(row[picked_ang])
-                                except Exception:
-                                    pa = None
-
-                            # Fallback to legacy combined string field
-                            if (dim_maj is None or dim_min is None) and (
-                                (picked_dims and picked_dims in row.colnames)
-                                or "dimensions" in row.colnames
-                            ):
-                                dimensions_str = str(row["dimensions"])
-                                if dimensions_str != "--" and dimensions_str.strip():
-                                    try:
-                                        if "x" in dimensions_str:
-                                            parts = dimensions_str.split("x")
-                                            if len(parts) == 2:
-                                                dim_maj = dim_maj or float(parts[0].strip())
-                                                dim_min = dim_min or float(parts[1].strip())
-                                        else:
-                                            dim_maj = dim_maj or float(dimensions_str)
-                                            dim_min = dim_min or dim_maj
-                                    except (ValueError, TypeError):
-                                        pass
-
-                            # Final fallback for PA via 'pa' field (if supported)
-                            if (
-                                pa is None
-                                and picked_ang
-                                and picked_ang in row.colnames
-                                and row[picked_ang] is not None
-                            ):
-                                pa_str = str(row[picked_ang])
-                                if pa_str != "--" and pa_str.strip():
-                                    try:
-                                        pa = float(pa_str)
-                                    except (ValueError, TypeError):
-                                        pa = None
-
-                            has_dimensions = dim_maj is not None and dim_min is not None
-                            pa = pa or 0.0
-
-                        # Draw ellipse if we have dimension data
-                        if (
-                            should_draw_ellipse
-                            and has_dimensions
-                            and dim_maj is not None
-                            and dim_min is not None
-                        ):
-                            ellipse_drawn = draw_ellipse_for_object(
-                                draw,
-                                x,
-                                y,
-                                dim_maj,
-                                dim_min,
-                                pa or 0.0,
-                                img_size,
-                                fov_w,
-                                fov_h,
-                                pa_deg,
-                                flip_x,
-                                tuple(self.object_color),
-                                2,
-                            )
-                            if not ellipse_drawn:
-                                # Fallback to marker if ellipse drawing failed
-                                draw.ellipse(
-                                    (
-                                        x - self.marker_size,
-                                        y - self.marker_size,
-                                        x + self.marker_size,
-                                        y + self.marker_size,
-                                    ),
-                                    outline=self.object_color,
-                                    width=2,
-                                )
-                        else:
-                            # Draw standard marker
-                            draw.ellipse(
-                                (
-                                    x - self.marker_size,
-                                    y - self.marker_size,
-                                    x + self.marker_size,
-                                    y + self.marker_size,
-                                ),
-                                outline=self.object_color,
-                                width=2,
-                            )
-
-                        # Safe name handling - try different possible column names
-                        name = None
-                        name_columns = ["MAIN_ID", "main_id", "MAINID", "mainid"]
-
-                        for name_col in name_columns:
-                            if name_col in row.colnames:
-                                name_value = row[name_col]
-                                if name_value is not None:
-                                    if isinstance(name_value, bytes):
-                                        name = name_value.decode("utf-8", errors="ignore")
-                                    else:
-                                        name = str(name_value)
-                                    break
-
-                        # Fallback if no name found
-                        if name is None:
-                            name = f"Obj_{objects_drawn}"
-
-                        # Truncate long names
-                        if len(name) > self.max_name_length:
-                            name = name[: self.max_name_length - 3] + "..."
-
-                        # If we drew an ellipse, place label along ellipse edge;
-                        # otherwise offset near marker
-                        if (
-                            should_draw_ellipse
-                            and has_dimensions
-                            and dim_maj is not None
-                            and dim_min is not None
-                        ):
-                            lx, ly, tang_deg = compute_ellipse_label_pose(
-                                int(x),
-                                int(y),
-                                float(dim_maj),
-                                float(dim_min),
-                                float(pa or 0.0),
-                                img_size,
-                                fov_w,
-                                fov_h,
-                                pa_deg,
-                                flip_x,
-                                theta_deg=45.0,
-                            )
-                            lx += 6
-                            ly += 4
-                            # Use ellipse label overrides if available
-                            label_color = self.ellipse_label_color
-                            try:
-                                font = self._get_info_panel_font(size=self.ellipse_label_font_size)
-                            except Exception:
-                                font = self.get_font()
-                        else:
-                            lx = x + self.text_offset[0]
-                            ly = y + self.text_offset[1]
-                            label_color = self.text_color
-                        try:
-                            if (
-                                should_draw_ellipse
-                                and has_dimensions
-                                and dim_maj is not None
-                                and dim_min is not None
-                            ):
-                                draw_text_rotated(
-                                    img,
-                                    name,
-                                    (int(lx), int(ly)),
-                                    float(tang_deg),
-                                    font,
-                                    label_color,
-                                )
-                            else:
-                                draw.text((lx, ly), name, fill=label_color, font=font)
-                        except Exception:
-                            draw.text((lx, ly), name, fill=label_color, font=font)
-                        objects_drawn += 1
-
-                except Exception as e:
-                    # More detailed error information for debugging
-                    if self.advanced_config.get("debug_simbad", False):
-                        self.logger.warning(f"Error processing object: {e}")
-                        self.logger.debug(
-                            "  Available columns: %s",
-                            row.colnames if hasattr(row, "colnames") else "No colnames",
+                    lx += 6
+                    ly += 4
+                    # Use ellipse label overrides if available
+                    label_color = self.ellipse_label_color
+                    try:
+                        font = self._get_info_panel_font(size=self.ellipse_label_font_size)
+                    except Exception:
+                        font = self.get_font()
+                else:
+                    lx = x + self.text_offset[0]
+                    ly = y + self.text_offset[1]
+                    label_color = self.text_color
+                try:
+                    if (
+                        should_draw_ellipse
+                        and has_dimensions
+                        and dim_maj is not None
+                        and dim_min is not None
+                    ):
+                        draw_text_rotated(
+                            img,
+                            name,
+                            (int(lx), int(ly)),
+                            float(tang_deg),
+                            font,
+                            label_color,
                         )
-                        if hasattr(row, "colnames") and "main_id" in row.colnames:
-                            self.logger.debug(f"  main_id value: {row['main_id']}")
                     else:
-                        self.logger.warning(f"Error processing object: {e}")
-                    continue
+                        draw.text((lx, ly), name, fill=label_color, font=font)
+                except Exception:
+                    draw.text((lx, ly), name, fill=label_color, font=font)
+                objects_drawn += 1
 
-            # Atomic save to avoid partial writes/race conditions
-            try:
-                out_dir = os.path.dirname(output_file) or "."
-                os.makedirs(out_dir, exist_ok=True)
-                fd, tmp_path = tempfile.mkstemp(suffix=".png", dir=out_dir)
-                os.close(fd)
-                try:
-                    img.save(tmp_path)
-                    os.replace(tmp_path, output_file)
-                finally:
-                    try:
-                        if os.path.exists(tmp_path):
-                            os.unlink(tmp_path)
-                    except Exception:
-                        pass
-            except Exception:
-                # Fallback to direct save if atomic path fails
-                img.save(output_file)
-            self.logger.info("Overlay with %d objects saved as %s", objects_drawn, output_file)
-            # Return path string to satisfy method signature
-            return str(output_file)
+            except Exception as e:
+                # More detailed error information for debugging
+                if self.advanced_config.get("debug_simbad", False):
+                    self.logger.warning(f"Error processing object: {e}")
+                    self.logger.debug(
+                        "  Available columns: %s",
+                        row.colnames if hasattr(row, "colnames") else "No colnames",
+                    )
+                    if hasattr(row, "colnames") and "main_id" in row.colnames:
+                        self.logger.debug(f"  main_id value: {row['main_id']}")
+                else:
+                    self.logger.warning(f"Error processing object: {e}")
+                continue
 
-        except Exception as e:
-            self.logger.error(f"Error: {e}")
-            # Re-raise or return a fallback path; we return the default filename
-            return output_file or self.default_filename
+        self.last_objects_drawn = objects_drawn
+        return img
 
     def _draw_solar_system(
         self,
@@ -943,55 +1336,25 @@ class OverlayGenerator:
         Uses the frame timestamp if available via FITS 'DATE-OBS' or capture metadata
         attached to the generator (optional). Falls back to current time if unavailable.
         """
-        try:
-            from astropy import constants as const
-            from astropy.coordinates import (
-                EarthLocation,
-                SkyCoord,
-                get_body,
-                solar_system_ephemeris,
-            )
-            from astropy.time import Time
-            import astropy.units as u
-        except Exception as e:
-            self.logger.debug(f"Astropy not available for solar system overlay: {e}")
-            return
-
         # Font for labels
         try:
             font_local = self.get_font()
         except Exception:
             font_local = None
 
-        # Ephemeris selection (optional)
-        try:
-            eph = str(self.solar_system_config.get("ephemeris", "de432s")).lower()
-            eph = {"de432": "de432s", "de430": "de430"}.get(eph, eph)
-            solar_system_ephemeris.set(eph)
-            self.logger.debug(f"Solar-system ephemeris set to: {eph}")
-        except Exception as e:
-            self.logger.debug(f"Could not set ephemeris: {e}")
-
-        # Site location from config (optional; defaults to geocenter)
+        # Shared ephemeris service for the site (ephemeris selection is optional)
         try:
+            eph = ephemeris_name(self.solar_system_config.get("ephemeris", "de432s"))
             site_cfg = self.config.get("site", {})
-            lat = float(site_cfg.get("latitude"))
-            lon = float(site_cfg.get("longitude"))
-            elev = float(site_cfg.get("elevation_m", 0.0))
-            location = EarthLocation(lat=lat * u.deg, lon=lon * u.deg, height=elev * u.m)
-        except Exception:
-            location = None
+            service = ephemeris_service_for_site(site_cfg, ephemeris=eph, logger=self.logger)
+        except Exception as e:
+            self.logger.debug(f"Ephemeris service unavailable: {e}")
+            return
 
         # Observation time: prefer frame timestamp if the generator has it
         # A caller can set self.frame_timestamp_iso = 'YYYY-MM-DDTHH:MM:SS'
-        try:
-            if hasattr(self, "frame_timestamp_iso") and self.frame_timestamp_iso:
-                obstime = Time(self.frame_timestamp_iso)
-            else:
-                obstime = Time.now()
-            self.logger.debug(f"Solar-system obstime: {obstime.isot}")
-        except Exception:
-            obstime = Time.now()
+        obstime = getattr(self, "frame_timestamp_iso", None) or None
+        self.logger.debug(f"Solar-system obstime: {obstime or 'now'}")
 
         center = SkyCoord(ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame="icrs")
         self.logger.debug(
@@ -1004,16 +1367,16 @@ class OverlayGenerator:
         )
         half_diag = (fov_w**2 + fov_h**2) ** 0.5 / 2.0
 
-        # Targets and radii
+        # Targets and mean radii (m); astropy.constants only has Earth, Jupiter and Sun
         bodies = [
-            ("Moon", const.R_moon),
-            ("Mercury", const.R_mercury),
-            ("Venus", const.R_venus),
-            ("Mars", const.R_mars),
-            ("Jupiter", const.R_jup),
-            ("Saturn", const.R_sat),
-            ("Uranus", const.R_uranus),
-            ("Neptune", const.R_neptune),
+            ("Moon", 1.7374e6),
+            ("Mercury", 2.4397e6),
+            ("Venus", 6.0518e6),
+            ("Mars", 3.3895e6),
+            ("Jupiter", 6.9911e7),
+            ("Saturn", 5.8232e7),
+            ("Uranus", 2.5362e7),
+            ("Neptune", 2.4622e7),
         ]
         # Optional config: include Pluto and set magnitude threshold to draw small/ dim bodies
         try:
@@ -1021,10 +1384,8 @@ class OverlayGenerator:
         except Exception:
             include_pluto = True
         if include_pluto:
-            try:
-                bodies.append(("Pluto", const.R_earth * 0.18))  # rough visual proxy
-            except Exception:
-                pass
+            bodies.append(("Pluto", 1.1883e6))
+        radii = {name.lower(): (name, R) for name, R in bodies}
 
         color = tuple(self.solar_system_config.get("color", [255, 255, 0, 255]))
         line_width = int(self.solar_system_config.get("line_width", 2))
@@ -1043,29 +1404,24 @@ class OverlayGenerator:
             except Exception:
                 return 0.0
 
-        # For each body, compute topocentric coordinate and draw if inside FOV
-        for name, R in bodies:
-            try:
-                if name == "Moon":
-                    coord = get_body("moon", obstime, location=location)
-                else:
-                    coord = get_body(name.lower(), obstime, location=location)
-
-                sep = coord.icrs.separation(center).degree
-                if sep > half_diag:
-                    continue
+        # Topocentric positions of the bodies inside the FOV (one vectorized query)
+        try:
+            in_fov = service.bodies_within(
+                ra_deg, dec_deg, half_diag, when=obstime, bodies=list(radii)
+            )
+        except Exception as e:
+            self.logger.debug(f"Solar-system positions unavailable: {e}")
+            return
 
-                # Distance (m). Some frames may lack distance; skip size if unavailable
-                dist_m = None
-                try:
-                    if hasattr(coord, "distance") and coord.distance is not None:
-                        dist_m = coord.distance.to(u.m).value
-                except Exception:
-                    dist_m = None
+        for body in in_fov:
+            try:
+                name, R = radii[body.name]
+                coord = SkyCoord(ra=body.ra_deg * u.deg, dec=body.dec_deg * u.deg, frame="icrs")
+                dist_m = body.distance_m
 
                 # Apparent diameter in arcmin (fallback sizes if distance missing)
                 if dist_m:
-                    dia_arcmin = apparent_diameter_arcmin(R.to(u.m).value, dist_m)
+                    dia_arcmin = apparent_diameter_arcmin(R, dist_m)
                 else:
                     # Use a smaller default for dim/remote bodies to ensure visibility when scaled
                     if name == "Moon":
@@ -1097,7 +1453,7 @@ class OverlayGenerator:
 
                 # Project to pixel coordinate
                 x, y = self.skycoord_to_pixel_with_rotation(
-                    coord.icrs,
+                    coord,
                     center,
                     img_size,
                     fov_w,
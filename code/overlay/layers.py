@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Cached overlay layers.
+
+Between two overlays at the same pointing only the info panel text (time,
+status messages) changes, yet every overlay used to redraw the title, the
+secondary FOV, the solar system bodies and all catalog markers and labels.
+The overlay is therefore drawn as separate RGBA layers:
+
+- title: static, depends on the image size only
+- info_panel: re-rendered when its text lines change
+- sky: secondary FOV, solar system and catalog objects, keyed by pointing
+  (SkyLayerKey); reused while center, scale and rotation differ by less than
+  tolerance_px pixels at the field edge, and re-rendered after max_age_s
+  (the Moon and planets move). A sky layer rendered after a failed or empty
+  SIMBAD query is not kept, so the next overlay queries again.
+
+and composed bottom to top in that order.
+
+    overlay:
+      layer_cache:
+        enabled: true
+        tolerance_px: 1.0    # max. marker shift when reusing the sky layer
+        sky_max_age_s: 300   # re-render the sky layer at least this often
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+from services.ephemeris import angular_separation_deg, radec_to_unit
+
+
+@dataclass(frozen=True)
+class SkyLayerKey:
+    """Inputs of the sky layer; compared with a pixel tolerance by within()."""
+
+    ra_deg: float
+    dec_deg: float
+    fov_width_deg: float
+    fov_height_deg: float
+    pa_deg: float
+    image_size: Tuple[int, int]
+    # Inputs that must match exactly (flips, magnitude limit, WCS, toggles)
+    options: Tuple[Any, ...] = ()
+
+    def within(self, other: "SkyLayerKey", tolerance_px: float) -> bool:
+        """True if other draws the same sky to within tolerance_px at the field edge."""
+        if self.image_size != other.image_size or self.options != other.options:
+            return False
+        width, height = self.image_size
+        if width <= 0 or height <= 0 or self.fov_width_deg <= 0 or self.fov_height_deg <= 0:
+            return self == other
+        half_diagonal_px = math.hypot(width, height) / 2.0
+        deg_per_px = max(self.fov_width_deg / width, self.fov_height_deg / height)
+        center = radec_to_unit(np.array([self.ra_deg]), np.array([self.dec_deg]))[0]
+        other_center = radec_to_unit(np.array([other.ra_deg]), np.array([other.dec_deg]))
+        shift_px = float(angular_separation_deg(other_center, center)[0]) / deg_per_px
+        dpa = abs((self.pa_deg - other.pa_deg + 180.0) % 360.0 - 180.0)
+        rotation_px = math.radians(dpa) * half_diagonal_px
+        scale_px = half_diagonal_px * max(
+            abs(other.fov_width_deg / self.fov_width_deg - 1.0),
+            abs(other.fov_height_deg / self.fov_height_deg - 1.0),
+        )
+        return max(shift_px, rotation_px, scale_px) <= tolerance_px
+
+
+@dataclass
+class _Entry:
+    key: Any
+    image: Image.Image
+    rendered_at: float
+
+
+class OverlayLayerCache:
+    """RGBA layers by name, re-rendered only when their inputs change."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        tolerance_px: float = 1.0,
+        sky_max_age_s: Optional[float] = 300.0,
+    ) -> None:
+        self.enabled = bool(enabled)
+        self.tolerance_px = max(0.0, float(tolerance_px))
+        self.sky_max_age_s = None if sky_max_age_s is None else float(sky_max_age_s)
+        self._entries: Dict[str, _Entry] = {}
+        # Last composition: ids of its layers (kept referenced) and the result
+        self._composed: Optional[Tuple[Tuple[int, ...], Image.Image]] = None
+        self._composed_layers: list = []
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_config(cls, overlay_config: Dict[str, Any]) -> "OverlayLayerCache":
+        cfg = overlay_config.get("layer_cache", {}) or {}
+        max_age = cfg.get("sky_max_age_s", 300.0)
+        return cls(
+            enabled=bool(cfg.get("enabled", True)),
+            tolerance_px=float(cfg.get("tolerance_px", 1.0)),
+            sky_max_age_s=None if max_age is None else float(max_age),
+        )
+
+    def layer(
+        self,
+        name: str,
+        key: Any,
+        render: Callable[[], Image.Image],
+        max_age_s: Optional[float] = None,
+    ) -> Image.Image:
+        """Cached layer for key, or render() it.
+
+        SkyLayerKey keys match within tolerance_px, other keys by equality.
+        """
+        stats = self._stats.setdefault(name, {"hits": 0, "renders": 0})
+        entry = self._entries.get(name)
+        if self.enabled and entry is not None and self._matches(entry.key, key):
+            fresh = max_age_s is None or time.monotonic() - entry.rendered_at <= max_age_s
+            if fresh:
+                stats["hits"] += 1
+                return entry.image
+        image = render()
+        stats["renders"] += 1
+        if self.enabled:
+            self._entries[name] = _Entry(key, image, time.monotonic())
+        return image
+
+    def _matches(self, cached: Any, key: Any) -> bool:
+        if isinstance(cached, SkyLayerKey) and isinstance(key, SkyLayerKey):
+            return cached.within(key, self.tolerance_px)
+        try:
+            return bool(cached == key)
+        except Exception:
+            return False
+
+    def compose(
+        self, size: Tuple[int, int], layers: Sequence[Optional[Image.Image]]
+    ) -> Image.Image:
+        """Stack layers bottom to top into one RGBA image.
+
+        Returns the previous image object if no layer changed, so consumers
+        keyed on the overlay object (OverlayCompositor) skip their preparation.
+        """
+        present = [layer for layer in layers if layer is not None]
+        ids = tuple(id(layer) for layer in present)
+        if self.enabled and self._composed is not None and self._composed[0] == ids:
+            return self._composed[1]
+        if len(present) == 1:
+            composed = present[0]
+        else:
+            composed = Image.new("RGBA", size, (0, 0, 0, 0))
+            for layer in present:
+                if layer.size != composed.size:
+                    layer = layer.resize(composed.size, Image.Resampling.LANCZOS)
+                composed.alpha_composite(layer)
+        if self.enabled:
+            self._composed = (ids, composed)
+            self._composed_layers = present
+        return composed
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop one layer (or all) so it is re-rendered next time."""
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+        self._composed = None
+        self._composed_layers = []
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(values) for name, values in self._stats.items()}
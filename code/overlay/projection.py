@@ -35,9 +35,66 @@ def skycoord_to_pixel_with_rotation(
     Returns:
         (x, y) pixel coordinates
     """
+    # Backward compatibility: allow legacy 'is_flipped' kwarg
+    if not flip_x and "is_flipped" in _legacy_kwargs:
+        try:
+            flip_x = bool(_legacy_kwargs.get("is_flipped", False))
+        except Exception:
+            flip_x = False
+
+    xs, ys = radec_to_pixel_arrays(
+        [obj_ra_deg],
+        [obj_dec_deg],
+        center_ra_deg,
+        center_dec_deg,
+        size_px,
+        fov_width_deg,
+        fov_height_deg,
+        position_angle_deg=position_angle_deg,
+        flip_x=flip_x,
+        flip_y=flip_y,
+        ra_increases_left=ra_increases_left,
+    )
+    # Use rounding to make flip symmetry exact in tests
+    return int(round(float(xs[0]))), int(round(float(ys[0])))
+
+
+def radec_to_pixel_arrays(
+    ra_deg,
+    dec_deg,
+    center_ra_deg: float,
+    center_dec_deg: float,
+    size_px: Tuple[int, int],
+    fov_width_deg: float,
+    fov_height_deg: float,
+    position_angle_deg: float = 0.0,
+    flip_x: bool = False,
+    flip_y: bool = False,
+    ra_increases_left: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized variant of ``skycoord_to_pixel_with_rotation``.
+
+    Args:
+        ra_deg: Array-like of object RA values in degrees
+        dec_deg: Array-like of object Dec values in degrees
+        center_ra_deg: Image center RA in degrees
+        center_dec_deg: Image center Dec in degrees
+        size_px: (width, height) in pixels
+        fov_width_deg: Field of view width in degrees
+        fov_height_deg: Field of view height in degrees
+        position_angle_deg: Rotation angle (degrees)
+        flip_x: Mirror in X
+        flip_y: Mirror in Y
+        ra_increases_left: Astronomical convention toggle
+    Returns:
+        (x, y) float64 arrays of unrounded pixel coordinates; NaN inputs stay NaN
+    """
+    ra = np.asarray(ra_deg, dtype=np.float64)
+    dec = np.asarray(dec_deg, dtype=np.float64)
+
     # Angular separations (arcmin), scale RA by cos(dec)
-    delta_ra_basic_arcmin = (obj_ra_deg - center_ra_deg) * 60.0 * np.cos(np.deg2rad(center_dec_deg))
-    delta_dec_arcmin = (obj_dec_deg - center_dec_deg) * 60.0
+    delta_ra_basic_arcmin = (ra - center_ra_deg) * 60.0 * np.cos(np.deg2rad(center_dec_deg))
+    delta_dec_arcmin = (dec - center_dec_deg) * 60.0
 
     delta_ra_arcmin = -delta_ra_basic_arcmin if ra_increases_left else delta_ra_basic_arcmin
 
@@ -58,20 +115,12 @@ def skycoord_to_pixel_with_rotation(
     x = size_px[0] / 2.0 + (delta_ra_rot / scale_x)
     y = size_px[1] / 2.0 - (delta_dec_rot / scale_y)
 
-    # Backward compatibility: allow legacy 'is_flipped' kwarg
-    if not flip_x and "is_flipped" in _legacy_kwargs:
-        try:
-            flip_x = bool(_legacy_kwargs.get("is_flipped", False))
-        except Exception:
-            flip_x = False
-
     if flip_x:
         x = size_px[0] - x
     if flip_y:
         y = size_px[1] - y
 
-    # Use rounding to make flip symmetry exact in tests
-    return int(round(x)), int(round(y))
+    return x, y
 
 
 def skycoord_to_pixel_wcs(
@@ -93,11 +142,16 @@ def skycoord_to_pixel_wcs(
     converts world (RA,Dec) to pixel coordinates via astropy.wcs.
     """
     try:
-        from astropy.coordinates import SkyCoord
-        import astropy.io.fits as fits
-        import astropy.units as u
-        from astropy.wcs import WCS
-    except Exception as _e:
+        w, size_px = build_projection_wcs(
+            center_ra_deg,
+            center_dec_deg,
+            size_px,
+            pixel_scale_arcsec,
+            position_angle_deg=position_angle_deg,
+            ra_increases_left=ra_increases_left,
+            wcs_path=wcs_path,
+        )
+    except ImportError:
         # Fallback to math path if astropy is unavailable
         return skycoord_to_pixel_with_rotation(
             obj_ra_deg,
@@ -114,62 +168,111 @@ def skycoord_to_pixel_wcs(
             ra_increases_left=ra_increases_left,
         )
 
-    # Construct WCS
+    xs, ys = radec_to_pixel_arrays_wcs(
+        [obj_ra_deg], [obj_dec_deg], w, size_px, flip_x=flip_x, flip_y=flip_y
+    )
+    return int(round(float(xs[0]))), int(round(float(ys[0])))
+
+
+def build_projection_wcs(
+    center_ra_deg: float | None,
+    center_dec_deg: float | None,
+    size_px: Tuple[int, int] | None,
+    pixel_scale_arcsec: float | None,
+    position_angle_deg: float = 0.0,
+    ra_increases_left: bool = True,
+    wcs_path: str | None = None,
+):
+    """Build the WCS used for projection once so it can be reused for many objects.
+
+    Either parses the header of an existing WCS FITS (the pixel data is never read)
+    or constructs a synthetic TAN WCS from center, pixel scale and PA.
+
+    Returns:
+        (WCS, size_px) where size_px falls back to NAXIS1/NAXIS2 of the header
+        when not provided.
+
+    Raises:
+        ImportError: If astropy is not available
+    """
+    import astropy.io.fits as fits
+    from astropy.wcs import WCS
+
     # Build WCS either from an existing WCS FITS or synthetic parameters
     if wcs_path:
-        with fits.open(wcs_path) as hdul:
-            w = WCS(hdul[0].header)
-            if size_px is None:
-                data = hdul[0].data
-                if data is not None and hasattr(data, "shape"):
-                    if data.ndim == 2:
-                        height, width = data.shape
-                    elif data.ndim == 3:
-                        height, width = data.shape[-2], data.shape[-1]
-                    else:
-                        height = int(hdul[0].header.get("NAXIS2", 0))
-                        width = int(hdul[0].header.get("NAXIS1", 0))
-                    size_px = (int(width), int(height))
+        header = fits.getheader(wcs_path, 0)
+        w = WCS(header)
+        if size_px is None:
+            naxis = int(header.get("NAXIS", 0))
+            width = int(header.get("NAXIS1", 0)) if naxis >= 1 else 0
+            height = int(header.get("NAXIS2", 0)) if naxis >= 2 else 0
+            size_px = (width, height)
+        return w, size_px
+
+    w = WCS(naxis=2)
+    w.wcs.crval = [float(center_ra_deg or 0.0), float(center_dec_deg or 0.0)]
+    # CRPIX is 1-based in FITS, but astropy uses 1-based internally with WCS
+    # We set CRPIX to exact image center in 1-based coordinates
+    width_px, height_px = size_px or (1, 1)
+    w.wcs.crpix = [width_px / 2.0 + 0.5, height_px / 2.0 + 0.5]
+    w.wcs.ctype = ["RA---TAN", "DEC--TAN"]
+    w.wcs.cunit = ["deg", "deg"]
+
+    scale_deg = float(pixel_scale_arcsec or 1.0) / 3600.0
+    pa_rad = float(position_angle_deg) * np.pi / 180.0
+    cos_pa = np.cos(pa_rad)
+    sin_pa = np.sin(pa_rad)
+
+    # RA handedness: RA increases left implies negative CD1_1 baseline
+    if ra_increases_left:
+        cd11 = -scale_deg * cos_pa
+        cd12 = scale_deg * sin_pa
     else:
-        w = WCS(naxis=2)
-        w.wcs.crval = [float(center_ra_deg or 0.0), float(center_dec_deg or 0.0)]
-        # CRPIX is 1-based in FITS, but astropy uses 1-based internally with WCS
-        # We set CRPIX to exact image center in 1-based coordinates
-        width_px, height_px = size_px or (1, 1)
-        w.wcs.crpix = [width_px / 2.0 + 0.5, height_px / 2.0 + 0.5]
-        w.wcs.ctype = ["RA---TAN", "DEC--TAN"]
-        w.wcs.cunit = ["deg", "deg"]
-
-        scale_deg = float(pixel_scale_arcsec or 1.0) / 3600.0
-        pa_rad = float(position_angle_deg) * np.pi / 180.0
-        cos_pa = np.cos(pa_rad)
-        sin_pa = np.sin(pa_rad)
-
-        # RA handedness: RA increases left implies negative CD1_1 baseline
-        if ra_increases_left:
-            cd11 = -scale_deg * cos_pa
-            cd12 = scale_deg * sin_pa
-        else:
-            cd11 = scale_deg * cos_pa
-            cd12 = -scale_deg * sin_pa
-        cd21 = scale_deg * sin_pa
-        cd22 = scale_deg * cos_pa
-        w.wcs.cd = np.array([[cd11, cd12], [cd21, cd22]], dtype=float)
-
-    # World to pixel (astropy returns 1-based pixel coords if using WCS directly)
-    sc = SkyCoord(ra=float(obj_ra_deg) * u.deg, dec=float(obj_dec_deg) * u.deg, frame="icrs")
-    x1_f, y1_f = w.world_to_pixel(sc)  # returns 0-based floats in FITS/WCS (Y up)
+        cd11 = scale_deg * cos_pa
+        cd12 = -scale_deg * sin_pa
+    cd21 = scale_deg * sin_pa
+    cd22 = scale_deg * cos_pa
+    w.wcs.cd = np.array([[cd11, cd12], [cd21, cd22]], dtype=float)
+    return w, size_px
+
+
+def radec_to_pixel_arrays_wcs(
+    ra_deg,
+    dec_deg,
+    wcs,
+    size_px: Tuple[int, int] | None,
+    flip_x: bool = False,
+    flip_y: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Project RA/Dec arrays through a prepared WCS in a single call.
+
+    Args:
+        ra_deg: Array-like of object RA values in degrees
+        dec_deg: Array-like of object Dec values in degrees
+        wcs: WCS from ``build_projection_wcs``
+        size_px: (width, height) used for optional flips
+        flip_x: Mirror in X
+        flip_y: Mirror in Y
+    Returns:
+        (x, y) float64 arrays of 0-based pixel coordinates
+    """
+    ra = np.asarray(ra_deg, dtype=np.float64)
+    dec = np.asarray(dec_deg, dtype=np.float64)
+    if ra.size == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+
+    # all_world2pix applies distortion terms (SIP) as well; origin=0 gives 0-based pixels
+    x, y = wcs.all_world2pix(ra, dec, 0, quiet=True)
+    x = np.asarray(x, dtype=np.float64)
+    # WCS Y is kept as-is (no Y-down conversion), matching the scalar path
+    y = np.asarray(y, dtype=np.float64)
 
     # Apply optional flips in pixel space to match display conventions
-    x = float(x1_f)
-    # Convert WCS (Y up) to display coordinates (Y down)
     width_px = int(size_px[0]) if size_px is not None else 0
     height_px = int(size_px[1]) if size_px is not None else 0
-    # y = float(height_px - y1_f)
-    y = float(y1_f)
     if flip_x:
         x = float(width_px) - x
     if flip_y:
         y = float(height_px) - y
 
-    return int(round(x)), int(round(y))
+    return x, y
@@ -1,9 +1,11 @@
 # overlay_runner.py
+from collections import OrderedDict
 from datetime import datetime
 import logging
 import os
+import shutil
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
 
 # Import with error handling
 try:
@@ -30,8 +32,12 @@ except ImportError as e:
     print(f"Warning: Overlay generator not available: {e}")
     OVERLAY_AVAILABLE = False
 
+from services.stream_server import StreamServer, create_stream_server
 from status import Status, error_status, success_status
 
+# Rendered overlays kept for compositing (main, wait and fallback overlays)
+_MAX_OVERLAY_IMAGES = 4
+
 
 class OverlayRunner:
     def __init__(self, config, logger=None):
@@ -108,6 +114,20 @@ class OverlayRunner:
         self._last_overlay_path: Optional[str] = None
         self._last_overlay_ra_deg: Optional[float] = None
         self._last_overlay_dec_deg: Optional[float] = None
+        # In-memory compositing: overlays stay RGBA images and are blended onto the
+        # display frame; the overlay PNG is still written unless save_overlay_file is off
+        compositing_cfg = overlay_cfg.get("compositing", {}) or {}
+        self.composite_in_memory: bool = bool(compositing_cfg.get("in_memory", True))
+        self.save_overlay_file: bool = bool(
+            compositing_cfg.get("save_overlay_file", True) or not self.composite_in_memory
+        )
+        # Recently rendered overlay images by output path (bounded)
+        self._overlay_images: "OrderedDict[str, Any]" = OrderedDict()
+        # Overlay paths whose file holds the remembered image
+        self._overlay_files_current: Set[str] = set()
+
+        # Live HTTP stream of combined frames (overlay.stream_server, off by default)
+        self.stream_server: Optional[StreamServer] = create_stream_server(config, self.logger)
 
         # Initialize components
         self._initialize_components()
@@ -303,6 +323,87 @@ class OverlayRunner:
         except Exception:
             return 180.0
 
+    def _remember_overlay_image(self, path: str, image: Any, file_written: bool = False) -> None:
+        self._overlay_images[path] = image
+        self._overlay_images.move_to_end(path)
+        if file_written:
+            self._overlay_files_current.add(path)
+        else:
+            self._overlay_files_current.discard(path)
+        while len(self._overlay_images) > _MAX_OVERLAY_IMAGES:
+            evicted, _ = self._overlay_images.popitem(last=False)
+            self._overlay_files_current.discard(evicted)
+
+    def _combine_with_latest_frame(
+        self,
+        overlay_file: Optional[str],
+        combined_file: str,
+        frame_candidates: Sequence[str] = (),
+    ) -> Optional[Status]:
+        """Combine an overlay with the latest frame into combined_file.
+
+        Blends the in-memory overlay onto the latest display frame when possible;
+        otherwise combines the overlay file with the latest frame file (or the
+        first existing frame_candidates entry). A remembered overlay image always
+        takes precedence over an existing overlay file.
+
+        Returns:
+            Status of the combine, or None if no frame is available
+        """
+        vp = self.video_processor
+        if vp is None or not overlay_file:
+            return None
+        image = self._overlay_images.get(overlay_file)
+        if image is not None and hasattr(vp, "composite_overlay"):
+            status: Status = vp.composite_overlay(image, combined_file)
+            if status.is_success:
+                return status
+            self.logger.debug("In-memory composite unavailable: %s", status.message)
+        latest_frame = vp.get_latest_frame_path() if hasattr(vp, "get_latest_frame_path") else None
+        if not latest_frame:
+            latest_frame = next((c for c in frame_candidates if os.path.exists(c)), None)
+        if not latest_frame or not os.path.exists(latest_frame):
+            return None
+        if image is not None and overlay_file not in self._overlay_files_current:
+            # The file may hold an older overlay: rewrite it from the current image
+            self._save_overlay_image(image, overlay_file)
+            self._overlay_files_current.add(overlay_file)
+        combined: Status = vp.combine_overlay_with_image(latest_frame, overlay_file, combined_file)
+        return combined
+
+    def _save_overlay_image(self, image: Any, path: str) -> None:
+        generator = getattr(self.video_processor, "overlay_generator", None)
+        if generator is not None and hasattr(generator, "save_overlay"):
+            generator.save_overlay(image, path)
+        else:
+            image.save(path)
+
+    def _write_combined(
+        self, overlay_file: Optional[str], combined_file: str, reused: bool = False
+    ) -> None:
+        """Write combined_file: overlay on the latest frame, else the overlay alone."""
+        if not overlay_file:
+            return
+        kind = "reused" if reused else "created"
+        status = self._combine_with_latest_frame(overlay_file, combined_file)
+        if status is not None:
+            if status.is_success:
+                self.logger.info("Combined image %s: %s", kind, combined_file)
+            else:
+                self.logger.warning("Failed to combine images: %s", status.message)
+            return
+        try:
+            image = self._overlay_images.get(overlay_file)
+            if image is not None:
+                self._save_overlay_image(image, combined_file)
+            elif os.path.exists(overlay_file):
+                shutil.copyfile(overlay_file, combined_file)
+            else:
+                return
+            self.logger.info("Combined (copied, %s): %s", kind, combined_file)
+        except Exception as e:
+            self.logger.debug(f"Copying overlay to {combined_file} failed: {e}")
+
     def generate_overlay_with_coords(
         self,
         ra_deg: float,
@@ -435,24 +536,39 @@ class OverlayRunner:
                 # Non-fatal; continue with rendering
                 pass
 
-            # Generate overlay and wrap result into a Status
-            overlay_path = overlay_generator.generate_overlay(
-                ra_deg=ra_deg,
-                dec_deg=dec_deg,
-                output_file=output_file,
-                fov_width_deg=fov_width_deg,
-                fov_height_deg=fov_height_deg,
-                position_angle_deg=position_angle_deg,
-                image_size=image_size,
-                mag_limit=mag_limit,
-                flip_x=is_flipped,
-                flip_y=flip_y,
-                status_messages=status_messages,
-                wcs_path=wcs_path,
-            )
+            render_kwargs: Dict[str, Any] = {
+                "ra_deg": ra_deg,
+                "dec_deg": dec_deg,
+                "fov_width_deg": fov_width_deg,
+                "fov_height_deg": fov_height_deg,
+                "position_angle_deg": position_angle_deg,
+                "image_size": image_size,
+                "mag_limit": mag_limit,
+                "flip_x": is_flipped,
+                "flip_y": flip_y,
+                "status_messages": status_messages,
+                "wcs_path": wcs_path,
+            }
+            if self.composite_in_memory and hasattr(overlay_generator, "render_overlay"):
+                # Keep the RGBA image for in-memory compositing; the file is optional
+                overlay_image = overlay_generator.render_overlay(**render_kwargs)
+                overlay_path = str(output_file or overlay_generator.default_filename)
+                written = self.save_overlay_file
+                if written:
+                    overlay_generator.save_overlay(overlay_image, overlay_path)
+                self._remember_overlay_image(overlay_path, overlay_image, file_written=written)
+            else:
+                overlay_path = overlay_generator.generate_overlay(
+                    output_file=output_file, **render_kwargs
+                )
+                written = True
 
             self.logger.info("Overlay generated successfully: %s", overlay_path)
-            return success_status("Overlay generated successfully", data=overlay_path)
+            return success_status(
+                "Overlay generated successfully",
+                data=overlay_path,
+                details={"overlay_file_written": written},
+            )
 
         except Exception as e:
             self.logger.error(f"Error generating overlay: {e}")
@@ -484,6 +600,7 @@ class OverlayRunner:
         try:
             # Observation session is already started in __init__
             self.running = True
+            self._start_stream_server()
 
             # Try to connect to ASCOM mount if available; otherwise continue without it
             mount_obj = None
@@ -517,8 +634,29 @@ class OverlayRunner:
             # ASCOMMount is a context manager, so it will be cleaned up automatically
             if self.video_processor:
                 self.video_processor.stop()
+            self._stop_stream_server()
             self.logger.info("Overlay Runner stopped.")
 
+    def _start_stream_server(self) -> None:
+        """Start the stream server and let the video processor feed it."""
+        if self.stream_server is None:
+            return
+        try:
+            self.stream_server.start()
+        except Exception as e:
+            self.logger.error(f"Stream server could not start: {e}")
+            self.stream_server = None
+            return
+        if self.video_processor is not None:
+            self.video_processor.frame_hub = self.stream_server.hub
+
+    def _stop_stream_server(self) -> None:
+        if self.stream_server is None:
+            return
+        if self.video_processor is not None:
+            self.video_processor.frame_hub = None
+        self.stream_server.stop()
+
     def _main_loop(self) -> None:
         """Inner main loop, supports operation with or without a mount."""
         try:
@@ -910,50 +1048,16 @@ class OverlayRunner:
                                                         )
                                                     except Exception:
                                                         pass
-                                                    overlay_file_w = self._last_overlay_path
                                                     combined_file_w = (
                                                         f"combined_{datetime.now().strftime(self.timestamp_format)}.png"
                                                         if self.use_timestamps
                                                         else "combined.png"
                                                     )
-                                                    # If latest frame exists, combine; else copy
-                                                    latest_frame_w = None
-                                                    if self.video_processor and hasattr(
-                                                        self.video_processor,
-                                                        "get_latest_frame_path",
-                                                    ):
-                                                        latest_frame_w = (
-                                                            self.video_processor.get_latest_frame_path()
-                                                        )
-                                                    if latest_frame_w and os.path.exists(
-                                                        latest_frame_w
-                                                    ):
-                                                        comb_fn = (
-                                                            self.video_processor.combine_overlay_with_image
-                                                        )
-                                                        _st = comb_fn(
-                                                            latest_frame_w,
-                                                            overlay_file_w,
-                                                            combined_file_w,
-                                                        )
-                                                        if _st.is_success:
-                                                            self.logger.info(
-                                                                "Combined (reused) image: %s",
-                                                                combined_file_w,
-                                                            )
-                                                    else:
-                                                        try:
-                                                            import shutil as _shutil
-
-                                                            _shutil.copyfile(
-                                                                overlay_file_w, combined_file_w
-                                                            )
-                                                            self.logger.info(
-                                                                "Combined (copied, reused): %s",
-                                                                combined_file_w,
-                                                            )
-                                                        except Exception:
-                                                            pass
+                                                    self._write_combined(
+                                                        self._last_overlay_path,
+                                                        combined_file_w,
+                                                        reused=True,
+                                                    )
                                                     # Reset timer and continue waiting for solve
                                                     t_wait_start = time.time()
                                                     time.sleep(0.5)
@@ -1037,43 +1141,9 @@ class OverlayRunner:
                                                     if self.use_timestamps
                                                     else "combined.png"
                                                 )
-                                                latest_frame_w = None
-                                                if self.video_processor and hasattr(
-                                                    self.video_processor,
-                                                    "get_latest_frame_path",
-                                                ):
-                                                    latest_frame_w = (
-                                                        self.video_processor.get_latest_frame_path()
-                                                    )
-                                                if latest_frame_w and os.path.exists(
-                                                    latest_frame_w
-                                                ):
-                                                    comb_fn = (
-                                                        self.video_processor.combine_overlay_with_image
-                                                    )
-                                                    _st = comb_fn(
-                                                        latest_frame_w,
-                                                        overlay_file_w,
-                                                        combined_file_w,
-                                                    )
-                                                    if _st.is_success:
-                                                        self.logger.info(
-                                                            "Combined image created: %s",
-                                                            combined_file_w,
-                                                        )
-                                                else:
-                                                    try:
-                                                        import shutil as _shutil
-
-                                                        _shutil.copyfile(
-                                                            overlay_file_w, combined_file_w
-                                                        )
-                                                        self.logger.info(
-                                                            "Combined (copied) image: %s",
-                                                            combined_file_w,
-                                                        )
-                                                    except Exception:
-                                                        pass
+                                                self._write_combined(
+                                                    overlay_file_w, combined_file_w
+                                                )
                                         except Exception as _e:
                                             self.logger.debug(
                                                 f"Combine during wait-fallback failed: {_e}"
@@ -1254,32 +1324,7 @@ class OverlayRunner:
                                         self._last_overlay_dec_deg = float(dec_f)
                                     except Exception:
                                         pass
-                                    latest_frame_m = None
-                                    if self.video_processor and hasattr(
-                                        self.video_processor, "get_latest_frame_path"
-                                    ):
-                                        latest_frame_m = (
-                                            self.video_processor.get_latest_frame_path()
-                                        )
-                                    if latest_frame_m and os.path.exists(latest_frame_m):
-                                        comb_fn_m = self.video_processor.combine_overlay_with_image
-                                        _st_m = comb_fn_m(
-                                            latest_frame_m, overlay_file_m, combined_file_m
-                                        )
-                                        if _st_m.is_success:
-                                            self.logger.info(
-                                                "Combined image created: %s", combined_file_m
-                                            )
-                                    else:
-                                        try:
-                                            import shutil as _shutil
-
-                                            _shutil.copyfile(overlay_file_m, combined_file_m)
-                                            self.logger.info(
-                                                "Combined (copied) image: %s", combined_file_m
-                                            )
-                                        except Exception:
-                                            pass
+                                    self._write_combined(overlay_file_m, combined_file_m)
                                 except Exception as _e:
                                     self.logger.debug(
                                         f"Combine for Moon minimal overlay failed: {_e}"
@@ -1403,35 +1448,22 @@ class OverlayRunner:
                             self.video_processor, "combine_overlay_with_image"
                         ):
                             try:
-                                # Get the latest captured frame
-                                latest_frame = self.video_processor.get_latest_frame_path()
-                                # If None, try the latest FITS fallback (for display combine)
-                                if not latest_frame:
-                                    try:
-                                        # Prefer most recent PNG/JPG; simple fixed-name fallback
-                                        plate_dir = self.video_processor.frame_config.get(
-                                            "plate_solve_dir", "plate_solve_frames"
-                                        )
-                                        cand = os.path.join(plate_dir, "capture.png")
-                                        if os.path.exists(cand):
-                                            latest_frame = cand
-                                    except Exception:
-                                        pass
-                                if latest_frame and os.path.exists(latest_frame):
-                                    # Generate combined image filename
-                                    if self.use_timestamps:
-                                        timestamp = datetime.now().strftime(self.timestamp_format)
-                                        combined_file = f"combined_{timestamp}.png"
-                                    else:
-                                        combined_file = "combined.png"
-
-                                    # Combine overlay with captured image
-                                    # FITS headers preserved via FrameWriter
-                                    combine = self.video_processor.combine_overlay_with_image
-                                    combine_status = combine(
-                                        latest_frame, overlay_file, combined_file
-                                    )
-
+                                # Generate combined image filename
+                                if self.use_timestamps:
+                                    timestamp = datetime.now().strftime(self.timestamp_format)
+                                    combined_file = f"combined_{timestamp}.png"
+                                else:
+                                    combined_file = "combined.png"
+                                # Without a frame path, try the fixed-name display frame
+                                plate_dir = self.video_processor.frame_config.get(
+                                    "plate_solve_dir", "plate_solve_frames"
+                                )
+                                combine_status = self._combine_with_latest_frame(
+                                    overlay_file,
+                                    combined_file,
+                                    frame_candidates=[os.path.join(plate_dir, "capture.png")],
+                                )
+                                if combine_status is not None:
                                     if combine_status.is_success:
                                         self.logger.info(
                                             "Combined image created: %s", combined_file
@@ -1574,38 +1606,7 @@ class OverlayRunner:
                                             self._last_overlay_dec_deg = float(dec_deg)
                                         except Exception:
                                             pass
-                                        latest_frame_fb = None
-                                        if self.video_processor and hasattr(
-                                            self.video_processor, "get_latest_frame_path"
-                                        ):
-                                            latest_frame_fb = (
-                                                self.video_processor.get_latest_frame_path()
-                                            )
-                                        if latest_frame_fb and os.path.exists(latest_frame_fb):
-                                            comb_fn_fb = (
-                                                self.video_processor.combine_overlay_with_image
-                                            )
-                                            _st_fb = comb_fn_fb(
-                                                latest_frame_fb,
-                                                overlay_file_fb,
-                                                combined_file_fb,
-                                            )
-                                            if _st_fb.is_success:
-                                                self.logger.info(
-                                                    "Combined image created: %s",
-                                                    combined_file_fb,
-                                                )
-                                        else:
-                                            try:
-                                                import shutil as _shutil
-
-                                                _shutil.copyfile(overlay_file_fb, combined_file_fb)
-                                                self.logger.info(
-                                                    "Combined (copied) image: %s",
-                                                    combined_file_fb,
-                                                )
-                                            except Exception:
-                                                pass
+                                        self._write_combined(overlay_file_fb, combined_file_fb)
                                 except Exception as _e:
                                     self.logger.debug(
                                         f"Combine for fallback minimal overlay failed: {_e}"
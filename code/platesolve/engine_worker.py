@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Long-lived astrometry-engine worker.
+
+`solve-field` starts a new astrometry-engine for every image, which reloads the
+index files each time. This worker keeps one engine process running and feeds
+it augmented xylist (.axy) file names on stdin (``astrometry-engine -f -``), so
+the index data stays loaded between solves.
+
+One request is in flight at a time. A request is finished when
+
+    solved: the WCS file named in the .axy has been written completely
+    failed: the engine's final line for the field says it did not solve, or it exits
+    timeout: no result within the timeout (the engine is restarted)
+
+The engine logs "Field 1 did not solve (index ..., field objects ...)" for every
+index and object range it tries; those lines are progress, not a result, since a
+later index can still solve the field.
+
+The engine is started on the first request and restarted after it exits.
+"""
+
+import logging
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+# Final engine log line of a field that did not solve; the per-index lines carry
+# "(index ..., field objects ...)" and do not match
+_FIELD_FAILED_PATTERN = re.compile(r"^\s*Field \d+ did not solve\.?\s*$", re.IGNORECASE)
+
+# A complete FITS file is a whole number of 2880-byte blocks
+_FITS_BLOCK = 2880
+
+
+def wcs_file_complete(path: str) -> bool:
+    """True if a FITS file exists and ends on a block boundary."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    return size > 0 and size % _FITS_BLOCK == 0
+
+
+class AstrometryEngineWorker:
+    """Keep an astrometry-engine process alive and solve .axy files one at a time."""
+
+    def __init__(self, command: Sequence[str], logger: Optional[logging.Logger] = None) -> None:
+        """Initialize the worker (the process starts on the first request).
+
+        Args:
+            command: Engine command line reading .axy paths from stdin
+            logger: Logger instance
+        """
+        self.command: List[str] = list(command)
+        self.logger = logger or logging.getLogger(__name__)
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[str]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.solves = 0
+        self.restarts = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        """Start the engine process if it is not running."""
+        if self.is_running:
+            return
+        if self._proc is not None:
+            self.restarts += 1
+            self.logger.warning("astrometry-engine exited; restarting")
+        self.logger.info("Starting astrometry-engine: %s", " ".join(self.command))
+        self._lines = queue.Queue()
+        self._proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        threading.Thread(
+            target=self._read_output,
+            args=(self._proc, self._lines),
+            name="AstrometryEngineOutput",
+            daemon=True,
+        ).start()
+
+    def _read_output(self, proc: subprocess.Popen, lines: "queue.Queue[str]") -> None:
+        if proc.stdout is None:
+            return
+        for line in proc.stdout:
+            line = line.rstrip()
+            self.logger.debug("astrometry-engine: %s", line)
+            lines.put(line)
+
+    def solve(self, axy_path: str, wcs_path: str, timeout_s: float) -> Tuple[bool, str]:
+        """Hand one .axy file to the engine and wait for its result.
+
+        Args:
+            axy_path: Augmented xylist, as written by ``solve-field --just-augment``
+            wcs_path: WCS output file named in the .axy
+            timeout_s: Maximum wait
+
+        Returns:
+            (solved, engine output of this request)
+        """
+        with self._lock:
+            self.start()
+            assert self._proc is not None and self._proc.stdin is not None
+            while not self._lines.empty():
+                self._lines.get_nowait()
+            output: List[str] = []
+            if os.path.exists(wcs_path):
+                os.remove(wcs_path)
+            self._proc.stdin.write(axy_path + "\n")
+            self._proc.stdin.flush()
+            deadline = time.monotonic() + timeout_s
+            while time.monotonic() < deadline:
+                if wcs_file_complete(wcs_path):
+                    self.solves += 1
+                    return True, "\n".join(output)
+                try:
+                    line = self._lines.get(timeout=0.02)
+                except queue.Empty:
+                    if not self.is_running:
+                        output.append("astrometry-engine exited")
+                        return False, "\n".join(output)
+                    continue
+                output.append(line)
+                if _FIELD_FAILED_PATTERN.match(line):
+                    return False, "\n".join(output)
+            # A stuck request would block all later ones
+            self.logger.warning(f"astrometry-engine timed out after {timeout_s}s; restarting")
+            self._kill()
+            output.append(f"timed out after {timeout_s}s")
+            return False, "\n".join(output)
+
+    def cancel(self) -> None:
+        """Abort the request in flight by killing the engine (restarted on the next request)."""
+        if self.is_running and self._lock.locked():
+            self.logger.info("Cancelling astrometry-engine request")
+            self._kill()
+
+    def _kill(self) -> None:
+        if self._proc is None:
+            return
+        try:
+            self._proc.kill()
+            self._proc.wait(timeout=5)
+        except Exception:
+            pass
+
+    def stop(self) -> None:
+        """Close the engine's stdin and wait for it to exit."""
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                if self._proc.stdin:
+                    self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            except Exception:
+                self._kill()
+            self._proc = None
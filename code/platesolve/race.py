@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Parallel plate-solver race.
+
+RacingPlateSolver runs several configured solver entries on the same image at
+the same time and returns the first successful result. The entries still
+running are cancelled, which kills their solve-field/astrometry-engine child
+process; solvers without cancel support finish in the background and their
+result is discarded.
+
+Entries can be different solvers or the same solver with different hints:
+
+    plate_solve:
+      default_solver: "race"
+      race:
+        max_parallel: 3
+        adaptive_order: true
+        entries:
+          - {solver: astrometry_local, name: hinted, overrides: {search_radius_deg: 1.0}}
+          - {solver: astrometry_local, name: wide, overrides: {search_radius_deg: 15.0}}
+          - {solver: platesolve2}
+
+`overrides` replace keys of the solver's own config section for that entry.
+Entries of the same solver type get separate working directories so their
+output files do not collide.
+
+Every entry keeps win/failure counts and latencies. With adaptive_order,
+entries are launched in order of their (smoothed) win rate, then by their
+mean winning latency, so with max_parallel below the number of entries the
+entries that won during the night get the first slots.
+
+The solvers themselves run as child processes; each entry is supervised by a
+thread that waits for its process.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import copy
+from dataclasses import dataclass, field
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from platesolve.solver import PlateSolver, PlateSolverFactory
+from status import PlateSolveStatus, error_status, success_status
+
+# Seconds to wait for cancelled entries of the previous race before starting a new one
+_CANCEL_GRACE_S = 5.0
+
+# Output directories the solvers use when their config section sets none
+_DEFAULT_WORKING_DIRS = {"astrometry_local": "astrometry_output"}
+
+
+@dataclass
+class RaceStats:
+    """Outcome counters and latencies of one race entry."""
+
+    attempts: int = 0
+    wins: int = 0
+    failures: int = 0
+    cancelled: int = 0
+    win_time_s: float = 0.0
+    failure_time_s: float = 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Win rate with one prior win and loss, so untried entries rank at 0.5."""
+        return (self.wins + 1.0) / (self.attempts + 2.0)
+
+    @property
+    def mean_win_s(self) -> Optional[float]:
+        return self.win_time_s / self.wins if self.wins else None
+
+    @property
+    def mean_failure_s(self) -> Optional[float]:
+        return self.failure_time_s / self.failures if self.failures else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "wins": self.wins,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "win_rate": self.wins / self.attempts if self.attempts else 0.0,
+            "mean_win_s": self.mean_win_s,
+            "mean_failure_s": self.mean_failure_s,
+        }
+
+
+class _SectionOverrideConfig:
+    """Config view whose plate_solve.<section> is updated with per-entry overrides."""
+
+    def __init__(self, config: Any, section: str, overrides: Dict[str, Any]) -> None:
+        self._config = config
+        self._section = section
+        self._overrides = overrides
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        cfg: Dict[str, Any] = copy.deepcopy(self._config.get_plate_solve_config())
+        section = cfg.get(self._section)
+        cfg[self._section] = {**(section if isinstance(section, dict) else {}), **self._overrides}
+        return cfg
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._config, name)
+
+
+@dataclass
+class RaceEntry:
+    """One competitor of the race."""
+
+    name: str
+    solver: PlateSolver
+    stats: RaceStats = field(default_factory=RaceStats)
+    future: Optional[Future] = None
+
+
+class RacingPlateSolver(PlateSolver):
+    """Run several plate solvers in parallel and keep the first success."""
+
+    def __init__(self, config=None, logger=None):
+        super().__init__(config=config, logger=logger)
+        race_cfg = self.config.get_plate_solve_config().get("race", {}) or {}
+        self.timeout_s: float = float(race_cfg.get("timeout", 300))
+        self.adaptive_order: bool = bool(race_cfg.get("adaptive_order", True))
+        self.entries: List[RaceEntry] = self._build_entries(race_cfg.get("entries", []) or [])
+        # None (or missing): run all entries at once
+        max_parallel = race_cfg.get("max_parallel") or len(self.entries) or 1
+        self.max_parallel: int = max(1, int(max_parallel))
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self.entries)), thread_name_prefix="PlateSolveRace"
+        )
+
+    def _build_entries(self, entries_cfg: List[Dict[str, Any]]) -> List[RaceEntry]:
+        types = [str(e.get("solver", "")).lower() for e in entries_cfg]
+        section_cfg = self.config.get_plate_solve_config()
+        entries: List[RaceEntry] = []
+        names: List[str] = []
+        for entry_cfg, solver_type in zip(entries_cfg, types, strict=True):
+            if solver_type == "race":
+                self.logger.error("A race entry cannot be a race itself")
+                continue
+            name = str(entry_cfg.get("name", solver_type))
+            if name in names:
+                name = f"{name}_{len(names)}"
+            names.append(name)
+            overrides = dict(entry_cfg.get("overrides", {}) or {})
+            if types.count(solver_type) > 1 and "working_directory" not in overrides:
+                section = section_cfg.get(solver_type, {}) or {}
+                base_dir = section.get("working_directory") or _DEFAULT_WORKING_DIRS.get(
+                    solver_type
+                )
+                if base_dir:
+                    overrides["working_directory"] = os.path.join(base_dir, name)
+            entry_config = (
+                _SectionOverrideConfig(self.config, solver_type, overrides)
+                if overrides
+                else self.config
+            )
+            solver = PlateSolverFactory.create_solver(
+                solver_type, config=entry_config, logger=self.logger
+            )
+            if solver is None:
+                continue
+            entries.append(RaceEntry(name=name, solver=solver))
+        return entries
+
+    def set_mount_telemetry(self, telemetry: Any) -> None:
+        super().set_mount_telemetry(telemetry)
+        for entry in self.entries:
+            entry.solver.set_mount_telemetry(telemetry)
+
+    def get_name(self) -> str:
+        return "Race(" + ", ".join(e.name for e in self.entries) + ")"
+
+    def is_available(self) -> bool:
+        return any(e.solver.is_available() for e in self.entries)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-entry attempts, wins, win rate and mean latencies."""
+        return {e.name: e.stats.as_dict() for e in self.entries}
+
+    def ordered_entries(self) -> List[RaceEntry]:
+        """Entries in launch order (configured order unless adaptive_order)."""
+        if not self.adaptive_order:
+            return list(self.entries)
+
+        def _key(entry: RaceEntry) -> Tuple[float, float]:
+            mean_win = entry.stats.mean_win_s
+            return (-entry.stats.win_rate, mean_win if mean_win is not None else float("inf"))
+
+        return sorted(self.entries, key=_key)
+
+    def _run_entry(self, entry: RaceEntry, image_path: str) -> Tuple[PlateSolveStatus, float]:
+        t0 = time.perf_counter()
+        try:
+            status = entry.solver.solve(image_path)
+        except Exception as e:
+            status = error_status(f"{entry.name} error: {e}")
+        return status, time.perf_counter() - t0
+
+    def _cancel(self, entries: List[RaceEntry]) -> None:
+        for entry in entries:
+            entry.stats.cancelled += 1
+            try:
+                entry.solver.cancel()
+            except Exception as e:
+                self.logger.debug(f"Cancelling {entry.name} failed: {e}")
+
+    def solve(self, image_path: str) -> PlateSolveStatus:
+        entries = [e for e in self.ordered_entries() if e.solver.is_available()]
+        if not entries:
+            return error_status("No plate solver of the race is available")
+        # Entries cancelled in the previous race may still be winding down
+        leftovers = [e.future for e in entries if e.future is not None and not e.future.done()]
+        if leftovers:
+            wait(leftovers, timeout=_CANCEL_GRACE_S)
+            entries = [e for e in entries if e.future is None or e.future.done()]
+
+        start_time = time.time()
+        pending = list(entries)
+        running: Dict[Future, RaceEntry] = {}
+        failures: Dict[str, str] = {}
+
+        def _launch() -> None:
+            while pending and len(running) < self.max_parallel:
+                entry = pending.pop(0)
+                entry.stats.attempts += 1
+                entry.future = self._executor.submit(self._run_entry, entry, image_path)
+                running[entry.future] = entry
+
+        _launch()
+        deadline = start_time + self.timeout_s
+        while running:
+            done, _ = wait(
+                list(running), timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for fut in done:
+                entry = running.pop(fut)
+                status, elapsed = fut.result()
+                if status.is_success:
+                    entry.stats.wins += 1
+                    entry.stats.win_time_s += elapsed
+                    losers = list(running.values())
+                    self._cancel(losers)
+                    self.logger.info(
+                        "Plate-solve race won by %s in %.2fs (%d/%d wins); cancelled: %s",
+                        entry.name,
+                        elapsed,
+                        entry.stats.wins,
+                        entry.stats.attempts,
+                        ", ".join(e.name for e in losers) or "none",
+                    )
+                    details = dict(status.details or {})
+                    details.update(
+                        solving_time=time.time() - start_time,
+                        race_winner=entry.name,
+                        race_failures=failures,
+                        race_stats=self.get_stats(),
+                    )
+                    return success_status(status.message, data=status.data, details=details)
+                entry.stats.failures += 1
+                entry.stats.failure_time_s += elapsed
+                failures[entry.name] = status.message
+            _launch()
+
+        timed_out = bool(running)
+        self._cancel(list(running.values()))
+        summary = "; ".join(f"{name}: {msg}" for name, msg in failures.items())
+        message = (
+            f"Plate-solve race timed out after {self.timeout_s}s"
+            if timed_out
+            else f"Plate-solving failed: {summary}"
+        )
+        return error_status(
+            message,
+            details={
+                "solving_time": time.time() - start_time,
+                "race_failures": failures,
+                "race_stats": self.get_stats(),
+            },
+        )
+
+    def close(self) -> None:
+        """Cancel running entries, close their solvers and stop the worker threads."""
+        self._cancel([e for e in self.entries if e.future is not None and not e.future.done()])
+        for entry in self.entries:
+            closer = getattr(entry.solver, "close", None)
+            if callable(closer):
+                try:
+                    closer()
+                except Exception:
+                    pass
+        self._executor.shutdown(wait=False)
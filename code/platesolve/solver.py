@@ -29,10 +29,13 @@ from abc import ABC, abstractmethod
 import logging
 import math
 import os
+import subprocess
 import time
-from typing import Dict, Optional, Tuple, Type
+from typing import Any, Dict, Optional, Tuple, Type, cast
 
 import numpy as np
+from platesolve.engine_worker import AstrometryEngineWorker
+from platesolve.star_extraction import read_xylist_size
 from status import PlateSolveStatus, error_status, success_status
 
 
@@ -104,6 +107,8 @@ class PlateSolver(ABC):
             default_config = None
         self.config = config or default_config
         self.logger = logger or logging.getLogger(__name__)
+        # Shared MountTelemetryService for RA/Dec hints (None: query the mount per solve)
+        self.mount_telemetry: Any = None
 
     @abstractmethod
     def solve(self, image_path: str) -> PlateSolveStatus:
@@ -117,6 +122,28 @@ class PlateSolver(ABC):
     def get_name(self) -> str:
         pass
 
+    def cancel(self) -> None:
+        """Abort a solve running in another thread (no-op unless the solver supports it)."""
+        return None
+
+    def set_mount_telemetry(self, telemetry: Any) -> None:
+        """Take RA/Dec hints from a shared mount telemetry service."""
+        self.mount_telemetry = telemetry
+
+    def _mount_coordinates(self) -> Optional[Tuple[float, float]]:
+        """Mount pointing (RA, Dec) in degrees, None if unavailable."""
+        if self.mount_telemetry is not None:
+            coords: Optional[Tuple[float, float]] = self.mount_telemetry.sample().coordinates
+            return coords
+        from services.mount_telemetry import create_mount
+
+        mount = create_mount(self.config, logger=self.logger)
+        mstat = mount.get_coordinates()
+        if not mstat.is_success:
+            self.logger.warning(f"Could not get mount coordinates: {mstat.message}")
+            return None
+        return float(mstat.data[0]), float(mstat.data[1])
+
 
 class PlateSolve2(PlateSolver):
     """PlateSolve 2 Integration."""
@@ -163,19 +190,12 @@ class PlateSolve2(PlateSolver):
                 ra_deg = None
                 dec_deg = None
                 try:
-                    from drivers.ascom.mount import ASCOMMount
-
-                    mount = ASCOMMount(config=self.config, logger=self.logger)
-                    mount_status = mount.get_coordinates()
-                    if mount_status.is_success:
-                        ra_deg, dec_deg = mount_status.data
+                    coords = self._mount_coordinates()
+                    if coords is not None:
+                        ra_deg, dec_deg = coords
                         self.logger.info(
                             f"Using mount coordinates: RA={ra_deg:.4f}°, Dec={dec_deg:.4f}°"
                         )
-                    else:
-                        self.logger.warning(
-                            f"Could not get mount coordinates: {mount_status.message}"
-                        )
                 except Exception as e:
                     self.logger.warning(f"Could not get mount coordinates: {e}")
 
@@ -286,10 +306,42 @@ class LocalAstrometryNetSolver(PlateSolver):
         self.bash_path: str = a_cfg.get("bash_path", "bash")
         # Default to login + command; PowerShell example: bash -lc "solve-field ..."
         self.bash_args: list[str] = a_cfg.get("bash_args", ["-lc"])
+        # Warm engine: keep astrometry-engine (and its loaded indexes) alive between
+        # solves; solve-field only writes the augmented xylist (--just-augment)
+        self.warm_engine: bool = bool(a_cfg.get("warm_engine", False))
+        self.engine_path: str = a_cfg.get("engine_path", "astrometry-engine")
+        self.engine_args: list[str] = list(a_cfg.get("engine_args", ["-f", "-"]))
+        self._engine: Optional[AstrometryEngineWorker] = None
+        # Running solve-field process, killed by cancel()
+        self._proc: Optional[subprocess.Popen] = None
 
     def get_name(self) -> str:
         return "Astrometry.net (local)"
 
+    def cancel(self) -> None:
+        """Kill the running solve-field or astrometry-engine process."""
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+        if self._engine is not None:
+            self._engine.cancel()
+
+    def close(self) -> None:
+        """Stop the warm astrometry-engine process (if running)."""
+        if self._engine is not None:
+            self._engine.stop()
+            self._engine = None
+
+    def _engine_worker(self) -> AstrometryEngineWorker:
+        if self._engine is None:
+            cmd = [self.engine_path] + self.engine_args
+            if self.use_bash_wrapper:
+                import shlex as _shlex
+
+                cmd = [self.bash_path] + list(self.bash_args) + [_shlex.join(cmd)]
+            self._engine = AstrometryEngineWorker(cmd, logger=self.logger)
+        return self._engine
+
     def is_available(self) -> bool:
         # Consider available if the command is configured or in PATH
         return bool(self.solve_field_path)
@@ -341,7 +393,9 @@ class LocalAstrometryNetSolver(PlateSolver):
             pass
         img_path = _Path(image_path)
         base = img_path.stem
-        new_fits = str(out_dir / f"{base}.new")
+        # Star lists from extract_sources()/write_xylist() are solved without an image
+        xylist_size = read_xylist_size(image_path) if img_path.suffix == ".xyls" else None
+        new_fits = str(out_dir / (f"{base}.wcs" if xylist_size else f"{base}.new"))
 
         # scale-low/high window around estimate
         low = max(0.01, pixel_scale_arcsec - self.scale_pad)
@@ -351,22 +405,38 @@ class LocalAstrometryNetSolver(PlateSolver):
         dir_arg = out_dir.as_posix() if self.use_bash_wrapper else str(out_dir)
         img_arg = img_path.as_posix() if self.use_bash_wrapper else str(img_path)
 
-        cmd = [
-            self.solve_field_path,
-            "--overwrite",
-            "--no-plots",
-            "--fits-image",
-            "--scale-units",
-            "arcsecperpix",
-            "--scale-low",
-            f"{low}",
-            "--scale-high",
-            f"{high}",
-            "--dir",
-            dir_arg,
-            "--downsample",
-            str(self.downsample),
-        ]
+        cmd = [self.solve_field_path, "--overwrite", "--no-plots"]
+        if xylist_size:
+            cmd.extend(
+                [
+                    "--width",
+                    str(xylist_size[0]),
+                    "--height",
+                    str(xylist_size[1]),
+                    "--x-column",
+                    "X",
+                    "--y-column",
+                    "Y",
+                    "--sort-column",
+                    "FLUX",
+                ]
+            )
+        else:
+            cmd.append("--fits-image")
+        cmd.extend(
+            [
+                "--scale-units",
+                "arcsecperpix",
+                "--scale-low",
+                f"{low}",
+                "--scale-high",
+                f"{high}",
+                "--dir",
+                dir_arg,
+            ]
+        )
+        if not xylist_size:
+            cmd.extend(["--downsample", str(self.downsample)])
         if ra_deg is not None and dec_deg is not None:
             cmd.extend(
                 [
@@ -382,6 +452,36 @@ class LocalAstrometryNetSolver(PlateSolver):
         cmd.append(img_arg)
         return cmd, new_fits
 
+    def _build_augment_command(
+        self,
+        image_path: str,
+        ra_deg: Optional[float],
+        dec_deg: Optional[float],
+        pixel_scale_arcsec: float,
+    ) -> tuple[list[str], str, str]:
+        """solve-field command that only writes the .axy for the warm engine.
+
+        Returns:
+            (command, axy path, wcs path)
+        """
+        from pathlib import Path as _Path
+
+        cmd, _ = self._build_command(image_path, ra_deg, dec_deg, pixel_scale_arcsec)
+        out_dir = _Path(self.working_directory)
+        base = _Path(image_path).stem
+        axy = str(out_dir / f"{base}.axy")
+        wcs = str(out_dir / f"{base}.wcs")
+
+        def _arg(path: str) -> str:
+            return _Path(path).as_posix() if self.use_bash_wrapper else path
+
+        # Only the WCS is needed; skip the other sidecar files
+        options = ["--just-augment", "--axy", _arg(axy), "--wcs", _arg(wcs)]
+        for option in ("--new-fits", "--corr", "--rdls", "--match", "--index-xyls", "--solved"):
+            options.extend([option, "none"])
+        options.extend(["--cpulimit", f"{int(math.ceil(self.timeout_s))}"])
+        return cmd[:-1] + options + cmd[-1:], axy, wcs
+
     def _parse_sexagesimal_to_deg(self, value: str, is_ra: bool) -> Optional[float]:
         try:
             text = str(value).strip()
@@ -492,6 +592,14 @@ class LocalAstrometryNetSolver(PlateSolver):
             else:
                 height = int(hdr.get("NAXIS2", 0))
                 width = int(hdr.get("NAXIS1", 0))
+            # Header-only .wcs files carry the solved image size as IMAGEW/IMAGEH
+            if not width or not height:
+                width = int(hdr.get("IMAGEW", 0))
+                height = int(hdr.get("IMAGEH", 0))
+        if (not width or not height) and os.path.exists(image_path):
+            image_hdr = fits.getheader(image_path, 0)
+            width = int(image_hdr.get("NAXIS1", 0) or image_hdr.get("IMAGEW", 0))
+            height = int(image_hdr.get("NAXIS2", 0) or image_hdr.get("IMAGEH", 0))
 
         # Center from WCS
         ra_center = float(w.wcs.crval[0])
@@ -542,58 +650,20 @@ class LocalAstrometryNetSolver(PlateSolver):
             else:
                 # Fallback to mount coordinates
                 try:
-                    from drivers.ascom.mount import ASCOMMount
-
-                    mount = ASCOMMount(config=self.config, logger=self.logger)
-                    mstat = mount.get_coordinates()
-                    if mstat.is_success:
-                        ra_hint, dec_hint = mstat.data
-                        # Heuristic: if mount returns RA in hours (<=24), convert to degrees
-                        if isinstance(ra_hint, (int, float)) and 0.0 <= float(ra_hint) <= 24.0:
-                            ra_hint = float(ra_hint) * 15.0
+                    coords = self._mount_coordinates()
+                    if coords is not None:
+                        ra_hint, dec_hint = coords
                         self.logger.info(
-                            "Using mount coordinates: RA=%.6f°, Dec=%.6f°",
-                            float(ra_hint) if ra_hint is not None else float("nan"),
-                            float(dec_hint) if dec_hint is not None else float("nan"),
+                            "Using mount coordinates: RA=%.6f°, Dec=%.6f°", ra_hint, dec_hint
                         )
                 except Exception as e:
                     self.logger.debug(f"Mount RA/Dec hint unavailable: {e}")
 
             scale_arcsec = self._estimate_pixel_scale_arcsec()
+            if self.warm_engine:
+                return self._solve_warm(image_path, ra_hint, dec_hint, scale_arcsec, start_time)
             cmd, new_fits = self._build_command(image_path, ra_hint, dec_hint, scale_arcsec)
-
-            import subprocess
-
-            # On Windows or when configured, wrap command via bash (e.g., WSL/Git Bash)
-            if self.use_bash_wrapper:
-                import shlex as _shlex
-
-                cmd_str = _shlex.join(cmd)
-                full_cmd = [self.bash_path] + list(self.bash_args) + [cmd_str]
-                # Log as a PowerShell-friendly string with quotes around the -c payload
-                try:
-                    bash_prefix = " ".join([self.bash_path] + list(self.bash_args))
-                    self.logger.info(
-                        'Running (bash-wrapped) solve-field: %s "%s"',
-                        bash_prefix,
-                        cmd_str,
-                    )
-                except Exception:
-                    self.logger.info("Running (bash-wrapped) solve-field: %s", " ".join(full_cmd))
-                proc = subprocess.run(
-                    full_cmd,
-                    text=True,
-                    capture_output=True,
-                    timeout=self.timeout_s,
-                )
-            else:
-                self.logger.info("Running solve-field: %s", " ".join(cmd))
-                proc = subprocess.run(
-                    cmd,
-                    text=True,
-                    capture_output=True,
-                    timeout=self.timeout_s,
-                )
+            proc = self._run_command(cmd)
             # Log full stdout/stderr at debug level for diagnostics
             if proc.stdout:
                 self.logger.debug("solve-field stdout:\n%s", proc.stdout)
@@ -614,7 +684,7 @@ class LocalAstrometryNetSolver(PlateSolver):
             if not os.path.exists(new_fits):
                 solving_time = time.time() - start_time
                 return error_status(
-                    "Astrometry.net did not produce a .new FITS file",
+                    f"Astrometry.net did not produce {os.path.basename(new_fits)}",
                     details={"solving_time": solving_time},
                 )
 
@@ -655,6 +725,93 @@ class LocalAstrometryNetSolver(PlateSolver):
             self.logger.error(f"Astrometry.net local exception after {solving_time:.2f}s: {e}")
             return error_status(f"Astrometry.net local error: {e}")
 
+    def _run_command(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
+        """Run a solve-field command (bash-wrapped when configured)."""
+        # On Windows or when configured, wrap command via bash (e.g., WSL/Git Bash)
+        if self.use_bash_wrapper:
+            import shlex as _shlex
+
+            cmd_str = _shlex.join(cmd)
+            full_cmd = [self.bash_path] + list(self.bash_args) + [cmd_str]
+            # Log as a PowerShell-friendly string with quotes around the -c payload
+            try:
+                bash_prefix = " ".join([self.bash_path] + list(self.bash_args))
+                self.logger.info(
+                    'Running (bash-wrapped) solve-field: %s "%s"',
+                    bash_prefix,
+                    cmd_str,
+                )
+            except Exception:
+                self.logger.info("Running (bash-wrapped) solve-field: %s", " ".join(full_cmd))
+            return self._communicate(full_cmd)
+        self.logger.info("Running solve-field: %s", " ".join(cmd))
+        return self._communicate(cmd)
+
+    def _communicate(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
+        """subprocess.run() equivalent that keeps the process handle for cancel()."""
+        proc = subprocess.Popen(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._proc = proc
+        try:
+            stdout, stderr = proc.communicate(timeout=self.timeout_s)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        finally:
+            self._proc = None
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+    def _solve_warm(
+        self,
+        image_path: str,
+        ra_hint: Optional[float],
+        dec_hint: Optional[float],
+        scale_arcsec: float,
+        start_time: float,
+    ) -> PlateSolveStatus:
+        """Solve through the long-lived astrometry-engine worker."""
+        timings_ms: Dict[str, float] = {}
+        t0 = time.perf_counter()
+        cmd, axy, wcs = self._build_augment_command(image_path, ra_hint, dec_hint, scale_arcsec)
+        proc = self._run_command(cmd)
+        timings_ms["augment"] = (time.perf_counter() - t0) * 1000.0
+        if proc.returncode != 0 or not os.path.exists(axy):
+            msg = proc.stderr or proc.stdout or "no .axy written"
+            return error_status(
+                f"Astrometry.net solve-field augment error: {msg}",
+                details={"solving_time": time.time() - start_time, "timings_ms": timings_ms},
+            )
+
+        t1 = time.perf_counter()
+        remaining = max(1.0, self.timeout_s - (time.time() - start_time))
+        solved, output = self._engine_worker().solve(axy, wcs, remaining)
+        timings_ms["engine"] = (time.perf_counter() - t1) * 1000.0
+        if not solved:
+            return error_status(
+                "Astrometry.net engine did not solve the field",
+                details={
+                    "cli_hints": self._parse_cli_output_for_hints(output),
+                    "solving_time": time.time() - start_time,
+                    "timings_ms": timings_ms,
+                },
+            )
+
+        t2 = time.perf_counter()
+        data = self._parse_wcs_result(wcs, image_path)
+        timings_ms["parse"] = (time.perf_counter() - t2) * 1000.0
+        for k, v in self._parse_cli_output_for_hints(output).items():
+            data.setdefault(k, v)
+        return success_status(
+            "Astrometry.net local solving successful",
+            data=data,
+            details={
+                "solving_time": time.time() - start_time,
+                "timings_ms": timings_ms,
+                "method": self.get_name(),
+                "warm_engine": True,
+            },
+        )
+
     @staticmethod
     def _parse_cli_output_for_hints(text: str) -> Dict[str, object]:
         """Parse solve-field stdout/stderr for useful hints (best-effort).
@@ -753,6 +910,12 @@ class PlateSolverFactory:
                     "default_solver", "platesolve2"
                 )
 
+        if solver_type.lower() == "race":
+            # Composite of the solvers above; imported here to avoid a circular import
+            from platesolve.race import RacingPlateSolver
+
+            return cast(PlateSolver, RacingPlateSolver(config=config, logger=logger))
+
         solvers: Dict[str, Type[PlateSolver]] = {
             "platesolve2": PlateSolve2,
             "astrometry": AstrometryNetSolver,
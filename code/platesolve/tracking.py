@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+WCS tracking between plate-solves by star matching.
+
+While the mount tracks, consecutive frames differ by a small shift and
+rotation. After one full solve, the stars of each new frame are matched
+against the stars of the solved reference frame and a similarity transform
+(scale, rotation, shift) is fitted; the reference WCS is carried over to the
+new frame through that transform instead of running a new solve.
+
+Matching works on the brightest stars of both lists:
+
+    1. Hypotheses: a pair of bright reference stars is paired with every
+       pair of current stars with the same separation; two point pairs fix
+       a similarity transform
+    2. Consensus: each hypothesis is scored by the number of reference stars
+       landing within tolerance_px of a current star (RANSAC with the
+       minimal samples enumerated instead of drawn at random)
+    3. Refinement: least-squares fit over the inliers of the best hypothesis
+
+Positions are treated as complex numbers, so a similarity transform is
+z' = a * z + b with complex a (scale and rotation) and b (shift).
+
+A full solve is needed when matching fails, the field drifted more than
+max_drift_px from the reference, or the reference is older than
+max_reference_age_s.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import math
+import time
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from platesolve.solver import PlateSolveResult
+
+
+@dataclass
+class SimilarityTransform:
+    """Mapping of reference pixel positions onto current pixel positions."""
+
+    a: complex
+    b: complex
+    matches: int
+    rms_px: float
+
+    @property
+    def scale(self) -> float:
+        return abs(self.a)
+
+    @property
+    def rotation_deg(self) -> float:
+        return math.degrees(math.atan2(self.a.imag, self.a.real))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """2x3 affine matrix [A | t] acting on (x, y) column vectors."""
+        return np.array(
+            [
+                [self.a.real, -self.a.imag, self.b.real],
+                [self.a.imag, self.a.real, self.b.imag],
+            ]
+        )
+
+    def apply(self, points: np.ndarray) -> np.ndarray:
+        """Transform (N, 2) pixel positions."""
+        z = self.a * (points[:, 0] + 1j * points[:, 1]) + self.b
+        return np.column_stack([z.real, z.imag])
+
+
+def _fit_similarity(zr: np.ndarray, zc: np.ndarray) -> Tuple[complex, complex]:
+    """Least-squares similarity transform mapping zr onto zc."""
+    mr, mc = zr.mean(), zc.mean()
+    dr = zr - mr
+    a = complex(np.sum((zc - mc) * np.conj(dr)) / np.sum(np.abs(dr) ** 2))
+    return a, complex(mc - a * mr)
+
+
+def _nearest(pred: np.ndarray, zc: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Index of and distance to the nearest current star for each predicted position."""
+    dist = np.abs(pred[:, None] - zc[None, :])
+    idx = np.argmin(dist, axis=1)
+    return idx, dist[np.arange(len(pred)), idx]
+
+
+def match_star_lists(
+    reference: np.ndarray,
+    current: np.ndarray,
+    tolerance_px: float = 2.0,
+    min_matches: int = 6,
+    max_stars: int = 40,
+    anchor_stars: int = 8,
+    max_scale_change: float = 0.02,
+) -> Optional[SimilarityTransform]:
+    """Fit the similarity transform taking reference star positions to current ones.
+
+    Args:
+        reference: (N, 2+) x, y of the reference stars, brightest first
+        current: (M, 2+) x, y of the current stars, brightest first
+        tolerance_px: Maximum residual of a matched star
+        min_matches: Fewest matched stars accepted
+        max_stars: Brightest stars of each list used for matching
+        anchor_stars: Brightest reference stars whose pairs generate hypotheses
+        max_scale_change: Largest accepted relative change of the image scale
+
+    Returns:
+        Transform, or None if fewer than min_matches stars could be matched
+    """
+    ref = np.asarray(reference, dtype=np.float64)[:max_stars]
+    cur = np.asarray(current, dtype=np.float64)[:max_stars]
+    if len(ref) < 2 or len(cur) < 2:
+        return None
+    zr = ref[:, 0] + 1j * ref[:, 1]
+    zc = cur[:, 0] + 1j * cur[:, 1]
+    sep_cur = np.abs(zc[:, None] - zc[None, :])
+    min_sep = 10.0 * tolerance_px
+    good_enough = int(0.8 * min(len(zr), len(zc)))
+
+    best_count, best_a, best_b = 0, 0j, 0j
+    anchors = min(int(anchor_stars), len(zr))
+    for i in range(anchors):
+        for j in range(i + 1, anchors):
+            d_ref = zr[j] - zr[i]
+            sep = abs(d_ref)
+            if sep < min_sep:
+                continue
+            window = max(2.0 * tolerance_px, sep * max_scale_change)
+            ks, ms = np.nonzero(np.abs(sep_cur - sep) <= window)
+            for k, m in zip(ks, ms, strict=True):
+                a = (zc[m] - zc[k]) / d_ref
+                if abs(abs(a) - 1.0) > max_scale_change:
+                    continue
+                b = zc[k] - a * zr[i]
+                count = int(np.count_nonzero(_nearest(a * zr + b, zc)[1] <= tolerance_px))
+                if count > best_count:
+                    best_count, best_a, best_b = count, a, b
+            if best_count >= good_enough:
+                break
+        if best_count >= good_enough:
+            break
+    if best_count < max(2, int(min_matches)):
+        return None
+
+    # Refit on the inliers; a second pass picks up stars the anchor fit just missed
+    a, b = best_a, best_b
+    for _ in range(2):
+        idx, dist = _nearest(a * zr + b, zc)
+        inliers = dist <= tolerance_px
+        if np.count_nonzero(inliers) < max(2, int(min_matches)):
+            return None
+        a, b = _fit_similarity(zr[inliers], zc[idx[inliers]])
+    idx, dist = _nearest(a * zr + b, zc)
+    inliers = dist <= tolerance_px
+    if np.count_nonzero(inliers) < max(2, int(min_matches)):
+        return None
+    rms = float(np.sqrt(np.mean(dist[inliers] ** 2)))
+    return SimilarityTransform(a=a, b=b, matches=int(np.count_nonzero(inliers)), rms_px=rms)
+
+
+def transform_wcs(wcs: Any, transform: SimilarityTransform) -> Any:
+    """WCS of the current frame from the reference WCS and the reference->current transform.
+
+    The reference pixel moves with the transform and the CD matrix absorbs its
+    inverse rotation and scale. SIP distortion terms are not carried over.
+    """
+    from astropy.wcs import WCS
+
+    matrix = transform.matrix
+    linear = matrix[:, :2]
+    # CRPIX is 1-based; the transform acts on 0-based pixel positions
+    crpix0 = np.asarray(wcs.wcs.crpix, dtype=np.float64) - 1.0
+    crpix = linear @ crpix0 + matrix[:, 2] + 1.0
+    cd = np.asarray(wcs.pixel_scale_matrix, dtype=np.float64) @ np.linalg.inv(linear)
+
+    out = WCS(naxis=2)
+    out.wcs.ctype = [str(t).replace("-SIP", "") for t in wcs.wcs.ctype]
+    out.wcs.cunit = list(wcs.wcs.cunit)
+    out.wcs.crval = list(wcs.wcs.crval)
+    out.wcs.crpix = list(crpix)
+    out.wcs.cd = cd
+    return out
+
+
+def write_wcs_header(path: str, wcs: Any, image_size: Tuple[int, int]) -> str:
+    """Write a header-only WCS file with the image size as IMAGEW/IMAGEH."""
+    import astropy.io.fits as fits
+
+    header = wcs.to_header()
+    header["IMAGEW"] = int(image_size[0])
+    header["IMAGEH"] = int(image_size[1])
+    fits.PrimaryHDU(header=header).writeto(path, overwrite=True)
+    return path
+
+
+@dataclass
+class TrackedPointing:
+    """Outcome of a successful tracking step."""
+
+    transform: SimilarityTransform
+    wcs: Any
+    drift_px: float
+    elapsed_s: float
+
+
+class WcsTracker:
+    """Carry a solved WCS across frames by matching their stars to the solved frame."""
+
+    def __init__(
+        self,
+        tolerance_px: float = 2.0,
+        min_matches: int = 8,
+        max_stars: int = 40,
+        max_drift_px: float = 200.0,
+        max_reference_age_s: float = 600.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the tracker without a reference.
+
+        Args:
+            tolerance_px: Maximum residual of a matched star
+            min_matches: Fewest matched stars for a valid tracking step
+            max_stars: Brightest stars of each frame used for matching
+            max_drift_px: Image-center shift from the reference that requires a full solve
+            max_reference_age_s: Reference age that requires a full solve (0 disables)
+            logger: Logger instance
+        """
+        self.tolerance_px = float(tolerance_px)
+        self.min_matches = int(min_matches)
+        self.max_stars = int(max_stars)
+        self.max_drift_px = float(max_drift_px)
+        self.max_reference_age_s = float(max_reference_age_s)
+        self.logger = logger or logging.getLogger(__name__)
+        self.reference_result: Optional[PlateSolveResult] = None
+        self.last_failure: Optional[str] = None
+        self._reference_sources: Optional[np.ndarray] = None
+        self._reference_wcs: Any = None
+        self._image_size: Tuple[int, int] = (0, 0)
+        self._reference_time = 0.0
+
+    @property
+    def has_reference(self) -> bool:
+        return self._reference_wcs is not None
+
+    @property
+    def image_size(self) -> Tuple[int, int]:
+        """(width, height) of the reference frame."""
+        return self._image_size
+
+    def set_reference(
+        self,
+        result: PlateSolveResult,
+        sources: np.ndarray,
+        wcs: Any,
+        image_size: Tuple[int, int],
+    ) -> None:
+        """Use a fully solved frame as the reference for following frames."""
+        self.reference_result = result
+        self._reference_sources = np.asarray(sources)[: self.max_stars]
+        self._reference_wcs = wcs
+        self._image_size = (int(image_size[0]), int(image_size[1]))
+        self._reference_time = time.monotonic()
+        self.last_failure = None
+
+    def reset(self) -> None:
+        """Drop the reference; the next frame needs a full solve."""
+        self.reference_result = None
+        self._reference_sources = None
+        self._reference_wcs = None
+
+    def track(self, sources: np.ndarray) -> Optional[TrackedPointing]:
+        """Match a frame's stars to the reference and derive its WCS.
+
+        Returns:
+            Tracked pointing, or None (reason in last_failure) if a full solve is needed
+        """
+        t0 = time.perf_counter()
+        if self._reference_wcs is None or self._reference_sources is None:
+            self.last_failure = "no reference"
+            return None
+        age = time.monotonic() - self._reference_time
+        if self.max_reference_age_s > 0 and age > self.max_reference_age_s:
+            self.last_failure = f"reference older than {self.max_reference_age_s:.0f}s"
+            return None
+        transform = match_star_lists(
+            self._reference_sources,
+            sources,
+            tolerance_px=self.tolerance_px,
+            min_matches=self.min_matches,
+            max_stars=self.max_stars,
+        )
+        if transform is None:
+            self.last_failure = "star matching failed"
+            return None
+        center = np.array([[(self._image_size[0] - 1) / 2.0, (self._image_size[1] - 1) / 2.0]])
+        drift = float(np.hypot(*(transform.apply(center)[0] - center[0])))
+        if drift > self.max_drift_px:
+            self.last_failure = f"drift {drift:.0f}px exceeds {self.max_drift_px:.0f}px"
+            return None
+        wcs = transform_wcs(self._reference_wcs, transform)
+        self.last_failure = None
+        return TrackedPointing(
+            transform=transform,
+            wcs=wcs,
+            drift_px=drift,
+            elapsed_s=time.perf_counter() - t0,
+        )
+
+    def tracked_result(
+        self, tracked: TrackedPointing, wcs_path: Optional[str] = None
+    ) -> PlateSolveResult:
+        """PlateSolveResult describing the tracked frame."""
+        ref = self.reference_result
+        width, height = self._image_size
+        sky = tracked.wcs.pixel_to_world_values((width - 1) / 2.0, (height - 1) / 2.0)
+        cd = np.asarray(tracked.wcs.wcs.cd, dtype=np.float64)
+        scale = tracked.transform.scale or 1.0
+        n_ref = len(self._reference_sources) if self._reference_sources is not None else 0
+        return PlateSolveResult(
+            ra_center=float(sky[0]) % 360.0,
+            dec_center=float(sky[1]),
+            fov_width=float(ref.fov_width) / scale if ref else 0.0,
+            fov_height=float(ref.fov_height) / scale if ref else 0.0,
+            solving_time=tracked.elapsed_s,
+            method="tracking",
+            confidence=tracked.transform.matches / max(1, n_ref),
+            position_angle=math.degrees(math.atan2(cd[0, 1], cd[0, 0])),
+            image_size=self._image_size,
+            is_flipped=ref.is_flipped if ref else None,
+            wcs_path=wcs_path,
+        )
@@ -0,0 +1,207 @@
+"""Fast black/white point statistics for display normalization.
+
+Limits are estimated from a strided spatial subsample instead of the full frame:
+integer images (uint8/uint16) use a single ``np.bincount`` histogram covering all
+channels at once, float images use ``np.percentile`` on the subsample, and zscale
+limits are fit on the same ~1000 evenly strided samples astropy's ZScaleInterval
+would pick. A small smoother can carry limits across frames to avoid flicker.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_MAX_SAMPLES = 250_000
+DEFAULT_ZSCALE_SAMPLES = 1000
+
+
+def subsample(image: np.ndarray, max_samples: Optional[int] = DEFAULT_MAX_SAMPLES) -> np.ndarray:
+    """Return a strided view with at most ~max_samples pixels (per channel).
+
+    Args:
+        image: 2D or 3D (H, W, C) image
+        max_samples: Pixel budget; None/0 returns the image unchanged
+    """
+    if not max_samples or image.ndim < 2:
+        return image
+    h, w = image.shape[:2]
+    n = h * w
+    if n <= max_samples:
+        return image
+    step = int(np.ceil(np.sqrt(n / float(max_samples))))
+    return image[::step, ::step]
+
+
+def _split_channels(image: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Return (pixels x channels 2D array, channel count) for 2D/3D images."""
+    if image.ndim == 3:
+        channels = int(image.shape[2])
+        return image.reshape(-1, channels), channels
+    return image.reshape(-1, 1), 1
+
+
+def channel_histograms(image: np.ndarray) -> np.ndarray:
+    """Return per-channel histograms (C x 2**bits) of an integer image in one bincount pass."""
+    pixels, channels = _split_channels(image)
+    nbins = 256 if image.dtype == np.uint8 else 65536
+    idx = pixels.astype(np.int64, copy=False)
+    if channels > 1:
+        idx = idx + (np.arange(channels, dtype=np.int64) * nbins)[None, :]
+    counts = np.bincount(idx.ravel(), minlength=channels * nbins)
+    return counts[: channels * nbins].reshape(channels, nbins)
+
+
+def histogram_percentiles(hist: np.ndarray, percentiles: Sequence[float]) -> List[float]:
+    """Return values at the given percentiles (0..100) of a histogram (bin index = value)."""
+    cumulative = np.cumsum(hist)
+    total = int(cumulative[-1]) if cumulative.size else 0
+    if total <= 0:
+        return [0.0 for _ in percentiles]
+    out = []
+    for p in percentiles:
+        rank = min(max(float(p), 0.0), 100.0) / 100.0 * (total - 1)
+        out.append(float(np.searchsorted(cumulative, rank, side="right")))
+    return out
+
+
+def _is_histogrammable(arr: np.ndarray) -> bool:
+    return arr.dtype in (np.uint8, np.uint16)
+
+
+def _fix_window(lo: float, hi: float, sample: np.ndarray) -> Tuple[float, float]:
+    if hi <= lo or not (np.isfinite(lo) and np.isfinite(hi)):
+        finite = sample[np.isfinite(sample)] if sample.dtype.kind == "f" else sample
+        if finite.size:
+            lo, hi = float(np.min(finite)), float(np.max(finite))
+    if hi <= lo:
+        lo, hi = 0.0, 1.0
+    return lo, hi
+
+
+def channel_percentile_limits(
+    image: np.ndarray,
+    black_p: float,
+    white_p: float,
+    max_samples: Optional[int] = DEFAULT_MAX_SAMPLES,
+) -> List[Tuple[float, float]]:
+    """Return (black, white) per channel, computed from one pass over a subsample.
+
+    Falls back to the sample min/max when the percentile window collapses.
+    """
+    sample = subsample(image, max_samples)
+    limits: List[Tuple[float, float]] = []
+    if _is_histogrammable(sample):
+        hists = channel_histograms(sample)
+        for c in range(hists.shape[0]):
+            lo, hi = histogram_percentiles(hists[c], (black_p, white_p))
+            ch = sample if sample.ndim == 2 else sample[:, :, c]
+            limits.append(_fix_window(lo, hi, ch))
+        return limits
+    pixels, channels = _split_channels(sample)
+    for c in range(channels):
+        vals = pixels[:, c]
+        if vals.dtype.kind == "f":
+            vals = vals[np.isfinite(vals)]
+        if vals.size == 0:
+            limits.append((0.0, 1.0))
+            continue
+        lo, hi = (float(v) for v in np.percentile(vals, (black_p, white_p)))
+        limits.append(_fix_window(lo, hi, vals))
+    return limits
+
+
+def percentile_limits(
+    data: np.ndarray,
+    black_p: float,
+    white_p: float,
+    max_samples: Optional[int] = DEFAULT_MAX_SAMPLES,
+) -> Tuple[float, float]:
+    """Return (black, white) of all values of a 2D image or 1D array."""
+    if data.ndim == 1:
+        step = max(1, int(data.size // max_samples)) if max_samples else 1
+        sample = data[::step]
+        if _is_histogrammable(sample):
+            nbins = 256 if sample.dtype == np.uint8 else 65536
+            lo, hi = histogram_percentiles(np.bincount(sample, minlength=nbins), (black_p, white_p))
+            return _fix_window(lo, hi, sample)
+        return channel_percentile_limits(sample.reshape(-1, 1), black_p, white_p, None)[0]
+    return channel_percentile_limits(data, black_p, white_p, max_samples)[0]
+
+
+def zscale_samples(channel: np.ndarray, n_samples: int = DEFAULT_ZSCALE_SAMPLES) -> np.ndarray:
+    """Pick n_samples values evenly strided over the flattened channel (any strides).
+
+    Matches astropy's ZScaleInterval sampling for finite data without flattening
+    or converting the full channel.
+    """
+    h, w = channel.shape[:2]
+    n = h * w
+    if n == 0:
+        return np.empty(0, dtype=np.float32)
+    stride = max(1, int(n / n_samples))
+    flat_idx = np.arange(0, n, stride)[:n_samples]
+    rows, cols = np.divmod(flat_idx, w)
+    values = np.asarray(channel[rows, cols], dtype=np.float32)
+    return values[np.isfinite(values)]
+
+
+def zscale_limits(
+    channel: np.ndarray, contrast: float = 0.25, n_samples: int = DEFAULT_ZSCALE_SAMPLES
+) -> Tuple[float, float]:
+    """Return zscale (vmin, vmax) for one 2D channel from a strided sample."""
+    from astropy.visualization import ZScaleInterval
+
+    samples = zscale_samples(channel, n_samples)
+    if samples.size == 0:
+        return 0.0, 1.0
+    lo, hi = ZScaleInterval(n_samples=max(n_samples, samples.size), contrast=contrast).get_limits(
+        samples
+    )
+    return float(lo), float(hi)
+
+
+class LimitSmoother:
+    """Exponential smoothing of display limits across consecutive frames.
+
+    ``alpha`` is the weight of the previous limits (0 disables smoothing). History
+    is reset when the frame shape changes.
+    """
+
+    def __init__(self, alpha: float = 0.0) -> None:
+        self.alpha = float(alpha)
+        self._limits: Dict[Hashable, Tuple[float, float]] = {}
+        self._shape: Optional[Tuple[int, ...]] = None
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._limits.clear()
+            self._shape = None
+
+    def update(
+        self,
+        key: Hashable,
+        lo: float,
+        hi: float,
+        shape: Optional[Tuple[int, ...]] = None,
+        alpha: Optional[float] = None,
+    ) -> Tuple[float, float]:
+        """Blend new limits with the previous ones for key and return the result."""
+        a = self.alpha if alpha is None else float(alpha)
+        with self._lock:
+            if shape is not None and shape != self._shape:
+                self._limits.clear()
+                self._shape = shape
+            prev = self._limits.get(key)
+            if prev is not None and 0.0 < a < 1.0:
+                lo = a * prev[0] + (1.0 - a) * lo
+                hi = a * prev[1] + (1.0 - a) * hi
+            self._limits[key] = (lo, hi)
+            return lo, hi
+
+
+# Shared smoother for the live display pipeline (enabled via normalization.temporal_smoothing)
+default_smoother = LimitSmoother()
@@ -149,7 +149,8 @@ def convert_camera_data_to_opencv(
                 logger.error("Image data is None")
             return None
 
-        image_array = np.array(raw_data)
+        # No copy: every later step (dtype promotion, cvtColor) allocates its own output
+        image_array = np.asarray(raw_data)
         if image_array.size == 0:
             if logger:
                 logger.error("Image array is empty")
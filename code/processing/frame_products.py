@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Per-frame processing products shared by writers, the overlay compositor and previews.
+
+Each product is computed at most once per captured Frame and cached on it via
+Frame.product(); plain arrays are processed without caching.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional, cast
+
+from capture.frame import Frame
+import numpy as np
+from processing.format_conversion import convert_camera_data_to_opencv
+from processing.orientation import enforce_long_side_horizontal
+
+
+def as_frame(obj: Any) -> Optional[Frame]:
+    """Return the Frame carried by obj (Frame or Status-like wrapping a Frame)."""
+    if isinstance(obj, Frame):
+        return obj
+    inner = getattr(obj, "data", None)
+    if isinstance(inner, Frame):
+        return inner
+    return None
+
+
+def frame_display_u8(
+    frame: Any,
+    camera: Any,
+    config: Any,
+    logger: Any = None,
+    camera_type: str = "opencv",
+    orientation_policy: str = "long_side_horizontal",
+    override_method: Optional[str] = None,
+) -> Optional[np.ndarray]:
+    """Return the uint8 display image of a frame, oriented and normalized.
+
+    The result is cached per (camera type, orientation policy, normalization override)
+    so the display writer, overlay compositing and previews share one conversion.
+    """
+    frame_obj = as_frame(frame)
+    if frame_obj is not None:
+        data: Any = frame_obj.data
+    else:
+        data = frame.data if hasattr(frame, "data") else frame
+
+    def _compute() -> Optional[np.ndarray]:
+        img: Any
+        if camera_type in ["alpaca", "ascom"]:
+            img = convert_camera_data_to_opencv(data, camera, config, logger)
+        else:
+            img = data
+        if img is None:
+            return None
+        if not isinstance(img, np.ndarray):
+            img = np.array(img)
+        if orientation_policy == "long_side_horizontal":
+            img, _ = enforce_long_side_horizontal(img)
+        if img.dtype != np.uint8:
+            try:
+                from processing.normalization import normalize_to_uint8
+
+                img = normalize_to_uint8(img, config, logger, override_method=override_method)
+            except Exception:
+                if img.dtype in [np.float32, np.float64]:
+                    vmin = float(np.min(img))
+                    vmax = float(np.max(img))
+                    if vmax > vmin:
+                        img = ((img - vmin) / (vmax - vmin) * 255).astype(np.uint8)
+                    else:
+                        img = img.astype(np.uint8)
+                else:
+                    img = img.astype(np.uint8)
+        return cast(np.ndarray, img)
+
+    if frame_obj is None:
+        return _compute()
+    key = ("display_u8", camera_type, orientation_policy, override_method)
+    return cast(Optional[np.ndarray], frame_obj.product(key, _compute))
+
+
+def frame_solve_plane(frame: Any) -> Optional[np.ndarray]:
+    """Return the 2D plane written to the solving FITS (see FrameWriter.save_fits).
+
+    The oriented green channel when available, else the oriented data; color data
+    contributes its green channel. Pixel coordinates of sources detected on this
+    plane match the FITS file, so a WCS solved from either applies to both.
+    """
+    frame_obj = as_frame(frame)
+
+    def _compute() -> Optional[np.ndarray]:
+        if frame_obj is not None:
+            green = frame_obj.oriented_green
+            plane = green if green is not None else frame_obj.oriented
+        else:
+            data = frame if isinstance(frame, np.ndarray) else getattr(frame, "data", frame)
+            if data is None:
+                return None
+            plane, _ = enforce_long_side_horizontal(np.asarray(data))
+        if plane.ndim == 3:
+            plane = plane[:, :, 1] if plane.shape[2] >= 3 else plane[:, :, 0]
+        return cast(np.ndarray, plane)
+
+    if frame_obj is None:
+        return _compute()
+    return cast(Optional[np.ndarray], frame_obj.product("solve_plane", _compute))
+
+
+def frame_sources(
+    frame: Any, max_sources: int = 200, threshold_sigma: float = 5.0, mesh_size: int = 64
+) -> Optional[np.ndarray]:
+    """Stars detected on frame_solve_plane(), brightest first (see extract_sources).
+
+    Cached per detection setting, so star-list solving and WCS tracking of the
+    same frame share one extraction.
+    """
+    from platesolve.star_extraction import extract_sources
+
+    def _compute() -> Optional[np.ndarray]:
+        plane = frame_solve_plane(frame)
+        if plane is None:
+            return None
+        sources = extract_sources(
+            plane,
+            max_sources=max_sources,
+            threshold_sigma=threshold_sigma,
+            mesh_size=mesh_size,
+        )
+        return cast(np.ndarray, sources)
+
+    frame_obj = as_frame(frame)
+    if frame_obj is None:
+        return _compute()
+    key = f"sources_{int(max_sources)}_{float(threshold_sigma):g}_{int(mesh_size)}"
+    return cast(Optional[np.ndarray], frame_obj.product(key, _compute))
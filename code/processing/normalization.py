@@ -2,45 +2,145 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Optional, Tuple, cast
 
 import numpy as np
-
-
-def scale_16bit_to_8bit(image_16bit: np.ndarray) -> np.ndarray:
+from processing.display_stats import (
+    DEFAULT_MAX_SAMPLES,
+    DEFAULT_ZSCALE_SAMPLES,
+    LimitSmoother,
+    channel_percentile_limits,
+    default_smoother,
+    percentile_limits,
+    subsample,
+    zscale_limits,
+)
+
+
+def scale_16bit_to_8bit(
+    image_16bit: np.ndarray, max_samples: Optional[int] = DEFAULT_MAX_SAMPLES
+) -> np.ndarray:
     """Histogram-based scaling from 16-bit to 8-bit.
 
-    Uses 1% and 99% percentiles; falls back to min/max if necessary.
+    Uses 1% and 99% percentiles of a subsampled histogram; falls back to min/max
+    if necessary.
     """
     try:
-        # Calculate histogram percentiles
-        hist, bins = np.histogram(image_16bit.flatten(), bins=256, range=(0, 65535))
-        cumulative = np.cumsum(hist)
-        total = cumulative[-1]
-        lower_idx = np.searchsorted(cumulative, total * 0.01)
-        upper_idx = np.searchsorted(cumulative, total * 0.99)
-        lower = bins[lower_idx] if lower_idx < len(bins) else 0
-        upper = bins[upper_idx] if upper_idx < len(bins) else 65535
-        if upper <= lower:
-            lower = int(image_16bit.min())
-            upper = int(image_16bit.max())
-            if upper <= lower:
-                lower, upper = 0, 65535
+        p_lo, p_hi = percentile_limits(image_16bit, 1.0, 99.0, max_samples)
+        lower, upper = _hist_window(float(p_lo), float(p_hi), image_16bit)
         rng = upper - lower
         if rng > 0:
-            out = ((image_16bit.astype(np.float32) - lower) / rng) * 255.0
-        else:
-            out = (image_16bit / 256.0).astype(np.float32)
-        return np.clip(out, 0, 255).astype(np.uint8)
+            levels = lut_levels(image_16bit)
+            if levels:
+                return apply_lut(image_16bit, scale_lut(lower, upper, levels))
+            return _scale_to_uint8(image_16bit, lower, upper)
+        return (image_16bit / 256.0).astype(np.uint8)
     except Exception:
         return (image_16bit / 256).astype(np.uint8)
 
 
+def _hist_window(lower: float, upper: float, image: np.ndarray) -> Tuple[float, float]:
+    """Snap a window to the left edges of 256 bins over [0, 65535] (classic hist look).
+
+    Falls back to the image min/max when snapping collapses the window.
+    """
+    width = 65535.0 / 256.0
+    lo = float(min(np.floor(lower / width), 255.0) * width)
+    hi = float(min(np.floor(upper / width), 255.0) * width)
+    if hi <= lo:
+        lo, hi = float(np.min(image)), float(np.max(image))
+    return lo, hi
+
+
+def _scale_to_uint8(ch: np.ndarray, black: float, white: float) -> np.ndarray:
+    """Map [black, white] linearly to [0, 255] with one float32 temporary."""
+    arr = ch.astype(np.float32)
+    arr -= np.float32(black)
+    arr *= np.float32(255.0 / (white - black))
+    np.clip(arr, 0.0, 255.0, out=arr)
+    return arr.astype(np.uint8)
+
+
+# Values mapped per np.take call; bounds the intp index temporary numpy creates
+LUT_CHUNK_VALUES = 1 << 18
+
+
+def lut_levels(image: np.ndarray) -> int:
+    """Return the number of input levels for a lookup-table stretch (0 = not applicable)."""
+    if image.dtype == np.uint8:
+        return 256
+    if image.dtype == np.uint16:
+        return 65536
+    return 0
+
+
+def scale_lut(black: float, white: float, levels: int = 65536) -> np.ndarray:
+    """Return the uint8 table of _scale_to_uint8 for every input level."""
+    return _scale_to_uint8(np.arange(levels, dtype=np.float32), black, white)
+
+
+def stretch_lut(
+    black: float,
+    white: float,
+    levels: int = 65536,
+    curve: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+) -> np.ndarray:
+    """Return the uint8 table of a window stretch followed by an optional unit curve.
+
+    The table is computed with the same float32 operations as the per-pixel path,
+    so mapping an integer image through it gives the same result.
+    """
+    unit = (np.arange(levels, dtype=np.float32) - float(black)) / float(white - black)
+    unit = np.clip(unit, 0.0, 1.0)
+    if curve is not None:
+        unit = curve(unit)
+    return cast(np.ndarray, (np.clip(unit, 0.0, 1.0) * 255.0).astype(np.uint8))
+
+
+def apply_lut(image: np.ndarray, lut: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Map an integer image through a lookup table into a uint8 array.
+
+    Args:
+        image: uint8/uint16 image (2D or 3D)
+        lut: 1D table shared by all channels, or a (C, levels) table per channel of a
+            (H, W, C) image
+        out: Optional uint8 array of image's shape to write into
+
+    Returns:
+        The uint8 output array
+    """
+    if out is None:
+        out = np.empty(image.shape, dtype=np.uint8)
+    if image.size == 0:
+        return out
+    per_channel = lut.ndim == 2 and image.ndim == 3
+    row_values = max(1, image.size // image.shape[0])
+    step = max(1, LUT_CHUNK_VALUES // row_values)
+    for r0 in range(0, image.shape[0], step):
+        src = image[r0 : r0 + step]
+        dst = out[r0 : r0 + step]
+        if per_channel:
+            # Row chunks keep the strided channel reads/writes in cache
+            for c in range(image.shape[2]):
+                np.take(lut[c], src[:, :, c], out=dst[:, :, c], mode="clip")
+        else:
+            np.take(lut, src, out=dst, mode="clip")
+    return out
+
+
 def normalize_to_uint8(
-    image: np.ndarray, config: Any, logger: Any = None, override_method: Optional[str] = None
+    image: np.ndarray,
+    config: Any,
+    logger: Any = None,
+    override_method: Optional[str] = None,
+    smoother: Optional[LimitSmoother] = None,
 ) -> np.ndarray:
     """Normalize image (2D/3D) to uint8 using config-driven method.
 
+    Black/white points come from subsampled statistics (see processing.display_stats).
+    With ``normalization.temporal_smoothing`` > 0 (or an explicit smoother), limits are
+    blended with those of the previous frame.
+
     Supported methods:
       - none: no additional stretching (safe 16->8 mapping)
       - linear: min/max or percentile window
@@ -72,25 +172,27 @@ def normalize_to_uint8(
         arr: np.ndarray, black_p: float, white_p: float
     ) -> Tuple[float, float]:
         try:
-            lo = float(np.percentile(arr, black_p))
-            hi = float(np.percentile(arr, white_p))
-            if hi <= lo:
-                # Fallback to min/max
-                lo = float(np.min(arr))
-                hi = float(np.max(arr))
-            if hi <= lo:
-                lo, hi = 0.0, 1.0
-            return lo, hi
+            lo, hi = percentile_limits(arr, black_p, white_p, stats_max_samples)
+            return float(lo), float(hi)
         except Exception:
             return 0.0, 1.0
 
+    def _smooth(key: Any, lo: float, hi: float) -> Tuple[float, float]:
+        if active_smoother is None or smoothing <= 0.0:
+            return lo, hi
+        s_lo, s_hi = active_smoother.update(
+            (method, key), lo, hi, shape=image.shape, alpha=smoothing
+        )
+        return float(s_lo), float(s_hi)
+
     def _linear_scale_to_uint8(ch: np.ndarray, black: float, white: float) -> np.ndarray:
         rng = float(white - black)
         if rng <= 0.0 or not np.isfinite(rng):
             return _to_uint8_no_scale(ch)
         arr = (ch.astype(np.float32) - float(black)) / rng
         arr = np.clip(arr, 0.0, 1.0)
-        return (arr * 255.0).astype(np.uint8)
+        scaled: np.ndarray = (arr * 255.0).astype(np.uint8)
+        return scaled
 
     def _linear_to_unit(ch: np.ndarray, black: float, white: float) -> np.ndarray:
         rng = float(white - black)
@@ -108,7 +210,8 @@ def normalize_to_uint8(
         try:
             g = float(gamma)
             g = 1e-6 if g <= 0 else g
-            return np.power(unit_arr, g)
+            powered: np.ndarray = np.power(unit_arr, g)
+            return powered
         except Exception:
             return unit_arr
 
@@ -116,7 +219,8 @@ def normalize_to_uint8(
         try:
             a = float(log_gain)
             a = max(a, 1.0)
-            return np.log1p(a * unit_arr) / np.log1p(a)
+            logged: np.ndarray = np.log1p(a * unit_arr) / np.log1p(a)
+            return logged
         except Exception:
             return unit_arr
 
@@ -124,7 +228,8 @@ def normalize_to_uint8(
         try:
             s = float(soften)
             s = max(s, 1e-6)
-            return np.arcsinh(s * unit_arr) / np.arcsinh(s)
+            stretched: np.ndarray = np.arcsinh(s * unit_arr) / np.arcsinh(s)
+            return stretched
         except Exception:
             return unit_arr
 
@@ -140,6 +245,10 @@ def normalize_to_uint8(
     gamma_value = 0.9
     asinh_soften = 12.0
     log_gain = 1000.0
+    stats_max_samples: Optional[int] = DEFAULT_MAX_SAMPLES
+    zscale_samples = DEFAULT_ZSCALE_SAMPLES
+    smoothing = 0.0
+    use_lut = True
     planetary_cfg = {
         "center_fraction": 0.2,
         "white_percentile": 99.8,
@@ -170,6 +279,10 @@ def normalize_to_uint8(
         gamma_value = float(norm_cfg.get("gamma_value", 0.9))
         asinh_soften = float(norm_cfg.get("asinh_soften", 12.0))
         log_gain = float(norm_cfg.get("log_gain", 1000.0))
+        stats_max_samples = int(norm_cfg.get("stats_max_samples", DEFAULT_MAX_SAMPLES)) or None
+        zscale_samples = int(norm_cfg.get("zscale_samples", DEFAULT_ZSCALE_SAMPLES))
+        smoothing = float(norm_cfg.get("temporal_smoothing", 0.0) or 0.0)
+        use_lut = bool(norm_cfg.get("use_lut", True))
         # Merge nested cfgs
         p = norm_cfg.get("planetary", {}) or {}
         for k in planetary_cfg:
@@ -203,6 +316,11 @@ def normalize_to_uint8(
 
     # Keep for config compatibility; behavior is enforced by clipping to [0,1]
     _ = preserve_black_point
+    active_smoother = smoother if smoother is not None else default_smoother
+    if smoother is not None and smoothing <= 0.0:
+        smoothing = smoother.alpha
+    # Integer input is mapped through a per-frame lookup table instead of float math
+    levels = lut_levels(image) if use_lut else 0
 
     # Prepare channel handling helpers
     def _iterate_channels(img: np.ndarray):
@@ -222,6 +340,43 @@ def normalize_to_uint8(
             out[:, :, c] = channels[c]
         return out
 
+    def _window_ok(black: float, white: float) -> bool:
+        rng = float(white - black)
+        return rng > 0.0 and bool(np.isfinite(rng))
+
+    def _stretch(
+        img: np.ndarray,
+        black: float,
+        white: float,
+        curve: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> np.ndarray:
+        # Window + optional unit curve; a single table lookup for integer input
+        if levels and _window_ok(black, white):
+            return apply_lut(img, stretch_lut(black, white, levels, curve))
+        parts_stretch: list[np.ndarray] = []
+        for _, ch in _iterate_channels(img):
+            unit = _linear_to_unit(ch, black, white)
+            if curve is not None:
+                unit = curve(unit)
+            parts_stretch.append((np.clip(unit, 0.0, 1.0) * 255.0).astype(np.uint8))
+        return _merge_channels(img, parts_stretch)
+
+    def _apply_tables(img: np.ndarray, tables: list[Optional[np.ndarray]]) -> Optional[np.ndarray]:
+        # One lookup pass with per-channel tables; None if any channel has no table
+        ready = [t for t in tables if t is not None]
+        if not ready or len(ready) != len(tables):
+            return None
+        return apply_lut(img, ready[0] if len(ready) == 1 else np.stack(ready))
+
+    def _curve_for(name: str) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        if name == "gamma":
+            return lambda unit: _apply_gamma01(unit, gamma_value)
+        if name == "log":
+            return lambda unit: _apply_log(unit, log_gain)
+        if name == "asinh":
+            return lambda unit: _apply_asinh(unit, asinh_soften)
+        return None
+
     # Method: none
     if method == "none":
         if image.ndim == 2:
@@ -235,22 +390,26 @@ def normalize_to_uint8(
 
     if method == "zscale":
         try:
-            from astropy.visualization import ImageNormalize, ZScaleInterval
-
-            def zscale_channel(ch: np.ndarray) -> np.ndarray:
-                norm = ImageNormalize(
-                    ch.astype(np.float32), interval=ZScaleInterval(contrast=contrast)
-                )
-                arr = norm(ch.astype(np.float32))
-                return np.clip(arr * 255.0, 0, 255).astype(np.uint8)
-
-            if image.ndim == 2:
-                return zscale_channel(image)
-            if image.ndim == 3 and image.shape[2] in (3, 4):
-                out = np.empty_like(image, dtype=np.uint8)
-                for c in range(image.shape[2]):
-                    out[:, :, c] = zscale_channel(image[:, :, c])
-                return out
+            if image.ndim == 2 or (image.ndim == 3 and image.shape[2] in (3, 4)):
+                windows = []
+                for c, ch in _iterate_channels(image):
+                    lo, hi = zscale_limits(ch, contrast=contrast, n_samples=zscale_samples)
+                    windows.append(_smooth(c, lo, hi))
+                if levels:
+                    identity = np.arange(levels, dtype=image.dtype)
+                    zs_tables: list[Optional[np.ndarray]] = [
+                        scale_lut(lo, hi, levels) if hi > lo else _to_uint8_no_scale(identity)
+                        for lo, hi in windows
+                    ]
+                    return cast(np.ndarray, _apply_tables(image, zs_tables))
+                parts_zs: list[np.ndarray] = []
+                for i, (_, ch) in enumerate(_iterate_channels(image)):
+                    lo, hi = windows[i]
+                    if hi > lo:
+                        parts_zs.append(_scale_to_uint8(ch, lo, hi))
+                    else:
+                        parts_zs.append(_to_uint8_no_scale(ch))
+                return _merge_channels(image, parts_zs)
             # Fallback to hist if shapes unexpected
             method = "hist"
         except Exception as e:
@@ -260,55 +419,68 @@ def normalize_to_uint8(
 
     # Histogram/percentile fallback
     if method in ("hist", "histogram", "percentile"):
-        if image.ndim == 2:
+        if image.ndim in (2, 3) and (image.ndim == 2 or image.shape[2] in (3, 4)):
             img16 = image.astype(np.uint16) if image.dtype != np.uint16 else image
-            return scale_16bit_to_8bit(img16)
-        if image.ndim == 3 and image.shape[2] in (3, 4):
-            out = np.empty_like(image, dtype=np.uint8)
-            for c in range(image.shape[2]):
-                ch = image[:, :, c]
-                img16 = ch.astype(np.uint16) if ch.dtype != np.uint16 else ch
-                out[:, :, c] = scale_16bit_to_8bit(img16)
-            return out
+            # All channel windows from one histogram pass
+            hist_limits = channel_percentile_limits(img16, 1.0, 99.0, stats_max_samples)
+            hist_windows: list[Tuple[float, float]] = []
+            for c, ch in _iterate_channels(img16):
+                p_lo, p_hi = hist_limits[c or 0]
+                hist_windows.append(_smooth(c, *_hist_window(float(p_lo), float(p_hi), ch)))
+            if use_lut:
+                coarse = (np.arange(65536, dtype=np.uint16) / 256.0).astype(np.uint8)
+                hist_tables: list[Optional[np.ndarray]] = [
+                    scale_lut(lo, hi, 65536) if hi > lo else coarse for lo, hi in hist_windows
+                ]
+                return cast(np.ndarray, _apply_tables(img16, hist_tables))
+            parts_hist: list[np.ndarray] = []
+            for i, (_, ch) in enumerate(_iterate_channels(img16)):
+                lo, hi = hist_windows[i]
+                if hi > lo:
+                    parts_hist.append(_scale_to_uint8(ch, lo, hi))
+                else:
+                    parts_hist.append((ch / 256.0).astype(np.uint8))
+            return _merge_channels(image, parts_hist)
         return (image / 256).astype(np.uint8)
 
     # Linear based methods (linear/gamma/log/asinh)
     if method in ("linear", "gamma", "log", "asinh"):
+        curve = _curve_for(method)
         # Compute scaling bounds
         if per_channel:
-            parts_pc: list[np.ndarray] = []
-            for _, ch in _iterate_channels(image):
-                if lin_min is not None and lin_max is not None:
-                    b, w = float(lin_min), float(lin_max)
+            pc_limits = None
+            if lin_min is None or lin_max is None:
+                pc_limits = channel_percentile_limits(
+                    image, clip_black, clip_white, stats_max_samples
+                )
+            pc_windows = []
+            for c, _ in _iterate_channels(image):
+                if pc_limits is None:
+                    pc_windows.append((float(lin_min), float(lin_max)))  # type: ignore[arg-type]
                 else:
-                    b, w = _compute_percentiles(ch, clip_black, clip_white)
-                unit = _linear_to_unit(ch, b, w)
-                if method == "gamma":
-                    unit = _apply_gamma01(unit, gamma_value)
-                elif method == "log":
-                    unit = _apply_log(unit, log_gain)
-                elif method == "asinh":
-                    unit = _apply_asinh(unit, asinh_soften)
-                parts_pc.append((np.clip(unit, 0.0, 1.0) * 255.0).astype(np.uint8))
+                    pc_windows.append(_smooth(c, *pc_limits[c or 0]))
+            if levels:
+                pc_tables: list[Optional[np.ndarray]] = [
+                    stretch_lut(b, w, levels, curve) if _window_ok(b, w) else None
+                    for b, w in pc_windows
+                ]
+                out_pc = _apply_tables(image, pc_tables)
+                if out_pc is not None:
+                    return out_pc
+            parts_pc = [
+                _stretch(ch, *pc_windows[i], curve)
+                for i, (_, ch) in enumerate(_iterate_channels(image))
+            ]
             return _merge_channels(image, parts_pc)
         else:
             # Shared window on luminance/mean
-            ref = image if image.ndim == 2 else image.mean(axis=2)
+            sample = subsample(image, stats_max_samples)
+            ref = sample if sample.ndim == 2 else sample.mean(axis=2)
             if lin_min is not None and lin_max is not None:
                 b, w = float(lin_min), float(lin_max)
             else:
-                b, w = _compute_percentiles(ref, clip_black, clip_white)
-            parts_shared: list[np.ndarray] = []
-            for _, ch in _iterate_channels(image):
-                unit = _linear_to_unit(ch, b, w)
-                if method == "gamma":
-                    unit = _apply_gamma01(unit, gamma_value)
-                elif method == "log":
-                    unit = _apply_log(unit, log_gain)
-                elif method == "asinh":
-                    unit = _apply_asinh(unit, asinh_soften)
-                parts_shared.append((np.clip(unit, 0.0, 1.0) * 255.0).astype(np.uint8))
-            return _merge_channels(image, parts_shared)
+                b, w = _smooth("shared", *_compute_percentiles(ref, clip_black, clip_white))
+            return _stretch(image, b, w, curve)
 
     # Planetary mode: ROI-weighted percentiles
     if method == "planetary":
@@ -319,7 +491,8 @@ def normalize_to_uint8(
         roi_sigma = float(planetary_cfg["auto_roi_sigma"])  # 4.0
         min_area_frac = float(planetary_cfg["roi_min_area_frac"])  # 0.02
 
-        gray = image if image.ndim == 2 else image.mean(axis=2)
+        sample = subsample(image, stats_max_samples)
+        gray = sample if sample.ndim == 2 else sample.mean(axis=2)
         H, W = gray.shape[:2]
         roi_mask = np.zeros_like(gray, dtype=bool)
 
@@ -346,12 +519,8 @@ def normalize_to_uint8(
         black_ref = gray
         b, _ = _compute_percentiles(black_ref, bp, 100.0)
         _, w = _compute_percentiles(white_ref, 0.0, wp)
-
-        parts_planetary: list[np.ndarray] = []
-        for _, ch in _iterate_channels(image):
-            unit = _linear_to_unit(ch, b, w)
-            parts_planetary.append((np.clip(unit, 0.0, 1.0) * 255.0).astype(np.uint8))
-        return _merge_channels(image, parts_planetary)
+        b, w = _smooth("planetary", b, w)
+        return _stretch(image, b, w)
 
     # Moon mode: planetary with midtone/shadows emphasis
     if method == "moon":
@@ -360,8 +529,9 @@ def normalize_to_uint8(
         midtone_boost = float(moon_cfg["midtone_boost"])  # 1.25
         shadows_boost = float(moon_cfg["shadows_boost"])  # 1.1
 
-        gray = image if image.ndim == 2 else image.mean(axis=2)
-        b, w = _compute_percentiles(gray, bp, wp)
+        sample = subsample(image, stats_max_samples)
+        gray = sample if sample.ndim == 2 else sample.mean(axis=2)
+        b, w = _smooth("moon", *_compute_percentiles(gray, bp, wp))
 
         def _moon_curve(unit: np.ndarray) -> np.ndarray:
             # Asinh then gamma-like midtone boost, small shadow lift
@@ -375,14 +545,10 @@ def normalize_to_uint8(
             # Optional extra gamma from config, applied at end
             if gamma_value and gamma_value > 0:
                 arr = _apply_gamma01(arr, gamma_value)
-            return np.clip(arr, 0.0, 1.0)
-
-        parts_moon: list[np.ndarray] = []
-        for _, ch in _iterate_channels(image):
-            unit = _linear_to_unit(ch, b, w)
-            unit = _moon_curve(unit)
-            parts_moon.append((unit * 255.0).astype(np.uint8))
-        return _merge_channels(image, parts_moon)
+            clipped: np.ndarray = np.clip(arr, 0.0, 1.0)
+            return clipped
+
+        return _stretch(image, b, w, _moon_curve)
 
     # Final fallback
     return _to_uint8_no_scale(image)
@@ -28,20 +28,43 @@ Dependencies:
 - config_manager: For configuration management
 """
 
+from collections import deque
 from datetime import datetime
 import logging
 import os
 from pathlib import Path
 import threading
 import time
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, cast
 
 # Import local modules
 from capture.controller import VideoCapture
+from capture.pipeline import CapturePipeline
+import cv2
+import numpy as np
+from overlay.compositor import OverlayCompositor, encode_image, fit_to_resolution, write_atomic
 from overlay.generator import OverlayGenerator
 from PIL import Image
 from platesolve.solver import PlateSolveResult, PlateSolverFactory
+from platesolve.tracking import WcsTracker, write_wcs_header
+from processing.frame_products import frame_display_u8, frame_solve_plane, frame_sources
+from processing.solve_worker import PlateSolveWorker, SolveJob
+from services.ephemeris import (
+    BRIGHT_BODIES,
+    BodyPosition,
+    angular_separation_deg,
+    ephemeris_name,
+    ephemeris_service_for_site,
+    radec_to_unit,
+    to_unix_time,
+)
 from services.frame_writer import FrameWriter
+from services.mount_telemetry import (
+    MountSample,
+    MountTelemetryService,
+    create_mount,
+    create_mount_telemetry,
+)
 from status import VideoProcessingStatus, error_status, success_status
 from utils.status_utils import unwrap_status
 
@@ -94,7 +117,9 @@ class VideoProcessor:
         self.video_capture: Optional[VideoCapture] = None
         self.frame_writer: Optional[FrameWriter] = None
         self.plate_solver: Optional[Any] = None
-        self.mount: Optional[Any] = None  # ASCOM mount for slewing detection
+        self.mount: Optional[Any] = None  # ASCOM/Alpaca mount for slewing detection
+        # Shared pointing/slewing/tracking samples of the mount
+        self.mount_telemetry: Optional[MountTelemetryService] = None
         self.is_running: bool = False
         self.processing_thread: Optional[threading.Thread] = None
 
@@ -118,6 +143,22 @@ class VideoProcessor:
         # Raw FITS archival options
         self.save_raw_fits: bool = bool(self.frame_config.get("save_raw_fits", False))
         self.raw_fits_dir: Path = Path(self.frame_config.get("raw_fits_dir", "raw_fits"))
+        # Most recent captured frame (Frame or Status wrapping one); carries cached products
+        self.last_frame: Any = None
+        self.last_normalization_override: Optional[str] = None
+        # Pending asynchronous FrameWriter jobs of the current capture (kind -> Future)
+        self._pending_writes: dict[str, Any] = {}
+        self.write_wait_timeout_s: float = float(
+            (self.frame_config.get("async_writer", {}) or {}).get("block_timeout_s", 30.0)
+        )
+        # Pipelined capture: next exposure starts while the previous frame is processed
+        self.pipeline_config: dict[str, Any] = self.frame_config.get("pipelined_capture", {}) or {}
+        self.capture_pipeline: Optional[CapturePipeline] = None
+        # In-memory overlay compositing onto the display frame (reused output buffer)
+        self.compositor = OverlayCompositor()
+        self.last_combined_image: Optional[np.ndarray] = None
+        # Live stream (services.stream_server.FrameHub): combined frames, solves, telemetry
+        self.frame_hub: Optional[Any] = None
 
         # Capture gating (slew/tracking) from overlay config (robust to minimal test configs)
         try:
@@ -140,6 +181,29 @@ class VideoProcessor:
         self.plate_solve_enabled: bool = self.auto_solve  # Alias for consistency
         self.min_solve_interval: int = self.plate_solve_config.get("min_solve_interval", 30)
 
+        # WCS tracking between full solves by star matching (see platesolve.tracking)
+        tracking_cfg = self.plate_solve_config.get("tracking", {}) or {}
+        self.tracking_config: dict[str, Any] = (
+            tracking_cfg if isinstance(tracking_cfg, dict) else {}
+        )
+        self.wcs_tracker: Optional[WcsTracker] = None
+        if self.tracking_config.get("enabled", False):
+            self.wcs_tracker = WcsTracker(
+                tolerance_px=float(self.tracking_config.get("match_tolerance_px", 2.0)),
+                min_matches=int(self.tracking_config.get("min_matches", 8)),
+                max_stars=int(self.tracking_config.get("max_stars", 40)),
+                max_drift_px=float(self.tracking_config.get("max_drift_px", 200.0)),
+                max_reference_age_s=float(self.tracking_config.get("max_reference_age_s", 600.0)),
+                logger=self.logger,
+            )
+        self.tracked_solves: int = 0
+        # WCS files of tracked solves; older ones are deleted (the newest two stay
+        # readable for overlays still rendering with the previous result)
+        self._tracked_wcs_files: deque[str] = deque()
+        # Solve on a background worker so capture continues during long solves
+        self.async_solve: bool = bool(self.plate_solve_config.get("async_solve", True))
+        self.solve_worker: Optional[PlateSolveWorker] = None
+
         # Slewing detection settings
         # These settings control how the system handles mount movement during imaging
         mount_config = self.config.get_mount_config()
@@ -216,6 +280,7 @@ class VideoProcessor:
                     logger=self.logger,
                     camera=self.video_capture.camera,
                     camera_type=self.video_capture.camera_type,
+                    device_state=getattr(self.video_capture, "device_state", None),
                 )
                 # Initialize CoolingService and kick off status monitoring if enabled
                 try:
@@ -223,7 +288,10 @@ class VideoProcessor:
 
                     self.cooling_service = CoolingService(self.config, logger=self.logger)
                     if self.video_capture and self.video_capture.camera:
-                        self.cooling_service.initialize(self.video_capture.camera)
+                        self.cooling_service.initialize(
+                            self.video_capture.camera,
+                            device_state=getattr(self.video_capture, "device_state", None),
+                        )
                 except Exception as e:
                     self.logger.debug(f"CoolingService not started: {e}")
                 # Make overlay generator aware of processor for cooling info
@@ -264,40 +332,114 @@ class VideoProcessor:
 
         # Initialize plate solver
         if self.auto_solve:
-            try:
-                self.plate_solver = PlateSolverFactory.create_solver(
-                    self.solver_type, config=self.config, logger=self.logger
-                )
-                if (
-                    self.plate_solver
-                    and hasattr(self.plate_solver, "is_available")
-                    and self.plate_solver.is_available()
-                ):
-                    name = (
-                        self.plate_solver.get_name()
-                        if hasattr(self.plate_solver, "get_name")
-                        else str(self.plate_solver)
-                    )
-                    self.logger.info(f"Plate solver initialized: {name}")
-                else:
-                    self.logger.warning(f"Plate solver not available: {self.solver_type}")
-                    self.plate_solver = None
-            except Exception as e:
-                self.logger.error(f"Error initializing plate solver: {e}")
-                self.plate_solver = None
+            self._init_plate_solver()
 
         # Initialize mount for slewing detection (optional)
         try:
-            from drivers.ascom.mount import ASCOMMount
-
-            self.mount = ASCOMMount(config=self.config, logger=self.logger)
+            self.mount = create_mount(self.config, logger=self.logger)
             self.logger.info("Mount initialized for slewing detection")
         except Exception as e:
             self.logger.warning(f"Could not initialize mount for slewing detection: {e}")
             self.mount = None
+        self._start_mount_telemetry()
 
         return success
 
+    def _start_mount_telemetry(self) -> None:
+        """Poll the mount on one thread and share the samples with all consumers."""
+        self._stop_mount_telemetry()
+        if self.mount is None:
+            return
+        telemetry = create_mount_telemetry(self.mount, self.config, logger=self.logger)
+        if telemetry is None:
+            # Disabled: every read polls the mount
+            telemetry = MountTelemetryService(self.mount, max_age_s=0.0, logger=self.logger)
+        else:
+            telemetry.start()
+        self.mount_telemetry = telemetry
+        telemetry.add_listener(self._publish_telemetry)
+        self._attach_mount_telemetry()
+
+    def _init_plate_solver(self) -> None:
+        """Create the configured plate solver, closing any previous instance."""
+        self._release_plate_solver()
+        try:
+            solver = PlateSolverFactory.create_solver(
+                self.solver_type, config=self.config, logger=self.logger
+            )
+            if solver and hasattr(solver, "is_available") and solver.is_available():
+                self.plate_solver = solver
+                self._attach_mount_telemetry()
+                name = solver.get_name() if hasattr(solver, "get_name") else str(solver)
+                self.logger.info(f"Plate solver initialized: {name}")
+            else:
+                self.logger.warning(f"Plate solver not available: {self.solver_type}")
+        except Exception as e:
+            self.logger.error(f"Error initializing plate solver: {e}")
+
+    def _release_plate_solver(self) -> None:
+        """Close and drop the current plate solver.
+
+        Solvers may own resident processes (warm astrometry-engine, race workers);
+        close() stops them so a replaced or stopped solver does not leak them.
+        """
+        solver = self.plate_solver
+        self.plate_solver = None
+        closer = getattr(solver, "close", None)
+        if callable(closer):
+            try:
+                closer()
+            except Exception as e:
+                self.logger.debug(f"Error closing plate solver: {e}")
+
+    def _attach_mount_telemetry(self) -> None:
+        """Give the current plate solver the shared mount telemetry (for its hints)."""
+        if self.mount_telemetry is None:
+            return
+        setter = getattr(self.plate_solver, "set_mount_telemetry", None)
+        if callable(setter):
+            setter(self.mount_telemetry)
+
+    def _publish_telemetry(self, sample: Any) -> None:
+        """Forward a mount sample to stream clients (telemetry thread)."""
+        if self.frame_hub is None or getattr(sample, "error", None):
+            return
+        self.frame_hub.publish_event(
+            "telemetry",
+            {
+                "ra_deg": sample.ra_deg,
+                "dec_deg": sample.dec_deg,
+                "slewing": sample.slewing,
+                "tracking": sample.tracking,
+                "side_of_pier": sample.side_of_pier,
+                "timestamp": sample.timestamp,
+            },
+        )
+
+    def _publish_solve_result(self, result: PlateSolveResult) -> None:
+        """Forward a plate-solve result to stream clients."""
+        if self.frame_hub is None:
+            return
+        self.frame_hub.publish_event(
+            "solve",
+            {
+                "ra_deg": result.ra_center,
+                "dec_deg": result.dec_center,
+                "fov_width_deg": result.fov_width,
+                "fov_height_deg": result.fov_height,
+                "position_angle_deg": result.position_angle,
+                "is_flipped": result.is_flipped,
+                "method": result.method,
+                "solving_time_s": result.solving_time,
+                "timestamp": time.time(),
+            },
+        )
+
+    def _stop_mount_telemetry(self) -> None:
+        if self.mount_telemetry is not None:
+            self.mount_telemetry.stop()
+            self.mount_telemetry = None
+
     def start(self) -> VideoProcessingStatus:
         """Start video processing.
 
@@ -317,6 +459,9 @@ class VideoProcessor:
                 return error_status(
                     "Initialization failed", details={"frame_enabled": self.frame_enabled}
                 )
+        elif self.auto_solve and self.plate_solver is None:
+            # The stop paths release the plate solver; recreate it on restart
+            self._init_plate_solver()
 
         if not self.video_capture:
             self.logger.error("Video capture not available")
@@ -327,6 +472,8 @@ class VideoProcessor:
         # Video capture is already started in start_observation_session
         # Just start the processing loop
         self.is_running = True
+        self._start_capture_pipeline()
+        self._start_solve_worker()
         self.processing_thread = threading.Thread(target=self._processing_loop, daemon=True)
         self.processing_thread.start()
         self.logger.info("Video processing loop started")
@@ -348,6 +495,15 @@ class VideoProcessor:
             pass
         if self.processing_thread:
             self.processing_thread.join(timeout=5.0)
+        self._stop_capture_pipeline()
+        self._stop_solve_worker()
+        self._release_plate_solver()
+        self._stop_mount_telemetry()
+        if self.frame_writer is not None:
+            try:
+                self.frame_writer.shutdown(wait=True)
+            except Exception:
+                pass
         if self.video_capture:
             self.video_capture.stop_capture()
             self.video_capture.disconnect()
@@ -371,6 +527,9 @@ class VideoProcessor:
             pass
         if self.processing_thread:
             self.processing_thread.join(timeout=5.0)
+        self._stop_capture_pipeline()
+        self._stop_solve_worker()
+        self._release_plate_solver()
         if self.video_capture:
             self.video_capture.stop_capture()
         self.logger.info("Video processor processing stopped (camera connection maintained)")
@@ -423,8 +582,10 @@ class VideoProcessor:
                         solver = PlateSolverFactory.create_solver(
                             self.solver_type, config=self.config, logger=self.logger
                         )
+                        self._release_plate_solver()
                         if solver and hasattr(solver, "is_available") and solver.is_available():
                             self.plate_solver = solver
+                            self._attach_mount_telemetry()
                             name = solver.get_name() if hasattr(solver, "get_name") else str(solver)
                             self.logger.info(
                                 "Plate solver reinitialized: %s (auto_solve=%s)",
@@ -436,14 +597,13 @@ class VideoProcessor:
                                 "Plate solver not available after reload: %s",
                                 self.solver_type,
                             )
-                            self.plate_solver = None
                     except Exception as e:
                         self.logger.error(f"Error reinitializing plate solver: {e}")
-                        self.plate_solver = None
+                        self._release_plate_solver()
             else:
                 if self.plate_solver is not None:
                     self.logger.info("Auto-solve disabled; releasing plate solver instance")
-                self.plate_solver = None
+                self._release_plate_solver()
 
             if interval_changed:
                 self.logger.info(
@@ -484,11 +644,15 @@ class VideoProcessor:
 
             # Recreate FrameWriter to pick up orientation/normalization changes
             try:
+                if self.frame_writer is not None:
+                    # Already queued writes still complete on the old pool
+                    self.frame_writer.shutdown(wait=False)
                 self.frame_writer = FrameWriter(
                     config=self.config,
                     logger=self.logger,
                     camera=self.video_capture.camera if self.video_capture else None,
                     camera_type=self.video_capture.camera_type if self.video_capture else "opencv",
+                    device_state=getattr(self.video_capture, "device_state", None),
                 )
             except Exception as e:
                 try:
@@ -515,25 +679,10 @@ class VideoProcessor:
         try:
             cam_type = getattr(self.video_capture, "camera_type", "opencv")
             if cam_type in ["alpaca", "ascom"]:
-                # Pass adaptive exposure override to capture controller (if set)
-                try:
-                    if self.next_exposure_time_override is not None:
-                        self.video_capture.next_exposure_time_override = float(
-                            self.next_exposure_time_override
-                        )
-                    else:
-                        # Clear previous override
-                        if hasattr(self.video_capture, "next_exposure_time_override"):
-                            self.video_capture.next_exposure_time_override = None
-                except Exception:
-                    pass
-
+                self._pass_exposure_override()
                 status = self.video_capture.capture_single_frame()
                 # One-shot override; clear after use
-                try:
-                    self.next_exposure_time_override = None
-                except Exception:
-                    pass
+                self.next_exposure_time_override = None
                 if not status or not getattr(status, "is_success", False):
                     msg = getattr(status, "message", "unknown error")
                     self.logger.warning(f"Single-frame capture failed: {msg}")
@@ -544,33 +693,178 @@ class VideoProcessor:
             self.logger.warning(f"Failed to obtain frame: {e}")
             return None
 
-    def _mount_is_slewing(self) -> bool:
+    def _pass_exposure_override(self) -> None:
+        """Pass the adaptive exposure override (if set) to the capture controller."""
         try:
-            if not hasattr(self, "mount") or self.mount is None:
-                return False
-            st = self.mount.is_slewing()
-            return bool(getattr(st, "data", False)) if getattr(st, "is_success", False) else False
+            if self.next_exposure_time_override is not None:
+                self.video_capture.next_exposure_time_override = float(  # type: ignore[union-attr]
+                    self.next_exposure_time_override
+                )
+            else:
+                # Clear previous override
+                if hasattr(self.video_capture, "next_exposure_time_override"):
+                    self.video_capture.next_exposure_time_override = None  # type: ignore[union-attr]
         except Exception:
-            return False
+            pass
 
-    def _mount_is_tracking(self) -> Optional[bool]:
+    def _start_capture_pipeline(self) -> None:
+        """Start pipelined capture for long-exposure cameras when enabled."""
+        if not bool(self.pipeline_config.get("enabled", False)) or self.capture_pipeline:
+            return
+        vc = self.video_capture
+        if getattr(vc, "camera_type", "opencv") not in ["alpaca", "ascom"] or not hasattr(
+            vc, "acquire_single_frame"
+        ):
+            self.logger.info("Pipelined capture needs an ASCOM/Alpaca camera; using sequential")
+            return
+        self.capture_pipeline = CapturePipeline(
+            acquire=self._pipeline_acquire,
+            process=vc.process_raw_frame,  # type: ignore[union-attr]
+            raw_queue_size=int(self.pipeline_config.get("raw_queue_size", 2)),
+            output_queue_size=int(self.pipeline_config.get("output_queue_size", 2)),
+            gate=self._capture_gate_open,
+            min_interval_s=float(self.pipeline_config.get("min_interval_s", 0.0)),
+            logger=self.logger,
+        )
+        self.capture_pipeline.start()
+        self.logger.info("Pipelined capture started")
+
+    def _stop_capture_pipeline(self) -> None:
+        if self.capture_pipeline is None:
+            return
         try:
-            if not hasattr(self, "mount") or self.mount is None:
-                return None
-            trk = getattr(self.mount, "is_tracking", None)
-            if callable(trk):
-                res = trk()
-                if hasattr(res, "is_success"):
-                    return bool(getattr(res, "data", False)) if res.is_success else None
-                return bool(res)
-            if trk is not None:
-                return bool(trk)
+            stats = self.capture_pipeline.stats()
+            self.capture_pipeline.stop()
+            self.logger.info(
+                "Pipelined capture stopped: acquired=%s delivered=%s failed=%s duty_cycle=%s",
+                stats.get("acquired"),
+                stats.get("delivered"),
+                stats.get("failed"),
+                stats.get("duty_cycle"),
+            )
+        except Exception as e:
+            self.logger.debug(f"Stopping capture pipeline failed: {e}")
+        self.capture_pipeline = None
+
+    def _pipeline_acquire(self) -> Any:
+        """Exposure stage of the capture pipeline (expose + download only)."""
+        self._pass_exposure_override()
+        status = self.video_capture.acquire_single_frame()  # type: ignore[union-attr]
+        self.next_exposure_time_override = None
+        return status
+
+    def _mount_sample(self) -> Optional[MountSample]:
+        """Latest mount telemetry sample (polled now if stale), None without a mount."""
+        if getattr(self, "mount", None) is None:
+            return None
+        if self.mount_telemetry is None or self.mount_telemetry.mount is not self.mount:
+            # No telemetry started for this mount: poll it on demand
+            self._stop_mount_telemetry()
+            self.mount_telemetry = MountTelemetryService(
+                self.mount, max_age_s=0.0, logger=self.logger
+            )
+        try:
+            return self.mount_telemetry.sample()
+        except Exception as e:
+            self.logger.debug(f"Mount telemetry unavailable: {e}")
             return None
+
+    def _mount_coordinates(self) -> Optional[tuple[float, float]]:
+        """Mount pointing (RA, Dec) in degrees from the shared telemetry."""
+        sample = self._mount_sample()
+        return sample.coordinates if sample is not None else None
+
+    def _mount_is_slewing(self) -> bool:
+        sample = self._mount_sample()
+        return bool(sample is not None and sample.slewing)
+
+    def _mount_is_tracking(self) -> Optional[bool]:
+        sample = self._mount_sample()
+        return sample.tracking if sample is not None else None
+
+    def _config_half_diag_deg(self) -> float:
+        """FOV half-diagonal in degrees from the telescope and camera config (0 if unknown)."""
+        try:
+            from math import atan, degrees
+
+            tel_cfg = self.config.get_telescope_config()
+            cam_cfg = self.config.get_camera_config()
+            focal_length_mm = float(tel_cfg.get("focal_length", 1000.0))
+            sensor_w_mm = float(cam_cfg.get("sensor_width", 13.2))
+            sensor_h_mm = float(cam_cfg.get("sensor_height", 8.8))
+            fov_w = 2.0 * degrees(atan((sensor_w_mm / 2.0) / focal_length_mm))
+            fov_h = 2.0 * degrees(atan((sensor_h_mm / 2.0) / focal_length_mm))
+            return float(((fov_w**2 + fov_h**2) ** 0.5) / 2.0)
         except Exception:
+            return 0.0
+
+    def _ephemeris_service(self) -> Optional[Any]:
+        """Shared ephemeris service for the configured site (site or overlay.site).
+
+        Uses the overlay's solar_system.ephemeris so the processor and the
+        overlay generator share one service.
+        """
+        try:
+            ovl = (
+                self.config.get_overlay_config()
+                if hasattr(self.config, "get_overlay_config")
+                else {}
+            )
+            ovl = ovl if isinstance(ovl, dict) else {}
+            site_cfg = None
+            if hasattr(self.config, "get_site_config"):
+                site_cfg = self.config.get_site_config()
+            if not site_cfg:
+                site_cfg = ovl.get("site", {})
+            solar_cfg = ovl.get("solar_system", {}) or {}
+            eph = ephemeris_name(solar_cfg.get("ephemeris", "de432s"))
+            return ephemeris_service_for_site(site_cfg, ephemeris=eph, logger=self.logger)
+        except Exception as e:
+            self.logger.debug(f"Ephemeris service unavailable: {e}")
             return None
 
+    @staticmethod
+    def _observation_time(metadata: Any) -> float:
+        """Capture time (Unix seconds) from frame metadata, or now."""
+        ts = None
+        if isinstance(metadata, dict):
+            ts = (
+                metadata.get("date_obs")
+                or metadata.get("DATE-OBS")
+                or metadata.get("capture_started_at")
+            )
+        try:
+            return float(to_unix_time(ts or None))
+        except Exception:
+            return time.time()
+
+    def _bright_bodies_in_fov(
+        self, ra_deg: float, dec_deg: float, half_diag_deg: float, metadata: Any
+    ) -> list[BodyPosition]:
+        """Moon and planets within half_diag_deg of a center at capture time, nearest first."""
+        service = self._ephemeris_service()
+        if service is None or half_diag_deg <= 0.0:
+            return []
+        try:
+            return list(
+                service.bodies_within(
+                    ra_deg,
+                    dec_deg,
+                    half_diag_deg,
+                    when=self._observation_time(metadata),
+                    bodies=BRIGHT_BODIES,
+                )
+            )
+        except Exception as e:
+            self.logger.debug(f"Bright-body check failed: {e}")
+            return []
+
     def _save_outputs(self, frame) -> tuple[Optional[Path], Optional[Path]]:
-        """Save display image and FITS; return their paths (may be None)."""
+        """Save display image and FITS; return their paths (may be None).
+
+        With the asynchronous writer the files may not exist yet when this
+        returns; use _written_path() before handing a path to a reader.
+        """
         frame_filename: Optional[Path] = None
         fits_filename: Optional[Path] = None
         if not self.save_frames:
@@ -591,6 +885,7 @@ class VideoProcessor:
                 logger=self.logger,
                 camera=self.video_capture.camera,
                 camera_type=self.video_capture.camera_type,
+                device_state=getattr(self.video_capture, "device_state", None),
             )
 
         # Extract details and attach capture_id
@@ -602,46 +897,17 @@ class VideoProcessor:
             details = {}
         details_with_id = {**details, "capture_id": self.capture_count}
         # If a mount is available, add current RA/Dec (degrees) to metadata for FITS headers
-        try:
-            if hasattr(self, "mount") and self.mount is not None:
-                mstat = self.mount.get_coordinates()
-                if (
-                    getattr(mstat, "is_success", False)
-                    and isinstance(getattr(mstat, "data", None), (list, tuple))
-                    and len(mstat.data) == 2
-                ):
-                    ra_m, dec_m = float(mstat.data[0]), float(mstat.data[1])
-                    # Convert RA hours to degrees if needed
-                    if 0.0 <= ra_m <= 24.0:
-                        ra_m *= 15.0
-                    details_with_id.setdefault("RA", ra_m)
-                    details_with_id.setdefault("DEC", dec_m)
-        except Exception:
-            pass
+        mount_sample = self._mount_sample()
+        if mount_sample is not None:
+            if mount_sample.coordinates is not None:
+                details_with_id.setdefault("RA", mount_sample.ra_deg)
+                details_with_id.setdefault("DEC", mount_sample.dec_deg)
+            if mount_sample.side_of_pier is not None:
+                details_with_id.setdefault("pier_side", mount_sample.side_of_pier)
 
         # Decide normalization override for display based on predicted bright bodies
         normalization_override = None
         try:
-            # Time
-            try:
-                from astropy.time import Time as _Time
-            except Exception:
-                _Time = None
-            if _Time is not None:
-                try:
-                    ts_val = None
-                    if isinstance(self.last_frame_metadata, dict):
-                        ts_val = (
-                            self.last_frame_metadata.get("date_obs")
-                            or self.last_frame_metadata.get("DATE-OBS")
-                            or self.last_frame_metadata.get("capture_started_at")
-                        )
-                    obstime_norm = _Time(ts_val) if ts_val else _Time.now()
-                except Exception:
-                    obstime_norm = _Time.now()
-            else:
-                obstime_norm = None
-
             # Center + FOV half-diagonal
             half_diag_for_norm = 0.0
             center_for_norm = None
@@ -660,129 +926,56 @@ class VideoProcessor:
                 center_for_norm = None
             if center_for_norm is None:
                 # Compute FOV from config and read mount pointing
-                try:
-                    from math import atan
-                    from math import degrees as _degrees
-
-                    tel_cfg2 = self.config.get_telescope_config()
-                    cam_cfg2 = self.config.get_camera_config()
-                    fl_mm = float(tel_cfg2.get("focal_length", 1000.0))
-                    sw_mm = float(cam_cfg2.get("sensor_width", 13.2))
-                    sh_mm = float(cam_cfg2.get("sensor_height", 8.8))
-                    fov_w2 = 2.0 * _degrees(atan((sw_mm / 2.0) / fl_mm))
-                    fov_h2 = 2.0 * _degrees(atan((sh_mm / 2.0) / fl_mm))
-                    half_diag_for_norm = ((fov_w2**2 + fov_h2**2) ** 0.5) / 2.0
-                except Exception:
-                    half_diag_for_norm = 0.0
-                try:
-                    if hasattr(self, "mount") and self.mount is not None:
-                        mstat2 = self.mount.get_coordinates()
-                        if (
-                            getattr(mstat2, "is_success", False)
-                            and isinstance(getattr(mstat2, "data", None), (list, tuple))
-                            and len(mstat2.data) == 2
-                        ):
-                            ra_m = float(mstat2.data[0])
-                            dec_m = float(mstat2.data[1])
-                            # Heuristic: RA hours vs degrees
-                            if 0.0 <= ra_m <= 24.0:
-                                ra_m = ra_m * 15.0
-                            center_for_norm = (ra_m, dec_m)
-                except Exception:
-                    center_for_norm = None
-
-            # Location
-            earth_loc = None
-            try:
-                from astropy.coordinates import EarthLocation as _EarthLocation
-                import astropy.units as _u
-            except Exception:
-                _EarthLocation = None
-            if _EarthLocation is not None:
-                try:
-                    site_cfg2 = None
-                    if hasattr(self.config, "get_site_config"):
-                        site_cfg2 = self.config.get_site_config()
-                    if not site_cfg2:
-                        ovl2 = (
-                            self.config.get_overlay_config()
-                            if hasattr(self.config, "get_overlay_config")
-                            else {}
-                        )
-                        site_cfg2 = ovl2.get("site", {}) if isinstance(ovl2, dict) else {}
-                    lat2 = site_cfg2.get("latitude")
-                    lon2 = site_cfg2.get("longitude")
-                    el2 = site_cfg2.get("elevation_m", 0.0)
-                    latf = float(lat2) if lat2 is not None else 0.0
-                    lonf = float(lon2) if lon2 is not None else 0.0
-                    elf = float(el2) if el2 is not None else 0.0
-                    earth_loc = _EarthLocation(
-                        lat=latf * _u.deg, lon=lonf * _u.deg, height=elf * _u.m
+                half_diag_for_norm = self._config_half_diag_deg()
+                if mount_sample is not None:
+                    center_for_norm = mount_sample.coordinates
+
+            # Check bodies (the Moon takes precedence over planets)
+            if center_for_norm is not None and half_diag_for_norm > 0.0:
+                names = [
+                    b.name
+                    for b in self._bright_bodies_in_fov(
+                        center_for_norm[0],
+                        center_for_norm[1],
+                        half_diag_for_norm,
+                        self.last_frame_metadata,
                     )
-                except Exception:
-                    earth_loc = None
-
-            # Check bodies
-            if (
-                obstime_norm is not None
-                and earth_loc is not None
-                and center_for_norm is not None
-                and half_diag_for_norm > 0.0
-            ):
-                try:
-                    from astropy.coordinates import SkyCoord as _SkyCoord
-                    from astropy.coordinates import get_body as _get_body
-                    import astropy.units as _u2
-                except Exception:
-                    pass
-                else:
-                    try:
-                        center_sc = _SkyCoord(
-                            ra=center_for_norm[0] * _u2.deg,
-                            dec=center_for_norm[1] * _u2.deg,
-                            frame="icrs",
-                        )
-                        # Moon first
-                        try:
-                            moon_sc = _get_body("moon", obstime_norm, location=earth_loc)
-                            sep_moon = float(moon_sc.icrs.separation(center_sc).degree)
-                            if sep_moon <= half_diag_for_norm:
-                                normalization_override = "moon"
-                        except Exception:
-                            pass
-                        if normalization_override is None:
-                            # Planets
-                            for bname in [
-                                "mercury",
-                                "venus",
-                                "mars",
-                                "jupiter",
-                                "saturn",
-                                "uranus",
-                                "neptune",
-                            ]:
-                                try:
-                                    b_sc = _get_body(bname, obstime_norm, location=earth_loc)
-                                    sep_b = float(b_sc.icrs.separation(center_sc).degree)
-                                    if sep_b <= half_diag_for_norm:
-                                        normalization_override = "planetary"
-                                        break
-                                except Exception:
-                                    continue
-                    except Exception:
-                        pass
+                ]
+                if "moon" in names:
+                    normalization_override = "moon"
+                elif names:
+                    normalization_override = "planetary"
         except Exception:
             normalization_override = None
 
         # Save display image (measure duration)
         frame_filename = self.frame_dir / f"{base}.{self.file_format}"
         t0 = time.monotonic()
+        self.last_normalization_override = normalization_override
         # Attach normalization override to metadata for display saving
         if normalization_override is not None:
             try:
                 details_with_id["normalization_override"] = normalization_override
             except Exception:
                 pass
+        use_async = bool(self.frame_writer and getattr(self.frame_writer, "async_enabled", False))
+        self._pending_writes = {}
+        if use_async and self.frame_writer is not None:
+            # Queue display, FITS and RAW writes; callers wait only for the file they need
+            self._pending_writes["image"] = self.frame_writer.submit(
+                frame,
+                str(frame_filename),
+                metadata=details_with_id,
+                callback=self._log_write_result,
+            )
+            self._pending_writes["fits"] = self.frame_writer.submit(
+                frame,
+                str(self.frame_dir / f"{base}.fits"),
+                metadata=details_with_id,
+                callback=self._log_write_result,
+            )
+            self._queue_raw_fits(frame, details_with_id, use_async=True)
+            return frame_filename, self.frame_dir / f"{base}.fits"
         img_status = (
             self.frame_writer.save(frame, str(frame_filename), metadata=details_with_id)
             if self.frame_writer
@@ -815,6 +1008,73 @@ class VideoProcessor:
             self.logger.info(f"FITS frame saved: {fits_filename} save_ms={fits_ms:.1f}")
 
         # Optionally save RAW (non-debayered) FITS with timestamp to separate directory
+        self._queue_raw_fits(frame, details_with_id, use_async=False)
+
+        return frame_filename, fits_filename
+
+    def _log_write_result(self, status: Any) -> None:
+        """Log the outcome of an asynchronous FrameWriter job."""
+        details = getattr(status, "details", None) or {}
+        if getattr(status, "is_success", False):
+            self.logger.info(
+                "Saved %s write_ms=%.1f queue_ms=%.1f",
+                details.get("path"),
+                float(details.get("write_ms", 0.0)),
+                float(details.get("queue_ms", 0.0)),
+            )
+        else:
+            self.logger.warning(
+                "Failed to save %s: %s", details.get("path"), getattr(status, "message", "")
+            )
+
+    def _await_write(
+        self, kind: str, timeout: Optional[float] = None, pending: Optional[dict] = None
+    ) -> Optional[bool]:
+        """Wait for a pending asynchronous write; None if no such write is pending.
+
+        pending: Writes of a specific capture (default: the last capture)
+        """
+        if pending is None:
+            pending = getattr(self, "_pending_writes", {})
+        fut = pending.get(kind)
+        if fut is None:
+            return None
+        try:
+            status = fut.result(timeout=timeout)
+        except Exception:
+            return False
+        return bool(getattr(status, "is_success", False))
+
+    def _written_path(
+        self, kind: str, path: Optional[Path], pending: Optional[dict] = None
+    ) -> Optional[Path]:
+        """path once its pending asynchronous write has finished; None if it failed."""
+        if path is None:
+            return None
+        written = self._await_write(kind, self.write_wait_timeout_s, pending)
+        return None if written is False else path
+
+    def _remove_file(self, path: Any) -> None:
+        """Delete a temporary solver file, ignoring errors."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.debug(f"Could not remove {path}: {e}")
+
+    def _remove_written_file(self, fut: Any) -> None:
+        """Done-callback deleting the file of a finished asynchronous write."""
+        try:
+            status = fut.result()
+            path = (getattr(status, "details", None) or {}).get("path")
+            if getattr(status, "is_success", False) and path and os.path.exists(path):
+                os.remove(path)
+        except Exception:
+            pass
+
+    def _queue_raw_fits(self, frame: Any, details_with_id: dict, use_async: bool) -> None:
+        """Save (or queue) the RAW FITS archival copy when enabled."""
         try:
             if self.save_raw_fits and self.frame_writer is not None:
                 # Extract original undebayered mosaic from Frame wherever available
@@ -872,6 +1132,15 @@ class VideoProcessor:
                     raw_base = "_".join(raw_name_parts)
                     raw_path = self.raw_fits_dir / f"{raw_base}.fits"
                     os.makedirs(self.raw_fits_dir, exist_ok=True)
+                    if use_async:
+                        self._pending_writes["raw"] = self.frame_writer.submit(
+                            raw_data,
+                            str(raw_path),
+                            metadata=details_with_id,
+                            raw=True,
+                            callback=self._log_write_result,
+                        )
+                        return
                     raw_status = self.frame_writer.save_raw_fits(
                         raw_data, str(raw_path), metadata=details_with_id
                     )
@@ -885,59 +1154,58 @@ class VideoProcessor:
         except Exception as e:
             self.logger.debug(f"RAW FITS archival skipped: {e}")
 
-        return frame_filename, fits_filename
-
     def _maybe_plate_solve(
-        self, fits_filename: Optional[Path], frame_filename: Optional[Path]
+        self,
+        fits_filename: Optional[Path],
+        frame_filename: Optional[Path],
+        job: Optional[SolveJob] = None,
     ) -> Optional[PlateSolveResult]:
-        """Run plate-solving if enabled and interval elapsed; prefer FITS."""
+        """Run plate-solving if enabled and interval elapsed; prefer FITS.
+
+        Args:
+            fits_filename: FITS file of the capture
+            frame_filename: Display image of the capture
+            job: Capture state when solving asynchronously (default: the last capture)
+        """
         if not (self.plate_solver and self.auto_solve):
             return None
-        if (time.monotonic() - self.last_solve_time) < self.min_solve_interval:
+        if job is None:
+            job = self._solve_job(fits_filename, frame_filename)
+        # Between full solves, carry the last WCS over by matching stars
+        tracked = self._track_wcs(job)
+        if tracked is not None:
+            return tracked
+        # Tracking that just lost its reference asks for a full solve right away
+        tracking_lost = self.wcs_tracker is not None and self.wcs_tracker.last_failure is not None
+        if (
+            not tracking_lost
+            and (time.monotonic() - self.last_solve_time) < self.min_solve_interval
+        ):
             return None
+        if self.wcs_tracker is not None:
+            self.wcs_tracker.last_failure = None
+        # Star list from the in-memory frame replaces the FITS handoff when enabled
+        use_xylist = self._xylist_solving_enabled() and job.frame is not None
+        exclude_center = 0.0
         candidate: Optional[Path] = None
-        if fits_filename and fits_filename.exists():
-            candidate = fits_filename
-            self.logger.info(f"Using FITS file for plate-solving: {candidate}")
-        elif frame_filename and frame_filename.exists():
-            candidate = frame_filename
-            self.logger.warning(
-                f"FITS not available, using display image for plate-solving: {candidate}"
-            )
-            self.logger.warning("This may not be supported by some solvers")
-        else:
-            self.logger.error("No suitable file to plate-solve")
-            return None
+        if not use_xylist:
+            candidate = self._solve_candidate(fits_filename, frame_filename, job)
+            if candidate is None:
+                return None
         # Pre-check: if the Moon is predicted to be inside the FOV (from mount pointing
         # or last plate-solve center + FOV from camera/telescope), skip solving entirely
         # and let the runner render a minimal overlay for this iteration.
         try:
             self.moon_in_fov_predicted = False  # default
             # Compute pointing center
-            center_ra_dec = None
             center_candidates: list[tuple[float, float]] = []
-            if hasattr(self, "mount") and self.mount is not None:
-                try:
-                    mstat = self.mount.get_coordinates()
-                    if (
-                        getattr(mstat, "is_success", False)
-                        and isinstance(getattr(mstat, "data", None), (list, tuple))
-                        and len(mstat.data) == 2
-                    ):
-                        # Trust ASCOMMount.get_coordinates() to return degrees
-                        ra_deg = float(mstat.data[0])
-                        dec_deg = float(mstat.data[1])
-                        center_ra_dec = (ra_deg, dec_deg)
-                        try:
-                            self.logger.debug(
-                                "Moon precheck: mount center RA=%.5f° Dec=%.5f°",
-                                ra_deg,
-                                dec_deg,
-                            )
-                        except Exception:
-                            pass
-                except Exception:
-                    center_ra_dec = None
+            center_ra_dec = self._mount_coordinates()
+            if center_ra_dec is not None:
+                self.logger.debug(
+                    "Moon precheck: mount center RA=%.5f° Dec=%.5f°",
+                    center_ra_dec[0],
+                    center_ra_dec[1],
+                )
             if (
                 center_ra_dec is None
                 and self.last_solve_result is not None
@@ -1020,217 +1288,59 @@ class VideoProcessor:
                                 pass
                 except Exception:
                     pass
-            # Compute half diagonal FOV from config
-            half_diag_deg = 0.0
-            try:
-                tel_cfg = self.config.get_telescope_config()
-                cam_cfg = self.config.get_camera_config()
-                focal_length_mm = float(tel_cfg.get("focal_length", 1000.0))
-                sensor_w_mm = float(cam_cfg.get("sensor_width", 13.2))
-                sensor_h_mm = float(cam_cfg.get("sensor_height", 8.8))
-                import math as _math
-
-                fov_w = 2.0 * _math.degrees(_math.atan((sensor_w_mm / 2.0) / focal_length_mm))
-                fov_h = 2.0 * _math.degrees(_math.atan((sensor_h_mm / 2.0) / focal_length_mm))
-                half_diag_deg = ((_math.pow(fov_w, 2) + _math.pow(fov_h, 2)) ** 0.5) / 2.0
-            except Exception:
-                half_diag_deg = 0.0
-            if center_ra_dec is not None and half_diag_deg > 0.0:
+            half_diag_deg = self._config_half_diag_deg()
+            service = self._ephemeris_service()
+            if service is not None and center_ra_dec is not None and half_diag_deg > 0.0:
+                obstime = self._observation_time(job.metadata)
                 try:
-                    from astropy.coordinates import (
-                        EarthLocation,
-                        SkyCoord,
-                        get_body,
-                        solar_system_ephemeris,
+                    moon = service.position("moon", when=obstime)
+                except Exception as e:
+                    self.logger.debug(f"Moon precheck: ephemeris unavailable: {e}")
+                    moon = None
+                if moon is not None:
+                    self.logger.debug(
+                        "Moon precheck: moon RA=%.5f° Dec=%.5f° obstime=%s",
+                        moon.ra_deg,
+                        moon.dec_deg,
+                        time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(obstime)),
                     )
-                    from astropy.time import Time
-                    import astropy.units as u
-                except Exception:
-                    pass
-                else:
-                    # Observation time
-                    try:
-                        ts = None
-                        if isinstance(self.last_frame_metadata, dict):
-                            ts = (
-                                self.last_frame_metadata.get("date_obs")
-                                or self.last_frame_metadata.get("DATE-OBS")
-                                or self.last_frame_metadata.get("capture_started_at")
-                            )
-                        if ts:
-                            # Normalize to ISO with explicit Z if missing tz
-                            if isinstance(ts, str):
-                                ts_str = ts.strip()
-                                # Add Z if naive ISO (no timezone info present)
-                                if ts_str.endswith("Z"):
-                                    obstime = Time(ts_str, format="isot", scale="utc")
-                                else:
-                                    # Heuristic: if contains 'T' and no space/tz, append Z
-                                    if "T" in ts_str and (
-                                        "+" not in ts_str and "-" not in ts_str[-6:]
-                                    ):
-                                        ts_str = ts_str + "Z"
-                                    obstime = Time(ts_str, format="isot", scale="utc")
-                            else:
-                                # If ts is a datetime, ensure UTC
-                                try:
-                                    from datetime import datetime
-                                    from datetime import timezone as _tz
-
-                                    if isinstance(ts, datetime):
-                                        if ts.tzinfo is None:
-                                            ts = ts.replace(tzinfo=_tz.utc)
-                                        obstime = Time(ts)
-                                    else:
-                                        obstime = Time(ts)
-                                except Exception:
-                                    obstime = Time(ts)
-                        else:
-                            obstime = Time.now()
-                    except Exception:
-                        obstime = Time.now()
-                    # Location
-                    try:
-                        site_cfg = None
-                        if hasattr(self.config, "get_site_config"):
-                            site_cfg = self.config.get_site_config()
-                        if not site_cfg:
-                            ovl = (
-                                self.config.get_overlay_config()
-                                if hasattr(self.config, "get_overlay_config")
-                                else {}
-                            )
-                            site_cfg = ovl.get("site", {}) if isinstance(ovl, dict) else {}
-                        lat_raw = site_cfg.get("latitude")
-                        lon_raw = site_cfg.get("longitude")
-                        elev_raw = site_cfg.get("elevation_m", 0.0)
-                        lat = float(lat_raw) if lat_raw is not None else 0.0
-                        lon = float(lon_raw) if lon_raw is not None else 0.0
-                        elev = float(elev_raw) if elev_raw is not None else 0.0
-                        location = EarthLocation(
-                            lat=lat * u.deg, lon=lon * u.deg, height=elev * u.m
-                        )
-                        try:
-                            self.logger.debug(
-                                "Moon precheck: site lat=%.5f lon=%.5f elev=%.1fm obstime=%s",
-                                lat,
-                                lon,
-                                elev,
-                                getattr(obstime, "isot", str(obstime)),
-                            )
-                        except Exception:
-                            pass
-                    except Exception:
-                        location = None
                     # Center coordinate (choose best RA interpretation if ambiguous)
-                    # Build candidate list: include center_ra_dec and any deferred candidates
-                    candidates: list[tuple[float, float]] = [center_ra_dec]
-                    try:
-                        if center_candidates:
-                            candidates = center_candidates
-                        try:
-                            self.logger.debug(
-                                "Moon precheck: %d candidate center(s): %s",
-                                len(candidates),
-                                str(candidates),
-                            )
-                        except Exception:
-                            pass
-                    except Exception:
-                        pass
-                    # Evaluate separation for candidates; choose smallest
-                    best_center = center_ra_dec
-                    try:
-                        # Normalize obstime to astropy Time if string/datetime slipped through
-                        try:
-                            from astropy.time import Time as _Time2
-
-                            if not isinstance(obstime, _Time2):
-                                obstime = _Time2(getattr(obstime, "isot", str(obstime)))
-                        except Exception:
-                            pass
-                        moon_coord = get_body("moon", obstime, location=location)
-                        try:
-                            self.logger.debug(
-                                "Moon precheck: moon RA=%.5f° Dec=%.5f° (ICRS)",
-                                float(moon_coord.icrs.ra.deg),
-                                float(moon_coord.icrs.dec.deg),
-                            )
-                        except Exception:
-                            pass
-                        best_sep = 1e9
-                        for ra_c, dec_c in candidates:
-                            c = SkyCoord(ra=ra_c * u.deg, dec=dec_c * u.deg, frame="icrs")
-                            s = c.separation(moon_coord.icrs).degree
-                            if s < best_sep:
-                                best_sep = s
-                                best_center = (ra_c, dec_c)
-                        center_ra_dec = best_center
-                        try:
-                            self.logger.debug(
-                                "Moon precheck: chosen center RA=%.5f° Dec=%.5f° (sep=%.3f°)",
-                                center_ra_dec[0],
-                                center_ra_dec[1],
-                                best_sep,
-                            )
-                        except Exception:
-                            pass
-                    except Exception:
-                        # Fall back to original center
-                        pass
-                    # Ensure RA wraps into 0..360 to avoid large separations
-                    try:
-                        ra_wrapped = float(center_ra_dec[0]) % 360.0
-                        dec_clamped = max(-90.0, min(90.0, float(center_ra_dec[1])))
-                    except Exception:
-                        ra_wrapped = center_ra_dec[0]
-                        dec_clamped = center_ra_dec[1]
-                    center = SkyCoord(ra=ra_wrapped * u.deg, dec=dec_clamped * u.deg, frame="icrs")
-                    try:
-                        # Ensure ephemeris is set to a modern file; ignore errors
-                        try:
-                            solar_system_ephemeris.set("de432s")
-                        except Exception:
-                            pass
-                        moon_coord = get_body("moon", obstime, location=location)
-                        sep = moon_coord.icrs.separation(center).degree
-                        # Unified info log with obstime for troubleshooting
-                        try:
-                            self.logger.info(
-                                "Pre-capture Moon sep: %.3f° (halfdiag=%.3f°) "
-                                "center=(%.4f,%.4f) obstime=%s",
-                                sep,
-                                half_diag_deg,
-                                center_ra_dec[0],
-                                center_ra_dec[1],
-                                getattr(obstime, "isot", str(obstime)),
-                            )
-                        except Exception:
-                            pass
-                        if sep <= half_diag_deg:
-                            self.moon_in_fov_predicted = True
-                            try:
-                                self.logger.info(
-                                    "Moon predicted in FOV (sep=%.3f°) center=(%.4f,%.4f)",
-                                    sep,
-                                    center_ra_dec[0],
-                                    center_ra_dec[1],
-                                )
-                            except Exception:
-                                pass
-                        else:
-                            try:
-                                self.logger.debug(
-                                    "Moon OUT of FOV (sep=%.3f°) halfdiag=%.3f° center=(%.4f,%.4f)",
-                                    sep,
-                                    half_diag_deg,
-                                    center_ra_dec[0],
-                                    center_ra_dec[1],
-                                )
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
+                    candidates = center_candidates or [center_ra_dec]
+                    self.logger.debug(
+                        "Moon precheck: %d candidate center(s): %s",
+                        len(candidates),
+                        str(candidates),
+                    )
+                    seps = angular_separation_deg(
+                        radec_to_unit([c[0] for c in candidates], [c[1] for c in candidates]),
+                        radec_to_unit(moon.ra_deg, moon.dec_deg),
+                    )
+                    best = int(np.argmin(seps))
+                    center_ra_dec = candidates[best]
+                    sep = float(seps[best])
+                    self.logger.info(
+                        "Pre-capture Moon sep: %.3f° (halfdiag=%.3f°) center=(%.4f,%.4f)",
+                        sep,
+                        half_diag_deg,
+                        center_ra_dec[0],
+                        center_ra_dec[1],
+                    )
+                    if sep <= half_diag_deg:
+                        self.moon_in_fov_predicted = True
+                        self.logger.info(
+                            "Moon predicted in FOV (sep=%.3f°) center=(%.4f,%.4f)",
+                            sep,
+                            center_ra_dec[0],
+                            center_ra_dec[1],
+                        )
+                    else:
+                        self.logger.debug(
+                            "Moon OUT of FOV (sep=%.3f°) halfdiag=%.3f° center=(%.4f,%.4f)",
+                            sep,
+                            half_diag_deg,
+                            center_ra_dec[0],
+                            center_ra_dec[1],
+                        )
             # If Moon predicted in FOV, skip solving now
             if getattr(self, "moon_in_fov_predicted", False):
                 self.logger.info("Moon predicted in FOV; skipping plate-solve for this frame")
@@ -1245,7 +1355,7 @@ class VideoProcessor:
         # solar-system object is predicted to be inside the FOV (based on the
         # mount pointing or the last successful solution center + FOV).
         try:
-            if candidate and candidate.suffix.lower() in {".fits", ".fit", ".fts"}:
+            if use_xylist or (candidate and candidate.suffix.lower() in {".fits", ".fit", ".fts"}):
                 ps_cfg = self.config.get_plate_solve_config()
                 ast_local_cfg = (
                     ps_cfg.get("astrometry_local", {}) if isinstance(ps_cfg, dict) else {}
@@ -1254,139 +1364,49 @@ class VideoProcessor:
                     ast_local_cfg.get("mask_center_on_solve", False)
                 ):
                     should_mask = False
+                    mask_body: Optional[str] = None
+                    mask_sep: Optional[float] = None
                     # Predict presence of SS object near pointing center using mount
-                    try:
-                        from astropy.coordinates import (
-                            EarthLocation,
-                            SkyCoord,
-                            get_body,
-                            solar_system_ephemeris,
+                    center = self._mount_coordinates()
+                    # Compute FOV from telescope and camera config
+                    half_diag = self._config_half_diag_deg()
+                    # Fallback to last plate-solve if mount not available
+                    if (
+                        center is None
+                        and self.last_solve_result is not None
+                        and isinstance(self.last_solve_result, PlateSolveResult)
+                    ):
+                        center = (
+                            float(self.last_solve_result.ra_center or 0.0),
+                            float(self.last_solve_result.dec_center or 0.0),
                         )
-                        from astropy.time import Time
-                        import astropy.units as u
-                    except Exception:
-                        should_mask = False
-                    else:
-                        center = None
-                        half_diag = 0.0
-                        # 1) Mount coordinates if available
-                        try:
-                            if hasattr(self, "mount") and self.mount is not None:
-                                mstat = self.mount.get_coordinates()
-                                if (
-                                    getattr(mstat, "is_success", False)
-                                    and isinstance(getattr(mstat, "data", None), (list, tuple))
-                                    and len(mstat.data) == 2
-                                ):
-                                    ra_deg, dec_deg = float(mstat.data[0]), float(mstat.data[1])
-                                    center = SkyCoord(
-                                        ra=ra_deg * u.deg, dec=dec_deg * u.deg, frame="icrs"
-                                    )
-                        except Exception:
-                            center = None
-                        # Compute FOV from telescope and camera config
+                        if half_diag <= 0.0:
+                            half_diag = (
+                                ((self.last_solve_result.fov_width or 0.0) ** 2)
+                                + ((self.last_solve_result.fov_height or 0.0) ** 2)
+                            ) ** 0.5 / 2.0
+                    if center is not None and half_diag > 0.0:
+                        in_fov = self._bright_bodies_in_fov(
+                            center[0], center[1], half_diag, job.metadata
+                        )
+                        if in_fov:
+                            should_mask = True
+                            mask_body = in_fov[0].name
+                            mask_sep = in_fov[0].separation_deg
+                    if should_mask and use_xylist:
+                        # Masking becomes a source filter on the star list
                         try:
-                            tel_cfg = self.config.get_telescope_config()
-                            focal_length_mm = float(tel_cfg.get("focal_length", 1000.0))
-                            cam_cfg = self.config.get_camera_config()
-                            sensor_w_mm = float(cam_cfg.get("sensor_width", 13.2))
-                            sensor_h_mm = float(cam_cfg.get("sensor_height", 8.8))
-                            import math as _math
-
-                            fov_w = 2.0 * _math.degrees(
-                                _math.atan((sensor_w_mm / 2.0) / focal_length_mm)
-                            )
-                            fov_h = 2.0 * _math.degrees(
-                                _math.atan((sensor_h_mm / 2.0) / focal_length_mm)
+                            exclude_center = max(
+                                0.0, min(float(ast_local_cfg.get("mask_center_fraction", 0.2)), 0.9)
                             )
-                            half_diag = ((_math.pow(fov_w, 2) + _math.pow(fov_h, 2)) ** 0.5) / 2.0
                         except Exception:
-                            half_diag = 0.0
-                        # 2) Fallback to last plate-solve if mount not available
-                        if (
-                            center is None
-                            and self.last_solve_result is not None
-                            and isinstance(self.last_solve_result, PlateSolveResult)
-                        ):
-                            center = SkyCoord(
-                                ra=(self.last_solve_result.ra_center or 0.0) * u.deg,
-                                dec=(self.last_solve_result.dec_center or 0.0) * u.deg,
-                                frame="icrs",
-                            )
-                            if half_diag <= 0.0:
-                                half_diag = (
-                                    ((self.last_solve_result.fov_width or 0.0) ** 2)
-                                    + ((self.last_solve_result.fov_height or 0.0) ** 2)
-                                ) ** 0.5 / 2.0
-                        if center is not None and half_diag > 0.0:
-                            # Observation time from metadata or now
-                            try:
-                                ts = None
-                                if isinstance(self.last_frame_metadata, dict):
-                                    ts = (
-                                        self.last_frame_metadata.get("date_obs")
-                                        or self.last_frame_metadata.get("DATE-OBS")
-                                        or self.last_frame_metadata.get("capture_started_at")
-                                    )
-                                obstime = Time(ts) if ts else Time.now()
-                            except Exception:
-                                obstime = Time.now()
-                            # Location from config (fallback geocenter)
-                            try:
-                                site_cfg = None
-                                if hasattr(self.config, "get_site_config"):
-                                    site_cfg = self.config.get_site_config()
-                                if not site_cfg:
-                                    ovl = (
-                                        self.config.get_overlay_config()
-                                        if hasattr(self.config, "get_overlay_config")
-                                        else {}
-                                    )
-                                    site_cfg = ovl.get("site", {}) if isinstance(ovl, dict) else {}
-                                lat_raw = site_cfg.get("latitude")
-                                lon_raw = site_cfg.get("longitude")
-                                elev_raw = site_cfg.get("elevation_m", 0.0)
-                                lat = float(lat_raw) if lat_raw is not None else 0.0
-                                lon = float(lon_raw) if lon_raw is not None else 0.0
-                                elev = float(elev_raw) if elev_raw is not None else 0.0
-                                location = EarthLocation(
-                                    lat=lat * u.deg, lon=lon * u.deg, height=elev * u.m
-                                )
-                            except Exception:
-                                location = None
-                            # Bodies to check
-                            bodies = [
-                                "moon",
-                                "mercury",
-                                "venus",
-                                "mars",
-                                "jupiter",
-                                "saturn",
-                                "uranus",
-                                "neptune",
-                            ]
-                            try:
-                                solar_system_ephemeris.set("de432s")
-                            except Exception:
-                                pass
-                            mask_body: Optional[str] = None
-                            mask_sep: Optional[float] = None
-                            for b in bodies:
-                                try:
-                                    coord = (
-                                        get_body("moon", obstime, location=location)
-                                        if b == "moon"
-                                        else get_body(b, obstime, location=location)
-                                    )
-                                    sep = coord.icrs.separation(center).degree
-                                    if sep <= half_diag:
-                                        should_mask = True
-                                        mask_body = b
-                                        mask_sep = float(sep)
-                                        break
-                                except Exception:
-                                    continue
-                    if should_mask:
+                            exclude_center = 0.2
+                        self.logger.info(
+                            "Excluding central sources due to bright SS body: %s (sep=%s°)",
+                            mask_body,
+                            f"{mask_sep:.3f}" if mask_sep is not None else "?",
+                        )
+                    elif should_mask and candidate is not None:
                         masked = self._create_center_masked_fits(candidate, ast_local_cfg)
                         if masked is not None:
                             try:
@@ -1404,107 +1424,40 @@ class VideoProcessor:
             # Proceed without masking on any error
             self.logger.debug(f"Center-masking skipped due to error: {_e}")
 
-        result = self._solve_frame(str(candidate))
+        if use_xylist:
+            candidate = self._write_solve_xylist(job, exclude_center)
+            if candidate is None:
+                candidate = self._solve_candidate(fits_filename, frame_filename, job)
+                if candidate is None:
+                    return None
+
+        solved_before = self.successful_solves
+        try:
+            result = self._solve_frame(str(candidate))
+        finally:
+            if candidate is not None and candidate.suffix == ".xyls":
+                # The star list is only solver input; outputs go to its working directory
+                self._remove_file(candidate)
+        if result is not None and self.successful_solves > solved_before:
+            self._set_tracking_reference(job, result)
         # Update last_solve_time only after the attempt completes
         self.last_solve_time = time.monotonic()
         # Adaptive exposure heuristic for bright solar system targets (Moon/planets)
         try:
             if result and isinstance(result, PlateSolveResult):
-                # Use astropy to check whether a bright SS object is in FOV
-                try:
-                    from astropy.coordinates import (
-                        EarthLocation,
-                        SkyCoord,
-                        get_body,
-                        solar_system_ephemeris,
-                    )
-                    from astropy.time import Time
-                    import astropy.units as u
-                except Exception:
-                    solar_present = False
-                else:
-                    # Observation time
-                    try:
-                        ts = None
-                        if isinstance(self.last_frame_metadata, dict):
-                            ts = (
-                                self.last_frame_metadata.get("date_obs")
-                                or self.last_frame_metadata.get("DATE-OBS")
-                                or self.last_frame_metadata.get("capture_started_at")
-                            )
-                        obstime = Time(ts) if ts else Time.now()
-                    except Exception:
-                        obstime = Time.now()
-
-                    # Location (fallback to geocenter if not configured)
-                    try:
-                        # Allow both get_site_config() or overlay.site
-                        site_cfg = None
-                        if hasattr(self.config, "get_site_config"):
-                            site_cfg = self.config.get_site_config()
-                        if not site_cfg:
-                            ovl = (
-                                self.config.get_overlay_config()
-                                if hasattr(self.config, "get_overlay_config")
-                                else {}
-                            )
-                            site_cfg = ovl.get("site", {}) if isinstance(ovl, dict) else {}
-                        lat_raw = site_cfg.get("latitude")
-                        lon_raw = site_cfg.get("longitude")
-                        elev_raw = site_cfg.get("elevation_m", 0.0)
-                        lat = float(lat_raw) if lat_raw is not None else 0.0
-                        lon = float(lon_raw) if lon_raw is not None else 0.0
-                        elev = float(elev_raw) if elev_raw is not None else 0.0
-                        location = EarthLocation(
-                            lat=lat * u.deg, lon=lon * u.deg, height=elev * u.m
-                        )
-                    except Exception:
-                        location = None
-
-                    # FOV half-diagonal
-                    half_diag = (
-                        (result.fov_width or 0.0) ** 2 + (result.fov_height or 0.0) ** 2
-                    ) ** 0.5 / 2.0
-                    center = SkyCoord(
-                        ra=(result.ra_center or 0.0) * u.deg,
-                        dec=(result.dec_center or 0.0) * u.deg,
-                        frame="icrs",
-                    )
-
-                    # Check common bright bodies
-                    solar_present = False
-                    detected_body: Optional[str] = None
-                    detected_sep: Optional[float] = None
-                    bodies = [
-                        "moon",
-                        "mercury",
-                        "venus",
-                        "mars",
-                        "jupiter",
-                        "saturn",
-                        "uranus",
-                        "neptune",
-                    ]
-                    try:
-                        solar_system_ephemeris.set("de432s")
-                    except Exception:
-                        pass
-                    for b in bodies:
-                        try:
-                            coord = (
-                                get_body("moon", obstime, location=location)
-                                if b == "moon"
-                                else get_body(b, obstime, location=location)
-                            )
-                            sep = coord.icrs.separation(center).degree
-                            if sep <= half_diag:
-                                solar_present = True
-                                detected_body = b
-                                detected_sep = float(sep)
-                                break
-                        except Exception:
-                            continue
-
+                # Check common bright bodies (Moon and planets) in the solved FOV
+                half_diag = (
+                    (result.fov_width or 0.0) ** 2 + (result.fov_height or 0.0) ** 2
+                ) ** 0.5 / 2.0
+                in_fov = self._bright_bodies_in_fov(
+                    float(result.ra_center or 0.0),
+                    float(result.dec_center or 0.0),
+                    half_diag,
+                    job.metadata,
+                )
+                solar_present = bool(in_fov)
+                detected_body: Optional[str] = in_fov[0].name if in_fov else None
+                detected_sep: Optional[float] = in_fov[0].separation_deg if in_fov else None
                 if solar_present:
                     try:
                         if detected_body is not None and detected_sep is not None:
@@ -1527,10 +1480,10 @@ class VideoProcessor:
                     except Exception:
                         cap_s = 0.01
                     # Only apply if current was longer than cap
-                    if isinstance(self.last_frame_metadata, dict):
-                        cur_exp = self.last_frame_metadata.get(
-                            "exposure_time_s"
-                        ) or self.last_frame_metadata.get("exposure_time")
+                    if isinstance(job.metadata, dict):
+                        cur_exp = job.metadata.get("exposure_time_s") or job.metadata.get(
+                            "exposure_time"
+                        )
                         try:
                             cur_exp_f = float(cur_exp) if cur_exp is not None else None
                         except Exception:
@@ -1662,6 +1615,13 @@ class VideoProcessor:
         """Main processing loop using monotonic clock and a condition for timing."""
         while self.is_running:
             try:
+                if self.capture_pipeline is not None:
+                    # Frames arrive from the pipeline as soon as they are calibrated
+                    frame = self.capture_pipeline.get(timeout=0.5)
+                    if frame is not None:
+                        self._capture_and_solve(frame)
+                        self.last_capture_time = time.monotonic()
+                    continue
                 now = time.monotonic()
                 elapsed = now - self.last_capture_time
                 if elapsed >= self.capture_interval:
@@ -1683,7 +1643,52 @@ class VideoProcessor:
                 except Exception:
                     time.sleep(0.5)
 
-    def _capture_and_solve(self) -> None:
+    def _wait_for_slewing_complete(self) -> bool:
+        """Wait for the slew to end; False on timeout."""
+        telemetry = self.mount_telemetry
+        if telemetry is not None and telemetry.is_running:
+            # Follow the telemetry samples instead of polling the mount a second time
+            return telemetry.wait_until_settled(timeout=self.slewing_wait_timeout) is not None
+        wait_status = self.mount.wait_for_slewing_complete(  # type: ignore[union-attr]
+            timeout=self.slewing_wait_timeout,
+            check_interval=self.slewing_check_interval,
+        )
+        if wait_status.is_success and wait_status.data:
+            return True
+        self.logger.warning(f"Slewing wait failed or timed out: {wait_status.message}")
+        if wait_status.data:
+            self.logger.warning("Continuing with capture despite slewing error")
+            return True
+        return False
+
+    def _capture_gate_open(self) -> bool:
+        """Pre-capture gating: False while the mount slews or tracking is required but off."""
+        if not self.video_capture:
+            return False
+        # CRITICAL: Check if mount is slewing before capturing
+        sample = self._mount_sample() if self.slewing_detection_enabled else None
+        if sample is not None and sample.slewing:
+            if self.slewing_wait_for_completion:
+                self.logger.info("Mount is slewing, waiting for completion...")
+                if not self._wait_for_slewing_complete():
+                    self.logger.info("Skipping capture due to slewing timeout")
+                    return False
+                self.logger.info("Slewing completed, proceeding with capture")
+            else:
+                self.logger.debug("Mount is slewing, skipping capture")
+                return False
+        elif sample is not None and sample.slewing is None:
+            self.logger.warning(f"Could not check slewing status: {sample.error}")
+
+        # Additional gating: require tracking ON if configured
+        if self.gating_require_tracking:
+            tracking = self._mount_is_tracking()
+            if tracking is False:
+                self.logger.info("Tracking is OFF; skipping capture per configuration")
+                return False
+        return True
+
+    def _capture_and_solve(self, frame: Any = None) -> None:
         """Capture a frame and perform plate-solving if enabled.
 
         This is the core method that handles the complete imaging pipeline:
@@ -1696,6 +1701,10 @@ class VideoProcessor:
         - Skip Mode: Skips captures during mount movement (default)
         - Wait Mode: Waits for slewing to complete before capturing
 
+        Args:
+            frame: Frame delivered by the capture pipeline (already gated, exposed and
+                calibrated); None captures one now.
+
         Note:
             This method is called from the processing loop and handles all
             the complexity of ensuring high-quality astronomical imaging.
@@ -1704,47 +1713,24 @@ class VideoProcessor:
             return
 
         try:
-            # CRITICAL: Check if mount is slewing before capturing
-            if hasattr(self, "mount") and self.mount and self.slewing_detection_enabled:
-                slewing_status = self.mount.is_slewing()
-                if slewing_status.is_success and slewing_status.data:
-                    if self.slewing_wait_for_completion:
-                        self.logger.info("Mount is slewing, waiting for completion...")
-                        wait_status = self.mount.wait_for_slewing_complete(
-                            timeout=self.slewing_wait_timeout,
-                            check_interval=self.slewing_check_interval,
-                        )
-                        if wait_status.is_success and wait_status.data:
-                            self.logger.info("Slewing completed, proceeding with capture")
-                        else:
-                            self.logger.warning(
-                                f"Slewing wait failed or timed out: {wait_status.message}"
-                            )
-                            if not wait_status.data:
-                                self.logger.info("Skipping capture due to slewing timeout")
-                                return
-                            else:
-                                self.logger.warning("Continuing with capture despite slewing error")
-                    else:
-                        self.logger.debug("Mount is slewing, skipping capture")
-                        return
-                elif not slewing_status.is_success:
-                    self.logger.warning(f"Could not check slewing status: {slewing_status.message}")
-
-            # Additional gating: require tracking ON if configured
-            if self.gating_require_tracking:
-                tracking = self._mount_is_tracking()
-                if tracking is False:
-                    self.logger.info("Tracking is OFF; skipping capture per configuration")
-                    return
-
-            # Obtain frame (one-shot for long exposures, current for OpenCV) and time it
-            t_capture_start = time.monotonic()
-            frame = self._obtain_frame()
             if frame is None:
-                self.logger.warning("No frame available for capture")
-                return
-            capture_ms = (time.monotonic() - t_capture_start) * 1000.0
+                if not self._capture_gate_open():
+                    return
+                # Obtain frame (one-shot for long exposures, current for OpenCV) and time it
+                t_capture_start = time.monotonic()
+                frame = self._obtain_frame()
+                if frame is None:
+                    self.logger.warning("No frame available for capture")
+                    return
+                capture_ms = (time.monotonic() - t_capture_start) * 1000.0
+            else:
+                # Pipelined: latency from exposure start until the frame reached this stage
+                capture_ms = sum(
+                    float(v)
+                    for k, v in self._stage_timings(frame).items()
+                    if k != "cycle" and isinstance(v, (int, float))
+                )
+            self.last_frame = frame
             # Increment capture counter once per cycle
             self.capture_count += 1
             # Capture and store frame metadata for downstream consumers; attach capture_id
@@ -1794,6 +1780,11 @@ class VideoProcessor:
                         self.logger.info("Discarding capture due to tracking OFF post-capture")
                         should_discard = True
                 if should_discard:
+                    # Queued writes are removed once they land on disk
+                    for kind in ("image", "fits"):
+                        fut = self._pending_writes.get(kind)
+                        if fut is not None:
+                            fut.add_done_callback(self._remove_written_file)
                     try:
                         if frame_filename and frame_filename.exists():
                             # Python 3.8+: missing_ok available; otherwise fallback below
@@ -1838,22 +1829,35 @@ class VideoProcessor:
             except Exception:
                 pass
 
-            # Trigger capture callback
+            # Trigger capture callback (with the display image on disk)
             if self.on_capture_frame:
-                self.on_capture_frame(frame, frame_filename)
+                self.on_capture_frame(frame, self._written_path("image", frame_filename))
 
-            # Plate-solve if enabled and interval elapsed
+            # Plate-solve if enabled and interval elapsed; the worker solves in the
+            # background and logs its own queue wait and solve time
             t_solve_start = time.monotonic()
-            self._maybe_plate_solve(fits_filename, frame_filename)
+            solve_label = "solve"
+            if self.solve_worker is not None and self.solve_worker.is_running:
+                self.solve_worker.submit(self._solve_job(fits_filename, frame_filename))
+                solve_label = "solve_submit"
+            else:
+                self._maybe_plate_solve(fits_filename, frame_filename)
             solve_ms = (time.monotonic() - t_solve_start) * 1000.0
 
-            # Aggregate and log timings
+            # Aggregate and log timings (plus per-stage capture timings when reported)
+            stages = "".join(
+                f" {k}={float(v):.1f}"
+                for k, v in self._stage_timings(frame).items()
+                if isinstance(v, (int, float))
+            )
             self.logger.info(
-                "capture_id=%s timings_ms capture=%.1f save=%.1f solve=%.1f",
+                "capture_id=%s timings_ms capture=%.1f save=%.1f %s=%.1f%s",
                 self.capture_count,
                 capture_ms,
                 total_save_ms,
+                solve_label,
                 solve_ms,
+                stages,
             )
 
         except Exception as e:
@@ -1861,6 +1865,59 @@ class VideoProcessor:
             if self.on_error:
                 self.on_error(e)
 
+    def _solve_job(self, fits_filename: Optional[Path], frame_filename: Optional[Path]) -> SolveJob:
+        """Solve job carrying the state of the last capture."""
+        return SolveJob(
+            capture_id=self.capture_count,
+            frame=self.last_frame,
+            metadata=self.last_frame_metadata,
+            fits_filename=fits_filename,
+            frame_filename=frame_filename,
+            pending_writes=getattr(self, "_pending_writes", {}),
+        )
+
+    def _run_solve_job(self, job: SolveJob) -> None:
+        """Plate-solve stage run by the asynchronous solve worker."""
+        t0 = time.monotonic()
+        self._maybe_plate_solve(job.fits_filename, job.frame_filename, job)
+        self.logger.info(
+            "capture_id=%s timings_ms solve_queue=%.1f solve=%.1f",
+            job.capture_id,
+            job.queue_ms,
+            (time.monotonic() - t0) * 1000.0,
+        )
+
+    def _start_solve_worker(self) -> None:
+        """Start the asynchronous plate-solve stage when enabled."""
+        if not self.async_solve or self.plate_solver is None:
+            return
+        if self.solve_worker is None:
+            self.solve_worker = PlateSolveWorker(self._run_solve_job, logger=self.logger)
+        self.solve_worker.start()
+        self.logger.info("Plate-solve worker started")
+
+    def _stop_solve_worker(self) -> None:
+        if self.solve_worker is None or not self.solve_worker.is_running:
+            return
+        # A solve in progress would hold up shutdown; solvers that support it abort
+        if self.solve_worker.is_busy and self.plate_solver is not None:
+            try:
+                self.plate_solver.cancel()
+            except Exception as e:
+                self.logger.debug(f"Cancelling plate-solve failed: {e}")
+        self.solve_worker.stop()
+        self.logger.info("Plate-solve worker stopped: %s", self.solve_worker.stats())
+
+    @staticmethod
+    def _stage_timings(frame: Any) -> dict[str, Any]:
+        """Per-stage capture timings (expose, readout, calibrate, ...) of a frame."""
+        try:
+            _, details = unwrap_status(frame)
+            timings = details.get("timings_ms")
+            return timings if isinstance(timings, dict) else {}
+        except Exception:
+            return {}
+
     def _status_to_result(self, status) -> Optional[PlateSolveResult]:
         """Convert PlateSolveStatus to PlateSolveResult.
 
@@ -1943,6 +2000,165 @@ class VideoProcessor:
 
         return result
 
+    def _solve_candidate(
+        self, fits_filename: Optional[Path], frame_filename: Optional[Path], job: SolveJob
+    ) -> Optional[Path]:
+        """File handed to the solver: the FITS if written, else the display image."""
+        # With asynchronous writes, wait only for the file the solver will read
+        fits_filename = self._written_path("fits", fits_filename, job.pending_writes)
+        if fits_filename is None:
+            frame_filename = self._written_path("image", frame_filename, job.pending_writes)
+        if fits_filename and fits_filename.exists():
+            self.logger.info(f"Using FITS file for plate-solving: {fits_filename}")
+            return fits_filename
+        if frame_filename and frame_filename.exists():
+            self.logger.warning(
+                f"FITS not available, using display image for plate-solving: {frame_filename}"
+            )
+            self.logger.warning("This may not be supported by some solvers")
+            return frame_filename
+        self.logger.error("No suitable file to plate-solve")
+        return None
+
+    def _xylist_solving_enabled(self) -> bool:
+        """True if astrometry_local solves star lists extracted in-process."""
+        if str(getattr(self, "solver_type", "")).lower() != "astrometry_local":
+            return False
+        try:
+            ps_cfg = self.config.get_plate_solve_config()
+            ast_local_cfg = ps_cfg.get("astrometry_local", {}) if isinstance(ps_cfg, dict) else {}
+            return bool(ast_local_cfg.get("extract_stars", False))
+        except Exception:
+            return False
+
+    def _write_solve_xylist(self, job: SolveJob, exclude_center: float = 0.0) -> Optional[Path]:
+        """Detect stars on the job's frame and write them as an xylist for solve-field.
+
+        Args:
+            job: Capture to solve
+            exclude_center: Fraction of width/height of the central box whose sources
+                are dropped (replaces the center-masked FITS)
+
+        Returns:
+            Path of the xylist, or None if extraction failed
+        """
+        try:
+            from platesolve.star_extraction import extract_sources, write_xylist
+
+            plane = frame_solve_plane(job.frame)
+            if plane is None:
+                return None
+            ps_cfg = self.config.get_plate_solve_config()
+            ast_local_cfg = ps_cfg.get("astrometry_local", {}) if isinstance(ps_cfg, dict) else {}
+            t0 = time.perf_counter()
+            detection = (
+                int(ast_local_cfg.get("max_sources", 200)),
+                float(ast_local_cfg.get("detection_sigma", 5.0)),
+                int(ast_local_cfg.get("background_mesh", 64)),
+            )
+            sources: Optional[np.ndarray]
+            if exclude_center > 0.0:
+                sources = extract_sources(plane, *detection, exclude_center=exclude_center)
+            else:
+                sources = frame_sources(job.frame, *detection)
+            if sources is None:
+                return None
+            # RA/Dec hints for the solver, as they would be in the FITS header
+            hints: dict[str, Any] = {}
+            coords = self._mount_coordinates()
+            if coords is not None:
+                hints = {"RA": coords[0], "DEC": coords[1]}
+            path = self.frame_dir / f"solve_{job.capture_id:04d}.xyls"
+            write_xylist(str(path), sources, plane.shape[1], plane.shape[0], header=hints)
+            self.logger.info(
+                "Extracted %d sources for plate-solving in %.1f ms: %s",
+                len(sources),
+                (time.perf_counter() - t0) * 1000.0,
+                path,
+            )
+            return path
+        except Exception as e:
+            self.logger.warning(f"Star extraction failed, solving the FITS instead: {e}")
+            return None
+
+    def _tracking_sources(self, frame: Any) -> Optional[np.ndarray]:
+        """Stars of a frame used for WCS tracking."""
+        sources = frame_sources(
+            frame,
+            max_sources=int(self.tracking_config.get("max_sources", 200)),
+            threshold_sigma=float(self.tracking_config.get("detection_sigma", 5.0)),
+        )
+        return cast(Optional[np.ndarray], sources)
+
+    def _set_tracking_reference(self, job: SolveJob, result: PlateSolveResult) -> None:
+        """Make a fully solved frame the reference for WCS tracking."""
+        tracker = self.wcs_tracker
+        if tracker is None or job.frame is None:
+            return
+        tracker.reset()
+        if not result.wcs_path or not os.path.exists(result.wcs_path):
+            self.logger.debug("WCS tracking needs a WCS file from the solver; not tracking")
+            return
+        try:
+            from astropy.io import fits as _fits
+            from astropy.wcs import WCS
+
+            plane = frame_solve_plane(job.frame)
+            sources = self._tracking_sources(job.frame)
+            if plane is None or sources is None:
+                return
+            wcs = WCS(_fits.getheader(result.wcs_path, 0))
+            tracker.set_reference(result, sources, wcs, (plane.shape[1], plane.shape[0]))
+            self.logger.info("WCS tracking reference set from %d stars", len(sources))
+        except Exception as e:
+            self.logger.debug(f"WCS tracking reference not set: {e}")
+
+    def _track_wcs(self, job: SolveJob) -> Optional[PlateSolveResult]:
+        """Derive the WCS of the job's frame from the tracking reference.
+
+        Returns:
+            Tracked result, or None if there is no reference or a full solve is needed
+        """
+        tracker = self.wcs_tracker
+        if tracker is None or not tracker.has_reference or job.frame is None:
+            return None
+        try:
+            sources = self._tracking_sources(job.frame)
+            tracked = tracker.track(sources) if sources is not None else None
+            if tracked is None:
+                self.logger.info(
+                    "WCS tracking lost (%s); running a full plate-solve", tracker.last_failure
+                )
+                tracker.reset()
+                return None
+            wcs_path = self.frame_dir / f"track_{job.capture_id:04d}.wcs"
+            write_wcs_header(str(wcs_path), tracked.wcs, tracker.image_size)
+            if str(wcs_path) not in self._tracked_wcs_files:
+                self._tracked_wcs_files.append(str(wcs_path))
+            while len(self._tracked_wcs_files) > 2:
+                self._remove_file(self._tracked_wcs_files.popleft())
+            result = tracker.tracked_result(tracked, wcs_path=str(wcs_path))
+        except Exception as e:
+            self.logger.warning(f"WCS tracking failed: {e}")
+            tracker.reset()
+            tracker.last_failure = str(e)
+            return None
+        self.tracked_solves += 1
+        self.last_solve_result = result
+        self.logger.info(
+            "WCS tracked: RA=%.4f°, Dec=%.4f°, shift=%.1fpx, rot=%.3f°, %d stars, %.1f ms",
+            result.ra_center,
+            result.dec_center,
+            tracked.drift_px,
+            tracked.transform.rotation_deg,
+            tracked.transform.matches,
+            tracked.elapsed_s * 1000.0,
+        )
+        self._publish_solve_result(result)
+        if self.on_solve_result:
+            self.on_solve_result(result)
+        return result
+
     def _solve_frame(self, frame_path: str) -> Optional[PlateSolveResult]:
         """Execute plate-solving for a specific frame.
 
@@ -1985,6 +2201,7 @@ class VideoProcessor:
                 )
 
                 # Trigger solve callback
+                self._publish_solve_result(result)
                 if self.on_solve_result:
                     self.on_solve_result(result)
             else:
@@ -2169,126 +2386,166 @@ class VideoProcessor:
                 base_name = os.path.splitext(os.path.basename(image_path))[0]
                 output_path = f"{base_name}_with_overlay.png"
 
-            # Load images
+            # Load images: base as a BGR frame, overlay as RGBA
             try:
-                base_image = Image.open(image_path).convert("RGBA")
-                overlay_image = Image.open(overlay_path).convert("RGBA")
+                base_bgr = cv2.imread(image_path, cv2.IMREAD_COLOR)
+                if base_bgr is None:
+                    with Image.open(image_path) as im:
+                        base_bgr = cv2.cvtColor(np.asarray(im.convert("RGB")), cv2.COLOR_RGB2BGR)
+                with Image.open(overlay_path) as im:
+                    overlay_image = im.convert("RGBA")
             except Exception as e:
                 return error_status(f"Error loading images: {e}")
 
-            # Resize overlay to match base image if sizes differ
-            if base_image.size != overlay_image.size:
-                self.logger.info(f"Resizing overlay from {overlay_image.size} to {base_image.size}")
-                overlay_image = overlay_image.resize(base_image.size, Image.Resampling.LANCZOS)
+            image_size = (int(base_bgr.shape[1]), int(base_bgr.shape[0]))
+            if overlay_image.size != image_size:
+                self.logger.info(f"Resizing overlay from {overlay_image.size} to {image_size}")
 
-            # Create composite image
             try:
-                composite = base_image.copy()
-                composite = Image.alpha_composite(composite, overlay_image)
-                composite_rgb = composite.convert("RGB")
-
-                # Optional: resize final combined image per overlay config
-                try:
-                    ov_cfg = (
-                        self.config.get_overlay_config()
-                        if hasattr(self.config, "get_overlay_config")
-                        else {}
-                    )
-                    combined_cfg = (
-                        ov_cfg.get("combined_output", {}) if isinstance(ov_cfg, dict) else {}
-                    )
-                    if bool(combined_cfg.get("enabled", False)):
-                        target = combined_cfg.get("resolution", [1920, 1080])
-                        if isinstance(target, (list, tuple)) and len(target) == 2:
-                            target_w = int(target[0])
-                            target_h = int(target[1])
-                            mode = str(combined_cfg.get("mode", "letterbox")).lower()
-                            resample_name = str(combined_cfg.get("resample", "lanczos")).lower()
-                            bg = combined_cfg.get("background_color", [0, 0, 0])
-                            try:
-                                bg_tuple = (
-                                    int(bg[0]),
-                                    int(bg[1]),
-                                    int(bg[2]),
-                                )
-                            except Exception:
-                                bg_tuple = (0, 0, 0)
-
-                            # Map resample names
-                            from PIL import Image as _PILImage
-
-                            resample_map = {
-                                "nearest": _PILImage.Resampling.NEAREST,
-                                "bilinear": _PILImage.Resampling.BILINEAR,
-                                "bicubic": _PILImage.Resampling.BICUBIC,
-                                "lanczos": _PILImage.Resampling.LANCZOS,
-                            }
-                            resample_filter = resample_map.get(
-                                resample_name, _PILImage.Resampling.LANCZOS
-                            )
-
-                            src_w, src_h = composite_rgb.size
-                            if (
-                                target_w > 0
-                                and target_h > 0
-                                and (src_w != target_w or src_h != target_h)
-                            ):
-                                if mode == "stretch":
-                                    composite_rgb = composite_rgb.resize(
-                                        (target_w, target_h), resample=resample_filter
-                                    )
-                                elif mode == "crop":
-                                    # Scale to cover, then center-crop to target
-                                    scale = max(target_w / src_w, target_h / src_h)
-                                    new_w = max(1, int(round(src_w * scale)))
-                                    new_h = max(1, int(round(src_h * scale)))
-                                    tmp = composite_rgb.resize(
-                                        (new_w, new_h), resample=resample_filter
-                                    )
-                                    left = max(0, (new_w - target_w) // 2)
-                                    top = max(0, (new_h - target_h) // 2)
-                                    composite_rgb = tmp.crop(
-                                        (left, top, left + target_w, top + target_h)
-                                    )
-                                else:
-                                    # letterbox: fit inside and pad with bg
-                                    scale = min(target_w / src_w, target_h / src_h)
-                                    new_w = max(1, int(round(src_w * scale)))
-                                    new_h = max(1, int(round(src_h * scale)))
-                                    tmp = composite_rgb.resize(
-                                        (new_w, new_h), resample=resample_filter
-                                    )
-                                    canvas = _PILImage.new(
-                                        "RGB", (target_w, target_h), color=bg_tuple
-                                    )
-                                    off_x = (target_w - new_w) // 2
-                                    off_y = (target_h - new_h) // 2
-                                    canvas.paste(tmp, (off_x, off_y))
-                                    composite_rgb = canvas
-                except Exception as _resize_e:
-                    # Keep original size if anything goes wrong
-                    self.logger.debug(f"Combined resize skipped: {_resize_e}")
-
-                composite_rgb.save(output_path, "PNG", quality=95)
-                self.logger.info(f"Combined image saved: {output_path}")
-                return success_status(
-                    f"Image combined successfully: {output_path}",
-                    data=output_path,
-                    details={
-                        "base_image": image_path,
-                        "overlay_image": overlay_path,
-                        "output_image": output_path,
-                        "image_size": base_image.size,
-                        "overlay_size": overlay_image.size,
-                    },
+                composite_status = self.composite_overlay(
+                    overlay_image, output_path=output_path, base=base_bgr, extension=".png"
                 )
             except Exception as e:
                 return error_status(f"Error creating composite image: {e}")
+            if not composite_status.is_success:
+                return composite_status
+            self.logger.info(f"Combined image saved: {output_path}")
+            return success_status(
+                f"Image combined successfully: {output_path}",
+                data=output_path,
+                details={
+                    "base_image": image_path,
+                    "overlay_image": overlay_path,
+                    "output_image": output_path,
+                    "image_size": image_size,
+                    "overlay_size": overlay_image.size,
+                },
+            )
 
         except Exception as e:
             self.logger.error(f"Error in combine_overlay_with_image: {e}")
             return error_status(f"Error combining overlay with image: {e}")
 
+    def composite_overlay(
+        self,
+        overlay: Any,
+        output_path: Optional[str] = None,
+        base: Optional[np.ndarray] = None,
+        extension: Optional[str] = None,
+    ) -> VideoProcessingStatus:
+        """Blend an in-memory overlay onto the latest display frame.
+
+        The overlay (RGBA PIL image or array) is blended onto the uint8 display
+        frame with premultiplied alpha, only inside its visible tiles (see
+        overlay.compositor), resized per overlay.combined_output and encoded
+        once. The result is kept in last_combined_image; it is written to
+        output_path only if one is given.
+
+        Args:
+            overlay: RGBA overlay image
+            output_path: Optional output file (format from its extension)
+            base: uint8 BGR or mono frame (default: get_latest_display_image())
+            extension: Encoding format overriding the output path's extension
+
+        Returns:
+            Status: Success with data=output_path (None if nothing was written)
+        """
+        if base is None:
+            base = self.get_latest_display_image()
+        if base is None:
+            return error_status("No display frame available for compositing")
+        t0 = time.perf_counter()
+        try:
+            combined = self.compositor.composite(base, overlay)
+            combined = fit_to_resolution(combined, **self._combined_output_options())
+        except Exception as e:
+            return error_status(f"Error creating composite image: {e}")
+        t_blend = time.perf_counter()
+        # Keep a private copy: the compositor reuses its output buffer
+        self.last_combined_image = (
+            combined.copy() if combined is self.compositor.buffer else combined
+        )
+        if self.frame_hub is not None:
+            try:
+                self.frame_hub.publish_frame(self.last_combined_image, copy=False)
+            except Exception as e:
+                self.logger.debug(f"Stream publish failed: {e}")
+        details: dict[str, Any] = {
+            "image_size": (int(base.shape[1]), int(base.shape[0])),
+            "output_size": (int(combined.shape[1]), int(combined.shape[0])),
+            "blend_ms": (t_blend - t0) * 1000.0,
+        }
+        if output_path:
+            ext = extension or os.path.splitext(output_path)[1] or ".png"
+            try:
+                write_atomic(output_path, encode_image(combined, ext))
+            except Exception as e:
+                return error_status(f"Error saving composite image: {e}")
+            details["encode_ms"] = (time.perf_counter() - t_blend) * 1000.0
+        return success_status(
+            f"Overlay composited{f': {output_path}' if output_path else ''}",
+            data=output_path,
+            details=details,
+        )
+
+    def _combined_output_options(self) -> dict[str, Any]:
+        """fit_to_resolution() arguments from overlay.combined_output (empty if disabled)."""
+        try:
+            ov_cfg = (
+                self.config.get_overlay_config()
+                if hasattr(self.config, "get_overlay_config")
+                else {}
+            )
+            combined_cfg = ov_cfg.get("combined_output", {}) if isinstance(ov_cfg, dict) else {}
+            if not bool(combined_cfg.get("enabled", False)):
+                return {"resolution": (0, 0)}
+            target = combined_cfg.get("resolution", [1920, 1080])
+            if not (isinstance(target, (list, tuple)) and len(target) == 2):
+                return {"resolution": (0, 0)}
+            bg = combined_cfg.get("background_color", [0, 0, 0])
+            try:
+                background = (int(bg[0]), int(bg[1]), int(bg[2]))
+            except Exception:
+                background = (0, 0, 0)
+            return {
+                "resolution": (int(target[0]), int(target[1])),
+                "mode": str(combined_cfg.get("mode", "letterbox")),
+                "resample": str(combined_cfg.get("resample", "lanczos")),
+                "background": background,
+            }
+        except Exception as e:
+            # Keep original size if anything goes wrong
+            self.logger.debug(f"Combined resize skipped: {e}")
+            return {"resolution": (0, 0)}
+
+    def get_latest_display_image(self) -> Optional[np.ndarray]:
+        """Return the uint8 display image of the latest frame without touching disk.
+
+        Shares the per-frame product cache with the display writer, so a frame that was
+        already saved is not converted again.
+        """
+        frame = self.last_frame
+        if frame is None:
+            return None
+        writer = self.frame_writer
+        camera = self.video_capture.camera if self.video_capture else None
+        camera_type = writer.camera_type if writer else "opencv"
+        orientation = writer.orientation_policy if writer else "long_side_horizontal"
+        try:
+            image = frame_display_u8(
+                frame,
+                camera,
+                self.config,
+                self.logger,
+                camera_type=camera_type,
+                orientation_policy=orientation,
+                override_method=self.last_normalization_override,
+            )
+            return cast(Optional[np.ndarray], image)
+        except Exception as e:
+            self.logger.debug(f"Display image unavailable: {e}")
+            return None
+
     def get_latest_frame_path(self) -> Optional[str]:
         """Get the path to the most recently captured frame.
 
@@ -2493,6 +2750,7 @@ class VideoProcessor:
             "capture_count": self.capture_count,
             "solve_count": self.solve_count,
             "successful_solves": self.successful_solves,
+            "tracked_solves": self.tracked_solves,
             "last_capture_time": self.last_capture_time,
             "last_solve_time": self.last_solve_time,
             "is_running": self.is_running,
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Asynchronous plate-solve stage.
+
+Solving (solve-field, PlateSolve2) often takes tens of seconds. The worker
+runs it on its own thread so the processing loop can keep capturing, saving
+and publishing frames in the meantime.
+
+Frames are handed over through a single slot instead of a queue: a frame
+submitted while another one is still waiting replaces it (latest frame wins).
+A solve therefore always works on the newest frame available when it starts,
+and a slow solver never builds up a backlog.
+
+Each job carries the state of its capture (frame, metadata, file names and
+pending writes), because the processor's own fields move on to later
+captures while the job waits or runs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class SolveJob:
+    """One capture handed to the plate-solve stage."""
+
+    capture_id: int
+    frame: Any
+    metadata: Optional[Dict[str, Any]] = None
+    fits_filename: Optional[Path] = None
+    frame_filename: Optional[Path] = None
+    # FrameWriter futures of this capture (kind -> Future)
+    pending_writes: Dict[str, Any] = field(default_factory=dict)
+    submitted_at: float = field(default_factory=time.perf_counter)
+    queue_ms: float = 0.0
+
+
+class PlateSolveWorker:
+    """Run plate-solves on a background thread with a latest-frame-wins slot."""
+
+    def __init__(
+        self,
+        solve: Callable[[SolveJob], Any],
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the worker (call start() to run it).
+
+        Args:
+            solve: Solves one job; exceptions are logged and the worker continues
+            logger: Logger instance
+        """
+        self.solve = solve
+        self.logger = logger or logging.getLogger(__name__)
+        self._slot: Optional[SolveJob] = None
+        self._busy = False
+        self._stop = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stats: Dict[str, Any] = {
+            "submitted": 0,
+            "replaced": 0,
+            "solved": 0,
+            "last_queue_ms": None,
+            "last_solve_ms": None,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_busy(self) -> bool:
+        """True while a job is waiting or being solved."""
+        with self._cond:
+            return self._busy or self._slot is not None
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        if self.is_running:
+            return
+        with self._cond:
+            self._stop = False
+        self._thread = threading.Thread(target=self._run, name="plate-solve", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Drop the waiting job and stop after the running solve (up to timeout)."""
+        with self._cond:
+            self._stop = True
+            self._slot = None
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                self.logger.warning("Plate-solve worker still busy after %.1fs", timeout)
+        self._thread = None
+
+    def submit(self, job: SolveJob) -> Optional[SolveJob]:
+        """Place a job in the slot.
+
+        Returns:
+            The waiting job it replaced, if any
+        """
+        with self._cond:
+            replaced = self._slot
+            self._slot = job
+            self._stats["submitted"] += 1
+            if replaced is not None:
+                self._stats["replaced"] += 1
+            self._cond.notify_all()
+        if replaced is not None:
+            self.logger.debug(
+                "capture_id=%s replaces unsolved capture_id=%s",
+                job.capture_id,
+                replaced.capture_id,
+            )
+        return replaced
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no job is waiting or running; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._busy or self._slot is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(timeout=remaining)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Submitted, replaced and solved counts plus the last queue wait and solve time."""
+        with self._cond:
+            return dict(self._stats)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._slot is None and not self._stop:
+                    self._cond.wait()
+                job = self._slot
+                if self._stop or job is None:
+                    return
+                self._slot = None
+                self._busy = True
+            job.queue_ms = (time.perf_counter() - job.submitted_at) * 1000.0
+            t0 = time.perf_counter()
+            try:
+                self.solve(job)
+            except Exception as e:
+                self.logger.error(f"Plate-solve worker error: {e}")
+            solve_ms = (time.perf_counter() - t0) * 1000.0
+            with self._cond:
+                self._busy = False
+                self._stats["solved"] += 1
+                self._stats["last_queue_ms"] = job.queue_ms
+                self._stats["last_solve_ms"] = solve_ms
+                self._cond.notify_all()
@@ -19,10 +19,12 @@ from status import Status, error_status, success_status, warning_status
 
 
 class CoolingManager:
-    def __init__(self, camera, config, logger=None):
+    def __init__(self, camera, config, logger=None, device_state=None):
         self.camera = camera
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
+        # Optional DeviceStateService: status reads come from its snapshots
+        self.device_state = device_state
         cooling_config = config.get_camera_config().get("cooling", {})
         self.target_temp = cooling_config.get("target_temperature", -10.0)
         self.wait_for_cooling = cooling_config.get("wait_for_cooling", True)
@@ -97,6 +99,7 @@ class CoolingManager:
             self.target_temp = target_temp
             self.is_cooling = True
             self.cooling_start_time = datetime.now()
+            self._invalidate_device_state()
             return success_status(
                 f"Cooling set to {target_temp}°C",
                 details={
@@ -180,6 +183,7 @@ class CoolingManager:
             self.is_cooling = False
             self.is_warming_up = True
             self.warmup_start_time = datetime.now()
+            self._invalidate_device_state()
             # Record start temperature for diagnostics
             try:
                 self._warmup_start_temp = self._get_temperature()
@@ -295,6 +299,20 @@ class CoolingManager:
             return error_status(f"Error waiting for warmup completion: {e}")
 
     def get_cooling_status(self) -> Dict[str, Any]:
+        snapshot = self._device_snapshot()
+        if snapshot is not None:
+            temp = snapshot.get("ccd_temperature")
+            return {
+                "temperature": float(temp) if temp is not None else None,
+                "target_temperature": self.target_temp,
+                "cooler_power": snapshot.get("cooler_power"),
+                "cooler_on": bool(snapshot.get("cooler_on", False)),
+                "is_cooling": self.is_cooling,
+                "is_warming_up": self.is_warming_up,
+                "can_set_temperature": bool(snapshot.get("can_set_ccd_temperature", False)),
+                "can_get_power": bool(snapshot.get("can_get_cooler_power", False)),
+                "snapshot_age_s": snapshot.age_s,
+            }
         try:
             return {
                 "temperature": self._get_temperature(),
@@ -318,6 +336,21 @@ class CoolingManager:
             return {"error": str(e)}
 
     # --- helpers ---
+    def _device_snapshot(self) -> Optional[Any]:
+        if self.device_state is None:
+            return None
+        try:
+            return self.device_state.current()
+        except Exception:
+            return None
+
+    def _invalidate_device_state(self) -> None:
+        if self.device_state is not None:
+            try:
+                self.device_state.invalidate()
+            except Exception:
+                pass
+
     def _get_any(self, obj: Any, names: list[str], default: Any) -> Any:
         for name in names:
             try:
@@ -337,5 +370,5 @@ class CoolingManager:
             return None
 
 
-def create_cooling_manager(camera, config, logger=None) -> CoolingManager:
-    return CoolingManager(camera, config, logger)
+def create_cooling_manager(camera, config, logger=None, device_state=None) -> CoolingManager:
+    return CoolingManager(camera, config, logger, device_state=device_state)
@@ -20,13 +20,15 @@ class CoolingService:
             self.config.get_camera_config().get("cooling", {}).get("enable_cooling", False)
         )
 
-    def initialize(self, camera: Any):
+    def initialize(self, camera: Any, device_state: Optional[Any] = None):
         if not self.enabled:
             return success_status("Cooling disabled")
         try:
             from services.cooling.backend import create_cooling_manager
 
-            self.manager = create_cooling_manager(camera, self.config, self.logger)
+            self.manager = create_cooling_manager(
+                camera, self.config, self.logger, device_state=device_state
+            )
             return success_status("Cooling manager initialized")
         except Exception as e:
             self.manager = None
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Device state snapshots for slow-changing camera properties.
+
+Gain, offset, readout mode, binning and the cooling values change rarely but
+are needed for every saved frame, by the cooling monitor and by the overlay
+info panel. Reading them one by one is a device round-trip each (an HTTP GET
+per property on Alpaca). DeviceStateService polls them all on one background
+thread at a configurable rate and publishes an immutable DeviceStateSnapshot;
+consumers read the latest snapshot instead of the device.
+
+    camera:
+      device_state:
+        enabled: true
+        poll_interval_s: 5.0   # seconds between polls
+        max_age_s: 15.0        # older snapshots are ignored (consumers read the device)
+
+Snapshots are replaced as a whole, so readers never see a half-updated state
+and need no lock. After writing a property (e.g. a new cooling target), call
+invalidate() to have the next poll run right away.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Snapshot key -> attribute names tried on the camera (adapters, wrappers, raw drivers)
+CAMERA_PROPERTIES: Dict[str, Tuple[str, ...]] = {
+    "gain": ("gain", "Gain"),
+    "offset": ("offset", "Offset"),
+    "readout_mode": ("readout_mode", "ReadoutMode"),
+    "bin_x": ("bin_x", "BinX"),
+    "bin_y": ("bin_y", "BinY"),
+    "ccd_temperature": ("ccd_temperature", "ccdtemperature", "CCDTemperature"),
+    "set_ccd_temperature": ("set_ccd_temperature", "SetCCDTemperature"),
+    "cooler_power": ("cooler_power", "CoolerPower"),
+    "cooler_on": ("cooler_on", "CoolerOn"),
+    "heat_sink_temperature": ("heat_sink_temperature", "HeatSinkTemperature"),
+}
+
+# Read once after start() and after invalidate(static=True)
+STATIC_CAMERA_PROPERTIES: Dict[str, Tuple[str, ...]] = {
+    "name": ("name", "Name"),
+    "can_set_ccd_temperature": ("can_set_ccd_temperature", "CanSetCCDTemperature"),
+    "can_get_cooler_power": ("can_get_cooler_power", "CanGetCoolerPower"),
+}
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class DeviceStateSnapshot:
+    """Immutable set of property values with their read times."""
+
+    values: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    # Wall-clock time (time.time()) at which each value was read
+    timestamps: Mapping[str, float] = field(default_factory=lambda: _EMPTY)
+    # Monotonic time of the poll that produced the snapshot
+    polled_at: float = field(default_factory=time.monotonic)
+    sequence: int = 0
+
+    def get(self, name: str, default: Any = None) -> Any:
+        value = self.values.get(name)
+        return default if value is None else value
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.values.get(name) is not None
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self.polled_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self.values)
+
+
+def read_property(device: Any, names: Tuple[str, ...]) -> Any:
+    """First non-None value among the attribute names (None if none is readable)."""
+    for name in names:
+        try:
+            value = getattr(device, name)
+        except Exception:
+            continue
+        if value is not None and not callable(value):
+            return value
+    return None
+
+
+class DeviceStateService:
+    """Poll camera properties in the background and publish snapshots."""
+
+    def __init__(
+        self,
+        device: Any,
+        interval_s: float = 5.0,
+        max_age_s: Optional[float] = None,
+        properties: Optional[Dict[str, Tuple[str, ...]]] = None,
+        static_properties: Optional[Dict[str, Tuple[str, ...]]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the service (call start() to begin polling).
+
+        Args:
+            device: Camera (adapter, wrapper or driver object)
+            interval_s: Seconds between polls
+            max_age_s: Age beyond which current() returns None (default 3 intervals)
+            properties: Polled properties (snapshot key -> attribute names)
+            static_properties: Properties read once per start/invalidate(static=True)
+            logger: Logger instance
+        """
+        self.device = device
+        self.interval_s = max(0.1, float(interval_s))
+        self.max_age_s = float(max_age_s) if max_age_s is not None else 3.0 * self.interval_s
+        self.properties = dict(CAMERA_PROPERTIES if properties is None else properties)
+        self.static_properties = dict(
+            STATIC_CAMERA_PROPERTIES if static_properties is None else static_properties
+        )
+        self.logger = logger or logging.getLogger(__name__)
+        self._snapshot: Optional[DeviceStateSnapshot] = None
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._static_due = True
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[DeviceStateSnapshot], None]] = []
+        self._stats: Dict[str, Any] = {"polls": 0, "read_errors": 0, "last_poll_ms": None}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def snapshot(self) -> Optional[DeviceStateSnapshot]:
+        """Latest snapshot regardless of age (None before the first poll)."""
+        return self._snapshot
+
+    def current(self, max_age_s: Optional[float] = None) -> Optional[DeviceStateSnapshot]:
+        """Latest snapshot if it is younger than max_age_s (default: the service's)."""
+        snap = self._snapshot
+        limit = self.max_age_s if max_age_s is None else float(max_age_s)
+        if snap is None or snap.age_s > limit:
+            return None
+        return snap
+
+    def add_listener(self, callback: Callable[[DeviceStateSnapshot], None]) -> None:
+        """Call callback with every new snapshot (on the polling thread)."""
+        self._listeners.append(callback)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+    def poll(self) -> DeviceStateSnapshot:
+        """Read all properties now and publish the resulting snapshot.
+
+        Properties that fail to read keep their previous value and timestamp.
+        """
+        with self._poll_lock:
+            prev = self._snapshot or DeviceStateSnapshot(polled_at=0.0)
+            values = dict(prev.values)
+            stamps = dict(prev.timestamps)
+            groups = [self.properties]
+            if self._static_due:
+                groups.append(self.static_properties)
+                self._static_due = False
+            t0 = time.perf_counter()
+            for group in groups:
+                for key, names in group.items():
+                    value = read_property(self.device, names)
+                    if value is None:
+                        if key in values:  # readable before: keep the last value
+                            self._stats["read_errors"] += 1
+                        continue
+                    values[key] = value
+                    stamps[key] = time.time()
+            snap = DeviceStateSnapshot(
+                values=MappingProxyType(values),
+                timestamps=MappingProxyType(stamps),
+                polled_at=time.monotonic(),
+                sequence=prev.sequence + 1,
+            )
+            self._snapshot = snap
+            self._stats["polls"] += 1
+            self._stats["last_poll_ms"] = (time.perf_counter() - t0) * 1000.0
+        for callback in list(self._listeners):
+            try:
+                callback(snap)
+            except Exception as e:
+                self.logger.debug(f"Device state listener failed: {e}")
+        return snap
+
+    def invalidate(self, static: bool = False) -> None:
+        """Poll again as soon as possible (e.g. after writing a property)."""
+        if static:
+            self._static_due = True
+        if self.is_running:
+            self._wake.set()
+        else:
+            # Nothing will refresh it: drop it so consumers read the device
+            self._snapshot = None
+            self._static_due = True
+
+    def start(self) -> None:
+        """Start the polling thread."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._static_due = True
+        self._thread = threading.Thread(target=self._run, name="DeviceStatePoller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop polling; the last snapshot stays readable."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        # COM drivers (ASCOM) need COM initialized on every thread that uses them
+        com = None
+        try:
+            import pythoncom
+
+            pythoncom.CoInitialize()
+            com = pythoncom
+        except Exception:
+            com = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.poll()
+                except Exception as e:
+                    self.logger.debug(f"Device state poll failed: {e}")
+                self._wake.wait(self.interval_s)
+                self._wake.clear()
+        finally:
+            if com is not None:
+                try:
+                    com.CoUninitialize()
+                except Exception:
+                    pass
+
+
+def create_device_state_service(
+    device: Any, config: Any, logger: Optional[logging.Logger] = None
+) -> Optional[DeviceStateService]:
+    """Service configured from camera.device_state, or None if disabled."""
+    try:
+        cfg = config.get_camera_config().get("device_state", {}) or {}
+    except Exception:
+        cfg = {}
+    if device is None or not bool(cfg.get("enabled", True)):
+        return None
+    return DeviceStateService(
+        device,
+        interval_s=float(cfg.get("poll_interval_s", 5.0)),
+        max_age_s=cfg.get("max_age_s"),
+        logger=logger,
+    )
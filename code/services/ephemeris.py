@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Cached solar-system ephemeris for the Moon and the planets.
+
+Positions are computed with astropy's get_body on a coarse time grid (one
+vectorized call per body for a block of grid points) and interpolated between
+grid points, so the per-frame checks (display normalization, Moon precheck,
+center masking, bright-target exposure cap, solar-system overlay) no longer
+evaluate the ephemeris themselves.
+
+Directions are the apparent (GCRS) positions seen from the site, stored as
+unit vectors; interpolation is linear on the vectors and distances. With the
+default 10 minute grid the error for the Moon, including the diurnal parallax,
+stays below 0.001 degrees.
+
+One service is shared per site and ephemeris:
+
+    service = get_ephemeris_service(latitude=52.4, longitude=13.1, elevation_m=40.0)
+    in_fov = service.bodies_within(ra_deg, dec_deg, half_diag_deg, when=date_obs)
+    for body in in_fov:  # nearest first
+        print(body.name, body.separation_deg)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+BRIGHT_BODIES: Tuple[str, ...] = (
+    "moon",
+    "mercury",
+    "venus",
+    "mars",
+    "jupiter",
+    "saturn",
+    "uranus",
+    "neptune",
+)
+# Tracked by the shared services; Pluto needs a JPL ephemeris (skipped with 'builtin')
+SOLAR_SYSTEM_BODIES: Tuple[str, ...] = BRIGHT_BODIES + ("pluto",)
+
+
+@dataclass(frozen=True)
+class BodyPosition:
+    """Apparent position of a body at one time."""
+
+    name: str
+    ra_deg: float
+    dec_deg: float
+    distance_m: float
+    separation_deg: Optional[float] = None
+
+
+def to_unix_time(when: Any = None) -> float:
+    """Convert a timestamp to Unix seconds (UTC).
+
+    Accepts None (now), Unix seconds, datetime (naive means UTC), astropy Time
+    and ISO strings (naive means UTC; a trailing Z is allowed).
+    """
+    if when is None:
+        return time.time()
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, datetime):
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return float(when.timestamp())
+    unix = getattr(when, "unix", None)
+    if unix is not None:
+        return float(unix)
+    text = str(when).strip()
+    if text.endswith("Z"):
+        text = text[:-1]
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        from astropy.time import Time
+
+        return float(Time(text, scale="utc").unix)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def radec_to_unit(ra_deg: Any, dec_deg: Any) -> np.ndarray:
+    """Unit vector(s) for RA/Dec in degrees; shape (..., 3)."""
+    ra = np.radians(np.asarray(ra_deg, dtype=float))
+    dec = np.radians(np.asarray(dec_deg, dtype=float))
+    cos_dec = np.cos(dec)
+    return np.stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)], axis=-1)
+
+
+def angular_separation_deg(vectors: np.ndarray, center: np.ndarray) -> np.ndarray:
+    """Angles in degrees between unit vectors (..., 3) and one unit vector (3,)."""
+    dot = vectors @ center
+    cross = np.linalg.norm(np.cross(vectors, center), axis=-1)
+    angles: np.ndarray = np.degrees(np.arctan2(cross, dot))
+    return angles
+
+
+class EphemerisService:
+    """Interpolated Moon and planet positions for one site."""
+
+    def __init__(
+        self,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        elevation_m: float = 0.0,
+        ephemeris: str = "de432s",
+        bodies: Sequence[str] = SOLAR_SYSTEM_BODIES,
+        grid_step_s: float = 600.0,
+        block_steps: int = 36,
+        max_blocks: int = 4,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the service; positions are computed on first use.
+
+        Args:
+            latitude, longitude, elevation_m: Observer site (geocentric if lat/lon are None)
+            ephemeris: astropy ephemeris name; falls back to 'builtin' if unavailable
+            bodies: Bodies to track (astropy get_body names)
+            grid_step_s: Spacing of the time grid in seconds
+            block_steps: Grid intervals computed per block (one get_body call per body)
+            max_blocks: Number of blocks kept in memory
+            logger: Logger instance
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.latitude = latitude
+        self.longitude = longitude
+        self.elevation_m = float(elevation_m or 0.0)
+        self.ephemeris = str(ephemeris or "builtin").lower()
+        self.bodies: Tuple[str, ...] = tuple(str(b).lower() for b in bodies)
+        self.grid_step_s = max(1.0, float(grid_step_s))
+        self.block_steps = max(1, int(block_steps))
+        self.max_blocks = max(1, int(max_blocks))
+        self._lock = threading.Lock()
+        # block index -> (unit vectors (bodies, steps+1, 3), distances (bodies, steps+1))
+        self._blocks: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._location: Any = None
+        self._ephemeris_checked = False
+        self._unavailable: set[str] = set()
+        self.stats: Dict[str, int] = {"queries": 0, "blocks_computed": 0}
+
+    @property
+    def block_span_s(self) -> float:
+        return self.grid_step_s * self.block_steps
+
+    def _earth_location(self) -> Any:
+        if self._location is None and self.latitude is not None and self.longitude is not None:
+            from astropy.coordinates import EarthLocation
+            import astropy.units as u
+
+            self._location = EarthLocation(
+                lat=float(self.latitude) * u.deg,
+                lon=float(self.longitude) * u.deg,
+                height=self.elevation_m * u.m,
+            )
+        return self._location
+
+    def _check_ephemeris(self, times: Any, location: Any) -> None:
+        from astropy.coordinates import get_body
+
+        self._ephemeris_checked = True
+        try:
+            get_body("moon", times[:1], location=location, ephemeris=self.ephemeris)
+        except Exception as e:
+            self.logger.debug(f"Ephemeris '{self.ephemeris}' unavailable ({e}); using builtin")
+            self.ephemeris = "builtin"
+
+    def _compute_block(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        from astropy.coordinates import get_body
+        from astropy.time import Time
+        import astropy.units as u
+
+        t0 = index * self.block_span_s
+        offsets = np.arange(self.block_steps + 1) * self.grid_step_s
+        times = Time(t0 + offsets, format="unix", scale="utc")
+        location = self._earth_location()
+        if not self._ephemeris_checked:
+            self._check_ephemeris(times, location)
+        vectors = np.full((len(self.bodies), len(offsets), 3), np.nan)
+        distances = np.full((len(self.bodies), len(offsets)), np.nan)
+        for i, name in enumerate(self.bodies):
+            if name in self._unavailable:
+                continue
+            try:
+                coord = get_body(name, times, location=location, ephemeris=self.ephemeris)
+            except Exception as e:
+                self._unavailable.add(name)
+                self.logger.debug(f"No ephemeris for {name}: {e}")
+                continue
+            vectors[i] = radec_to_unit(coord.ra.deg, coord.dec.deg)
+            distances[i] = coord.distance.to(u.m).value
+        self.stats["blocks_computed"] += 1
+        return vectors, distances
+
+    def _block(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        block = self._blocks.get(index)
+        if block is None:
+            block = self._compute_block(index)
+            self._blocks[index] = block
+            while len(self._blocks) > self.max_blocks:
+                # Drop the block farthest from the one in use
+                del self._blocks[max(self._blocks, key=lambda k: abs(k - index))]
+        return block
+
+    def _interpolate(self, unix_time: float) -> Tuple[np.ndarray, np.ndarray]:
+        index = int(np.floor(unix_time / self.block_span_s))
+        pos = (unix_time - index * self.block_span_s) / self.grid_step_s
+        step = min(int(pos), self.block_steps - 1)
+        frac = pos - step
+        with self._lock:
+            self.stats["queries"] += 1
+            vectors, distances = self._block(index)
+        vec = vectors[:, step] * (1.0 - frac) + vectors[:, step + 1] * frac
+        vec /= np.linalg.norm(vec, axis=-1, keepdims=True)
+        dist = distances[:, step] * (1.0 - frac) + distances[:, step + 1] * frac
+        return vec, dist
+
+    def _positions(
+        self, vec: np.ndarray, dist: np.ndarray, sep: Optional[np.ndarray], mask: np.ndarray
+    ) -> List[BodyPosition]:
+        ra = np.degrees(np.arctan2(vec[:, 1], vec[:, 0])) % 360.0
+        dec = np.degrees(np.arcsin(np.clip(vec[:, 2], -1.0, 1.0)))
+        return [
+            BodyPosition(
+                name=self.bodies[i],
+                ra_deg=float(ra[i]),
+                dec_deg=float(dec[i]),
+                distance_m=float(dist[i]),
+                separation_deg=None if sep is None else float(sep[i]),
+            )
+            for i in np.flatnonzero(mask)
+        ]
+
+    def _body_mask(self, vec: np.ndarray, bodies: Optional[Sequence[str]]) -> np.ndarray:
+        mask: np.ndarray = np.isfinite(vec[:, 0])
+        if bodies is not None:
+            wanted = {str(b).lower() for b in bodies}
+            mask &= np.array([name in wanted for name in self.bodies])
+        return mask
+
+    def positions(
+        self, when: Any = None, bodies: Optional[Sequence[str]] = None
+    ) -> List[BodyPosition]:
+        """Positions of all (or the given) bodies at a time (see to_unix_time)."""
+        vec, dist = self._interpolate(to_unix_time(when))
+        return self._positions(vec, dist, None, self._body_mask(vec, bodies))
+
+    def position(self, name: str, when: Any = None) -> Optional[BodyPosition]:
+        """Position of one body, or None if it has no ephemeris."""
+        found = self.positions(when, bodies=(name,))
+        return found[0] if found else None
+
+    def bodies_within(
+        self,
+        ra_deg: float,
+        dec_deg: float,
+        radius_deg: float,
+        when: Any = None,
+        bodies: Optional[Sequence[str]] = None,
+    ) -> List[BodyPosition]:
+        """Bodies within radius_deg of (ra_deg, dec_deg), nearest first."""
+        vec, dist = self._interpolate(to_unix_time(when))
+        mask = self._body_mask(vec, bodies)
+        sep = np.full(len(self.bodies), np.inf)
+        sep[mask] = angular_separation_deg(vec[mask], radec_to_unit(ra_deg, dec_deg))
+        found = self._positions(vec, dist, sep, mask & (sep <= radius_deg))
+        return sorted(found, key=lambda b: b.separation_deg or 0.0)
+
+
+_services: Dict[Tuple[Any, ...], EphemerisService] = {}
+_services_lock = threading.Lock()
+
+
+def get_ephemeris_service(
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    elevation_m: float = 0.0,
+    ephemeris: str = "de432s",
+    logger: Optional[logging.Logger] = None,
+) -> EphemerisService:
+    """Shared service for a site and ephemeris (created on first use)."""
+
+    def _num(value: Any) -> Optional[float]:
+        try:
+            return None if value is None else float(value)
+        except (TypeError, ValueError):
+            return None
+
+    lat, lon = _num(latitude), _num(longitude)
+    key = (lat, lon, _num(elevation_m) or 0.0, str(ephemeris or "builtin").lower())
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = EphemerisService(
+                latitude=lat,
+                longitude=lon,
+                elevation_m=key[2],
+                ephemeris=key[3],
+                logger=logger,
+            )
+            _services[key] = service
+        return service
+
+
+def ephemeris_name(value: Any) -> str:
+    """Normalized overlay.solar_system.ephemeris value ('de432' means 'de432s')."""
+    name = str(value if value is not None else "de432s").lower()
+    return {"de432": "de432s", "de430": "de430"}.get(name, name)
+
+
+def ephemeris_service_for_site(
+    site_cfg: Optional[Dict[str, Any]],
+    ephemeris: str = "de432s",
+    logger: Optional[logging.Logger] = None,
+) -> EphemerisService:
+    """Shared service for a site config dict (latitude, longitude, elevation_m)."""
+    site = site_cfg if isinstance(site_cfg, dict) else {}
+    return get_ephemeris_service(
+        latitude=site.get("latitude"),
+        longitude=site.get("longitude"),
+        elevation_m=site.get("elevation_m", 0.0),
+        ephemeris=ephemeris,
+        logger=logger,
+    )
@@ -1,29 +1,50 @@
 #!/usr/bin/env python3
 """
 FrameWriter: saves frames to FITS or display formats with proper headers and orientation.
+
+Writes can also be submitted asynchronously: each output file becomes one job on a
+small worker pool, so the display image, FITS and RAW FITS encode and write in
+parallel while the caller continues. Jobs return futures resolving to the usual
+Status (data=path) with queue/write timings in details.
 """
 
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
 
 from capture.frame import Frame
 import numpy as np
-from processing.format_conversion import convert_camera_data_to_opencv
+from processing.frame_products import as_frame, frame_display_u8
 from processing.orientation import enforce_long_side_horizontal
-from status import error_status, success_status
+from status import Status, error_status, success_status, warning_status
 from utils.fits_utils import enrich_header_from_metadata
 from utils.status_utils import unwrap_status
 
 
 class FrameWriter:
-    def __init__(self, config, logger=None, camera=None, camera_type: str = "opencv") -> None:
+    def __init__(
+        self,
+        config,
+        logger=None,
+        camera=None,
+        camera_type: str = "opencv",
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        device_state: Optional[Any] = None,
+        full_policy: Optional[str] = None,
+        block_timeout_s: Optional[float] = None,
+    ) -> None:
         self.config = config
         self.logger = logger
         self.camera = camera
         self.camera_type = camera_type
+        # Optional DeviceStateService: header properties come from its snapshots
+        self.device_state = device_state
         # Orientation/scaling policy from config
         try:
             fp_cfg = self.config.get_frame_processing_config()
@@ -35,6 +56,178 @@ class FrameWriter:
             self.orientation_policy = "long_side_horizontal"
             self.display_normalization = "zscale"
             self.display_contrast = 0.15
+        # Asynchronous write pool (optional)
+        try:
+            aw_cfg = self.config.get_frame_processing_config().get("async_writer", {}) or {}
+        except Exception:
+            aw_cfg = {}
+        self.async_enabled = bool(aw_cfg.get("enabled", False))
+        # Explicit queue settings (e.g. a dedicated series writer) override the config
+        self.async_workers = max(1, int(workers or aw_cfg.get("workers", 3)))
+        self.async_max_queue = max(1, int(max_queue or aw_cfg.get("max_queue", 8)))
+        policy = str(full_policy or aw_cfg.get("full_policy", "block")).lower()
+        self.async_full_policy = policy if policy in ("block", "drop") else "block"
+        if block_timeout_s is None:
+            block_timeout_s = aw_cfg.get("block_timeout_s", 30.0)
+        self.async_block_timeout_s = float(block_timeout_s)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.async_max_queue)
+        self._stats_lock = threading.Lock()
+        self._writer_stats: Dict[str, Any] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "dropped": 0,
+            "pending": 0,
+            "last_write_ms": None,
+            "last_queue_ms": None,
+        }
+
+    def _device_snapshot(self) -> Optional[Any]:
+        """Fresh device-state snapshot, or None to read the camera directly."""
+        if self.device_state is None:
+            return None
+        try:
+            return self.device_state.current()
+        except Exception:
+            return None
+
+    def _set_camera_name(self, header: Any, snapshot: Optional[Any]) -> None:
+        name = snapshot.get("name") if snapshot is not None else None
+        if name is None and hasattr(self.camera, "name"):
+            name = self.camera.name
+        if name is not None:
+            header["CAMNAME"] = name
+
+    # ----------------------------- async writes -----------------------------
+    def submit(
+        self,
+        frame: Any,
+        filename: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
+        callback: Optional[Callable[[Status], None]] = None,
+    ) -> Future:
+        """Queue a write and return a future resolving to its Status.
+
+        The Status carries ``data=filename`` on success and ``queue_ms``/``write_ms``
+        in details. When the queue is full, the ``full_policy`` decides whether to
+        wait for a free slot ("block") or resolve immediately with a warning ("drop").
+
+        Args:
+            frame: Frame/Status/array as accepted by save() (raw data when raw=True)
+            filename: Target path; the suffix selects the format
+            metadata: Header metadata
+            raw: Write through save_raw_fits instead of save
+            callback: Called with the final Status when the write has finished
+        """
+        fut: Future = Future()
+        if self.async_full_policy == "drop":
+            acquired = self._slots.acquire(blocking=False)
+        else:
+            acquired = self._slots.acquire(timeout=self.async_block_timeout_s)
+        if not acquired:
+            with self._stats_lock:
+                self._writer_stats["dropped"] += 1
+            if self.logger:
+                self.logger.warning(f"Write queue full, dropping {filename}")
+            status: Status = warning_status(
+                "Write dropped (queue full)", details={"path": filename, "dropped": True}
+            )
+            fut.set_result(status)
+            if callback:
+                self._run_callback(callback, status)
+            return fut
+
+        with self._stats_lock:
+            self._writer_stats["submitted"] += 1
+            self._writer_stats["pending"] += 1
+        # Copy metadata so later mutation by the caller cannot race the worker
+        meta = dict(metadata) if isinstance(metadata, dict) else metadata
+        t_submit = time.perf_counter()
+
+        def _job() -> None:
+            t_start = time.perf_counter()
+            try:
+                if raw:
+                    status = self.save_raw_fits(frame, filename, meta)
+                else:
+                    status = self.save(frame, filename, meta)
+            except Exception as e:  # save_* already convert errors; this is a last resort
+                status = error_status(f"Error writing {filename}: {e}")
+            t_end = time.perf_counter()
+            queue_ms = (t_start - t_submit) * 1000.0
+            write_ms = (t_end - t_start) * 1000.0
+            try:
+                status.details = {
+                    **(status.details or {}),
+                    "path": filename,
+                    "queue_ms": queue_ms,
+                    "write_ms": write_ms,
+                }
+            except Exception:
+                pass
+            with self._stats_lock:
+                self._writer_stats["pending"] -= 1
+                key = "completed" if getattr(status, "is_success", False) else "failed"
+                self._writer_stats[key] += 1
+                self._writer_stats["last_write_ms"] = write_ms
+                self._writer_stats["last_queue_ms"] = queue_ms
+            self._slots.release()
+            fut.set_result(status)
+            if callback:
+                self._run_callback(callback, status)
+
+        try:
+            self._get_executor().submit(_job)
+        except Exception as e:
+            self._slots.release()
+            with self._stats_lock:
+                self._writer_stats["pending"] -= 1
+                self._writer_stats["failed"] += 1
+            status = error_status(f"Could not queue write for {filename}: {e}")
+            fut.set_result(status)
+            if callback:
+                self._run_callback(callback, status)
+        return fut
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._stats_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.async_workers, thread_name_prefix="frame-writer"
+                )
+            return self._executor
+
+    def _run_callback(self, callback: Callable[[Status], None], status: Status) -> None:
+        try:
+            callback(status)
+        except Exception as e:
+            if self.logger:
+                self.logger.debug(f"Write callback failed: {e}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued writes have finished; return False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._stats_lock:
+                if self._writer_stats["pending"] <= 0:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the write pool; pending writes complete when wait is True."""
+        with self._stats_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Return counters for asynchronous writes."""
+        with self._stats_lock:
+            return dict(self._writer_stats)
 
     def save(self, frame: Any, filename: str, metadata: Optional[Dict[str, Any]] = None):
         suffix = Path(filename).suffix.lower()
@@ -49,59 +242,26 @@ class FrameWriter:
             except Exception as e:
                 return error_status(f"OpenCV not available for image saving: {e}")
 
-            if hasattr(frame, "data"):
-                frame_data = frame.data
-            else:
-                frame_data = frame
-
-            # If data is a Frame object, use its color image for display
-            if isinstance(frame_data, Frame):
-                frame_data = frame_data.data
-
-            if self.camera_type in ["alpaca", "ascom"]:
-                frame_np = convert_camera_data_to_opencv(
-                    frame_data, self.camera, self.config, self.logger
-                )
-            else:
-                frame_np = frame_data
-
+            override_method = None
+            try:
+                if isinstance(metadata, dict):
+                    override_method = metadata.get("normalization_override")
+            except Exception:
+                override_method = None
+
+            # Shared per-frame product: converted, oriented and normalized once per capture
+            frame_np = frame_display_u8(
+                frame,
+                self.camera,
+                self.config,
+                self.logger,
+                camera_type=self.camera_type,
+                orientation_policy=self.orientation_policy,
+                override_method=override_method,
+            )
             if frame_np is None:
                 return error_status("Failed to convert camera image to OpenCV format")
 
-            if not isinstance(frame_np, np.ndarray):
-                frame_np = np.array(frame_np)
-
-            # Enforce orientation for display if configured
-            if self.orientation_policy == "long_side_horizontal":
-                from processing.orientation import enforce_long_side_horizontal
-
-                frame_np, _ = enforce_long_side_horizontal(frame_np)
-
-            # Normalize to uint8 for display
-            if frame_np.dtype != np.uint8:
-                try:
-                    from processing.normalization import normalize_to_uint8
-
-                    override_method = None
-                    try:
-                        if isinstance(metadata, dict):
-                            override_method = metadata.get("normalization_override")
-                    except Exception:
-                        override_method = None
-                    frame_np = normalize_to_uint8(
-                        frame_np, self.config, self.logger, override_method=override_method
-                    )
-                except Exception:
-                    if frame_np.dtype in [np.float32, np.float64]:
-                        vmin = float(np.min(frame_np))
-                        vmax = float(np.max(frame_np))
-                        if vmax > vmin:
-                            frame_np = ((frame_np - vmin) / (vmax - vmin) * 255).astype(np.uint8)
-                        else:
-                            frame_np = frame_np.astype(np.uint8)
-                    else:
-                        frame_np = frame_np.astype(np.uint8)
-
             os.makedirs(os.path.dirname(filename), exist_ok=True)
             success = cv2.imwrite(filename, frame_np)
             if success:
@@ -119,9 +279,10 @@ class FrameWriter:
                 return error_status(f"Astropy not available for FITS saving: {e}")
 
             image_data, frame_details = unwrap_status(frame)
-            frame_obj: Optional[Frame] = None
-            if isinstance(image_data, Frame):
-                frame_obj = image_data
+            frame_obj: Optional[Frame] = (
+                image_data if isinstance(image_data, Frame) else as_frame(frame)
+            )
+            if frame_obj is not None:
                 # Prefer green channel for FITS if available
                 image_data = (
                     frame_obj.green_channel
@@ -144,7 +305,12 @@ class FrameWriter:
                 except Exception as conv_e:
                     return error_status(f"Failed to convert to numpy array: {conv_e}")
 
-            image_data, rotated = enforce_long_side_horizontal(image_data)
+            if frame_obj is not None and image_data is frame_obj.green_channel:
+                image_data = frame_obj.oriented_green
+            elif frame_obj is not None and image_data is frame_obj.data:
+                image_data = frame_obj.oriented
+            else:
+                image_data, _ = enforce_long_side_horizontal(image_data)
 
             # Ensure FITS is 2D: if color data slipped through, take green channel
             try:
@@ -186,27 +352,20 @@ class FrameWriter:
             header["BZERO"] = 0
             header["BSCALE"] = 1
             header["CAMERA"] = self.camera_type.capitalize()
-            if hasattr(self.camera, "name"):
-                header["CAMNAME"] = self.camera.name
+            snapshot = self._device_snapshot()
+            self._set_camera_name(header, snapshot)
 
-            # Enrich from metadata/config/camera
+            # Enrich from metadata/config/camera (cooling values included)
             enrich_header_from_metadata(
-                header, frame_details, self.camera, self.config, self.camera_type, self.logger
+                header,
+                frame_details,
+                self.camera,
+                self.config,
+                self.camera_type,
+                self.logger,
+                snapshot=snapshot,
             )
 
-            # Cooling details if available
-            try:
-                if hasattr(self.camera, "ccdtemperature"):
-                    header["CCD-TEMP"] = float(self.camera.ccdtemperature)
-                if hasattr(self.camera, "cooler_power"):
-                    cpwr = self.camera.cooler_power
-                    if cpwr is not None:
-                        header["COOLPOW"] = float(cpwr)
-                if hasattr(self.camera, "cooler_on"):
-                    header["COOLERON"] = bool(self.camera.cooler_on)
-            except Exception:
-                pass
-
             # Observation time
             try:
                 obstime = None
@@ -335,14 +494,20 @@ class FrameWriter:
             # Build header
             header = fits.Header()
             header["CAMERA"] = self.camera_type.capitalize()
-            if hasattr(self.camera, "name"):
-                header["CAMNAME"] = self.camera.name
+            snapshot = self._device_snapshot()
+            self._set_camera_name(header, snapshot)
 
             # Enrich with metadata/config
             frame_details = metadata or {}
             try:
                 enrich_header_from_metadata(
-                    header, frame_details, self.camera, self.config, self.camera_type, self.logger
+                    header,
+                    frame_details,
+                    self.camera,
+                    self.config,
+                    self.camera_type,
+                    self.logger,
+                    snapshot=snapshot,
                 )
             except Exception:
                 pass
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Shared mount telemetry: one poller for pointing, slewing and tracking.
+
+A capture cycle needs the mount position for the FITS metadata, the display
+normalization override, the Moon precheck and the solver hints, and the
+slewing/tracking state before and after the exposure. Asking the mount each
+time costs a COM call or HTTP round-trip per property and per consumer.
+MountTelemetryService polls the mount on one background thread and publishes
+an immutable MountSample; consumers read the latest sample and its age.
+
+    mount:
+      type: "ascom"            # or "alpaca" (drivers.alpaca.mount)
+      telemetry:
+        enabled: true
+        poll_interval_s: 1.0          # while the mount is at rest
+        slewing_poll_interval_s: 0.2  # while it slews
+        max_age_s: 3.0                # older samples are ignored
+
+While the mount slews the poller switches to the fast interval and only reads
+position and slewing; tracking and pier side are read at rest and after each
+slew ends (the pier side only changes during slews). Call invalidate() after
+commanding the mount to have the next poll run right away.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class MountSample:
+    """Mount state read in one poll (None where a value could not be read)."""
+
+    ra_deg: Optional[float] = None
+    dec_deg: Optional[float] = None
+    slewing: Optional[bool] = None
+    tracking: Optional[bool] = None
+    # ASCOM PierSide: 0 east, 1 west, -1 unknown
+    side_of_pier: Optional[int] = None
+    # Wall-clock (time.time()) and monotonic time of the poll
+    timestamp: float = field(default_factory=time.time)
+    sampled_at: float = field(default_factory=time.monotonic)
+    sequence: int = 0
+    error: Optional[str] = None
+
+    @property
+    def coordinates(self) -> Optional[Tuple[float, float]]:
+        if self.ra_deg is None or self.dec_deg is None:
+            return None
+        return (self.ra_deg, self.dec_deg)
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self.sampled_at
+
+
+def _status_value(result: Any) -> Any:
+    """Data of a successful Status, the value itself for plain returns, else None."""
+    if hasattr(result, "is_success"):
+        return getattr(result, "data", None) if result.is_success else None
+    return result
+
+
+def _read_tracking(mount: Any) -> Optional[bool]:
+    tracking = getattr(mount, "is_tracking", None)
+    value = tracking() if callable(tracking) else tracking
+    value = _status_value(value)
+    return None if value is None else bool(value)
+
+
+class MountTelemetryService:
+    """Poll a mount in the background and publish MountSamples."""
+
+    def __init__(
+        self,
+        mount: Any,
+        interval_s: float = 1.0,
+        slewing_interval_s: float = 0.2,
+        max_age_s: Optional[float] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the service (call start() to begin polling).
+
+        Args:
+            mount: ASCOMMount, AlpacaMount or any object with the same methods
+            interval_s: Seconds between polls while the mount is at rest
+            slewing_interval_s: Seconds between polls while it slews
+            max_age_s: Age beyond which current() returns None (default 3 intervals)
+            logger: Logger instance
+        """
+        self.mount = mount
+        self.interval_s = max(0.05, float(interval_s))
+        self.slewing_interval_s = max(0.05, min(float(slewing_interval_s), self.interval_s))
+        self.max_age_s = float(max_age_s) if max_age_s is not None else 3.0 * self.interval_s
+        self.logger = logger or logging.getLogger(__name__)
+        self._sample: Optional[MountSample] = None
+        self._poll_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[MountSample], None]] = []
+        self._stats: Dict[str, Any] = {"polls": 0, "read_errors": 0, "last_poll_ms": None}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def latest(self) -> Optional[MountSample]:
+        """Latest sample regardless of age (None before the first poll)."""
+        return self._sample
+
+    def current(self, max_age_s: Optional[float] = None) -> Optional[MountSample]:
+        """Latest sample if it is younger than max_age_s (default: the service's)."""
+        sample = self._sample
+        limit = self.max_age_s if max_age_s is None else float(max_age_s)
+        if sample is None or sample.age_s > limit:
+            return None
+        return sample
+
+    def sample(self, max_age_s: Optional[float] = None) -> MountSample:
+        """Current sample, or a fresh poll if there is none young enough."""
+        return self.current(max_age_s) or self.poll()
+
+    def add_listener(self, callback: Callable[[MountSample], None]) -> None:
+        """Call callback with every new sample (on the polling thread)."""
+        self._listeners.append(callback)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+    def poll(self) -> MountSample:
+        """Read the mount now and publish the resulting sample."""
+        with self._poll_lock:
+            prev = self._sample
+            t0 = time.perf_counter()
+            errors: List[str] = []
+
+            ra_deg = dec_deg = None
+            try:
+                coords = _status_value(self.mount.get_coordinates())
+                if isinstance(coords, (tuple, list)) and len(coords) == 2:
+                    ra_deg, dec_deg = float(coords[0]), float(coords[1])
+                else:
+                    errors.append("coordinates unavailable")
+            except Exception as e:
+                errors.append(f"coordinates: {e}")
+
+            slewing = None
+            try:
+                value = _status_value(self.mount.is_slewing())
+                slewing = None if value is None else bool(value)
+            except Exception as e:
+                errors.append(f"slewing: {e}")
+
+            # Tracking and pier side are skipped while slewing, refreshed when a slew ends
+            tracking = prev.tracking if prev is not None else None
+            side_of_pier = prev.side_of_pier if prev is not None else None
+            if not slewing:
+                try:
+                    tracking = _read_tracking(self.mount)
+                except Exception as e:
+                    errors.append(f"tracking: {e}")
+                slew_ended = prev is None or prev.slewing is not False
+                reader = getattr(self.mount, "get_side_of_pier", None)
+                if slew_ended and callable(reader):
+                    try:
+                        side_of_pier = reader()
+                    except Exception as e:
+                        errors.append(f"side of pier: {e}")
+
+            sample = MountSample(
+                ra_deg=ra_deg,
+                dec_deg=dec_deg,
+                slewing=slewing,
+                tracking=tracking,
+                side_of_pier=side_of_pier,
+                sequence=(prev.sequence + 1) if prev is not None else 1,
+                error="; ".join(errors) or None,
+            )
+            self._sample = sample
+            self._stats["polls"] += 1
+            self._stats["read_errors"] += len(errors)
+            self._stats["last_poll_ms"] = (time.perf_counter() - t0) * 1000.0
+        if prev is not None and slewing is not None and prev.slewing != slewing:
+            self.logger.debug("Mount %s slewing", "started" if slewing else "stopped")
+        with self._cond:
+            self._cond.notify_all()
+        for callback in list(self._listeners):
+            try:
+                callback(sample)
+            except Exception as e:
+                self.logger.debug(f"Mount telemetry listener failed: {e}")
+        return sample
+
+    def invalidate(self) -> None:
+        """Poll again as soon as possible (e.g. after commanding a slew)."""
+        self._wake.set()
+
+    def wait_until_settled(self, timeout: float = 300.0) -> Optional[MountSample]:
+        """Wait for a sample showing the mount at rest.
+
+        Returns:
+            The first sample with slewing False, or None on timeout
+        """
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        seen = -1
+        while True:
+            sample = self._sample if self.is_running else self.poll()
+            if sample is not None and sample.sequence != seen:
+                if sample.slewing is False:
+                    return sample
+                seen = sample.sequence
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if self.is_running:
+                with self._cond:
+                    self._cond.wait(timeout=min(remaining, self.interval_s))
+            else:
+                time.sleep(min(remaining, self.slewing_interval_s))
+
+    def start(self) -> None:
+        """Start the polling thread."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="MountTelemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop polling; the last sample stays readable."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        # COM drivers (ASCOM) need COM initialized on every thread that uses them
+        com = None
+        try:
+            import pythoncom
+
+            pythoncom.CoInitialize()
+            com = pythoncom
+        except Exception:
+            com = None
+        try:
+            while not self._stop.is_set():
+                sample = None
+                try:
+                    sample = self.poll()
+                except Exception as e:
+                    self.logger.debug(f"Mount telemetry poll failed: {e}")
+                fast = sample is not None and bool(sample.slewing)
+                self._wake.wait(self.slewing_interval_s if fast else self.interval_s)
+                self._wake.clear()
+        finally:
+            if com is not None:
+                try:
+                    com.CoUninitialize()
+                except Exception:
+                    pass
+
+
+def create_mount(config: Any, logger: Optional[logging.Logger] = None) -> Any:
+    """Mount driver selected by mount.type ('ascom' or 'alpaca').
+
+    Raises:
+        Exception: If the driver is unavailable or cannot connect.
+    """
+    mount_type = str(config.get_mount_config().get("type", "ascom") or "ascom").lower()
+    if mount_type == "alpaca":
+        from drivers.alpaca.mount import AlpacaMount
+
+        return AlpacaMount(config=config, logger=logger)
+    from drivers.ascom.mount import ASCOMMount
+
+    return ASCOMMount(config=config, logger=logger)
+
+
+def create_mount_telemetry(
+    mount: Any, config: Any, logger: Optional[logging.Logger] = None
+) -> Optional[MountTelemetryService]:
+    """Service configured from mount.telemetry, or None if disabled."""
+    try:
+        cfg = config.get_mount_config().get("telemetry", {}) or {}
+    except Exception:
+        cfg = {}
+    if mount is None or not bool(cfg.get("enabled", True)):
+        return None
+    return MountTelemetryService(
+        mount,
+        interval_s=float(cfg.get("poll_interval_s", 1.0)),
+        slewing_interval_s=float(cfg.get("slewing_poll_interval_s", 0.2)),
+        max_age_s=cfg.get("max_age_s"),
+        logger=logger,
+    )
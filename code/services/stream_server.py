@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Live HTTP streaming of combined frames.
+
+Viewers and OBS used to poll combined.png on disk. StreamServer serves the
+compositing output directly over HTTP (asyncio, standard library only):
+
+    GET /               minimal viewer page
+    GET /stream.mjpg    MJPEG stream (multipart/x-mixed-replace)
+    GET /snapshot.jpg   latest frame as one JPEG
+    GET /events         Server-Sent Events: solve results and mount telemetry
+
+Producers call FrameHub.publish_frame() and publish_event() from any thread.
+Each frame is JPEG-encoded once and the bytes are shared by all clients. A
+client always receives the newest frame when it is ready for the next one,
+so a slow connection skips stale frames instead of queueing them. Events go
+through a small per-client queue that drops its oldest entries when full.
+
+    overlay:
+      stream_server:
+        enabled: false
+        host: "127.0.0.1"
+        port: 8080
+        jpeg_quality: 85
+        max_fps: 10.0         # per-client frame rate cap
+        max_clients: 16
+        keepalive_s: 15.0     # SSE comment interval
+        write_timeout_s: 10.0 # drop clients that stop reading
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Coroutine, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from overlay.compositor import encode_image
+
+_BOUNDARY = "frame"
+_REASONS = {200: "OK", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+_INDEX_HTML = b"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Telescope stream</title>
+<style>body{margin:0;background:#000;color:#ccc;font:12px monospace}
+img{display:block;max-width:100vw;max-height:92vh;margin:auto}
+#ev{padding:4px 8px;white-space:pre}</style></head>
+<body><img src="/stream.mjpg" alt="stream"><div id="ev"></div>
+<script>
+const ev = document.getElementById("ev"), last = {};
+const src = new EventSource("/events");
+for (const name of ["solve", "telemetry"]) {
+  src.addEventListener(name, (e) => {
+    last[name] = e.data;
+    ev.textContent = Object.entries(last).map(([k, v]) => k + ": " + v).join("\\n");
+  });
+}
+</script></body></html>
+"""
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    """One Server-Sent Event."""
+
+    event: str
+    data: str
+    id: int
+
+    def encode(self) -> bytes:
+        # A newline inside a data field would end it; send one data line per line
+        data = "".join(f"data: {line}\n" for line in self.data.split("\n"))
+        return f"id: {self.id}\nevent: {self.event}\n{data}\n".encode()
+
+
+class FrameHub:
+    """Latest encoded frame and recent events, shared between producers and clients."""
+
+    def __init__(self, jpeg_quality: int = 85, max_events: int = 64) -> None:
+        self.jpeg_quality = int(jpeg_quality)
+        self.max_events = max(1, int(max_events))
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._frame: Optional[np.ndarray] = None
+        self._jpeg: Optional[bytes] = None
+        self._frame_time: Optional[float] = None
+        self._event_id = 0
+        # Last event of each type, replayed to new SSE clients
+        self._last_events: Dict[str, StreamEvent] = {}
+        self._frame_watchers: List[Callable[[], Any]] = []
+        self._event_watchers: List[Callable[[StreamEvent], Any]] = []
+        # Number of connected stream clients; frames are encoded eagerly while > 0
+        self.stream_clients = 0
+        self._stats: Dict[str, Any] = {"frames": 0, "encodes": 0, "last_encode_ms": None}
+
+    @property
+    def sequence(self) -> int:
+        return self._seq
+
+    def publish_frame(self, image: np.ndarray, copy: bool = True) -> int:
+        """Publish a uint8 BGR (or mono) frame; returns its sequence number.
+
+        With copy=False the caller must not modify image afterwards.
+        """
+        with self._lock:
+            self._seq += 1
+            frame = np.array(image, dtype=np.uint8) if copy else np.asarray(image, dtype=np.uint8)
+            self._frame = frame
+            self._jpeg = None
+            self._frame_time = time.time()
+            self._stats["frames"] += 1
+            seq = self._seq
+        if self.stream_clients > 0:
+            # Encode here, on the producer's thread, once for all clients
+            self.latest_jpeg()
+        for callback in list(self._frame_watchers):
+            callback()
+        return seq
+
+    def peek_jpeg(self) -> Tuple[int, Optional[bytes]]:
+        """Sequence and JPEG of the latest frame if already encoded (no encoding)."""
+        with self._lock:
+            return self._seq, self._jpeg
+
+    def latest_jpeg(self) -> Tuple[int, Optional[bytes]]:
+        """Sequence and JPEG of the latest frame, encoding it on first use."""
+        with self._lock:
+            if self._jpeg is None and self._frame is not None:
+                t0 = time.perf_counter()
+                self._jpeg = encode_image(self._frame, ".jpg", quality=self.jpeg_quality)
+                self._frame = None
+                self._stats["encodes"] += 1
+                self._stats["last_encode_ms"] = (time.perf_counter() - t0) * 1000.0
+            return self._seq, self._jpeg
+
+    def publish_event(self, event: str, data: Any) -> StreamEvent:
+        """Publish an event (data is sent as JSON) to all SSE clients."""
+        payload = data if isinstance(data, str) else json.dumps(data, default=str)
+        with self._lock:
+            self._event_id += 1
+            item = StreamEvent(event=event, data=payload, id=self._event_id)
+            self._last_events[event] = item
+        for callback in list(self._event_watchers):
+            callback(item)
+        return item
+
+    def last_events(self) -> List[StreamEvent]:
+        with self._lock:
+            return sorted(self._last_events.values(), key=lambda e: e.id)
+
+    def add_frame_watcher(self, callback: Callable[[], Any]) -> None:
+        self._frame_watchers.append(callback)
+
+    def add_event_watcher(self, callback: Callable[[StreamEvent], Any]) -> None:
+        self._event_watchers.append(callback)
+
+    def remove_watchers(self) -> None:
+        self._frame_watchers.clear()
+        self._event_watchers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats, sequence=self._seq, frame_time=self._frame_time)
+
+
+class _EventQueue:
+    """Bounded per-client event queue that drops the oldest entries when full."""
+
+    def __init__(self, maxlen: int) -> None:
+        self.items: Deque[StreamEvent] = deque(maxlen=maxlen)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, item: StreamEvent) -> None:
+        if len(self.items) == self.items.maxlen:
+            self.dropped += 1
+        self.items.append(item)
+        self.ready.set()
+
+
+class StreamServer:
+    """Asyncio HTTP server for MJPEG, snapshots and SSE, running on its own thread."""
+
+    def __init__(
+        self,
+        hub: Optional[FrameHub] = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_fps: float = 10.0,
+        max_clients: int = 16,
+        keepalive_s: float = 15.0,
+        write_timeout_s: float = 10.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the server (call start() to listen).
+
+        Args:
+            hub: Frame and event source (a new FrameHub if None)
+            host: Interface to bind
+            port: TCP port (0 picks a free port; see self.port after start())
+            max_fps: Frame rate cap per MJPEG client (0 for no cap)
+            max_clients: Maximum concurrent stream and event clients
+            keepalive_s: Interval of SSE keepalive comments
+            write_timeout_s: Clients that do not read for this long are dropped
+            logger: Logger instance
+        """
+        self.hub = hub or FrameHub()
+        self.host = host
+        self.port = int(port)
+        self.max_fps = max(0.0, float(max_fps))
+        self.max_clients = max(1, int(max_clients))
+        self.keepalive_s = max(0.1, float(keepalive_s))
+        self.write_timeout_s = max(0.1, float(write_timeout_s))
+        self.logger = logger or logging.getLogger(__name__)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._shutdown: Optional[asyncio.Event] = None
+        self._start_error: Optional[BaseException] = None
+        self._frame_waiters: Set[asyncio.Event] = set()
+        self._event_queues: Set[_EventQueue] = set()
+        self._clients = 0
+        self._stats: Dict[str, int] = {"frames_sent": 0, "frames_skipped": 0, "clients_dropped": 0}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats, clients=self._clients, hub=self.hub.stats())
+
+    def start(self, timeout: float = 5.0) -> None:
+        """Start listening on a background thread.
+
+        Raises:
+            OSError: If the address cannot be bound.
+        """
+        if self.is_running:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="StreamServer", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        if self._start_error is not None:
+            self._thread.join(timeout)
+            self._thread = None
+            raise self._start_error
+        self.logger.info("Stream server listening on %s", self.url)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the server and disconnect all clients."""
+        loop, shutdown = self._loop, self._shutdown
+        if loop is not None and shutdown is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(shutdown.set)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    # Thread and loop
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        self._start_error = None
+        try:
+            loop.run_until_complete(self._serve())
+        except BaseException as e:  # noqa: BLE001 - reported to start()
+            if not self._ready.is_set():
+                self._start_error = e
+            else:
+                self.logger.error(f"Stream server stopped: {e}")
+        finally:
+            self.hub.remove_watchers()
+            self._ready.set()
+            loop.close()
+
+    async def _serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._shutdown = asyncio.Event()
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        sockets: Sequence[Any] = server.sockets or []
+        if sockets:
+            self.port = int(sockets[0].getsockname()[1])
+        self.hub.add_frame_watcher(lambda: loop.call_soon_threadsafe(self._wake_frame_waiters))
+        self.hub.add_event_watcher(
+            lambda item: loop.call_soon_threadsafe(self._dispatch_event, item)
+        )
+        self._ready.set()
+        try:
+            await self._shutdown.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            # Wake streaming handlers so they notice the shutdown
+            self._wake_frame_waiters()
+            for queue in list(self._event_queues):
+                queue.ready.set()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _wake_frame_waiters(self) -> None:
+        for waiter in list(self._frame_waiters):
+            waiter.set()
+
+    def _dispatch_event(self, item: StreamEvent) -> None:
+        for queue in list(self._event_queues):
+            queue.put(item)
+
+    # HTTP
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), self.write_timeout_s)
+            parts = request_line.decode("latin-1").split()
+            # Skip the request headers
+            while True:
+                line = await asyncio.wait_for(reader.readline(), self.write_timeout_s)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            if len(parts) < 2:
+                return
+            method, path = parts[0].upper(), parts[1].split("?", 1)[0]
+            if method not in ("GET", "HEAD"):
+                await self._respond(writer, 405, b"Method not allowed\n")
+            elif path in ("/", "/index.html"):
+                await self._respond(writer, 200, _INDEX_HTML, "text/html; charset=utf-8", method)
+            elif path == "/snapshot.jpg":
+                await self._snapshot(writer, method)
+            elif path in ("/stream.mjpg", "/stream"):
+                await self._with_client_slot(writer, self._mjpeg(writer), method)
+            elif path == "/events":
+                await self._with_client_slot(writer, self._events(writer), method)
+            else:
+                await self._respond(writer, 404, b"Not found\n")
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            self._stats["clients_dropped"] += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.debug(f"Stream client error: {e}")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str = "text/plain; charset=utf-8",
+        method: str = "GET",
+    ) -> None:
+        reason = _REASONS.get(status, "Error")
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Cache-Control: no-cache, no-store\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode() + (body if method != "HEAD" else b""))
+        await asyncio.wait_for(writer.drain(), self.write_timeout_s)
+
+    async def _snapshot(self, writer: asyncio.StreamWriter, method: str) -> None:
+        loop = asyncio.get_running_loop()
+        _, jpeg = self.hub.peek_jpeg()
+        if jpeg is None:
+            _, jpeg = await loop.run_in_executor(None, self.hub.latest_jpeg)
+        if jpeg is None:
+            await self._respond(writer, 503, b"No frame available yet\n")
+            return
+        await self._respond(writer, 200, jpeg, "image/jpeg", method)
+
+    async def _with_client_slot(
+        self, writer: asyncio.StreamWriter, handler: Coroutine[Any, Any, None], method: str
+    ) -> None:
+        if self._clients >= self.max_clients or method == "HEAD":
+            handler.close()
+            status = 503 if method != "HEAD" else 200
+            await self._respond(writer, status, b"", method=method)
+            return
+        self._clients += 1
+        try:
+            await handler
+        finally:
+            self._clients -= 1
+
+    async def _send(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(data)
+        await asyncio.wait_for(writer.drain(), self.write_timeout_s)
+
+    async def _mjpeg(self, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        await self._send(
+            writer,
+            (
+                "HTTP/1.1 200 OK\r\n"
+                f"Content-Type: multipart/x-mixed-replace; boundary={_BOUNDARY}\r\n"
+                "Cache-Control: no-cache, no-store\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode(),
+        )
+        waiter = asyncio.Event()
+        self._frame_waiters.add(waiter)
+        self.hub.stream_clients += 1
+        min_interval = 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+        sent_seq = 0
+        last_sent = 0.0
+        try:
+            while self._shutdown is not None and not self._shutdown.is_set():
+                if self.hub.sequence == sent_seq:
+                    waiter.clear()
+                    if self.hub.sequence == sent_seq:
+                        await waiter.wait()
+                    continue
+                delay = last_sent + min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                seq, jpeg = self.hub.peek_jpeg()
+                if jpeg is None:
+                    seq, jpeg = await loop.run_in_executor(None, self.hub.latest_jpeg)
+                if jpeg is None:
+                    sent_seq = seq
+                    continue
+                if sent_seq and seq > sent_seq + 1:
+                    self._stats["frames_skipped"] += seq - sent_seq - 1
+                part = (
+                    f"--{_BOUNDARY}\r\n"
+                    "Content-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(jpeg)}\r\n\r\n"
+                ).encode()
+                await self._send(writer, part + jpeg + b"\r\n")
+                sent_seq, last_sent = seq, time.monotonic()
+                self._stats["frames_sent"] += 1
+        finally:
+            self.hub.stream_clients -= 1
+            self._frame_waiters.discard(waiter)
+
+    async def _events(self, writer: asyncio.StreamWriter) -> None:
+        await self._send(
+            writer,
+            (
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: text/event-stream\r\n"
+                "Cache-Control: no-cache, no-store\r\n"
+                "Connection: close\r\n\r\n"
+                "retry: 3000\n\n"
+            ).encode(),
+        )
+        queue = _EventQueue(self.hub.max_events)
+        for item in self.hub.last_events():
+            queue.put(item)
+        self._event_queues.add(queue)
+        try:
+            while self._shutdown is not None and not self._shutdown.is_set():
+                if not queue.items:
+                    queue.ready.clear()
+                    try:
+                        await asyncio.wait_for(queue.ready.wait(), self.keepalive_s)
+                    except asyncio.TimeoutError:
+                        await self._send(writer, b": keepalive\n\n")
+                    continue
+                chunk = b"".join(item.encode() for item in queue.items)
+                queue.items.clear()
+                await self._send(writer, chunk)
+        finally:
+            self._event_queues.discard(queue)
+
+
+def create_stream_server(
+    config: Any, logger: Optional[logging.Logger] = None
+) -> Optional[StreamServer]:
+    """Server configured from overlay.stream_server, or None if disabled."""
+    try:
+        cfg = config.get_overlay_config().get("stream_server", {}) or {}
+    except Exception:
+        cfg = {}
+    if not bool(cfg.get("enabled", False)):
+        return None
+    hub = FrameHub(
+        jpeg_quality=int(cfg.get("jpeg_quality", 85)),
+        max_events=int(cfg.get("max_events", 64)),
+    )
+    return StreamServer(
+        hub,
+        host=str(cfg.get("host", "127.0.0.1")),
+        port=int(cfg.get("port", 8080)),
+        max_fps=float(cfg.get("max_fps", 10.0)),
+        max_clients=int(cfg.get("max_clients", 16)),
+        keepalive_s=float(cfg.get("keepalive_s", 15.0)),
+        write_timeout_s=float(cfg.get("write_timeout_s", 10.0)),
+        logger=logger,
+    )
@@ -13,6 +13,16 @@ def _safe_float(value: Any) -> float | None:
         return None
 
 
+def _camera_value(camera: Any, snapshot: Any, name: str, *aliases: str) -> Any:
+    """Property value from the device-state snapshot if given, else from the camera."""
+    if snapshot is not None:
+        return snapshot.get(name)
+    for attr in (name,) + aliases:
+        if hasattr(camera, attr):
+            return getattr(camera, attr)
+    return None
+
+
 def enrich_header_from_metadata(
     header,  # fits.Header
     frame_details: Dict[str, Any] | None,
@@ -20,10 +30,13 @@ def enrich_header_from_metadata(
     config: Any,
     camera_type: str,
     logger: Any,
+    snapshot: Any = None,
 ) -> None:
     """Populate a FITS header with exposure/camera/calibration fields.
 
-    This function mutates the provided header in-place.
+    This function mutates the provided header in-place. With a device-state
+    snapshot (services.device_state), camera properties come from the snapshot
+    and the camera itself is not read.
     """
     # Exposure
     if frame_details is not None and isinstance(frame_details, dict):
@@ -63,19 +76,19 @@ def enrich_header_from_metadata(
     gain = None
     if isinstance(frame_details, dict):
         gain = frame_details.get("gain")
+    if gain is None:
+        gain = _camera_value(camera, snapshot, "gain")
     if gain is not None:
         header["GAIN"] = gain
-    elif hasattr(camera, "gain"):
-        header["GAIN"] = camera.gain
 
     # Offset
     offset = None
     if isinstance(frame_details, dict):
         offset = frame_details.get("offset")
+    if offset is None:
+        offset = _camera_value(camera, snapshot, "offset")
     if offset is not None:
         header["OFFSET"] = offset
-    elif hasattr(camera, "offset"):
-        header["OFFSET"] = camera.offset
     else:
         camera_config = config.get_camera_config()
         for sub in ("ascom", "alpaca"):
@@ -88,10 +101,10 @@ def enrich_header_from_metadata(
     readout = None
     if isinstance(frame_details, dict):
         readout = frame_details.get("readout_mode")
+    if readout is None:
+        readout = _camera_value(camera, snapshot, "readout_mode")
     if readout is not None:
         header["READOUT"] = readout
-    elif hasattr(camera, "readout_mode"):
-        header["READOUT"] = camera.readout_mode
     else:
         camera_config = config.get_camera_config()
         for sub in ("ascom", "alpaca"):
@@ -111,9 +124,12 @@ def enrich_header_from_metadata(
         else:
             header["XBINNING"] = binning
             header["YBINNING"] = binning
-    elif hasattr(camera, "bin_x") and hasattr(camera, "bin_y"):
-        header["XBINNING"] = camera.bin_x
-        header["YBINNING"] = camera.bin_y
+    else:
+        bin_x = _camera_value(camera, snapshot, "bin_x")
+        bin_y = _camera_value(camera, snapshot, "bin_y")
+        if bin_x is not None and bin_y is not None:
+            header["XBINNING"] = bin_x
+            header["YBINNING"] = bin_y
 
     # Sensor / optics fields (optional)
     try:
@@ -135,20 +151,32 @@ def enrich_header_from_metadata(
     except Exception:
         pass
 
-    # Temperature / cooling
+    # Temperature / cooling (values sampled at capture time take precedence)
     try:
-        if hasattr(camera, "ccdtemperature"):
-            header["CCD-TEMP"] = float(camera.ccdtemperature)
-        if hasattr(camera, "set_ccd_temperature"):
-            tset = camera.set_ccd_temperature
+        if isinstance(frame_details, dict) and frame_details.get("ccd_temperature") is not None:
+            header["CCD-TEMP"] = float(frame_details["ccd_temperature"])
+            if frame_details.get("set_ccd_temperature") is not None:
+                header["CCD-TSET"] = float(frame_details["set_ccd_temperature"])
+            if frame_details.get("cooler_power") is not None:
+                header["COOLPOW"] = float(frame_details["cooler_power"])
+            if frame_details.get("cooler_on") is not None:
+                header["COOLERON"] = bool(frame_details["cooler_on"])
+        else:
+            temp = _camera_value(camera, snapshot, "ccd_temperature", "ccdtemperature")
+            if temp is not None:
+                header["CCD-TEMP"] = float(temp)
+        if "CCD-TSET" not in header:
+            tset = _camera_value(camera, snapshot, "set_ccd_temperature")
             if tset is not None:
                 header["CCD-TSET"] = float(tset)
-        if hasattr(camera, "cooler_power"):
-            cpwr = camera.cooler_power
+        if "COOLPOW" not in header:
+            cpwr = _camera_value(camera, snapshot, "cooler_power")
             if cpwr is not None:
                 header["COOLPOW"] = float(cpwr)
-        if hasattr(camera, "cooler_on"):
-            header["COOLERON"] = bool(camera.cooler_on)
+        if "COOLERON" not in header:
+            cooler_on = _camera_value(camera, snapshot, "cooler_on")
+            if cooler_on is not None:
+                header["COOLERON"] = bool(cooler_on)
     except Exception:
         pass
 
@@ -188,6 +216,8 @@ def enrich_header_from_metadata(
                 header["CAPEND"] = str(frame_details["capture_finished_at"])
             if "save_duration_ms" in frame_details:
                 header["SAVEMS"] = float(frame_details["save_duration_ms"])
+            if "download_ms" in frame_details:
+                header["DLMS"] = float(frame_details["download_ms"])
     except Exception:
         pass
 
@@ -198,7 +228,7 @@ def enrich_header_from_metadata(
 
         # Helper to parse from details
         def _get_coords_from_details(
-            details: Dict[str, Any]
+            details: Dict[str, Any],
         ) -> Tuple[Optional[float], Optional[float]]:
             ra_local: Optional[float] = None
             dec_local: Optional[float] = None
@@ -228,28 +258,33 @@ def enrich_header_from_metadata(
 
         if isinstance(frame_details, dict):
             ra_deg, dec_deg = _get_coords_from_details(frame_details)
+            # Mount pointing added by the processor (degrees, from the mount telemetry)
+            if ra_deg is None and dec_deg is None:
+                ra_deg = _safe_float(frame_details.get("RA"))
+                dec_deg = _safe_float(frame_details.get("DEC"))
 
-        # Try to query the mount (ASCOM) for coordinates and pier side regardless of camera type
+        # Query the mount (ASCOM) only if the metadata carries no pointing
         # Use results only to fill missing values, and to set PIERSIDE if not present
-        try:
-            from drivers.ascom.mount import ASCOMMount
+        if ra_deg is None or dec_deg is None:
+            try:
+                from drivers.ascom.mount import ASCOMMount
 
-            mount = ASCOMMount(config=config, logger=logger)
-            status = mount.get_mount_status()
-            if getattr(status, "is_success", False) and isinstance(status.data, dict):
-                data = status.data
-                if ra_deg is None:
-                    ra_val = data.get("ra_deg")
-                    ra_deg = _safe_float(ra_val)
-                if dec_deg is None:
-                    dec_val = data.get("dec_deg")
-                    dec_deg = _safe_float(dec_val)
-                # Pier side
-                if data.get("side_of_pier") is not None and "PIERSIDE" not in header:
-                    header["PIERSIDE"] = str(data.get("side_of_pier"))
-        except Exception:
-            # Silently ignore on non-Windows or when ASCOM not available
-            pass
+                mount = ASCOMMount(config=config, logger=logger)
+                status = mount.get_mount_status()
+                if getattr(status, "is_success", False) and isinstance(status.data, dict):
+                    data = status.data
+                    if ra_deg is None:
+                        ra_val = data.get("ra_deg")
+                        ra_deg = _safe_float(ra_val)
+                    if dec_deg is None:
+                        dec_val = data.get("dec_deg")
+                        dec_deg = _safe_float(dec_val)
+                    # Pier side
+                    if data.get("side_of_pier") is not None and "PIERSIDE" not in header:
+                        header["PIERSIDE"] = str(data.get("side_of_pier"))
+            except Exception:
+                # Silently ignore on non-Windows or when ASCOM not available
+                pass
 
         # If coordinates available, write both numeric and sexagesimal
         def _format_ra_sexagesimal(ra_degrees: float) -> str:
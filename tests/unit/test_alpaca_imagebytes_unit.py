@@ -0,0 +1,135 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+from drivers.alpaca.imagebytes import (
+    HEADER_SIZE,
+    IMAGE_BYTES_MIME,
+    AlpacaImageError,
+    decode_image_bytes,
+    download_image_array,
+    encode_image_bytes,
+)
+import numpy as np
+import pytest
+
+
+class _FakeAlpacaCameraServer:
+    """Local stand-in for an Alpaca camera serving imagearray in both encodings."""
+
+    def __init__(self, image: np.ndarray, imagebytes: bool = True) -> None:
+        self.image = image
+        self.imagebytes = imagebytes
+        self.requests: list = []
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                server.requests.append((self.path, self.headers.get("Accept", "")))
+                if server.imagebytes and IMAGE_BYTES_MIME in self.headers.get("Accept", ""):
+                    body = encode_image_bytes(server.image)
+                    content_type = IMAGE_BYTES_MIME
+                else:
+                    body = json.dumps(
+                        {
+                            "Type": 2,
+                            "Rank": server.image.ndim,
+                            "Value": server.image.tolist(),
+                            "ErrorNumber": 0,
+                            "ErrorMessage": "",
+                        }
+                    ).encode()
+                    content_type = "application/json"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _image(shape=(40, 30), dtype=np.uint16):
+    rng = np.random.default_rng(5)
+    return rng.integers(0, 60000, shape).astype(dtype)
+
+
+@pytest.mark.parametrize(
+    "shape,dtype", [((40, 30), np.uint16), ((8, 6, 3), np.int32), ((5, 7), np.float32)]
+)
+def test_imagebytes_roundtrip(shape, dtype):
+    image = _image(shape, dtype)
+    decoded = decode_image_bytes(bytearray(encode_image_bytes(image)))
+    assert decoded.dtype == image.dtype and decoded.shape == image.shape
+    np.testing.assert_array_equal(decoded, image)
+    assert decoded.flags.writeable
+
+
+def test_imagebytes_error_payload_raises():
+    payload = bytearray(encode_image_bytes(_image((2, 2))))
+    payload[4:8] = (1025).to_bytes(4, "little")
+    payload[HEADER_SIZE:] = b"Camera busy"
+    with pytest.raises(AlpacaImageError, match="1025"):
+        decode_image_bytes(payload)
+
+
+def test_download_prefers_imagebytes():
+    image = _image()
+    with _FakeAlpacaCameraServer(image) as server:
+        data, info = download_image_array("127.0.0.1", server.port, 0)
+    np.testing.assert_array_equal(data, image)
+    assert data.dtype == np.uint16
+    assert info["image_transfer"] == "imagebytes"
+    assert info["download_bytes"] == HEADER_SIZE + image.nbytes
+    assert info["download_ms"] >= 0.0 and info["decode_ms"] >= 0.0
+    path, accept = server.requests[0]
+    assert path.startswith("/api/v1/camera/0/imagearray?") and IMAGE_BYTES_MIME in accept
+
+
+def test_download_falls_back_to_json():
+    image = _image()
+    with _FakeAlpacaCameraServer(image, imagebytes=False) as server:
+        data, info = download_image_array("127.0.0.1", server.port, 0)
+    np.testing.assert_array_equal(data, image)
+    assert info["image_transfer"] == "json"
+
+
+def test_wrapper_reports_download_details():
+    pytest.importorskip("alpaca")
+    from drivers.alpaca.camera import AlpycaCameraWrapper
+
+    image = _image()
+    with _FakeAlpacaCameraServer(image) as server:
+        cam = AlpycaCameraWrapper("127.0.0.1", server.port, 0)
+        status = cam.get_image_array()
+    assert status.is_success
+    np.testing.assert_array_equal(status.data, image)
+    assert status.details["image_transfer"] == "imagebytes"
+    assert cam.last_download["download_bytes"] == HEADER_SIZE + image.nbytes
+
+
+@pytest.mark.slow
+def test_imagebytes_faster_than_json():
+    image = _image((600, 800))
+    timings = {}
+    for imagebytes in (True, False):
+        with _FakeAlpacaCameraServer(image, imagebytes=imagebytes) as server:
+            t0 = time.perf_counter()
+            data, info = download_image_array("127.0.0.1", server.port, 0)
+            timings[info["image_transfer"]] = time.perf_counter() - t0
+        np.testing.assert_array_equal(data, image)
+    assert timings["imagebytes"] < timings["json"]
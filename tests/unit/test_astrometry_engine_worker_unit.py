@@ -0,0 +1,114 @@
+from pathlib import Path
+import sys
+import textwrap
+import time
+from typing import Any, Dict
+
+import pytest
+
+fits = pytest.importorskip("astropy.io.fits")
+
+# Writes the .axy named by --axy; the file holds the WCS output path
+_FAKE_SOLVE_FIELD = """
+import sys
+args = sys.argv[1:]
+assert "--just-augment" in args
+axy = args[args.index("--axy") + 1]
+wcs = args[args.index("--wcs") + 1]
+with open(axy, "w") as fh:
+    fh.write(wcs + "\\n" + args[-1])
+"""
+
+# Reads .axy paths from stdin and stays alive. Like the real engine it logs a
+# "did not solve" line per index before the field solves with a later index;
+# images named "cloudy*" never solve and end with the final per-field line.
+_FAKE_ENGINE = """
+import os, sys, time
+import astropy.io.fits as fits
+with open(os.environ["ENGINE_STARTS"], "a") as fh:
+    fh.write("start\\n")
+for line in sys.stdin:
+    wcs, image = open(line.strip()).read().splitlines()
+    for index in ("index-4110.fits", "index-4109.fits", "index-4108.fits"):
+        for objs in ("1-10", "11-20"):
+            print(f"Field 1 did not solve (index {index}, field objects {objs}).", flush=True)
+            time.sleep(0.01)
+    if "cloudy" in os.path.basename(image):
+        print("Field 1 did not solve.", flush=True)
+        continue
+    hdr = fits.Header()
+    for key, value in (("CTYPE1", "RA---TAN"), ("CTYPE2", "DEC--TAN"),
+                       ("CRVAL1", 83.8), ("CRVAL2", -5.4), ("CRPIX1", 50.0),
+                       ("CRPIX2", 40.0), ("CD1_1", -0.001), ("CD1_2", 0.0),
+                       ("CD2_1", 0.0), ("CD2_2", 0.001), ("IMAGEW", 100),
+                       ("IMAGEH", 80)):
+        hdr[key] = value
+    print("Field 1: solved with index index-4107.fits", flush=True)
+    fits.PrimaryHDU(header=hdr).writeto(wcs, overwrite=True)
+"""
+
+
+def _script(path: Path, body: str) -> str:
+    path.write_text(f"#!{sys.executable}\n" + textwrap.dedent(body))
+    path.chmod(0o755)
+    return str(path)
+
+
+class _Cfg:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {
+            "astrometry_local": {
+                "solve_field_path": _script(self.root / "solve-field", _FAKE_SOLVE_FIELD),
+                "engine_path": _script(self.root / "engine", _FAKE_ENGINE),
+                "engine_args": [],
+                "working_directory": str(self.root / "out"),
+                "warm_engine": True,
+                "use_bash": False,
+                "timeout": 30,
+            }
+        }
+
+    def get_camera_config(self) -> Dict[str, Any]:
+        return {"pixel_size": 3.76}
+
+    def get_telescope_config(self) -> Dict[str, Any]:
+        return {"focal_length": 500.0}
+
+
+def _image(path: Path) -> str:
+    hdr = fits.Header()
+    hdr["RA"] = 83.8
+    hdr["DEC"] = -5.4
+    fits.PrimaryHDU(data=None, header=hdr).writeto(path)
+    return str(path)
+
+
+def test_warm_engine_reused_across_solves(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from platesolve.solver import LocalAstrometryNetSolver
+
+    starts = tmp_path / "starts.txt"
+    monkeypatch.setenv("ENGINE_STARTS", str(starts))
+    solver = LocalAstrometryNetSolver(config=_Cfg(tmp_path))
+    try:
+        for i in range(3):
+            status = solver.solve(_image(tmp_path / f"frame_{i}.fits"))
+            assert status.is_success, status.message
+            assert status.data["ra_center"] == pytest.approx(83.8)
+            assert status.data["image_size"] == (100, 80)
+            assert status.data["wcs_path"].endswith(f"frame_{i}.wcs")
+            assert set(status.details["timings_ms"]) == {"augment", "engine", "parse"}
+
+        t0 = time.monotonic()
+        failed = solver.solve(_image(tmp_path / "cloudy.fits"))
+        assert not failed.is_success and time.monotonic() - t0 < 10
+        assert "engine" in failed.details["timings_ms"]
+
+        # The next request sees its own result, not the tail of the failed one
+        status = solver.solve(_image(tmp_path / "frame_after.fits"))
+        assert status.is_success, status.message
+    finally:
+        solver.close()
+    assert starts.read_text().count("start") == 1
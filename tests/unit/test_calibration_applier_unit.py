@@ -83,3 +83,148 @@ def test_apply_dark_and_flat_simple(monkeypatch: pytest.MonkeyPatch):
     # simple expected transform: (frame - 10) / 2
     expected = (frame - 10.0) / 2.0
     assert np.allclose(status.data, expected)
+
+
+def _write_master(path, value: float, shape=(3, 4), **header: Any) -> None:
+    from astropy.io import fits
+
+    hdu = fits.PrimaryHDU(np.full(shape, value, dtype=np.float32))
+    for key, val in header.items():
+        hdu.header[key] = val
+    hdu.writeto(path)
+
+
+def test_master_frames_are_indexed_and_loaded_lazily(tmp_path):
+    from calibration_applier import CalibrationApplier
+
+    _write_master(tmp_path / "master_dark_1.0s.fits", 10.0, GAIN=100, OFFSET=50, READOUT=0)
+    _write_master(tmp_path / "master_flat.fits", 2.0, GAIN=100, OFFSET=50, READOUT=0)
+
+    class _DirConfig(_StubConfig):
+        def get_master_config(self) -> Dict[str, Any]:
+            cfg = super().get_master_config()
+            cfg["output_dir"] = str(tmp_path)
+            return cfg
+
+    applier = CalibrationApplier(config=_DirConfig())
+    status = applier.load_master_frames()
+    assert status.is_success
+    assert status.details["total_masters"] == 2
+    dark_info = applier.master_dark_cache[1.0]
+    assert "data" not in dark_info
+    assert dark_info["shape"] == (3, 4)
+    assert applier.master_store.cached_bytes == 0
+
+    frame = np.full((3, 4), 30.0, dtype=np.float32)
+    info = {"gain": 100.0, "offset": 50.0, "readout_mode": 0}
+    result = applier.calibrate_frame(frame, exposure_time=1.0, frame_info=info)
+    assert np.allclose(result.data, 10.0)
+    assert applier.master_store.is_loaded(dark_info["file"])
+    assert applier.get_master_frame_info()["master_darks"]["1.000s"]["shape"] == (3, 4)
+
+
+def test_master_store_respects_byte_budget_and_caches_transpose(tmp_path):
+    from calibration.master_store import MasterFrameStore
+
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"m{i}.fits"
+        _write_master(path, float(i), shape=(8, 16))
+        paths.append(path)
+
+    frame_bytes = 8 * 16 * 4
+    store = MasterFrameStore(max_bytes=2 * frame_bytes)
+    for path in paths:
+        assert store.get(path).dtype == np.float32
+    assert store.cached_bytes <= 2 * frame_bytes
+    assert not store.is_loaded(paths[0])
+    assert store.is_loaded(paths[2])
+
+    transposed = store.get(paths[2], transposed=True)
+    assert transposed.shape == (16, 8) and transposed.flags["C_CONTIGUOUS"]
+    assert store.get(paths[2], transposed=True) is transposed
+
+
+def test_fused_kernel_matches_reference_in_row_chunks():
+    from calibration.kernel import CalibrationKernel, prepare_masters
+
+    rng = np.random.default_rng(0)
+    raw = rng.integers(0, 4000, size=(64, 40), dtype=np.uint16).T  # strided view
+    dark = rng.normal(100.0, 5.0, size=raw.shape).astype(np.float32)
+    flat = rng.uniform(0.5, 1.5, size=raw.shape).astype(np.float32)
+    flat[0, :3] = 0.0
+
+    kernel = CalibrationKernel(max_workers=4, min_rows_per_chunk=8)
+    out = np.empty(raw.shape, dtype=np.float32)
+    result = kernel.apply(raw, prepare_masters(dark, flat), out=out)
+    kernel.shutdown()
+
+    expected = (raw.astype(np.float32) - dark) / np.where(flat > 0, flat, 1.0)
+    assert result is out
+    assert np.allclose(result, expected, rtol=1e-5, atol=1e-3)
+
+
+def test_stats_only_when_requested_and_output_ring_reused():
+    from calibration_applier import CalibrationApplier
+
+    class _RingConfig(_StubConfig):
+        def get_master_config(self) -> Dict[str, Any]:
+            cfg = super().get_master_config()
+            cfg["output_buffers"] = 2
+            return cfg
+
+    applier = CalibrationApplier(config=_RingConfig())
+    applier.master_flat_cache = {"data": np.full((3, 4), 2.0, dtype=np.float32), "file": "f"}
+    frame = np.full((4, 3), 8, dtype=np.uint16)  # portrait: calibrated long-side horizontal
+
+    first = applier.calibrate_frame(frame, exposure_time=1.0)
+    assert "stats" not in first.details
+    assert first.data.shape == (3, 4) and np.allclose(first.data, 4.0)
+
+    second = applier.calibrate_frame(frame, exposure_time=1.0, compute_stats=True)
+    assert second.details["stats"]["max"] == 4.0
+    assert second.data is not first.data
+    third = applier.calibrate_frame(frame, exposure_time=1.0)
+    assert third.data is first.data
+
+
+def test_prepared_terms_share_the_store_budget(tmp_path):
+    from calibration.kernel import prepare_masters
+    from calibration.master_store import MasterFrameStore
+
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"m{i}.fits"
+        _write_master(path, float(i + 1), shape=(8, 16))
+        paths.append(path)
+    frame_bytes = 8 * 16 * 4
+    store = MasterFrameStore(max_bytes=3 * frame_bytes)
+    builds = []
+
+    def prepared(dark, flat):
+        def build():
+            builds.append(1)
+            masters = prepare_masters(dark, flat)
+            return masters, int(masters.inv_flat.nbytes)
+
+        return store.get_derived((dark, flat), build)
+
+    dark, flat = store.get(paths[0]), store.get(paths[1])
+    terms = prepared(dark, flat)
+    assert prepared(dark, flat) is terms and len(builds) == 1
+    assert store.cached_bytes == 3 * frame_bytes
+
+    # Over budget, prepared terms are evicted before any frame
+    store.get(paths[2])
+    assert store.cached_bytes == 3 * frame_bytes and store.is_loaded(paths[0])
+    assert len(builds) == 1 and prepared(dark, flat) is not terms
+
+    # Terms that add no bytes (dark only) go with their dark when it is evicted
+    small = MasterFrameStore(max_bytes=2 * frame_bytes)
+    dark = small.get(paths[0])
+    terms = small.get_derived((dark, None), lambda: (prepare_masters(dark), 0))
+    assert terms.offset is dark and small.cached_bytes == frame_bytes
+    small.get(paths[1])
+    small.get(paths[2])
+    assert not small.is_loaded(paths[0]) and not small._derived
+    assert small.cached_bytes == 2 * frame_bytes
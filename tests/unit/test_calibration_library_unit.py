@@ -0,0 +1,134 @@
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+from calibration.library_index import (
+    PLAN_APPEND,
+    PLAN_REBUILD,
+    PLAN_UNCHANGED,
+    CalibrationLibrary,
+    RunningStack,
+)
+import numpy as np
+import pytest
+
+fits = pytest.importorskip("astropy.io.fits")
+
+
+def _write(path: Path, data: np.ndarray, **header: Any) -> str:
+    hdr = fits.Header()
+    for key, value in header.items():
+        hdr[key.replace("_", "-")] = value
+    fits.PrimaryHDU(data, header=hdr).writeto(path)
+    return str(path)
+
+
+def _frame(seed: int, shape=(12, 16)) -> np.ndarray:
+    return np.random.default_rng(seed).normal(500, 20, shape).astype(np.uint16)
+
+
+def test_running_stack_extends_exactly(tmp_path: Path):
+    frames = [_frame(i).astype(np.float64) for i in range(5)]
+    stack = RunningStack()
+    for f in frames[:3]:
+        stack.add(f)
+    stack.save(tmp_path / "acc.npz")
+    resumed = RunningStack.load(tmp_path / "acc.npz")
+    for f in frames[3:]:
+        resumed.add(f)
+    assert resumed.count == 5
+    np.testing.assert_allclose(resumed.result(), np.mean(frames, axis=0), rtol=1e-6)
+    np.testing.assert_allclose(resumed.std(), np.std(frames, axis=0, ddof=1), rtol=1e-5)
+
+
+def test_library_plans_and_reads_headers_once(tmp_path: Path, monkeypatch):
+    files = [
+        _write(tmp_path / f"d{i}.fits", _frame(i), EXPTIME=2.0, GAIN=100, OFFSET=10, CCD_TEMP=-10.0)
+        for i in range(3)
+    ]
+    lib = CalibrationLibrary(tmp_path / "index.json")
+    settings = {"method": "mean", "sigma": 3.0}
+    records = lib.scan(files)
+    assert [r.exptime for r in records] == [2.0] * 3
+    assert records[0].gain == 100 and records[0].offset == 10 and records[0].ccd_temp == -10.0
+    assert records[0].readout is None
+    assert lib.plan("dark:a", records, settings) == PLAN_REBUILD
+
+    master = _write(tmp_path / "master.fits", _frame(9))
+    acc = tmp_path / "master_accumulator.npz"
+    RunningStack(1, np.zeros((2, 2)), np.zeros((2, 2))).save(acc)
+    lib.record_group("dark:a", records, settings, master, str(acc))
+    lib.save()
+
+    reloaded = CalibrationLibrary(tmp_path / "index.json")
+    reads = []
+    monkeypatch.setattr(reloaded, "_read_header", lambda record: reads.append(record.path))
+    assert reloaded.plan("dark:a", reloaded.scan(files), settings) == PLAN_UNCHANGED
+    assert reads == []
+
+    extra = _write(tmp_path / "d3.fits", _frame(3), EXPTIME=2.0)
+    records = reloaded.scan(files + [extra])
+    assert reads == [os.path.abspath(extra)]
+    assert reloaded.plan("dark:a", records, settings) == PLAN_APPEND
+    assert [r.path for r in reloaded.new_records("dark:a", records)] == [os.path.abspath(extra)]
+    assert reloaded.plan("dark:a", records, {"method": "median", "sigma": 3.0}) == PLAN_REBUILD
+    # A removed input cannot be taken out of a running mean
+    assert reloaded.plan("dark:a", reloaded.scan(files[1:]), settings) == PLAN_REBUILD
+
+
+class _Config:
+    def __init__(self, root: Path, method: str) -> None:
+        self.root = root
+        self.method = method
+
+    def get_dark_config(self) -> Dict[str, Any]:
+        return {"output_dir": str(self.root / "darks"), "min_exposure": 0.001}
+
+    def get_flat_config(self) -> Dict[str, Any]:
+        return {"output_dir": str(self.root / "flats")}
+
+    def get_master_config(self) -> Dict[str, Any]:
+        return {
+            "output_dir": str(self.root / "masters"),
+            "rejection_method": self.method,
+            "combine_workers": 1,
+        }
+
+
+def test_master_darks_skip_unchanged_and_extend_mean(tmp_path: Path):
+    from calibration.master_frame_builder import MasterFrameCreator
+
+    exp_dir = tmp_path / "darks" / "exp_2.000s"
+    exp_dir.mkdir(parents=True)
+    frames = [_frame(i) for i in range(4)]
+    for i in range(3):
+        _write(exp_dir / f"dark_{i:03d}.fits", frames[i], EXPTIME=2.0)
+
+    first = MasterFrameCreator(config=_Config(tmp_path, "mean")).create_master_darks()
+    assert first.is_success and len(first.data) == 1
+    (master,) = first.data
+    assert os.path.exists(os.path.splitext(master)[0] + "_accumulator.npz")
+
+    again = MasterFrameCreator(config=_Config(tmp_path, "mean"))
+    status = again._create_master_dark_for_exposure(str(exp_dir), 2.0)
+    assert status.details["plan"] == PLAN_UNCHANGED and status.data == master
+
+    _write(exp_dir / "dark_003.fits", frames[3], EXPTIME=2.0)
+    status = again._create_master_dark_for_exposure(str(exp_dir), 2.0)
+    assert status.details["plan"] == PLAN_APPEND
+    updated = fits.getdata(status.data)
+    np.testing.assert_allclose(
+        updated, np.mean(np.array(frames, dtype=np.float64), axis=0), rtol=1e-6
+    )
+    # The superseded accumulator is removed; the previous master is kept
+    if status.data != master:
+        assert os.path.exists(master)
+        assert not os.path.exists(os.path.splitext(master)[0] + "_accumulator.npz")
+
+    median = MasterFrameCreator(config=_Config(tmp_path, "median"))
+    status = median._create_master_dark_for_exposure(str(exp_dir), 2.0)
+    assert status.details["plan"] == PLAN_REBUILD
+    np.testing.assert_allclose(
+        fits.getdata(status.data), np.median(np.array(frames, dtype=np.float32), axis=0)
+    )
+    assert not any(p.suffix == ".npz" for p in (tmp_path / "masters").iterdir())
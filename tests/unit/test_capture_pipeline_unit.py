@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+import time
+import types
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+
+def _status(data=None, details=None, ok=True):
+    return types.SimpleNamespace(
+        is_success=ok, message="ok" if ok else "failed", data=data, details=details or {}
+    )
+
+
+def _acquire_after(delay_s: float, counter: list):
+    def _acquire():
+        time.sleep(delay_s)
+        counter.append(1)
+        return _status(np.zeros((4, 4)), {"exposure_time_s": delay_s, "n": len(counter)})
+
+    return _acquire
+
+
+def _process_after(delay_s: float):
+    def _process(acquired):
+        time.sleep(delay_s)
+        return _status(acquired.data, dict(acquired.details))
+
+    return _process
+
+
+def test_pipeline_overlaps_exposure_with_processing():
+    from capture.pipeline import CapturePipeline
+
+    acquired: list = []
+    pipe = CapturePipeline(_acquire_after(0.05, acquired), _process_after(0.05))
+    pipe.start()
+    try:
+        frames = []
+        while len(frames) < 6:
+            frame = pipe.get(timeout=2.0)
+            assert frame is not None
+            time.sleep(0.04)  # save/solve stage
+            frames.append(frame)
+        stats = pipe.stats()
+    finally:
+        pipe.stop()
+    assert [f.details["n"] for f in frames] == list(range(1, 7))
+    timings = frames[-1].details["timings_ms"]
+    assert {"raw_queue", "out_queue", "cycle"} <= set(timings)
+    # Sequential capture would spend ~1/3 of the time exposing
+    assert stats["duty_cycle"] is not None and stats["duty_cycle"] > 0.6
+    assert not pipe.is_running
+
+
+def test_pipeline_backpressure_bounds_buffered_frames():
+    from capture.pipeline import CapturePipeline
+
+    acquired: list = []
+    pipe = CapturePipeline(
+        _acquire_after(0.005, acquired),
+        _process_after(0.0),
+        raw_queue_size=1,
+        output_queue_size=1,
+    )
+    pipe.start()
+    time.sleep(0.3)
+    stats = pipe.stats()
+    pipe.stop()
+    # One frame per queue, one in each stage's hands
+    assert stats["acquired"] <= 4
+    assert stats["delivered"] == 0
+
+
+def test_pipeline_gate_blocks_exposures():
+    from capture.pipeline import CapturePipeline
+
+    acquired: list = []
+    gate_calls = threading.Event()
+
+    def _gate():
+        gate_calls.set()
+        return False
+
+    pipe = CapturePipeline(
+        _acquire_after(0.0, acquired), _process_after(0.0), gate=_gate, retry_delay_s=0.01
+    )
+    pipe.start()
+    assert gate_calls.wait(1.0)
+    assert pipe.get(timeout=0.1) is None
+    pipe.stop()
+    assert acquired == []
+
+
+class _StubConfig:
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"enabled": True, "output_dir": "captured_frames"}
+
+    def get_camera_config(self) -> Dict[str, Any]:
+        return {"camera_type": "opencv", "opencv": {}, "cooling": {"enable_cooling": False}}
+
+
+class _FakeLongExposureCamera:
+    def __init__(self) -> None:
+        self.started = 0
+
+    def start_exposure(self, exposure_time_s: float, light: bool = True) -> None:
+        self.started += 1
+
+    def wait_for_image_ready(self, timeout_s: float) -> bool:
+        return True
+
+    def get_image_array(self):
+        return np.full((6, 8), 100, dtype=np.uint16)
+
+
+def test_capture_split_into_acquire_and_process(monkeypatch: pytest.MonkeyPatch):
+    from capture.controller import VideoCapture
+
+    monkeypatch.setattr(VideoCapture, "_initialize_camera", lambda self: _status())
+    vc = VideoCapture(config=_StubConfig(), enable_calibration=False)
+    vc.camera = _FakeLongExposureCamera()
+
+    acquired = vc.acquire_raw_frame(0.5)
+    assert acquired.is_success
+    assert acquired.data.shape == (6, 8)
+    assert {"expose", "readout"} <= set(acquired.details["timings_ms"])
+    assert acquired.details["exposure_time_s"] == 0.5
+
+    status = vc.process_raw_frame(acquired)
+    assert status.is_success
+    assert {"expose", "readout", "calibrate"} <= set(status.details["timings_ms"])
+    assert "capture_started_at" in status.details and "capture_finished_at" in status.details
+    assert vc.camera.started == 1
+
+
+class _ProcCfg:
+    def __init__(self, dir_path: str):
+        self._dir = dir_path
+
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"enabled": True, "save_plate_solve_frames": False, "plate_solve_dir": self._dir}
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {"default_solver": "platesolve2", "auto_solve": False, "min_solve_interval": 0}
+
+    def get_mount_config(self) -> Dict[str, Any]:
+        return {"slewing_detection": {"enabled": False}}
+
+
+def test_pipelined_frame_logs_stage_timings(tmp_path: Path, caplog):
+    from processing.processor import VideoProcessor
+
+    vp = VideoProcessor(config=_ProcCfg(str(tmp_path)))
+    vp.video_capture = types.SimpleNamespace(camera_type="alpaca")
+    frame = _status(
+        np.zeros((4, 4), dtype=np.uint16),
+        {"timings_ms": {"expose": 1000.0, "readout": 50.0, "raw_queue": 2.0, "cycle": 1060.0}},
+    )
+    caplog.set_level("INFO")
+    vp._capture_and_solve(frame)
+    lines = [r.getMessage() for r in caplog.records if "timings_ms" in r.getMessage()]
+    assert lines
+    assert "capture=1052.0" in lines[-1]
+    assert "expose=1000.0" in lines[-1] and "cycle=1060.0" in lines[-1]
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import numpy as np
+from PIL import Image
+import pytest
+
+
+def _records(rows):
+    from overlay.catalog_cache import CATALOG_DTYPE
+
+    out = np.zeros(len(rows), dtype=CATALOG_DTYPE)
+    for i, (ra, dec, vmag, name) in enumerate(rows):
+        out[i]["ra"] = ra
+        out[i]["dec"] = dec
+        out[i]["V"] = vmag
+        out[i]["otype"] = "*"
+        out[i]["main_id"] = name
+        out[i]["dim_maj"] = np.nan
+        out[i]["dim_min"] = np.nan
+        out[i]["dim_pa"] = np.nan
+    return out
+
+
+def test_tiles_cover_cone_and_wrap_ra(tmp_path):
+    from overlay.catalog_cache import CatalogTileCache
+
+    cache = CatalogTileCache(tmp_path / "tiles", tile_size_deg=2.0)
+    tiles = cache.tiles_for_cone(359.5, 0.0, 1.0)
+    ra_ranges = [cache.tile_bounds(t)[:2] for t in tiles]
+    # Cone straddles RA=0, so both the first and the last RA tile are needed
+    assert any(lo == 0.0 for lo, _ in ra_ranges)
+    assert any(hi == pytest.approx(360.0) for _, hi in ra_ranges)
+
+    # Cones containing the pole need the whole polar band
+    polar = cache.tiles_for_cone(10.0, 89.5, 1.0)
+    top_band = max(t[0] for t in polar)
+    assert {t[1] for t in polar if t[0] == top_band} == set(range(int(cache._ra_counts[top_band])))
+
+
+def test_cone_search_after_store(tmp_path):
+    from overlay.catalog_cache import CatalogTileCache
+
+    cache = CatalogTileCache(tmp_path / "tiles", tile_size_deg=2.0)
+    assert cache.cone_search(10.0, 20.0, 0.5) is None
+
+    missing = cache.missing_tiles(10.0, 20.0, 0.5)
+    recs = _records([(10.0, 20.0, 5.0, "A"), (10.3, 20.1, 7.0, "B"), (13.0, 20.0, 6.0, "Far")])
+    cache.store_records(recs, missing)
+
+    found = cache.cone_search(10.0, 20.0, 0.5)
+    assert found is not None
+    assert sorted(found["main_id"]) == ["A", "B"]
+    assert cache.missing_tiles(10.0, 20.0, 0.5) == []
+
+    # Index and tiles persist across instances
+    reopened = CatalogTileCache(tmp_path / "tiles", tile_size_deg=2.0)
+    again = reopened.cone_search(10.0, 20.0, 0.5)
+    assert again is not None and len(again) == 2
+
+
+def test_memory_and_disk_lru_eviction(tmp_path):
+    from overlay.catalog_cache import CatalogTileCache
+
+    cache = CatalogTileCache(
+        tmp_path / "tiles", tile_size_deg=2.0, max_tiles_in_memory=1, max_tiles_on_disk=2
+    )
+    for ra in (10.0, 30.0, 50.0):
+        tiles = cache.tiles_for_cone(ra, 1.0, 0.1)
+        cache.store_records(_records([(ra, 1.0, 5.0, f"S{ra}")]), tiles)
+        cache.cone_search(ra, 1.0, 0.1)
+        assert cache.stats()["tiles_in_memory"] <= 1
+
+    assert cache.stats()["tiles_on_disk"] == 2
+    # Oldest tile was evicted from disk
+    assert cache.cone_search(10.0, 1.0, 0.1) is None
+    assert cache.cone_search(50.0, 1.0, 0.1) is not None
+
+
+def test_stale_tiles_reported_as_missing(tmp_path):
+    from overlay.catalog_cache import CatalogTileCache
+
+    cache = CatalogTileCache(tmp_path / "tiles", tile_size_deg=2.0, max_age_s=60.0)
+    tiles = cache.missing_tiles(100.0, -30.0, 0.2)
+    cache.store_records(_records([(100.0, -30.0, 4.0, "X")]), tiles)
+    now = __import__("time").time()
+    assert cache.tile_age_s(tiles[0], now=now) < 60.0
+    assert cache.missing_tiles(100.0, -30.0, 0.2) == []
+    for info in cache._tiles.values():
+        info["filled_at"] -= 120.0
+    assert cache.is_stale(tiles[0])
+    assert cache.missing_tiles(100.0, -30.0, 0.2)
+    # Stale data is still served for offline use
+    assert len(cache.cone_search(100.0, -30.0, 0.2)) == 1
+
+
+def test_import_offline_catalog(tmp_path):
+    from astropy.table import Table
+    from overlay.catalog_cache import CatalogTileCache
+
+    path = tmp_path / "cat.ecsv"
+    Table(
+        {
+            "ra": [150.0, 150.2, 300.0],
+            "dec": [2.0, 2.1, -45.0],
+            "V": [6.0, 9.5, 3.0],
+            "otype": ["*", "G", "*"],
+            "main_id": ["P", "Q", "R"],
+        }
+    ).write(path)
+
+    cache = CatalogTileCache(tmp_path / "tiles", tile_size_deg=5.0)
+    assert cache.import_catalog(path) == 3
+    assert cache.import_catalog(path) == 0  # unchanged file is not re-imported
+    assert cache.missing_tiles(0.0, 0.0, 10.0) == []
+    found = cache.cone_search(150.0, 2.0, 0.5)
+    assert sorted(found["main_id"]) == ["P", "Q"]
+
+
+def test_full_sky_import_survives_default_disk_limit(tmp_path):
+    from astropy.table import Table
+    from overlay.catalog_cache import CatalogTileCache
+
+    rng = np.random.default_rng(3)
+    n = 2000
+    path = tmp_path / "allsky.ecsv"
+    Table(
+        {
+            "ra": rng.uniform(0.0, 360.0, n),
+            "dec": np.rad2deg(np.arcsin(rng.uniform(-1.0, 1.0, n))),
+            "V": rng.uniform(1.0, 9.0, n),
+            "otype": ["*"] * n,
+            "main_id": [f"S{i}" for i in range(n)],
+        }
+    ).write(path)
+
+    # Default config: 2 deg tiles (> 10000 tiles for the whole sky), 5000 on disk
+    cache = CatalogTileCache(tmp_path / "tiles", tile_size_deg=2.0, max_tiles_on_disk=5000)
+    cache.import_catalog(path)
+    assert cache.stats()["tiles_on_disk"] > 5000
+    for ra, dec in zip(rng.uniform(0.0, 360.0, 50), rng.uniform(-89.0, 89.0, 50), strict=True):
+        assert cache.cone_search(float(ra), float(dec), 1.0) is not None
+
+    # SIMBAD fills stay bounded by the limit without touching imported tiles
+    small = CatalogTileCache(tmp_path / "small", tile_size_deg=10.0, max_tiles_on_disk=1)
+    small.import_catalog(path)
+    imported = small.stats()["tiles_on_disk"]
+    small.store_records(_records([(15.0, 1.0, 5.0, "A")]), small.tiles_for_cone(15.0, 1.0, 0.1))
+    small.store_records(_records([(55.0, 1.0, 5.0, "B")]), small.tiles_for_cone(55.0, 1.0, 0.1))
+    assert small.stats()["tiles_on_disk"] == imported - 1
+    # Evicting a refreshed catalog tile forgets the import so it is redone
+    assert small.cone_search(15.0, 1.0, 0.1) is None
+    assert small.stats()["sources"] == []
+    assert small.import_catalog(path) == n
+    assert small.cone_search(15.0, 1.0, 0.1) is not None
+
+
+def test_generator_uses_cache_without_network(tmp_path, monkeypatch, cfg_no_ui):
+    # No astroquery: objects must come from the pre-filled tile cache
+    monkeypatch.setitem(__import__("sys").modules, "astroquery", None)
+    monkeypatch.setitem(__import__("sys").modules, "astroquery.simbad", None)
+    from overlay.catalog_cache import CatalogTileCache
+    from overlay.generator import OverlayGenerator
+
+    cache_dir = tmp_path / "catalog"
+    cache = CatalogTileCache(cache_dir, tile_size_deg=2.0)
+    cache.store_records(
+        _records([(0.0, 0.0, 8.0, "A"), (0.05, 0.03, 8.5, "B")]),
+        cache.tiles_for_cone(0.0, 0.0, 2.0),
+    )
+
+    base_cfg = cfg_no_ui.get_overlay_config()
+
+    class _Cfg(type(cfg_no_ui)):
+        def get_overlay_config(self):
+            cfg = dict(base_cfg)
+            cfg["catalog_cache"] = {"enabled": True, "cache_dir": str(cache_dir)}
+            return cfg
+
+    gen_cached = OverlayGenerator(config=_Cfg())
+    out_cached = tmp_path / "cached.png"
+    gen_cached.generate_overlay(ra_deg=0.0, dec_deg=0.0, output_file=str(out_cached))
+
+    gen_plain = OverlayGenerator(config=cfg_no_ui)
+    out_plain = tmp_path / "plain.png"
+    gen_plain.generate_overlay(ra_deg=0.0, dec_deg=0.0, output_file=str(out_plain))
+
+    def _count(p):
+        return int((np.array(Image.open(p).convert("RGBA"))[:, :, 3] > 0).sum())
+
+    assert _count(out_cached) > _count(out_plain)
+
+
+def test_generator_fills_cache_once_from_simbad(tmp_path, fake_simbad, cfg_no_ui):
+    from overlay.generator import OverlayGenerator
+
+    calls = []
+    original = fake_simbad.query_region
+
+    def _counting_query(self, center, radius):
+        calls.append(float(radius.value))
+        return original(self, center, radius)
+
+    fake_simbad.query_region = _counting_query
+
+    base_cfg = cfg_no_ui.get_overlay_config()
+    cache_dir = tmp_path / "catalog"
+
+    class _Cfg(type(cfg_no_ui)):
+        def get_overlay_config(self):
+            cfg = dict(base_cfg)
+            cfg["catalog_cache"] = {"enabled": True, "cache_dir": str(cache_dir)}
+            return cfg
+
+    gen = OverlayGenerator(config=_Cfg())
+    gen.generate_overlay(ra_deg=45.0, dec_deg=10.0, output_file=str(tmp_path / "a.png"))
+    gen.generate_overlay(ra_deg=45.01, dec_deg=10.01, output_file=str(tmp_path / "b.png"))
+
+    # One covering query for all missing tiles, second overlay served from the cache
+    assert len(calls) == 1
+    assert calls[0] > ((1.5**2 * 2) ** 0.5) / 2
+    assert (cache_dir / "index.json").exists()
+
+
+def test_generator_uses_partial_cache_when_simbad_fill_fails(tmp_path, fake_simbad, cfg_no_ui):
+    from overlay.catalog_cache import CatalogTileCache
+    from overlay.generator import OverlayGenerator
+
+    calls = []
+
+    def _unreachable(self, center, radius):
+        calls.append(float(radius.value))
+        raise ConnectionError("SIMBAD unreachable")
+
+    fake_simbad.query_region = _unreachable
+
+    # Only the tile holding the field center is cached
+    cache_dir = tmp_path / "catalog"
+    cache = CatalogTileCache(cache_dir, tile_size_deg=2.0)
+    center_tile = cache.tiles_for_cone(45.0, 10.0, 0.0)
+    cache.store_records(_records([(45.0, 10.0, 8.0, "A")]), center_tile)
+
+    base_cfg = cfg_no_ui.get_overlay_config()
+
+    class _Cfg(type(cfg_no_ui)):
+        def get_overlay_config(self):
+            cfg = dict(base_cfg)
+            cfg["catalog_cache"] = {"enabled": True, "cache_dir": str(cache_dir)}
+            return cfg
+
+    gen = OverlayGenerator(config=_Cfg())
+    assert gen._get_catalog_cache().missing_tiles(45.0, 10.0, 1.0)
+    gen.generate_overlay(ra_deg=45.0, dec_deg=10.0, output_file=str(tmp_path / "a.png"))
+
+    # The failed tile fill is not followed by a second, direct SIMBAD query
+    assert len(calls) == 1
+    assert gen.last_objects_drawn == 1
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections import Counter
+import time
+from typing import Any, Dict
+
+import pytest
+
+
+class _Camera:
+    """Camera whose property reads are counted (each one a device round-trip)."""
+
+    def __init__(self) -> None:
+        self.reads: Counter = Counter()
+        self.values: Dict[str, Any] = {
+            "gain": 100,
+            "offset": 50,
+            "readout_mode": 0,
+            "bin_x": 1,
+            "bin_y": 1,
+            "ccd_temperature": -9.8,
+            "set_ccd_temperature": -10.0,
+            "cooler_power": 42.0,
+            "cooler_on": True,
+            "name": "ZWO ASI2600MC Pro",
+            "can_set_ccd_temperature": True,
+            "can_get_cooler_power": True,
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        values = self.__dict__.get("values", {})
+        if name not in values:
+            raise AttributeError(name)
+        self.reads[name] += 1
+        value = values[name]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+class _NoReads:
+    """Camera that must not be touched."""
+
+    def __getattr__(self, name: str) -> Any:
+        raise AssertionError(f"camera.{name} was read")
+
+
+def test_poll_publishes_immutable_snapshot():
+    from services.device_state import DeviceStateService
+
+    cam = _Camera()
+    service = DeviceStateService(cam, interval_s=60.0)
+    assert service.current() is None
+
+    snap = service.poll()
+    assert snap.get("gain") == 100 and snap.get("ccd_temperature") == -9.8
+    assert snap.get("name") == "ZWO ASI2600MC Pro" and "heat_sink_temperature" not in snap
+    assert snap.timestamps["gain"] <= time.time()
+    with pytest.raises(TypeError):
+        snap.values["gain"] = 1  # type: ignore[index]
+
+    # Static properties are read once; a failing read keeps the last value
+    cam.values["ccd_temperature"] = RuntimeError("HTTP timeout")
+    cam.values["cooler_power"] = 55.0
+    second = service.poll()
+    assert cam.reads["name"] == 1 and cam.reads["gain"] == 2
+    assert second.get("ccd_temperature") == -9.8 and second.get("cooler_power") == 55.0
+    assert second.sequence == snap.sequence + 1 and service.stats()["read_errors"] == 1
+    assert service.current() is second and service.current(max_age_s=-1) is None
+
+
+def test_background_polling_and_invalidate():
+    from services.device_state import DeviceStateService
+
+    cam = _Camera()
+    service = DeviceStateService(cam, interval_s=30.0)
+    seen = []
+    service.add_listener(seen.append)
+    service.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        cam.values["set_ccd_temperature"] = -15.0
+        service.invalidate()
+        while len(seen) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        service.stop()
+    assert not service.is_running
+    assert len(seen) >= 2 and seen[-1].get("set_ccd_temperature") == -15.0
+
+
+def test_header_enrichment_reads_snapshot_only():
+    fits = pytest.importorskip("astropy.io.fits")
+    from services.device_state import DeviceStateService
+    from utils.fits_utils import enrich_header_from_metadata
+
+    class _Cfg:
+        def get_camera_config(self) -> Dict[str, Any]:
+            return {"pixel_size": 3.76}
+
+        def get_telescope_config(self) -> Dict[str, Any]:
+            return {"focal_length": 400.0}
+
+    snap = DeviceStateService(_Camera()).poll()
+    header = fits.Header()
+    enrich_header_from_metadata(
+        header, {"exposure_time_s": 5.0}, _NoReads(), _Cfg(), "alpaca", None, snapshot=snap
+    )
+    assert header["GAIN"] == 100 and header["OFFSET"] == 50 and header["XBINNING"] == 1
+    assert header["CCD-TEMP"] == -9.8 and header["CCD-TSET"] == -10.0
+    assert header["COOLPOW"] == 42.0 and header["COOLERON"] is True
+
+
+def test_cooling_status_from_snapshot():
+    from services.cooling.backend import create_cooling_manager
+    from services.device_state import DeviceStateService
+
+    class _Cfg:
+        def get_camera_config(self) -> Dict[str, Any]:
+            return {"cooling": {"target_temperature": -10.0}}
+
+    service = DeviceStateService(_Camera(), interval_s=60.0)
+    service.poll()
+    manager = create_cooling_manager(_NoReads(), _Cfg(), device_state=service)
+    status = manager.get_cooling_status()
+    assert status["temperature"] == -9.8 and status["cooler_power"] == 42.0
+    assert status["cooler_on"] is True and status["can_get_power"] is True
@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+pytest.importorskip("astropy")
+
+WHEN = "2026-10-16T20:07:13"
+
+
+def _direct(name: str, when: str, lat: float = 52.4, lon: float = 13.1):
+    from astropy.coordinates import EarthLocation, get_body
+    from astropy.time import Time
+    import astropy.units as u
+
+    location = EarthLocation(lat=lat * u.deg, lon=lon * u.deg, height=40.0 * u.m)
+    return get_body(name, Time(when, scale="utc"), location=location, ephemeris="builtin")
+
+
+def test_interpolated_positions_match_get_body():
+    from services.ephemeris import EphemerisService, angular_separation_deg, radec_to_unit
+
+    service = EphemerisService(52.4, 13.1, 40.0, ephemeris="builtin")
+    for when in (WHEN, "2026-10-17T03:33:00Z"):
+        for body in service.positions(when):
+            coord = _direct(body.name, when)
+            sep = angular_separation_deg(
+                radec_to_unit(body.ra_deg, body.dec_deg)[None],
+                radec_to_unit(coord.ra.deg, coord.dec.deg),
+            )[0]
+            assert sep * 3600.0 < 2.0, body.name
+            assert body.distance_m == pytest.approx(coord.distance.to("m").value, rel=1e-5)
+    # Two blocks serve both times; further queries reuse them
+    service.positions("2026-10-16T20:30:00")
+    assert service.stats["blocks_computed"] == 2
+
+
+def test_bodies_within_nearest_first_and_filtered():
+    from services.ephemeris import BRIGHT_BODIES, EphemerisService
+
+    service = EphemerisService(52.4, 13.1, 40.0, ephemeris="builtin")
+    moon = service.position("moon", WHEN)
+    assert moon is not None
+
+    found = service.bodies_within(moon.ra_deg + 0.5, moon.dec_deg, 1.0, when=WHEN)
+    assert [b.name for b in found] == ["moon"]
+    assert found[0].separation_deg == pytest.approx(0.5 * np.cos(np.radians(moon.dec_deg)), 1e-3)
+    assert service.bodies_within(moon.ra_deg + 5.0, moon.dec_deg, 1.0, when=WHEN) == []
+
+    everything = service.bodies_within(moon.ra_deg, moon.dec_deg, 180.0, when=WHEN)
+    seps = [b.separation_deg for b in everything]
+    assert seps == sorted(seps) and {b.name for b in everything} >= set(BRIGHT_BODIES)
+    planets = service.bodies_within(moon.ra_deg, moon.dec_deg, 180.0, WHEN, bodies=["mars"])
+    assert [b.name for b in planets] == ["mars"]
+
+
+def test_time_inputs_agree():
+    from services.ephemeris import to_unix_time
+
+    expected = datetime(2026, 10, 16, 20, 7, 13, tzinfo=timezone.utc).timestamp()
+    assert to_unix_time(WHEN) == expected
+    assert to_unix_time(WHEN + "Z") == expected
+    assert to_unix_time(datetime(2026, 10, 16, 20, 7, 13)) == expected
+    assert to_unix_time(expected) == expected
+
+
+class _Cfg:
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {"auto_solve": False}
+
+    def get_mount_config(self) -> Dict[str, Any]:
+        return {"slewing_detection": {"enabled": False}}
+
+    def get_site_config(self) -> Dict[str, Any]:
+        return {"latitude": 52.4, "longitude": 13.1, "elevation_m": 40.0}
+
+
+def test_processor_uses_shared_service():
+    from processing.processor import VideoProcessor
+
+    vp = VideoProcessor(config=_Cfg())
+    service = vp._ephemeris_service()
+    assert service is not None and service is vp._ephemeris_service()
+    moon = service.position("moon", WHEN)
+    assert moon is not None
+
+    metadata = {"date_obs": WHEN}
+    hits = vp._bright_bodies_in_fov(moon.ra_deg, moon.dec_deg + 0.2, 0.5, metadata)
+    assert [b.name for b in hits] == ["moon"]
+    assert vp._bright_bodies_in_fov(moon.ra_deg, moon.dec_deg + 2.0, 0.5, metadata) == []
+
+
+def test_processor_uses_overlay_ephemeris():
+    from processing.processor import VideoProcessor
+    from services.ephemeris import ephemeris_name, ephemeris_service_for_site
+
+    class _OverlayCfg(_Cfg):
+        def get_overlay_config(self) -> Dict[str, Any]:
+            return {"solar_system": {"ephemeris": "builtin"}}
+
+    cfg = _OverlayCfg()
+    service = VideoProcessor(config=cfg)._ephemeris_service()
+    # Same shared service as the overlay generator's
+    assert service is ephemeris_service_for_site(cfg.get_site_config(), ephemeris="builtin")
+    assert ephemeris_name("DE432") == "de432s" and ephemeris_name(None) == "de432s"
@@ -0,0 +1,85 @@
+import types
+from typing import Any, Dict
+
+from calibration.exposure_model import FlatExposureSolver, frame_statistics
+import numpy as np
+import pytest
+
+
+def test_frame_statistics_histogram_matches_numpy():
+    rng = np.random.default_rng(1)
+    frame = rng.normal(20000, 500, (300, 400)).astype(np.uint16)
+
+    stats = frame_statistics(frame, max_samples=0)
+    assert stats["sample_count"] == frame.size
+    assert stats["mean_value"] == pytest.approx(float(frame.mean()))
+    assert stats["std_value"] == pytest.approx(float(frame.std()))
+    assert stats["min_value"] == frame.min() and stats["max_value"] == frame.max()
+    assert stats["median_value"] == pytest.approx(float(np.median(frame)), abs=1)
+
+    sub = frame_statistics(frame, max_samples=4096, roi_fraction=0.5)
+    assert sub["sample_count"] <= 4096
+    assert sub["mean_value"] == pytest.approx(20000, rel=0.01)
+
+
+def _sensor(exposure: float, bias: float = 300.0, rate: float = 12000.0) -> float:
+    return min(bias + rate * exposure, 65535.0)
+
+
+def test_solver_recovers_from_saturation_and_fits_bias():
+    solver = FlatExposureSolver(target_level=32767, full_scale=65535, max_exposure=30.0)
+    exposure = 10.0
+    steps = 0
+    while abs(_sensor(exposure) - 32767) > 0.02 * 32767:
+        assert solver.add_sample(exposure, _sensor(exposure)).saturated == (exposure == 10.0)
+        exposure = solver.next_exposure()
+        steps += 1
+        assert steps < 4
+    assert steps == 2
+
+    # Two unsaturated samples pin down bias and rate exactly
+    solver = FlatExposureSolver(target_level=32767, full_scale=65535)
+    solver.add_sample(0.5, _sensor(0.5))
+    solver.add_sample(1.0, _sensor(1.0))
+    assert solver.model() == pytest.approx((300.0, 12000.0))
+    assert _sensor(solver.next_exposure()) == pytest.approx(32767)
+
+
+class _Config:
+    def get_flat_config(self) -> Dict[str, Any]:
+        return {"min_exposure": 0.001, "max_exposure": 30.0, "test_frame_roi": 0.5}
+
+    def get_camera_config(self) -> Dict[str, Any]:
+        return {"camera_type": "alpaca", "bit_depth": 16, "alpaca": {"gain": 100}}
+
+
+def test_flat_capture_converges_on_raw_subframes(tmp_path, monkeypatch):
+    from calibration.flat_capture import FlatCapture
+
+    monkeypatch.chdir(tmp_path)
+    subframes = []
+    exposures = []
+
+    def _acquire(exposure_time_s, gain=None, binning=1):
+        exposures.append(exposure_time_s)
+        level = _sensor(exposure_time_s, bias=500.0, rate=3000.0)
+        frame = np.random.default_rng(len(exposures)).normal(level, 50, (64, 48))
+        return types.SimpleNamespace(
+            is_success=True, data=np.clip(frame, 0, 65535).astype(np.uint16), details={}
+        )
+
+    fc = FlatCapture(config=_Config())
+    fc.video_capture = types.SimpleNamespace(
+        camera_type="alpaca",
+        acquire_raw_frame=_acquire,
+        set_subframe=lambda fraction: subframes.append(fraction) or True,
+    )
+    fc.current_exposure = 2.0
+
+    status = fc._adjust_exposure_for_target()
+
+    assert status.is_success
+    assert len(exposures) <= 3
+    assert _sensor(fc.current_exposure, 500.0, 3000.0) == pytest.approx(32767, rel=0.1)
+    # Full frame restored after the test frames
+    assert subframes == [0.5, None]
@@ -0,0 +1,62 @@
+from typing import Any, Dict
+
+import numpy as np
+
+
+class _Cfg:
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"normalization": {"method": "linear"}, "debayer_method": "RGGB"}
+
+    def get_camera_config(self) -> Dict[str, Any]:
+        return {"type": "color"}
+
+
+def test_display_image_is_computed_once_per_frame(monkeypatch):
+    from capture.frame import Frame
+    from processing.frame_products import frame_display_u8
+    import processing.normalization as norm
+    from status import success_status
+
+    calls = []
+    original = norm.normalize_to_uint8
+
+    def _counting(img, config, logger=None, override_method=None):
+        calls.append(override_method)
+        return original(img, config, logger, override_method=override_method)
+
+    monkeypatch.setattr(norm, "normalize_to_uint8", _counting)
+
+    data = np.arange(4 * 6 * 3, dtype=np.uint16).reshape(6, 4, 3) * 100
+    frame = Frame(data=data)
+    wrapped = success_status("Frame captured", data=frame)
+
+    first = frame_display_u8(frame, None, _Cfg())
+    again = frame_display_u8(wrapped, None, _Cfg())
+    assert first is again
+    assert first.dtype == np.uint8 and first.shape[:2] == (4, 6)
+    assert calls == [None]
+
+    # A different normalization override is a separate product
+    frame_display_u8(frame, None, _Cfg(), override_method="moon")
+    assert calls == [None, "moon"]
+
+
+def test_fits_writer_uses_cached_oriented_green(tmp_path):
+    from astropy.io import fits
+    from capture.frame import Frame
+    from services.frame_writer import FrameWriter
+
+    class _WriterCfg(_Cfg):
+        def __getattr__(self, name: str) -> Any:
+            if name.startswith("get_"):
+                return lambda: {}
+            raise AttributeError(name)
+
+    color = np.zeros((6, 4, 3), dtype=np.uint16)
+    green = np.arange(24, dtype=np.uint16).reshape(6, 4)
+    frame = Frame(data=color, green_channel=green)
+
+    status = FrameWriter(config=_WriterCfg()).save_fits(frame, str(tmp_path / "g.fits"))
+    assert status.is_success
+    assert frame.has_product("oriented_green")
+    assert np.array_equal(fits.getdata(tmp_path / "g.fits"), green.T)
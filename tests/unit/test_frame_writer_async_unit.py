@@ -0,0 +1,106 @@
+import threading
+from typing import Any, Dict
+
+import numpy as np
+
+
+class _WriterCfg:
+    def __init__(self, **async_cfg: Any) -> None:
+        self._async = {"enabled": True, **async_cfg}
+
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"orientation": "none", "async_writer": self._async}
+
+    def __getattr__(self, name: str) -> Any:
+        # Other config sections (used for FITS headers) are empty
+        if name.startswith("get_"):
+            return lambda: {}
+        raise AttributeError(name)
+
+
+def test_submit_writes_fits_and_reports_timings(tmp_path):
+    from services.frame_writer import FrameWriter
+
+    writer = FrameWriter(config=_WriterCfg(workers=2))
+    seen = []
+    fut = writer.submit(
+        np.arange(12, dtype=np.uint16).reshape(3, 4),
+        str(tmp_path / "a.fits"),
+        metadata={"exposure_time_s": 1.0},
+        callback=seen.append,
+    )
+    status = fut.result(timeout=10)
+    writer.shutdown()
+
+    assert status.is_success
+    assert status.data == str(tmp_path / "a.fits")
+    assert status.details["write_ms"] >= 0.0 and "queue_ms" in status.details
+    assert seen == [status]
+    assert writer.get_writer_stats()["completed"] == 1
+
+
+def test_full_queue_drop_policy_and_block_policy(tmp_path, monkeypatch):
+    from services.frame_writer import FrameWriter
+
+    gate = threading.Event()
+
+    def _slow_save(self, frame, filename, metadata=None):
+        gate.wait(5)
+        from status import success_status
+
+        return success_status("saved", data=filename)
+
+    monkeypatch.setattr(FrameWriter, "save", _slow_save)
+
+    dropper = FrameWriter(config=_WriterCfg(workers=1, max_queue=1, full_policy="drop"))
+    first = dropper.submit(None, str(tmp_path / "1.png"))
+    dropped = dropper.submit(None, str(tmp_path / "2.png"))
+    assert dropped.done() and dropped.result().details["dropped"] is True
+    gate.set()
+    assert first.result(timeout=5).is_success
+    assert dropper.flush(timeout=5)
+    assert dropper.get_writer_stats()["dropped"] == 1
+    dropper.shutdown()
+
+    gate.clear()
+    blocker = FrameWriter(
+        config=_WriterCfg(workers=1, max_queue=1, full_policy="block", block_timeout_s=5)
+    )
+    blocker.submit(None, str(tmp_path / "3.png"))
+    threading.Timer(0.05, gate.set).start()
+    # Waits for the first write to free its slot instead of dropping
+    assert blocker.submit(None, str(tmp_path / "4.png")).result(timeout=5).is_success
+    blocker.shutdown()
+
+
+def test_processor_hands_out_paths_only_after_their_write(tmp_path):
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from processing.processor import VideoProcessor
+    from status import error_status, success_status
+
+    class _Cfg:
+        def get_frame_processing_config(self) -> Dict[str, Any]:
+            return {"enabled": False}
+
+        def get_plate_solve_config(self) -> Dict[str, Any]:
+            return {"auto_solve": False}
+
+        def get_mount_config(self) -> Dict[str, Any]:
+            return {"slewing_detection": {"enabled": False}}
+
+        def get_overlay_config(self) -> Dict[str, Any]:
+            return {}
+
+    vp = VideoProcessor(config=_Cfg())
+    image, fits = Future(), Future()
+    vp._pending_writes = {"image": image, "fits": fits}
+    path = Path(tmp_path / "capture.png")
+
+    threading.Timer(0.05, image.set_result, [success_status("saved", data=str(path))]).start()
+    assert vp._written_path("image", path) == path and image.done()
+    fits.set_result(error_status("disk full"))
+    assert vp._written_path("fits", Path(tmp_path / "capture.fits")) is None
+    # Synchronous writes (nothing pending) pass through
+    assert vp._written_path("raw", path) == path
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from typing import Any, Dict
+import urllib.parse
+
+import pytest
+
+
+class _FakeAlpacaTelescope:
+    """Local stand-in for an Alpaca telescope device."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {
+            "connected": False,
+            "rightascension": 5.5,  # hours
+            "declination": -5.25,
+            "slewing": False,
+            "tracking": True,
+            "atpark": False,
+            "sideofpier": 0,
+        }
+        self.gets: Counter = Counter()
+        self.puts: list = []
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def _reply(self, value: Any = None, error: int = 0, message: str = "") -> None:
+                body = json.dumps(
+                    {"Value": value, "ErrorNumber": error, "ErrorMessage": message}
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # noqa: N802
+                name = urllib.parse.urlparse(self.path).path.rsplit("/", 1)[-1]
+                server.gets[name] += 1
+                value = server.values.get(name)
+                if isinstance(value, Exception):
+                    self._reply(error=1024, message=str(value))
+                else:
+                    self._reply(value)
+
+            def do_PUT(self):  # noqa: N802
+                name = self.path.rsplit("/", 1)[-1]
+                length = int(self.headers.get("Content-Length", 0))
+                form = urllib.parse.parse_qs(self.rfile.read(length).decode())
+                server.puts.append((name, form))
+                if name == "connected":
+                    server.values["connected"] = form["Connected"][0] == "True"
+                self._reply()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _mount(server: _FakeAlpacaTelescope):
+    from drivers.alpaca.mount import AlpacaMount
+
+    return AlpacaMount(host="127.0.0.1", port=server.port, device_id=0)
+
+
+def test_alpaca_mount_against_local_server():
+    with _FakeAlpacaTelescope() as server:
+        mount = _mount(server)
+        assert server.values["connected"] is True and server.puts[0][0] == "connected"
+
+        coords = mount.get_coordinates()
+        assert coords.is_success and coords.data == pytest.approx((82.5, -5.25))
+        assert mount.is_slewing().data is False and mount.is_tracking().data is True
+        status = mount.get_mount_status()
+        assert status.data["side_of_pier"] == 0 and status.data["at_park"] is False
+
+        server.values["rightascension"] = RuntimeError("not available")
+        failed = mount.get_coordinates()
+        assert failed.is_error and "not available" in failed.message
+
+        mount.disconnect()
+        assert server.values["connected"] is False
+
+
+def test_telemetry_samples_and_slew_handling():
+    from services.mount_telemetry import MountTelemetryService
+
+    with _FakeAlpacaTelescope() as server:
+        service = MountTelemetryService(_mount(server), interval_s=30.0, slewing_interval_s=0.05)
+        first = service.poll()
+        assert first.coordinates == pytest.approx((82.5, -5.25))
+        assert first.tracking is True and first.side_of_pier == 0 and first.error is None
+
+        # At rest the pier side is not read again; consumers share the sample
+        service.poll()
+        assert server.gets["sideofpier"] == 1
+        reads = server.gets["rightascension"]
+        assert service.sample() is service.latest and server.gets["rightascension"] == reads
+
+        # Slewing: fast polling of position and slewing only
+        server.values.update(slewing=True, sideofpier=1)
+        service.start()
+        service.invalidate()
+        try:
+            deadline = time.monotonic() + 5
+            while server.gets["slewing"] < 8 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert server.gets["slewing"] >= 8 and server.gets["tracking"] == 2
+            assert service.latest is not None and service.latest.slewing is True
+            threading.Timer(0.2, lambda: server.values.update(slewing=False)).start()
+            settled = service.wait_until_settled(timeout=5.0)
+        finally:
+            service.stop()
+        assert settled is not None and settled.slewing is False and settled.side_of_pier == 1
+        assert not service.is_running
+
+
+class _Cfg:
+    def __init__(self, telemetry: Dict[str, Any]) -> None:
+        self.telemetry = telemetry
+
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {"auto_solve": False, "astrometry_local": {}}
+
+    def get_mount_config(self) -> Dict[str, Any]:
+        return {"slewing_detection": {"enabled": True}, "telemetry": self.telemetry}
+
+
+class _CountingMount:
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self.slewing = False
+
+    def get_coordinates(self):
+        from status import success_status
+
+        self.calls["coordinates"] += 1
+        return success_status("ok", data=(10.0, 20.0))
+
+    def is_slewing(self):
+        from status import success_status
+
+        self.calls["slewing"] += 1
+        return success_status("ok", data=self.slewing)
+
+    def is_tracking(self):
+        self.calls["tracking"] += 1
+        return True
+
+
+def test_processor_consumers_share_one_sample():
+    from platesolve.solver import LocalAstrometryNetSolver
+    from processing.processor import VideoProcessor
+
+    cfg = _Cfg({"enabled": True, "poll_interval_s": 30.0, "max_age_s": 60.0})
+    vp = VideoProcessor(config=cfg)
+    vp.mount = _CountingMount()
+    vp.plate_solver = LocalAstrometryNetSolver(config=cfg)
+    vp._start_mount_telemetry()
+    try:
+        deadline = time.monotonic() + 5
+        while vp.mount_telemetry.latest is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert vp._mount_coordinates() == (10.0, 20.0)
+        assert vp._mount_is_tracking() is True and not vp._mount_is_slewing()
+        assert vp.plate_solver._mount_coordinates() == (10.0, 20.0)
+        assert vp.mount.calls["coordinates"] == 1
+
+        vp.video_capture = object()
+        assert vp._capture_gate_open() is True
+        vp.mount.slewing = True
+        vp.mount_telemetry.invalidate()
+        while not vp._mount_is_slewing() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert vp._capture_gate_open() is False
+    finally:
+        vp._stop_mount_telemetry()
+
+
+def test_rebuilt_solver_gets_mount_telemetry(monkeypatch):
+    import processing.processor as processor_mod
+    from processing.processor import VideoProcessor
+
+    class _Solver:
+        telemetry = None
+
+        def is_available(self) -> bool:
+            return True
+
+        def get_name(self) -> str:
+            return "fake"
+
+        def set_mount_telemetry(self, telemetry: Any) -> None:
+            self.telemetry = telemetry
+
+    class _AutoCfg(_Cfg):
+        def get_plate_solve_config(self) -> Dict[str, Any]:
+            return {"auto_solve": True, "default_solver": "astrometry_local"}
+
+    monkeypatch.setattr(
+        processor_mod.PlateSolverFactory, "create_solver", lambda *a, **k: _Solver()
+    )
+    vp = VideoProcessor(config=_AutoCfg({"enabled": False}))
+    vp.mount = _CountingMount()
+    vp._start_mount_telemetry()
+    try:
+        vp.refresh_plate_solve_settings()
+        assert vp.plate_solver.telemetry is vp.mount_telemetry is not None
+    finally:
+        vp._stop_mount_telemetry()
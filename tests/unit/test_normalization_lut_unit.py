@@ -0,0 +1,51 @@
+import numpy as np
+from processing.display_stats import LimitSmoother
+from processing.normalization import apply_lut, normalize_to_uint8, stretch_lut
+import pytest
+
+
+class _StubConfig:
+    def __init__(self, **norm) -> None:
+        self._norm = norm
+
+    def get_frame_processing_config(self):
+        return {"normalization": dict(self._norm)}
+
+
+def _render(image, **norm):
+    return normalize_to_uint8(image, _StubConfig(**norm), smoother=LimitSmoother(0.0))
+
+
+@pytest.mark.parametrize(
+    "method", ["zscale", "hist", "linear", "gamma", "log", "asinh", "planetary", "moon"]
+)
+@pytest.mark.parametrize("per_channel", [False, True])
+def test_lut_matches_float_path_uint16(method, per_channel):
+    rng = np.random.default_rng(7)
+    color = rng.normal(3000, 900, (64, 80, 3)).clip(0, 65535).astype(np.uint16)
+    mono = rng.gamma(2.0, 2500.0, (63, 81)).clip(0, 65535).astype(np.uint16)
+    for image in (color, mono):
+        fast = _render(image, method=method, per_channel=per_channel, use_lut=True)
+        slow = _render(image, method=method, per_channel=per_channel, use_lut=False)
+        assert fast.dtype == np.uint8 and fast.shape == image.shape
+        np.testing.assert_array_equal(fast, slow)
+
+
+def test_lut_matches_float_path_uint8_and_degenerate_window():
+    rng = np.random.default_rng(3)
+    image8 = rng.integers(0, 256, (40, 50, 3)).astype(np.uint8)
+    flat16 = np.full((20, 30, 3), 1234, dtype=np.uint16)
+    for image in (image8, flat16):
+        for method in ("linear", "asinh", "zscale"):
+            np.testing.assert_array_equal(
+                _render(image, method=method, use_lut=True),
+                _render(image, method=method, use_lut=False),
+            )
+
+
+def test_apply_lut_per_channel_tables():
+    image = np.arange(2 * 3 * 3, dtype=np.uint16).reshape(2, 3, 3) * 1000
+    tables = np.stack([stretch_lut(0, 20000), stretch_lut(5000, 10000), stretch_lut(0, 1)])
+    out = apply_lut(image, tables)
+    for c in range(3):
+        np.testing.assert_array_equal(out[:, :, c], tables[c][image[:, :, c]])
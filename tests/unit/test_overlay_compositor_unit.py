@@ -0,0 +1,88 @@
+from pathlib import Path
+from typing import Any, Dict
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+def _overlay(size=(200, 120)) -> Image.Image:
+    img = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([(10, 8), (70, 30)], fill=(255, 200, 0, 160))
+    draw.ellipse([(120, 60), (180, 110)], outline=(0, 255, 128, 255), width=3)
+    return img
+
+
+def test_blend_matches_alpha_composite_and_skips_transparent_tiles():
+    from overlay.compositor import OverlayCompositor, opaque_boxes
+
+    rng = np.random.default_rng(1)
+    base_rgb = rng.integers(0, 256, size=(120, 200, 3), dtype=np.uint8)
+    overlay = _overlay()
+
+    expected = np.asarray(
+        Image.alpha_composite(Image.fromarray(base_rgb).convert("RGBA"), overlay).convert("RGB")
+    )
+    compositor = OverlayCompositor(tile=16)
+    out = compositor.composite(np.ascontiguousarray(base_rgb[..., ::-1]), overlay)
+    assert np.abs(out[..., ::-1].astype(int) - expected.astype(int)).max() <= 1
+
+    boxes = opaque_boxes(np.asarray(overlay)[..., 3], tile=16)
+    covered = np.zeros((120, 200), dtype=bool)
+    for x0, y0, x1, y1 in boxes:
+        covered[y0:y1, x0:x1] = True
+    assert covered[np.asarray(overlay)[..., 3] > 0].all()
+    assert covered.mean() < 0.5
+    # Pixels outside the boxes are the base frame unchanged
+    assert (out[~covered] == base_rgb[..., ::-1][~covered]).all()
+
+    # Same overlay object: prepared once, output buffer reused; mono frames work too
+    prepared = compositor.prepare(overlay, (200, 120))
+    again = compositor.composite(np.full((120, 200), 40, dtype=np.uint8), overlay)
+    assert again is out and compositor.prepare(overlay, (200, 120)) is prepared
+    assert (again[0, 0] == 40).all()
+
+
+class _Cfg:
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {"auto_solve": False}
+
+    def get_mount_config(self) -> Dict[str, Any]:
+        return {"slewing_detection": {"enabled": False}}
+
+    def get_overlay_config(self) -> Dict[str, Any]:
+        return {
+            "combined_output": {
+                "enabled": True,
+                "resolution": [100, 100],
+                "mode": "letterbox",
+                "background_color": [0, 0, 255],
+            }
+        }
+
+
+def test_processor_composites_display_frame_in_memory(tmp_path):
+    from processing.processor import VideoProcessor
+
+    vp = VideoProcessor(config=_Cfg())
+    frame = np.full((120, 200, 3), 30, dtype=np.uint8)
+    out_path = tmp_path / "combined.jpg"
+
+    status = vp.composite_overlay(_overlay(), str(out_path), base=frame)
+    assert status.is_success and status.data == str(out_path)
+    assert status.details["output_size"] == (100, 100)
+    combined = vp.last_combined_image
+    assert combined is not None and combined.shape == (100, 100, 3)
+    # Letterbox bars in the configured RGB color (stored as BGR)
+    assert tuple(combined[0, 50]) == (255, 0, 0)
+    written = cv2.imread(str(out_path))
+    assert written is not None and written.shape == (100, 100, 3)
+
+    # Nothing written without an output path; no frame at all is an error
+    assert vp.composite_overlay(_overlay(), base=frame).data is None
+    assert not list(Path(tmp_path).glob("*.png"))
+    assert vp.composite_overlay(_overlay()).is_error
@@ -0,0 +1,75 @@
+import numpy as np
+
+
+def test_sky_layer_key_pixel_tolerance():
+    from overlay.layers import SkyLayerKey
+
+    key = SkyLayerKey(10.0, 20.0, 1.0, 0.5, 30.0, (1000, 500), options=(12.0, False))
+    # 1 px = 0.001 deg here
+    assert key.within(SkyLayerKey(10.0, 20.0005, 1.0, 0.5, 30.0, (1000, 500), (12.0, False)), 1.0)
+    assert not key.within(
+        SkyLayerKey(10.0, 20.005, 1.0, 0.5, 30.0, (1000, 500), (12.0, False)), 1.0
+    )
+    assert not key.within(SkyLayerKey(10.0, 20.0, 1.0, 0.5, 31.0, (1000, 500), (12.0, False)), 1.0)
+    assert not key.within(SkyLayerKey(10.0, 20.0, 1.0, 0.5, 30.0, (1000, 500), (12.0, True)), 1.0)
+
+
+def test_generator_reuses_layers_until_inputs_change(cfg_no_ui):
+    from overlay.generator import OverlayGenerator
+
+    gen = OverlayGenerator(config=cfg_no_ui)
+    gen.info_panel_enabled = True
+    gen.info_panel_config = {"show_timestamp": False, "show_coordinates": False}
+    gen.catalog_query_enabled = False
+    gen.secondary_fov_config = {"enabled": True}
+
+    first = gen.render_overlay(10.0, 20.0, 1.0, 0.75, image_size=(200, 150))
+    second = gen.render_overlay(10.0, 20.0001, 1.0, 0.75, image_size=(200, 150))
+    stats = gen.layers.stats()
+    assert stats["sky"] == {"hits": 1, "renders": 1}
+    assert stats["title"]["renders"] == 1 and stats["info_panel"]["renders"] == 1
+    assert second.size == (200, 150)
+
+    # Unchanged inputs: the composed overlay object itself is reused
+    assert gen.render_overlay(10.0, 20.0001, 1.0, 0.75, image_size=(200, 150)) is second
+
+    # New status line: only the info panel is redrawn
+    gen.render_overlay(10.0, 20.0, 1.0, 0.75, image_size=(200, 150), status_messages=["Slewing"])
+    assert gen.layers.stats()["info_panel"]["renders"] == 2
+    assert gen.layers.stats()["sky"]["renders"] == 1
+
+    # Pointing moved by several pixels, or a setting changed: sky redrawn
+    gen.render_overlay(10.0, 20.1, 1.0, 0.75, image_size=(200, 150))
+    gen.object_types = ["G"]
+    gen.render_overlay(10.0, 20.1, 1.0, 0.75, image_size=(200, 150))
+    assert gen.layers.stats()["sky"]["renders"] == 3
+
+    # Disabled cache renders the same image every time
+    gen.layers.enabled = False
+    gen.layers.invalidate()
+    uncached = gen.render_overlay(10.0, 20.0, 1.0, 0.75, image_size=(200, 150))
+    assert np.array_equal(np.asarray(uncached)[..., 3] > 0, np.asarray(first)[..., 3] > 0)
+
+
+def test_sky_layer_not_cached_after_failed_simbad_query(cfg_no_ui, fake_simbad, monkeypatch):
+    from overlay.generator import OverlayGenerator
+
+    calls = []
+    answer = fake_simbad.query_region
+
+    def _flaky(self, center, radius):
+        calls.append(center)
+        if len(calls) == 1:
+            raise ConnectionError("SIMBAD unreachable")
+        return answer(self, center, radius)
+
+    monkeypatch.setattr(fake_simbad, "query_region", _flaky)
+    gen = OverlayGenerator(config=cfg_no_ui)
+
+    gen.render_overlay(10.0, 20.0, 1.0, 0.75, image_size=(200, 150))
+    gen.render_overlay(10.0, 20.0, 1.0, 0.75, image_size=(200, 150))
+    # The failed query is retried; the successful one is then reused
+    gen.render_overlay(10.0, 20.0, 1.0, 0.75, image_size=(200, 150))
+    assert len(calls) == 2
+    assert gen.layers.stats()["sky"] == {"hits": 1, "renders": 2}
+    assert gen.last_objects_drawn == 1
@@ -26,3 +26,41 @@ def test_overlay_runner_start_stop(monkeypatch):
     assert status.is_success
     status = runner.stop_observation()
     assert status.is_success
+
+
+def test_in_memory_overlay_replaces_stale_file(tmp_path):
+    from overlay.runner import OverlayRunner
+    from PIL import Image
+    from status import error_status, success_status
+
+    overlay_file = str(tmp_path / "overlay.png")
+    frame_file = str(tmp_path / "frame.png")
+    Image.new("RGBA", (8, 8), (255, 0, 0, 255)).save(overlay_file)  # previous cycle
+    Image.new("RGB", (8, 8)).save(frame_file)
+    seen = []
+
+    class _VP:
+        def composite_overlay(self, image, combined_file):
+            return error_status("no display frame")
+
+        def get_latest_frame_path(self):
+            return frame_file
+
+        def combine_overlay_with_image(self, frame, overlay, combined):
+            with Image.open(overlay) as img:
+                seen.append(img.getpixel((0, 0)))
+            return success_status("ok")
+
+    runner = OverlayRunner(config=_Cfg())
+    runner.video_processor = _VP()
+    runner._remember_overlay_image(overlay_file, Image.new("RGBA", (8, 8), (0, 255, 0, 255)))
+
+    assert runner._combine_with_latest_frame(overlay_file, str(tmp_path / "c.png")).is_success
+    assert seen == [(0, 255, 0, 255)]
+
+    # Without a frame the combined output is the in-memory overlay, not the file
+    Image.new("RGBA", (8, 8), (255, 0, 0, 255)).save(overlay_file)
+    runner.video_processor = None
+    runner._write_combined(overlay_file, str(tmp_path / "c.png"))
+    with Image.open(tmp_path / "c.png") as img:
+        assert img.getpixel((0, 0)) == (0, 255, 0, 255)
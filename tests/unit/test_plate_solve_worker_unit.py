@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+from typing import Any, Dict, List
+
+
+def test_latest_frame_wins_while_solving():
+    from processing.solve_worker import PlateSolveWorker, SolveJob
+
+    release = threading.Event()
+    started = threading.Event()
+    solved: List[SolveJob] = []
+
+    def _solve(job: SolveJob) -> None:
+        started.set()
+        release.wait(5)
+        solved.append(job)
+
+    worker = PlateSolveWorker(_solve)
+    worker.start()
+    try:
+        worker.submit(SolveJob(capture_id=1, frame=None))
+        assert started.wait(5)
+        # Both arrive while capture 1 is solving; only the newer one is kept
+        assert worker.submit(SolveJob(capture_id=2, frame=None)) is None
+        replaced = worker.submit(SolveJob(capture_id=3, frame=None))
+        assert replaced is not None and replaced.capture_id == 2
+        release.set()
+        assert worker.wait_idle(5)
+    finally:
+        worker.stop()
+
+    assert [j.capture_id for j in solved] == [1, 3]
+    assert solved[1].queue_ms > 0
+    stats = worker.stats()
+    assert stats["submitted"] == 3 and stats["replaced"] == 1 and stats["solved"] == 2
+
+
+class _Cfg:
+    def __init__(self, dir_path: str):
+        self._dir = dir_path
+
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "save_plate_solve_frames": False,
+            "plate_solve_dir": self._dir,
+            "file_format": "PNG",
+            "use_timestamps": False,
+        }
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {
+            "default_solver": "platesolve2",
+            "auto_solve": True,
+            "min_solve_interval": 0,
+            "async_solve": True,
+        }
+
+    def get_mount_config(self) -> Dict[str, Any]:
+        return {"slewing_detection": {"enabled": False}}
+
+
+class _SlowSolver:
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.paths: List[str] = []
+
+    def is_available(self) -> bool:
+        return True
+
+    def get_name(self) -> str:
+        return "slow"
+
+    def cancel(self) -> None:
+        self.release.set()
+
+    def solve(self, path: str):
+        self.started.set()
+        self.release.wait(5)
+        self.paths.append(path)
+
+        class _S:
+            is_success = True
+            message = "ok"
+            data = {"ra_center": 10.0, "dec_center": 20.0, "fov_width": 1.0, "fov_height": 0.5}
+            details = {"solving_time": 0.1}
+
+        return _S()
+
+
+def test_processor_solves_in_background(tmp_path: Path):
+    from processing.processor import VideoProcessor
+
+    vp = VideoProcessor(config=_Cfg(str(tmp_path)))
+    solver = _SlowSolver()
+    vp.plate_solver = solver
+    results: List[Any] = []
+    vp.on_solve_result = results.append
+    vp._start_solve_worker()
+    try:
+        for i in (1, 2, 3):
+            image = tmp_path / f"capture_{i}.PNG"
+            image.write_bytes(b"x")
+            vp.capture_count = i
+            vp.solve_worker.submit(vp._solve_job(None, image))
+            assert solver.started.wait(5)
+        # Captures continue while capture 1 is solving; capture 2 was superseded
+        solver.release.set()
+        assert vp.solve_worker.wait_idle(5)
+    finally:
+        vp._stop_solve_worker()
+
+    assert [Path(p).name for p in solver.paths] == ["capture_1.PNG", "capture_3.PNG"]
+    assert len(results) == 2 and results[-1].ra_center == 10.0
+    assert not vp.solve_worker.is_running
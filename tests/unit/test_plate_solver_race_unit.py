@@ -0,0 +1,132 @@
+from pathlib import Path
+import sys
+import textwrap
+import time
+from typing import Any, Dict
+
+import pytest
+
+fits = pytest.importorskip("astropy.io.fits")
+
+# Hinted searches solve at once, blind ones (wide radius) hang until killed;
+# cloudy images fail right away
+_FAKE_SOLVE_FIELD = """
+import os, sys, time
+import astropy.io.fits as fits
+args = sys.argv[1:]
+out = args[args.index("--dir") + 1]
+base = os.path.splitext(os.path.basename(args[-1]))[0]
+if "cloudy" in base:
+    print("Did not solve (or no WCS file was written).")
+    sys.exit(0)
+if float(args[args.index("--radius") + 1]) > 5:
+    time.sleep(60)
+hdr = fits.Header()
+for key, value in (("CTYPE1", "RA---TAN"), ("CTYPE2", "DEC--TAN"), ("CRVAL1", 83.8),
+                   ("CRVAL2", -5.4), ("CRPIX1", 50.0), ("CRPIX2", 40.0),
+                   ("CD1_1", -0.001), ("CD1_2", 0.0), ("CD2_1", 0.0), ("CD2_2", 0.001),
+                   ("IMAGEW", 100), ("IMAGEH", 80)):
+    hdr[key] = value
+fits.PrimaryHDU(header=hdr).writeto(os.path.join(out, base + ".new"), overwrite=True)
+"""
+
+
+class _Cfg:
+    def __init__(self, root: Path) -> None:
+        script = root / "solve-field"
+        script.write_text(f"#!{sys.executable}\n" + textwrap.dedent(_FAKE_SOLVE_FIELD))
+        script.chmod(0o755)
+        self.script = str(script)
+        self.root = root
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {
+            "astrometry_local": {
+                "solve_field_path": self.script,
+                "working_directory": str(self.root / "out"),
+                "use_bash": False,
+                "timeout": 60,
+            },
+            "race": {
+                "timeout": 30,
+                "entries": [
+                    {
+                        "solver": "astrometry_local",
+                        "name": "blind",
+                        "overrides": {"search_radius_deg": 30.0},
+                    },
+                    {
+                        "solver": "astrometry_local",
+                        "name": "hinted",
+                        "overrides": {"search_radius_deg": 1.0},
+                    },
+                ],
+            },
+        }
+
+    def get_camera_config(self) -> Dict[str, Any]:
+        return {"pixel_size": 3.76}
+
+    def get_telescope_config(self) -> Dict[str, Any]:
+        return {"focal_length": 500.0}
+
+
+def _image(path: Path) -> str:
+    hdr = fits.Header()
+    hdr["RA"] = 83.8
+    hdr["DEC"] = -5.4
+    fits.PrimaryHDU(data=None, header=hdr).writeto(path)
+    return str(path)
+
+
+def test_race_returns_first_success_and_cancels_the_rest(tmp_path: Path):
+    from platesolve.race import RacingPlateSolver
+    from platesolve.solver import PlateSolverFactory
+
+    solver = PlateSolverFactory.create_solver("race", config=_Cfg(tmp_path))
+    assert isinstance(solver, RacingPlateSolver)
+    try:
+        # Same solver type: each entry writes to its own directory
+        assert {e.solver.working_directory for e in solver.entries} == {
+            str(tmp_path / "out" / "blind"),
+            str(tmp_path / "out" / "hinted"),
+        }
+        t0 = time.monotonic()
+        status = solver.solve(_image(tmp_path / "frame.fits"))
+        assert status.is_success, status.message
+        assert status.details["race_winner"] == "hinted"
+        assert status.data["ra_center"] == pytest.approx(83.8)
+        # The blind entry is killed instead of running into its 60s sleep
+        blind = solver.entries[0]
+        blind.future.result(timeout=10)
+        assert time.monotonic() - t0 < 15
+
+        stats = solver.get_stats()
+        assert stats["hinted"]["wins"] == 1 and stats["blind"]["cancelled"] == 1
+        # The winner is launched first from now on
+        assert solver.ordered_entries()[0].name == "hinted"
+
+        failed = solver.solve(_image(tmp_path / "cloudy.fits"))
+        assert not failed.is_success
+        assert set(failed.details["race_failures"]) == {"blind", "hinted"}
+    finally:
+        solver.close()
+
+
+def test_race_entries_get_own_directories_without_configured_one(tmp_path: Path):
+    from platesolve.solver import PlateSolverFactory
+
+    class _DefaultDirCfg(_Cfg):
+        def get_plate_solve_config(self) -> Dict[str, Any]:
+            cfg = super().get_plate_solve_config()
+            del cfg["astrometry_local"]["working_directory"]
+            cfg["race"]["entries"].append({"solver": "astrometry_local", "name": "hinted"})
+            return cfg
+
+    solver = PlateSolverFactory.create_solver("race", config=_DefaultDirCfg(tmp_path))
+    try:
+        dirs = [e.solver.working_directory for e in solver.entries]
+        assert len(set(dirs)) == 3
+        assert all(Path(d).parent == Path("astrometry_output") for d in dirs)
+    finally:
+        solver.close()
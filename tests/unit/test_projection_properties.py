@@ -1,3 +1,4 @@
+import numpy as np
 from overlay.projection import skycoord_to_pixel_with_rotation
 
 
@@ -44,3 +45,45 @@ def test_position_angle_rotates_quadrants():
     assert y0 < height // 2
     # For PA=90 deg, rotation should move that offset primarily into +X direction
     assert x90 > width // 2
+
+
+def test_batch_projection_known_offsets():
+    from overlay.projection import radec_to_pixel_arrays
+
+    # 640x480 px over 2.0 x 1.5 deg: 0.1875 arcmin per pixel on both axes
+    cos_dec = np.cos(np.deg2rad(20.0))
+    ras = np.array([10.0, 10.0, 10.0 + 0.1 / cos_dec, np.nan])
+    decs = np.array([20.0, 20.1, 20.0, 20.0])
+    xs, ys = radec_to_pixel_arrays(ras, decs, 10.0, 20.0, (640, 480), 2.0, 1.5, 0.0)
+    # Center, 6' north (32 px up), 6' east (32 px left with RA increasing left)
+    np.testing.assert_allclose(xs[:3], [320.0, 320.0, 288.0], atol=1e-9)
+    np.testing.assert_allclose(ys[:3], [240.0, 208.0, 240.0], atol=1e-9)
+    assert np.isnan(xs[3]) and np.isnan(ys[3])
+
+    # PA=90 moves the northern offset into +X; flip_x mirrors about the width
+    xs, ys = radec_to_pixel_arrays(
+        ras[:2], decs[:2], 10.0, 20.0, (640, 480), 2.0, 1.5, 90.0, flip_x=True
+    )
+    np.testing.assert_allclose(xs, [320.0, 640.0 - 352.0], atol=1e-9)
+    np.testing.assert_allclose(ys, [240.0, 240.0], atol=1e-9)
+
+
+def test_batch_wcs_projection_matches_astropy_scalar():
+    from astropy.coordinates import SkyCoord
+    import astropy.units as u
+    from overlay.projection import build_projection_wcs, radec_to_pixel_arrays_wcs
+
+    ras = np.array([10.0, 10.2, 9.7, 10.0])
+    decs = np.array([20.0, 20.1, 19.8, 20.0 + 9.0 / 3600.0])
+    w, size = build_projection_wcs(10.0, 20.0, (640, 480), 9.0, position_angle_deg=15.0)
+    xs, ys = radec_to_pixel_arrays_wcs(ras, decs, w, size, flip_x=True)
+    for ra, dec, x, y in zip(ras, decs, xs, ys, strict=True):
+        ref_x, ref_y = w.world_to_pixel(SkyCoord(ra * u.deg, dec * u.deg, frame="icrs"))
+        assert abs(x - (640.0 - float(ref_x))) < 1e-6
+        assert abs(y - float(ref_y)) < 1e-6
+
+    # The center lands on CRPIX (0-based 319.5, 239.5), mirrored in X
+    assert abs(xs[0] - 320.5) < 1e-6 and abs(ys[0] - 239.5) < 1e-6
+    # One pixel scale north moves one pixel, rotated by PA=15 deg
+    step = np.hypot(xs[3] - xs[0], ys[3] - ys[0])
+    assert abs(step - 1.0) < 1e-3
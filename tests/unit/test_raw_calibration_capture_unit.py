@@ -0,0 +1,175 @@
+from pathlib import Path
+import time
+import types
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+fits = pytest.importorskip("astropy.io.fits")
+
+
+class _StubConfig:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"enabled": True, "output_dir": str(self.root / "captured")}
+
+    def get_camera_config(self) -> Dict[str, Any]:
+        return {
+            "camera_type": "alpaca",
+            "alpaca": {"gain": 120, "binning": [1, 1]},
+            "cooling": {"enable_cooling": False},
+        }
+
+    def get_dark_config(self) -> Dict[str, Any]:
+        return {"output_dir": str(self.root / "darks"), "num_darks": 3, "min_exposure": 0.001}
+
+
+class _FakeCamera:
+    """Returns (NumX, NumY)-shaped frames like ASCOM/Alpaca ImageArray."""
+
+    ccd_temperature = -10.0
+    cooler_on = True
+
+    def __init__(self, readout_s: float = 0.0) -> None:
+        self.readout_s = readout_s
+        self.exposures = 0
+
+    def start_exposure(self, exposure_time_s: float, light: bool = True) -> None:
+        self.exposures += 1
+
+    def wait_for_image_ready(self, timeout_s: float) -> bool:
+        return True
+
+    def get_image_array(self):
+        time.sleep(self.readout_s)
+        return np.full((8, 6), 1000 + self.exposures, dtype=np.uint16)
+
+
+def _video_capture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, camera: _FakeCamera):
+    from capture.controller import VideoCapture
+
+    monkeypatch.setattr(
+        VideoCapture, "_initialize_camera", lambda self: types.SimpleNamespace(is_success=True)
+    )
+    vc = VideoCapture(config=_StubConfig(tmp_path), enable_calibration=False)
+    vc.camera = camera
+    return vc
+
+
+def test_raw_series_writes_undebayered_fits(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from capture.controller import VideoCapture
+
+    def _no_processing(self, acquired):
+        raise AssertionError("raw series must not calibrate or debayer")
+
+    monkeypatch.setattr(VideoCapture, "process_raw_frame", _no_processing)
+    vc = _video_capture(tmp_path, monkeypatch, _FakeCamera())
+    paths = [str(tmp_path / "darks" / f"bias_{i:03d}.fits") for i in range(3)]
+
+    status = vc.capture_raw_series(0.001, paths, gain=120)
+
+    assert status.is_success and status.data == paths
+    assert status.details["captured"] == 3 and status.details["failed"] == 0
+    for i, path in enumerate(paths):
+        with fits.open(path) as hdul:
+            data = hdul[0].data
+            header = hdul[0].header
+        # Long side horizontal, like frames saved through save_frame()
+        assert data.shape == (6, 8) and data.dtype == np.uint16
+        assert int(data[0, 0]) == 1001 + i
+        assert header["EXPTIME"] == pytest.approx(0.001)
+        assert header["GAIN"] == 120
+        assert header["CCD-TEMP"] == pytest.approx(-10.0)
+        assert header["COOLERON"] is True
+
+
+def test_raw_series_overlaps_writes_with_readout(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from services.frame_writer import FrameWriter
+
+    original = FrameWriter.save_raw_fits
+
+    def _slow_save(self, image_data, filename, metadata=None):
+        time.sleep(0.05)
+        return original(self, image_data, filename, metadata)
+
+    monkeypatch.setattr(FrameWriter, "save_raw_fits", _slow_save)
+    vc = _video_capture(tmp_path, monkeypatch, _FakeCamera(readout_s=0.05))
+    paths = [str(tmp_path / f"flat_{i:03d}.fits") for i in range(8)]
+
+    t0 = time.perf_counter()
+    status = vc.capture_raw_series(0.001, paths)
+    elapsed = time.perf_counter() - t0
+
+    assert status.details["captured"] == 8
+    # Serial readout + write would take >= 0.8 s
+    assert elapsed < 0.7
+
+
+def test_raw_series_fails_when_no_frame_is_saved(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    class _BrokenCamera(_FakeCamera):
+        def wait_for_image_ready(self, timeout_s: float) -> bool:
+            return False
+
+    vc = _video_capture(tmp_path, monkeypatch, _BrokenCamera())
+    paths = [str(tmp_path / f"dark_{i:03d}.fits") for i in range(2)]
+
+    status = vc.capture_raw_series(0.001, paths)
+
+    assert not status.is_success
+    assert status.details["captured"] == 0 and status.details["failed"] == 2
+
+
+def test_raw_series_blocks_instead_of_dropping(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from services.frame_writer import FrameWriter
+
+    class _DropConfig(_StubConfig):
+        def get_frame_processing_config(self) -> Dict[str, Any]:
+            cfg = super().get_frame_processing_config()
+            cfg["async_writer"] = {"full_policy": "drop", "block_timeout_s": 0.0}
+            return cfg
+
+    original = FrameWriter.save_raw_fits
+
+    def _slow_save(self, image_data, filename, metadata=None):
+        time.sleep(0.05)
+        return original(self, image_data, filename, metadata)
+
+    monkeypatch.setattr(FrameWriter, "save_raw_fits", _slow_save)
+    vc = _video_capture(tmp_path, monkeypatch, _FakeCamera())
+    vc.config = _DropConfig(tmp_path)
+    paths = [str(tmp_path / f"flat_{i:03d}.fits") for i in range(6)]
+
+    status = vc.capture_raw_series(0.001, paths, max_pending=1)
+
+    # The display writer's drop policy must not discard calibration frames
+    assert status.is_success and status.data == paths
+
+
+def test_dark_series_uses_raw_capture(tmp_path: Path):
+    from calibration.dark_capture import DarkCapture
+
+    calls = []
+
+    def _capture_raw_series(exposure_time_s, paths, gain=None, binning=1):
+        calls.append((exposure_time_s, list(paths), gain, binning))
+        return types.SimpleNamespace(
+            is_success=True,
+            message="ok",
+            data=list(paths),
+            details={"elapsed_s": 0.1, "frames_per_s": 30.0},
+        )
+
+    dc = DarkCapture(config=_StubConfig(tmp_path))
+    dc.video_capture = types.SimpleNamespace(
+        camera_type="alpaca", capture_raw_series=_capture_raw_series
+    )
+    status = dc._capture_dark_series(0.001)
+
+    assert status.is_success and status.details["captured_count"] == 3
+    ((exposure, paths, gain, binning),) = calls
+    assert exposure == 0.001 and gain == 120 and binning == [1, 1]
+    assert all(Path(p).name.startswith("bias_") for p in paths)
+    assert all(Path(p).parent.name == "exp_0.001s" for p in paths)
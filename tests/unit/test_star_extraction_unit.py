@@ -0,0 +1,154 @@
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+fits = pytest.importorskip("astropy.io.fits")
+pytest.importorskip("cv2")
+
+
+def _star_field(stars, shape=(400, 600), sigma=1.6, seed=0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[: shape[0], : shape[1]]
+    image = rng.normal(1000.0, 10.0, shape)
+    for x, y, amp in stars:
+        image += amp * np.exp(-((xx - x) ** 2 + (yy - y) ** 2) / (2 * sigma**2))
+    return image.astype(np.uint16)
+
+
+def test_extract_sources_centroids_and_flux_order():
+    from platesolve.star_extraction import extract_sources
+
+    stars = [(100.3, 50.7, 800.0), (420.6, 300.2, 3000.0), (250.1, 180.9, 1500.0)]
+    sources = extract_sources(_star_field(stars), max_sources=10)
+
+    assert sources.shape == (3, 3)
+    # Brightest first
+    expected = sorted(stars, key=lambda s: -s[2])
+    for (x, y, _), row in zip(expected, sources, strict=True):
+        assert row[0] == pytest.approx(x, abs=0.1)
+        assert row[1] == pytest.approx(y, abs=0.1)
+    assert list(sources[:, 2]) == sorted(sources[:, 2], reverse=True)
+
+    assert len(extract_sources(_star_field(stars), max_sources=2)) == 2
+
+
+def test_extract_sources_excludes_center_and_discs():
+    from platesolve.star_extraction import extract_sources
+
+    image = _star_field([(60.0, 60.0, 2000.0), (300.0, 200.0, 5000.0)]).astype(np.float32)
+    # A saturated planet disc larger than a mesh box is rejected
+    yy, xx = np.mgrid[:400, :600]
+    image[(xx - 480) ** 2 + (yy - 300) ** 2 < 50**2] = 60000.0
+
+    sources = extract_sources(image, mesh_size=64)
+    assert len(sources) == 2
+    centered = extract_sources(image, mesh_size=64, exclude_center=0.2)
+    assert len(centered) == 1 and centered[0][0] == pytest.approx(60.0, abs=0.1)
+
+
+def test_xylist_round_trip(tmp_path: Path):
+    from platesolve.star_extraction import read_xylist_size, write_xylist
+
+    sources = np.array([[10.0, 20.0, 500.0], [30.5, 40.5, 100.0]])
+    path = str(tmp_path / "stars.xyls")
+    write_xylist(path, sources, 600, 400, header={"RA": 83.8, "DEC": None})
+
+    assert read_xylist_size(path) == (600, 400)
+    with fits.open(path) as hdul:
+        assert hdul[0].header["RA"] == 83.8 and "DEC" not in hdul[0].header
+        table = hdul[1].data
+        # astrometry.net uses 1-based pixel coordinates
+        assert list(table["X"]) == [11.0, 31.5]
+        assert list(table["Y"]) == [21.0, 41.5]
+        assert list(table["FLUX"]) == [500.0, 100.0]
+    assert read_xylist_size(str(tmp_path / "missing.xyls")) is None
+
+
+class _Cfg:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {
+            "astrometry_local": {
+                "solve_field_path": "solve-field",
+                "working_directory": str(self.root / "out"),
+                "use_bash": False,
+                "downsample": 4,
+            }
+        }
+
+    def get_camera_config(self) -> Dict[str, Any]:
+        return {"pixel_size": 3.76}
+
+    def get_telescope_config(self) -> Dict[str, Any]:
+        return {"focal_length": 500.0}
+
+
+def test_solver_command_for_xylist(tmp_path: Path):
+    from platesolve.solver import LocalAstrometryNetSolver
+    from platesolve.star_extraction import write_xylist
+
+    path = str(tmp_path / "solve_0001.xyls")
+    write_xylist(path, np.array([[10.0, 20.0, 500.0]]), 600, 400, header={"RA": 10.0})
+    solver = LocalAstrometryNetSolver(config=_Cfg(tmp_path))
+
+    cmd, result_path = solver._build_command(path, 10.0, None, 1.55)
+
+    assert "--fits-image" not in cmd and "--downsample" not in cmd
+    assert cmd[cmd.index("--width") + 1] == "600"
+    assert cmd[cmd.index("--height") + 1] == "400"
+    assert cmd[cmd.index("--sort-column") + 1] == "FLUX"
+    assert str(result_path).endswith("solve_0001.wcs")
+
+
+class _ProcessorCfg(_Cfg):
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"enabled": True, "plate_solve_dir": str(self.root), "use_timestamps": False}
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        cfg = super().get_plate_solve_config()
+        cfg["astrometry_local"].update(extract_stars=True, mask_center_on_solve=False)
+        cfg.update(default_solver="astrometry_local", auto_solve=True, min_solve_interval=0)
+        return cfg
+
+    def get_mount_config(self) -> Dict[str, Any]:
+        return {"slewing_detection": {"enabled": False}}
+
+
+def test_processor_solves_extracted_star_list(tmp_path: Path):
+    from processing.processor import VideoProcessor
+
+    solved = []
+
+    class _Solver:
+        def is_available(self) -> bool:
+            return True
+
+        def get_name(self) -> str:
+            return "fake"
+
+        def solve(self, path: str):
+            with fits.open(path) as hdul:
+                solved.append((path, hdul[0].header["IMAGEW"], len(hdul[1].data)))
+
+            class _S:
+                is_success = False
+                message = "no match"
+                details: Dict[str, Any] = {}
+
+            return _S()
+
+    vp = VideoProcessor(config=_ProcessorCfg(tmp_path))
+    vp.plate_solver = _Solver()
+    vp.solver_type = "astrometry_local"
+    vp.last_frame = _star_field([(100.0, 50.0, 800.0), (420.0, 300.0, 3000.0)])
+
+    vp._maybe_plate_solve(fits_filename=None, frame_filename=None)
+
+    assert len(solved) == 1 and solved[0][0].endswith(".xyls")
+    assert solved[0][1:] == (600, 2)
+    # The star list is removed once the solve is done
+    assert not Path(solved[0][0]).exists()
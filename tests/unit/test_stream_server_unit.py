@@ -0,0 +1,104 @@
+import json
+import socket
+import time
+import urllib.error
+import urllib.request
+
+import cv2
+import numpy as np
+import pytest
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((40, 60, 3), value, dtype=np.uint8)
+
+
+def _read_until(sock: socket.socket, marker: bytes, data: bytes = b"") -> bytes:
+    deadline = time.time() + 5
+    while marker not in data and time.time() < deadline:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+@pytest.fixture
+def server():
+    from services.stream_server import FrameHub, StreamServer
+
+    srv = StreamServer(FrameHub(jpeg_quality=90), port=0, max_fps=0, keepalive_s=0.2)
+    srv.start()
+    yield srv
+    srv.stop()
+    assert not srv.is_running
+
+
+def test_snapshot_and_mjpeg_share_one_encoding(server):
+    base = f"http://127.0.0.1:{server.port}"
+    with pytest.raises(urllib.error.HTTPError) as err:
+        urllib.request.urlopen(f"{base}/snapshot.jpg", timeout=5)
+    assert err.value.code == 503
+
+    # Frames published while nobody watches are dropped unencoded; the latest wins
+    for value in (10, 20, 30):
+        server.hub.publish_frame(_frame(value))
+    with urllib.request.urlopen(f"{base}/snapshot.jpg", timeout=5) as resp:
+        assert resp.headers["Content-Type"] == "image/jpeg"
+        image = cv2.imdecode(np.frombuffer(resp.read(), np.uint8), cv2.IMREAD_COLOR)
+    assert image.shape == (40, 60, 3) and abs(int(image.mean()) - 30) <= 2
+    assert server.hub.stats()["encodes"] == 1
+
+    with socket.create_connection(("127.0.0.1", server.port), timeout=5) as sock:
+        sock.sendall(b"GET /stream.mjpg HTTP/1.1\r\nHost: x\r\n\r\n")
+        data = _read_until(sock, b"\xff\xd9")
+        assert b"multipart/x-mixed-replace; boundary=frame" in data
+        # The already encoded frame is sent as is
+        assert server.hub.stats()["encodes"] == 1
+        server.hub.publish_frame(_frame(200))
+        data = _read_until(sock, b"\xff\xd9", data.split(b"\xff\xd9", 1)[1])
+        assert data.count(b"--frame\r\n") == 1
+    assert server.hub.stats()["encodes"] == 2
+
+    with urllib.request.urlopen(f"{base}/", timeout=5) as resp:
+        assert b"/stream.mjpg" in resp.read()
+    with pytest.raises(urllib.error.HTTPError) as err:
+        urllib.request.urlopen(f"{base}/missing", timeout=5)
+    assert err.value.code == 404
+
+
+def test_events_replay_latest_and_stream_new(server):
+    server.hub.publish_event("solve", {"ra_deg": 10.0})
+    server.hub.publish_event("solve", {"ra_deg": 11.0})
+    with socket.create_connection(("127.0.0.1", server.port), timeout=5) as sock:
+        sock.sendall(b"GET /events HTTP/1.1\r\nHost: x\r\n\r\n")
+        data = _read_until(sock, b"event: solve")
+        data = _read_until(sock, b"\n\n", data.split(b"event: solve", 1)[1])
+        assert json.loads(data.split(b"data: ", 1)[1].split(b"\n", 1)[0]) == {"ra_deg": 11.0}
+
+        server.hub.publish_event("telemetry", {"slewing": False})
+        data = _read_until(sock, b'{"slewing": false}')
+        assert b"event: telemetry" in data
+        assert b": keepalive" in _read_until(sock, b": keepalive")
+
+
+def test_event_encode_splits_multiline_data():
+    from services.stream_server import StreamEvent
+
+    encoded = StreamEvent(event="log", data="first\nsecond\n", id=3).encode()
+    assert encoded == b"id: 3\nevent: log\ndata: first\ndata: second\ndata: \n\n"
+
+
+def test_factory_disabled_by_default():
+    from services.stream_server import create_stream_server
+
+    class _Cfg:
+        def __init__(self, overlay):
+            self.overlay = overlay
+
+        def get_overlay_config(self):
+            return self.overlay
+
+    assert create_stream_server(_Cfg({})) is None
+    srv = create_stream_server(_Cfg({"stream_server": {"enabled": True, "port": 0}}))
+    assert srv is not None and srv.port == 0 and not srv.is_running
@@ -0,0 +1,130 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+from calibration.tile_combiner import TileCombiner, describe_frame, reduce_stack
+import numpy as np
+import pytest
+
+fits = pytest.importorskip("astropy.io.fits")
+
+
+def _write_frames(tmp_path: Path, frames: np.ndarray) -> List[str]:
+    paths = []
+    for i, frame in enumerate(frames):
+        path = tmp_path / f"frame_{i:03d}.fits"
+        fits.PrimaryHDU(frame).writeto(path)  # uint16 is stored with BZERO=32768
+        paths.append(str(path))
+    return paths
+
+
+def _frames(n=7, shape=(37, 23), seed=11) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    frames = rng.normal(1000, 30, (n,) + shape)
+    if n > 2:
+        frames[2, 5, 7] = 60000  # cosmic ray in one frame
+    return frames.clip(0, 65535).astype(np.uint16)
+
+
+def _welford_sigma_clip(stack: np.ndarray, sigma: float) -> np.ndarray:
+    # Reference: the previous two-pass streaming implementation
+    n = 0
+    mean = np.zeros(stack.shape[1:])
+    m2 = np.zeros(stack.shape[1:])
+    for arr in stack:
+        n += 1
+        delta = arr - mean
+        mean += delta / n
+        m2 += delta * (arr - mean)
+    std = np.sqrt(np.maximum(m2 / max(n - 1, 1), 0.0))
+    mask = np.abs(stack - mean) <= sigma * std
+    return (np.where(mask, stack, 0.0).sum(axis=0) / np.maximum(mask.sum(axis=0), 1)).astype(
+        np.float32
+    )
+
+
+def test_describe_frame_reads_scaled_rows(tmp_path: Path):
+    frames = _frames(n=1)
+    (path,) = _write_frames(tmp_path, frames)
+    layout = describe_frame(path)
+    assert layout.shape == frames.shape[1:] and layout.bzero == 32768.0
+    np.testing.assert_array_equal(layout.read_rows(3, 9), frames[0, 3:9].astype(np.float32))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("method", ["mean", "median", "minmax", "sigma_clip"])
+def test_tiles_match_full_frame_reference(tmp_path: Path, method: str, workers: int):
+    frames = _frames()
+    stack = frames.astype(np.float32)
+    paths = _write_frames(tmp_path, frames)
+    # Tiny memory cap forces several tiles
+    combiner = TileCombiner(method, sigma=2.5, max_memory_mb=0.01, workers=workers)
+    assert combiner.rows_per_tile(len(paths), frames.shape[1:]) < frames.shape[1]
+    combined = combiner.combine(paths)
+    assert combined is not None and combined.dtype == np.float32
+    expected = {
+        "mean": stack.mean(axis=0),
+        "median": np.median(stack, axis=0),
+        "minmax": np.sort(stack, axis=0)[1:-1].mean(axis=0),
+        "sigma_clip": _welford_sigma_clip(stack.astype(np.float64), 2.5),
+    }[method]
+    np.testing.assert_allclose(combined, expected, rtol=1e-6)
+
+
+def test_dark_subtraction_and_clipped_estimators(tmp_path: Path):
+    frames = _frames(n=9)
+    dark = np.full(frames.shape[1:], 100.0, dtype=np.float32)
+    paths = _write_frames(tmp_path, frames)
+    clean = np.median(np.delete(frames[:, 5, 7], 2).astype(np.float32))
+    for method in ("sigma_clip_median", "winsorized"):
+        combined = TileCombiner(method, sigma=3.0, workers=1).combine(paths, subtract=dark)
+        assert combined is not None
+        # The 60000 outlier is rejected (median) or clamped (winsorized)
+        assert abs(combined[5, 7] - (clean - 100.0)) < 100.0
+    median = TileCombiner("median", workers=1).combine(paths, subtract=dark)
+    np.testing.assert_allclose(median, np.median(frames.astype(np.float32), axis=0) - 100.0)
+
+
+def test_mismatched_and_unreadable_files_are_skipped(tmp_path: Path):
+    frames = _frames(n=3)
+    paths = _write_frames(tmp_path, frames)
+    odd = tmp_path / "odd.fits"
+    fits.PrimaryHDU(np.zeros((5, 5), dtype=np.uint16)).writeto(odd)
+    broken = tmp_path / "broken.fits"
+    broken.write_bytes(b"not a fits file")
+    combined = TileCombiner("mean", workers=1).combine(paths + [str(odd), str(broken)])
+    np.testing.assert_allclose(combined, frames.astype(np.float32).mean(axis=0), rtol=1e-6)
+    assert TileCombiner("mean", workers=1).combine([str(broken)]) is None
+
+
+def test_reduce_stack_falls_back_for_small_stacks():
+    stack = np.array([[[1.0, 2.0]], [[3.0, 6.0]]], dtype=np.float32)
+    for method in ("minmax", "winsorized", "sigma_clip"):
+        np.testing.assert_allclose(reduce_stack(stack, method), [[2.0, 4.0]])
+
+
+class _MasterConfig:
+    def __init__(self, out_dir: str) -> None:
+        self._out = out_dir
+
+    def get_dark_config(self) -> Dict[str, Any]:
+        return {}
+
+    def get_flat_config(self) -> Dict[str, Any]:
+        return {}
+
+    def get_master_config(self) -> Dict[str, Any]:
+        return {"output_dir": self._out, "combine_workers": 1, "combine_memory_mb": 1}
+
+
+def test_master_frame_creator_uses_tile_combiner(tmp_path: Path):
+    from calibration.master_frame_builder import MasterFrameCreator
+
+    frames = _frames(n=5)
+    paths = _write_frames(tmp_path, frames)
+    creator = MasterFrameCreator(config=_MasterConfig(str(tmp_path / "masters")))
+    dark = creator._combine_frames_streaming_files(paths, "dark_1.000s", "sigma_clip", 3.0)
+    np.testing.assert_allclose(dark, _welford_sigma_clip(frames.astype(np.float64), 3.0), rtol=1e-6)
+    flat = creator._combine_flats_with_dark_streaming(paths, dark, "flat_1.000s", "minmax", 3.0)
+    expected = np.sort(frames.astype(np.float32) - dark, axis=0)[1:-1].mean(axis=0)
+    np.testing.assert_allclose(flat, expected, rtol=1e-5, atol=1e-3)
+    assert creator.get_status()["combine_workers"] == 1
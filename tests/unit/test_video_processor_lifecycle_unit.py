@@ -118,3 +118,47 @@ def test_slewing_wait_mode_then_capture(tmp_path, monkeypatch):
     vp._capture_and_solve()
     # After waiting completes, capture proceeds
     assert vp.capture_count == 1
+
+
+def test_replaced_and_stopped_solvers_are_closed(tmp_path, monkeypatch):
+    import processing.processor as processor_mod
+    from processing.processor import VideoProcessor
+
+    class _Solver:
+        def __init__(self) -> None:
+            self.closed = 0
+
+        def is_available(self) -> bool:
+            return True
+
+        def get_name(self) -> str:
+            return "fake"
+
+        def close(self) -> None:
+            self.closed += 1
+
+    class _AutoCfg(_CfgBase):
+        def get_plate_solve_config(self) -> Dict[str, Any]:
+            return {"default_solver": "astrometry_local", "auto_solve": True}
+
+    created: list[_Solver] = []
+
+    def _create(*_a, **_k):
+        created.append(_Solver())
+        return created[-1]
+
+    monkeypatch.setattr(processor_mod.PlateSolverFactory, "create_solver", _create)
+    vp = VideoProcessor(config=_AutoCfg(str(tmp_path), wait_for_completion=False))
+    vp.video_capture = _FakeCapture(tmp_path / "cap.png")
+
+    # Every reload replaces the solver; the old one must release its processes
+    for _ in range(3):
+        vp.refresh_plate_solve_settings()
+    assert [s.closed for s in created] == [1, 1, 0]
+
+    vp.stop_processing_only()
+    assert created[-1].closed == 1 and vp.plate_solver is None
+
+    vp.refresh_plate_solve_settings()
+    vp.stop()
+    assert created[-1].closed == 1 and vp.plate_solver is None
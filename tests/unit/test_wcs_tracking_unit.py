@@ -0,0 +1,190 @@
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pytest
+
+fits = pytest.importorskip("astropy.io.fits")
+pytest.importorskip("cv2")
+
+
+def _stars(n: int = 60, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    stars = np.column_stack(
+        [rng.uniform(20, 580, n), rng.uniform(20, 380, n), rng.uniform(500, 5000, n)]
+    )
+    return stars[np.argsort(-stars[:, 2])]
+
+
+def _move(stars: np.ndarray, dx: float, dy: float, rot_deg: float) -> np.ndarray:
+    a = np.exp(1j * np.radians(rot_deg))
+    z = a * (stars[:, 0] + 1j * stars[:, 1]) + complex(dx, dy)
+    return np.column_stack([z.real, z.imag, stars[:, 2]])
+
+
+def _wcs():
+    from astropy.wcs import WCS
+
+    w = WCS(naxis=2)
+    w.wcs.ctype = ["RA---TAN", "DEC--TAN"]
+    w.wcs.crval = [83.8, -5.4]
+    w.wcs.crpix = [300.5, 200.5]
+    w.wcs.cd = np.array([[-0.0005, 0.0], [0.0, 0.0005]])
+    return w
+
+
+def test_match_recovers_shift_and_rotation():
+    from platesolve.tracking import match_star_lists
+
+    ref = _stars()
+    cur = _move(ref, 12.3, -7.8, 0.4)[5:]  # some reference stars lost
+    transform = match_star_lists(ref, cur, min_matches=8)
+
+    assert transform is not None and transform.matches >= 30
+    assert transform.b.real == pytest.approx(12.3, abs=0.01)
+    assert transform.b.imag == pytest.approx(-7.8, abs=0.01)
+    assert transform.rotation_deg == pytest.approx(0.4, abs=0.001)
+    assert transform.scale == pytest.approx(1.0, abs=1e-6)
+
+    assert match_star_lists(ref, _stars(seed=1), min_matches=8) is None
+
+
+def test_transform_wcs_keeps_stars_on_the_sky():
+    from platesolve.tracking import match_star_lists, transform_wcs
+
+    ref = _stars()
+    cur = _move(ref, 25.0, 4.0, -0.3)
+    transform = match_star_lists(ref, cur)
+    ref_wcs = _wcs()
+    cur_wcs = transform_wcs(ref_wcs, transform)
+
+    sky_ref = ref_wcs.pixel_to_world_values(ref[:, 0], ref[:, 1])
+    sky_cur = cur_wcs.pixel_to_world_values(cur[:, 0], cur[:, 1])
+    assert np.allclose(sky_ref, sky_cur, atol=1e-7)
+
+
+def test_tracker_drift_and_age_limits():
+    from platesolve.solver import PlateSolveResult
+    from platesolve.tracking import WcsTracker
+
+    ref = _stars()
+    result = PlateSolveResult(83.8, -5.4, 0.3, 0.2, 1.0, "astrometry", image_size=(600, 400))
+    tracker = WcsTracker(max_drift_px=20.0, max_reference_age_s=0)
+    tracker.set_reference(result, ref, _wcs(), (600, 400))
+
+    tracked = tracker.track(_move(ref, 3.0, 4.0, 0.0))
+    assert tracked is not None and tracked.drift_px == pytest.approx(5.0, abs=0.01)
+    solved = tracker.tracked_result(tracked)
+    assert solved.method == "tracking" and solved.image_size == (600, 400)
+    # Field moved 3px right: the center now sees what was 3px left of it (RA increases left)
+    assert solved.ra_center > 83.8
+
+    assert tracker.track(_move(ref, 30.0, 0.0, 0.0)) is None
+    assert "drift" in (tracker.last_failure or "")
+
+
+def _field(stars: np.ndarray, shape=(400, 600), sigma=1.5) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    yy, xx = np.mgrid[: shape[0], : shape[1]]
+    image = rng.normal(1000.0, 10.0, shape)
+    for x, y, amp in stars:
+        image += amp * np.exp(-((xx - x) ** 2 + (yy - y) ** 2) / (2 * sigma**2))
+    return image.astype(np.uint16)
+
+
+class _Cfg:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def get_frame_processing_config(self) -> Dict[str, Any]:
+        return {"enabled": True, "plate_solve_dir": str(self.root), "use_timestamps": False}
+
+    def get_plate_solve_config(self) -> Dict[str, Any]:
+        return {
+            "default_solver": "astrometry_local",
+            "auto_solve": True,
+            "min_solve_interval": 3600,
+            "tracking": {"enabled": True, "max_drift_px": 50},
+        }
+
+    def get_mount_config(self) -> Dict[str, Any]:
+        return {"slewing_detection": {"enabled": False}}
+
+
+class _Status:
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.is_success = True
+        self.message = "ok"
+        self.data = data
+        self.details: Dict[str, Any] = {}
+
+
+class _Solver:
+    def __init__(self, wcs_path: str) -> None:
+        self.wcs_path = wcs_path
+        self.calls: List[str] = []
+
+    def is_available(self) -> bool:
+        return True
+
+    def get_name(self) -> str:
+        return "fake"
+
+    def solve(self, path: str) -> _Status:
+        self.calls.append(path)
+        return _Status(
+            {
+                "ra_center": 83.8,
+                "dec_center": -5.4,
+                "fov_width": 0.3,
+                "fov_height": 0.2,
+                "solving_time": 1.0,
+                "method": "fake",
+                "image_size": (600, 400),
+                "wcs_path": self.wcs_path,
+            }
+        )
+
+
+def test_processor_tracks_between_full_solves(tmp_path: Path):
+    from processing.processor import VideoProcessor
+
+    wcs_path = tmp_path / "solved.wcs"
+    fits.PrimaryHDU(header=_wcs().to_header()).writeto(wcs_path)
+    image = tmp_path / "capture.fits"
+    image.write_bytes(b"x")
+    stars = _stars(40)
+
+    vp = VideoProcessor(config=_Cfg(tmp_path))
+    solver = _Solver(str(wcs_path))
+    vp.plate_solver = solver
+    vp.last_solve_time = -1e9
+    results: List[Tuple[str, float]] = []
+    vp.on_solve_result = lambda r: results.append((r.method, r.ra_center))
+
+    vp.last_frame = _field(stars)
+    vp._maybe_plate_solve(fits_filename=image, frame_filename=None)
+    assert len(solver.calls) == 1 and vp.wcs_tracker.has_reference
+
+    # Small shift: tracked without a solve despite the long solve interval
+    vp.last_frame = _field(_move(stars, 4.0, -3.0, 0.1))
+    tracked = vp._maybe_plate_solve(fits_filename=image, frame_filename=None)
+    assert len(solver.calls) == 1 and vp.tracked_solves == 1
+    assert tracked is not None and tracked.method == "tracking"
+    assert Path(tracked.wcs_path).exists()
+
+    # Only the two newest tracked WCS files are kept
+    for capture_id in range(1, 4):
+        vp.capture_count = capture_id
+        vp.last_frame = _field(_move(stars, 4.0 + capture_id, -3.0, 0.1))
+        assert vp._maybe_plate_solve(fits_filename=image, frame_filename=None) is not None
+    assert sorted(p.name for p in tmp_path.rglob("track_*.wcs")) == [
+        "track_0002.wcs",
+        "track_0003.wcs",
+    ]
+
+    # Unrelated field: tracking is lost and a full solve runs right away
+    vp.last_frame = _field(_stars(40, seed=3))
+    vp._maybe_plate_solve(fits_filename=image, frame_filename=None)
+    assert len(solver.calls) == 2
+    assert [m == "tracking" for m, _ in results] == [False, True, True, True, True, False]